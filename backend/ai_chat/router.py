@@ -12,7 +12,6 @@ import json
 from database import get_db
 import models
 from .models import ChatSession, ChatMessage, DailyUsage
-from .gemini_client import gemini_client
 
 router = APIRouter(prefix="/ai", tags=["AI Chat"])
 KST = pytz.timezone('Asia/Seoul')
@@ -21,6 +20,12 @@ KST = pytz.timezone('Asia/Seoul')
 DAILY_QUESTION_LIMIT = 10
 
 
+def _gemini():
+    """Gemini 클라이언트 (google.generativeai/PIL import가 무거워 서버 시작이 아닌 첫 사용 때 로드)"""
+    from .gemini_client import gemini_client
+    return gemini_client
+
+
 # === Pydantic 스키마 ===
 
 class ChatRequest(BaseModel):
@@ -162,7 +167,7 @@ async def chat(request: ChatRequest, db: Session = Depends(get_db)):
     db.commit()
 
     # AI 응답 생성
-    ai_response = await gemini_client.chat(
+    ai_response = await _gemini().chat(
         message=request.message,
         history=history,
         image_base64=request.image_base64
@@ -242,7 +247,7 @@ async def chat_stream(request: ChatRequest, db: Session = Depends(get_db)):
         # 세션 ID 먼저 전송
         yield f"data: {json.dumps({'type': 'session', 'session_id': session.id})}\n\n"
 
-        async for chunk in gemini_client.chat_stream(
+        async for chunk in _gemini().chat_stream(
             message=request.message,
             history=history,
             image_base64=request.image_base64
@@ -360,7 +365,7 @@ async def get_usage(student_id: Optional[int] = None, db: Session = Depends(get_
 @router.get("/health")
 async def health_check():
     """AI 서비스 상태 확인"""
-    is_configured = gemini_client.model is not None
+    is_configured = _gemini().model is not None
     return {
         "status": "ok" if is_configured else "not_configured",
         "model": "gemini-1.5-flash" if is_configured else None,
@@ -1,6 +1,6 @@
 # ClassUp 스크래핑 모듈
 from .scraper import ClassUpScraper
-from .models import ClassUpAttendance, ClassUpSyncLog
+from .models import ClassUpAttendance, ClassUpDailySummary, ClassUpSyncLog, ClassUpSyncRollup
 from .router import router as classup_router
 
-__all__ = ['ClassUpScraper', 'ClassUpAttendance', 'ClassUpSyncLog', 'classup_router']
+__all__ = ['ClassUpScraper', 'ClassUpAttendance', 'ClassUpDailySummary', 'ClassUpSyncLog', 'ClassUpSyncRollup', 'classup_router']
@@ -1,13 +1,18 @@
 """ClassUp 빠른 스크래핑 Worker - 브라우저 유지하며 주기적 스크래핑"""
 import json
+import os
 import sys
-import time
 import signal
 from datetime import datetime
 from pathlib import Path
 import pytz
 
-from playwright.sync_api import sync_playwright
+# backend 디렉토리 (classup_core) import 경로
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from classup_core.backends import create_backend
+from classup_core.parser import record_to_json
+from classup_core.runner import ScrapeLoop
 
 KST = pytz.timezone('Asia/Seoul')
 
@@ -17,28 +22,17 @@ RESULT_FILE = Path(__file__).parent / "scrape_result.json"
 COMMAND_FILE = Path(__file__).parent / "worker_command.json"
 STATUS_FILE = Path(__file__).parent / "worker_status.json"
 
+# 스크래핑 엔진: "browser" (Playwright, 기본값) / "http" (세션 쿠키 + httpx)
+SCRAPE_ENGINE = os.getenv("CLASSUP_SCRAPE_ENGINE", "browser").lower()
+
 # 전역 상태
 _running = True
 
 
-def parse_datetime(datetime_str: str):
-    """날짜/시간 문자열 파싱"""
-    try:
-        datetime_str = datetime_str.strip()
-        if " " in datetime_str:
-            dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-        else:
-            today = datetime.now(KST).date()
-            time_part = datetime.strptime(datetime_str, "%H:%M:%S").time()
-            dt = datetime.combine(today, time_part)
-        return KST.localize(dt) if dt.tzinfo is None else dt
-    except Exception as e:
-        return None
-
-
 def save_status(status: dict):
     """Worker 상태 저장"""
     status["timestamp"] = datetime.now(KST).isoformat()
+    status.setdefault("engine", SCRAPE_ENGINE)
     with open(STATUS_FILE, 'w', encoding='utf-8') as f:
         json.dump(status, f, ensure_ascii=False, indent=2)
 
@@ -63,6 +57,15 @@ def check_command():
     return None
 
 
+def should_stop() -> bool:
+    """종료 시그널 또는 중지 명령 확인"""
+    global _running
+    if _running and check_command() == "stop":
+        print("중지 명령 수신")
+        _running = False
+    return not _running
+
+
 def signal_handler(signum, frame):
     """종료 시그널 처리"""
     global _running
@@ -70,60 +73,40 @@ def signal_handler(signum, frame):
     _running = False
 
 
-def scrape_page(page):
-    """페이지에서 데이터 스크래핑"""
-    records = []
-
-    try:
-        # 페이지 새로고침
-        page.reload(wait_until='networkidle', timeout=15000)
-        page.wait_for_timeout(300)
-
-        # 로그인 체크
-        if "login" in page.url.lower():
-            return {"success": False, "error": "세션 만료", "records": []}
-
-        # 팝업 닫기
-        page.keyboard.press("Escape")
-        page.wait_for_timeout(100)
-
-        # 테이블 데이터 수집
-        rows = page.query_selector_all('table tbody tr, table tr')
-
-        for row in rows:
-            try:
-                cells = row.query_selector_all('td')
-
-                if len(cells) >= 5:
-                    name = cells[0].inner_text().strip()
-                    phone = cells[1].inner_text().strip()
-                    available_time = cells[2].inner_text().strip()
-                    status = cells[3].inner_text().strip()
-                    record_time_str = cells[4].inner_text().strip()
-
-                    record_time = parse_datetime(record_time_str)
-
-                    if name and status and record_time:
-                        records.append({
-                            "student_name": name,
-                            "phone_number": phone,
-                            "available_time": available_time,
-                            "status": status,
-                            "record_time": record_time.isoformat()
-                        })
-            except:
-                continue
-
-        return {"success": True, "records": records}
-
-    except Exception as e:
-        return {"success": False, "error": str(e), "records": []}
+def on_cycle(result: dict):
+    """사이클 결과 기록 (실패 시에도 결과 파일 갱신)"""
+    cycle = result["cycle"]
+    metrics = result.get("metrics") or {}
+
+    if result["success"]:
+        save_result({
+            "success": True,
+            "records": [record_to_json(r) for r in result["records"]],
+            "scrape_count": cycle,
+            "elapsed_ms": result["elapsed_ms"],
+            "metrics": metrics,
+            "rss_kb": result.get("rss_kb"),
+        })
+        if cycle % 20 == 1 or result["new"]:
+            print(f"[{cycle}] 스크래핑 완료: {len(result['records'])}개, 새 기록 {result['new']}개 "
+                  f"({result['elapsed_ms']}ms, {metrics.get('bytes', 0) / 1024:.1f}KB, "
+                  f"요청 {metrics.get('requests', 0)}개, 차단 {metrics.get('blocked', 0)}개)")
+    else:
+        save_result({
+            "success": False,
+            "error": result["error"],
+            "records": [],
+            "scrape_count": cycle,
+            "elapsed_ms": result["elapsed_ms"],
+        })
+        print(f"[{cycle}] 스크래핑 실패: {result['error']}")
+
+    if result["session_expired"]:
+        save_status({"status": "error", "message": "세션 만료"})
 
 
 def main():
     """메인 Worker 루프"""
-    global _running
-
     # 시그널 핸들러 설정
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -133,103 +116,37 @@ def main():
         print("세션 파일 없음")
         sys.exit(1)
 
-    playwright = None
-    browser = None
-    page = None
+    backend = create_backend(SCRAPE_ENGINE, SESSION_FILE)
+    loop = ScrapeLoop(
+        backend,
+        on_records=lambda records, new_records: len(new_records),
+        should_stop=should_stop,
+        on_cycle=on_cycle,
+        stop_on_session_expired=True,
+    )
 
     try:
-        print("Worker 시작...")
+        print(f"Worker 시작 ({backend.name} 엔진)...")
         save_status({"status": "starting"})
 
-        playwright = sync_playwright().start()
-        browser = playwright.chromium.launch(
-            headless=True,
-            args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
-        )
-
-        context = browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            locale='ko-KR',
-            timezone_id='Asia/Seoul',
-            storage_state=str(SESSION_FILE)
-        )
-
-        page = context.new_page()
-
-        # 초기 페이지 로드
-        print("출입 기록 페이지 접속...")
-        page.goto("https://academy.classup.io/user/entrance", wait_until='networkidle', timeout=30000)
-        page.wait_for_timeout(1000)
-
-        if "login" in page.url.lower():
-            save_status({"status": "error", "message": "세션 만료"})
-            print("세션 만료")
+        if not loop.start_backend():
+            save_status({"status": "error", "message": "백엔드 시작 실패"})
             sys.exit(1)
 
-        # 팝업 닫기
-        for _ in range(2):
-            page.keyboard.press("Escape")
-            page.wait_for_timeout(200)
-
-        save_status({"status": "running", "message": "브라우저 준비 완료"})
+        save_status({"status": "running", "message": "스크래퍼 준비 완료"})
         print("Worker 준비 완료 - 스크래핑 루프 시작")
 
-        scrape_count = 0
-        while _running:
-            # 명령 확인
-            cmd = check_command()
-            if cmd == "stop":
-                print("중지 명령 수신")
-                break
-
-            # 스크래핑 수행
-            start_time = time.time()
-            result = scrape_page(page)
-            elapsed = time.time() - start_time
-
-            scrape_count += 1
-
-            # 결과 저장
-            result["scrape_count"] = scrape_count
-            result["elapsed_ms"] = int(elapsed * 1000)
-            save_result(result)
-
-            if result["success"]:
-                print(f"[{scrape_count}] 스크래핑 완료: {len(result['records'])}개 ({elapsed*1000:.0f}ms)")
-            else:
-                print(f"[{scrape_count}] 스크래핑 실패: {result.get('error')}")
-                # 세션 만료 시 종료
-                if "세션 만료" in result.get("error", ""):
-                    break
-
-            # 2초 대기 (빠른 폴링)
-            time.sleep(2)
+        # 시간표/활동량 기반 대기 (경계 시각 ~1초, 교시 중간 느리게, 운영 시간 외 정지)
+        loop.run()
 
     except Exception as e:
         print(f"Worker 오류: {e}")
         save_status({"status": "error", "message": str(e)})
+        return
 
-    finally:
-        print("Worker 종료 중...")
+    if not loop.session_expired:
         save_status({"status": "stopped"})
-
-        if page:
-            try:
-                page.close()
-            except:
-                pass
-        if browser:
-            try:
-                browser.close()
-            except:
-                pass
-        if playwright:
-            try:
-                playwright.stop()
-            except:
-                pass
-
-        print("Worker 종료 완료")
+    print("Worker 종료 완료")
 
 
 if __name__ == "__main__":
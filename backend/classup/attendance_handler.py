@@ -1,38 +1,16 @@
 """클래스업 출입 기록 처리 핸들러"""
 import re
 from datetime import datetime, timedelta, time as time_type
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 import pytz
 
 import models
+from timetable import Interval, get_timeline_index, get_timetable
 from .models import ClassUpAttendance
 
 KST = pytz.timezone('Asia/Seoul')
-
-# 시간표 정의
-SCHEDULE = {
-    "lunch": {"start": time_type(12, 0), "end": time_type(13, 0)},      # 점심시간
-    "dinner": {"start": time_type(18, 0), "end": time_type(19, 0)},     # 저녁시간
-    "breaks": [  # 쉬는시간들
-        {"start": time_type(10, 0), "end": time_type(10, 20)},   # 1교시 쉬는시간
-        {"start": time_type(15, 0), "end": time_type(15, 20)},   # 3교시 쉬는시간
-        {"start": time_type(16, 40), "end": time_type(16, 50)},  # 4교시 쉬는시간
-        {"start": time_type(20, 20), "end": time_type(20, 30)},  # 6교시 쉬는시간
-    ],
-    "closing": time_type(22, 0),  # 정규 하원 시간
-}
-
-# 교시별 시간 정의 (지각 처리용)
-PERIODS = [
-    {"name": "1교시", "start": time_type(8, 0), "end": time_type(10, 0)},
-    {"name": "2교시", "start": time_type(10, 20), "end": time_type(12, 0)},
-    {"name": "3교시", "start": time_type(13, 0), "end": time_type(15, 0)},
-    {"name": "4교시", "start": time_type(15, 20), "end": time_type(16, 40)},
-    {"name": "5교시", "start": time_type(16, 50), "end": time_type(18, 0)},
-    {"name": "6교시", "start": time_type(19, 0), "end": time_type(20, 20)},
-    {"name": "7교시", "start": time_type(20, 30), "end": time_type(22, 0)},
-]
+LATE_THRESHOLD = time_type(8, 0)  # 08:00 지각 기준
 
 # 복귀 시간 설정
 RETURN_TIMES = {
@@ -69,51 +47,28 @@ def parse_status(raw_status: str) -> Tuple[str, Optional[str]]:
 
 
 def is_within_schedule(current_time: time_type, schedule_type: str) -> bool:
-    """주어진 시간이 시간표 내인지 확인"""
-    if schedule_type == "lunch":
-        return SCHEDULE["lunch"]["start"] <= current_time <= SCHEDULE["lunch"]["end"]
-    elif schedule_type == "dinner":
-        return SCHEDULE["dinner"]["start"] <= current_time <= SCHEDULE["dinner"]["end"]
-    elif schedule_type == "break":
-        for break_time in SCHEDULE["breaks"]:
-            if break_time["start"] <= current_time <= break_time["end"]:
-                return True
-        return False
-    return False
+    """주어진 시간이 시간표 내인지 확인 (schedule_type: lunch/dinner/break)"""
+    return get_timetable().window_at(current_time, schedule_type) is not None
 
 
 def get_next_session_start(current_time: time_type) -> Optional[time_type]:
     """현재 시간 이후 다음 교시 시작 시간 반환"""
-    session_starts = [
-        time_type(8, 0),    # 1교시
-        time_type(10, 20),  # 2교시
-        time_type(13, 0),   # 3교시
-        time_type(15, 20),  # 4교시
-        time_type(16, 50),  # 5교시
-        time_type(19, 0),   # 6교시
-        time_type(20, 30),  # 7교시
-    ]
-    for start in session_starts:
-        if start > current_time:
-            return start
-    return None
+    slot = get_timetable().next_period(current_time)
+    return slot.start if slot else None
 
 
-def check_recurring_outing(student_id: int, current_datetime: datetime, db: Session) -> Optional[models.RecurringOuting]:
-    """학생의 정기외출 일정 확인"""
-    day_of_week = current_datetime.weekday()  # 0=Monday
-    current_time = current_datetime.time()
-    current_time_str = current_time.strftime("%H:%M")
+def _window_label(kind: str) -> str:
+    """시간표의 해당 구분 구간 표시 (예: "12:00~13:00")"""
+    return ", ".join(
+        f"{slot.start.strftime('%H:%M')}~{slot.end.strftime('%H:%M')}"
+        for slot in get_timetable().windows(kind)
+    )
 
-    outing = db.query(models.RecurringOuting).filter(
-        models.RecurringOuting.student_id == student_id,
-        models.RecurringOuting.day_of_week == day_of_week,
-        models.RecurringOuting.is_active == 1,
-        models.RecurringOuting.start_time <= current_time_str,
-        models.RecurringOuting.end_time >= current_time_str
-    ).first()
 
-    return outing
+def check_recurring_outing(student_id: int, current_datetime: datetime, db: Session) -> Optional[Interval]:
+    """학생의 정기외출 일정 확인 (일일 타임라인 조회 - 인덱스가 빌드된 뒤에는 DB 조회 없음)"""
+    index = get_timeline_index(db, current_datetime.date())
+    return index.first_at(student_id, current_datetime, ("recurring_outing",))
 
 
 def calculate_expected_return(record_time: datetime, status: str, detail: str, student_id: int, db: Session) -> Optional[datetime]:
@@ -138,18 +93,17 @@ def calculate_expected_return(record_time: datetime, status: str, detail: str, s
 
     elif detail == "쉬는시간":
         # 쉬는시간 종료 시간
-        for break_time in SCHEDULE["breaks"]:
-            if break_time["start"] <= current_time <= break_time["end"]:
-                return datetime.combine(record_time.date(), break_time["end"]).replace(tzinfo=KST)
+        break_slot = get_timetable().window_at(current_time, "break")
+        if break_slot:
+            return datetime.combine(record_time.date(), break_slot.end).replace(tzinfo=KST)
         return record_time + timedelta(minutes=20)
 
     elif detail == "정기외출":
         # RecurringOuting에서 end_time 확인
         if student_id:
             outing = check_recurring_outing(student_id, record_time, db)
-            if outing and outing.end_time:
-                end_time = datetime.strptime(outing.end_time, "%H:%M").time()
-                return datetime.combine(record_time.date(), end_time).replace(tzinfo=KST)
+            if outing:
+                return datetime.combine(record_time.date(), outing.end_time).replace(tzinfo=KST)
         return None  # 정기외출 없으면 None
 
     elif detail == "병원 진료":
@@ -170,12 +124,12 @@ def validate_outing_schedule(record_time: datetime, detail: str, student_id: int
 
     if detail == "점심식사":
         if not is_within_schedule(current_time, "lunch"):
-            return False, f"점심시간({SCHEDULE['lunch']['start'].strftime('%H:%M')}~{SCHEDULE['lunch']['end'].strftime('%H:%M')}) 외 시간에 점심식사 외출"
+            return False, f"점심시간({_window_label('lunch')}) 외 시간에 점심식사 외출"
         return True, ""
 
     elif detail == "저녁식사":
         if not is_within_schedule(current_time, "dinner"):
-            return False, f"저녁시간({SCHEDULE['dinner']['start'].strftime('%H:%M')}~{SCHEDULE['dinner']['end'].strftime('%H:%M')}) 외 시간에 저녁식사 외출"
+            return False, f"저녁시간({_window_label('dinner')}) 외 시간에 저녁식사 외출"
         return True, ""
 
     elif detail == "쉬는시간":
@@ -203,7 +157,7 @@ def validate_exit(record_time: datetime, student_id: int, db: Session) -> Tuple[
     Returns: (is_valid, reason)
     """
     current_time = record_time.time()
-    closing_time = SCHEDULE["closing"]
+    closing_time = get_timetable().closing
 
     # 22:00 이전 퇴장 체크
     if current_time < closing_time:
@@ -246,10 +200,10 @@ def link_return_to_outing(reentry_record: ClassUpAttendance, db: Session):
 
 
 def get_current_period(current_time: time_type) -> Optional[dict]:
-    """현재 시간이 속한 교시 반환"""
-    for period in PERIODS:
-        if period["start"] <= current_time <= period["end"]:
-            return period
+    """현재 시간이 속한 교시 반환 ({"name", "start", "end"})"""
+    slot = get_timetable().period_at(current_time)
+    if slot:
+        return {"name": slot.name, "start": slot.start, "end": slot.end}
     return None
 
 
@@ -292,3 +246,147 @@ def get_late_students_in_period(current_time: time_type, db: Session) -> list:
     ).all()
 
     return late_records
+
+
+def build_classup_record(record, main_status: str, status_detail: Optional[str],
+                         db: Session) -> Tuple[ClassUpAttendance, Optional[models.Student], str]:
+    """출입 기록 → ClassUpAttendance 행 (학생 매칭/지각/예상 복귀/일정 검증)
+
+    세션에 추가하거나 커밋하지 않으므로 호출 측이 한 건씩 또는 묶어서 저장합니다.
+    Returns: (행, 매칭된 학생, 일정 검증 사유)
+    """
+    # 이름으로 Dittonweb 학생 매칭
+    student = db.query(models.Student).filter(
+        models.Student.name == record.student_name,
+        models.Student.status == "재원"
+    ).first()
+    student_id = student.id if student else None
+
+    # 지각 여부 판단 (입장만)
+    is_late = False
+    if main_status == "입장":
+        record_time = record.record_time
+        if record_time.tzinfo is None:
+            record_time = KST.localize(record_time)
+        is_late = record_time.time() > LATE_THRESHOLD
+
+    # 예상 복귀 시간 계산 (외출/이동)
+    expected_return = calculate_expected_return(
+        record.record_time, main_status, status_detail, student_id, db
+    )
+
+    # 일정 유효성 검증
+    is_schedule_valid = None
+    validation_reason = ""
+    if main_status == "외출":
+        is_schedule_valid, validation_reason = validate_outing_schedule(
+            record.record_time, status_detail, student_id, db
+        )
+    elif main_status == "퇴장":
+        is_schedule_valid, validation_reason = validate_exit(
+            record.record_time, student_id, db
+        )
+
+    classup_record = ClassUpAttendance(
+        student_name=record.student_name,
+        phone_number=record.phone_number,
+        available_time=record.available_time,
+        status=main_status,
+        status_detail=status_detail,
+        record_time=record.record_time,
+        local_student_id=student_id,
+        is_late=is_late,
+        synced_to_attendance=False,
+        discord_notified=False,
+        expected_return_time=expected_return,
+        is_schedule_valid=is_schedule_valid
+    )
+    return classup_record, student, validation_reason
+
+
+def sync_dittonweb_attendance(classup_record: ClassUpAttendance, student, db: Session,
+                              on_return_linked=None) -> List[dict]:
+    """저장된 ClassUp 기록을 Dittonweb 출석 기록에 반영 (입장/재입장/외출·이동/퇴장)
+
+    on_return_linked(outing_record): 재입장이 외출/이동 기록과 연결됐을 때 호출 (복귀 타이머 해제)
+    Returns: 추가로 보낼 알림 (늦은 복귀) - send_discord_notification 키워드 인자 목록
+    """
+    alerts = []
+    if not student:
+        return alerts
+
+    main_status = classup_record.status
+    record_time = classup_record.record_time
+    today = datetime.now(KST).date()
+
+    existing_attendance = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.student_id == student.id,
+        models.AttendanceRecord.date == today
+    ).first()
+
+    if main_status == "입장":
+        # 첫 입장: 출석 기록 생성
+        if not existing_attendance:
+            attendance_status = "지각" if classup_record.is_late else "자습중"
+            new_attendance = models.AttendanceRecord(
+                student_id=student.id,
+                date=today,
+                status=attendance_status,
+                check_in_time=record_time.time() if record_time else None
+            )
+            db.add(new_attendance)
+            classup_record.synced_to_attendance = True
+            db.commit()
+
+    elif main_status == "재입장":
+        # 재입장: 상태를 "자습중"으로 변경, 외출 기록과 연결
+        outing_record = link_return_to_outing(classup_record, db)
+        if outing_record and on_return_linked:
+            on_return_linked(outing_record)
+
+        # 늦게 복귀했는지 체크
+        if outing_record and outing_record.expected_return_time:
+            return_time = record_time
+            if return_time.tzinfo is None:
+                return_time = KST.localize(return_time)
+            expected_time = outing_record.expected_return_time
+            if expected_time.tzinfo is None:
+                expected_time = KST.localize(expected_time)
+
+            if return_time > expected_time:
+                # 늦게 복귀 - 지연 시간 계산
+                delay_minutes = int((return_time - expected_time).total_seconds() / 60)
+                classup_record.is_late = True  # 복귀 지각 표시
+                db.commit()
+
+                alerts.append(dict(
+                    title="⏰ 늦은 복귀 알림",
+                    category="늦은복귀",
+                    message=f"**{classup_record.student_name}** ({student.seat_number if student else '미등록'}) 학생이 예정보다 늦게 복귀했습니다.",
+                    color=0xFFA500,  # 주황색
+                    fields=[
+                        {"name": "학생", "value": classup_record.student_name, "inline": True},
+                        {"name": "외출 유형", "value": outing_record.status_detail or outing_record.status, "inline": True},
+                        {"name": "예상 복귀", "value": expected_time.strftime("%H:%M"), "inline": True},
+                        {"name": "실제 복귀", "value": return_time.strftime("%H:%M"), "inline": True},
+                        {"name": "지연 시간", "value": f"{delay_minutes}분", "inline": True}
+                    ],
+                ))
+
+        if existing_attendance and existing_attendance.status in ["외출", "이동", "일정중"]:
+            existing_attendance.status = "자습중"
+            db.commit()
+
+    elif main_status in ["외출", "이동"]:
+        # 외출/이동: 상태 변경
+        if existing_attendance:
+            existing_attendance.status = "일정중"
+            db.commit()
+
+    elif main_status in ["퇴장", "강제퇴장"]:
+        # 퇴장: 하원 처리
+        if existing_attendance:
+            existing_attendance.check_out_time = record_time.time() if record_time else None
+            db.commit()
+
+    return alerts
@@ -0,0 +1,501 @@
+"""ClassUp 데이터 보관/정리
+
+보관 정책 (환경변수로 조정):
+- 이상 기록(지각/강제퇴장/일정 검증 미통과/미복귀 알림): CLASSUP_RETENTION_ANOMALY_DAYS (기본 365일)
+- 일반 기록(입장/퇴장/외출/재입장 등): CLASSUP_RETENTION_NORMAL_DAYS (기본 30일)
+  삭제 전에 classup_daily_summaries에 일별(학생/상태별) 건수로 집계 (CLASSUP_AGGREGATE_ROUTINE=false면 집계 없이 삭제)
+- 동기화 개별 로그: CLASSUP_RETENTION_SYNC_LOG_DAYS (기본 7일), 롤업: CLASSUP_RETENTION_ROLLUP_DAYS (기본 90일)
+- 알림 아웃박스: 전송 완료 NOTIFY_OUTBOX_RETENTION_DAYS (기본 7일), 최종 실패 NOTIFY_OUTBOX_FAILED_RETENTION_DAYS (기본 30일)
+
+삭제는 CLASSUP_CLEANUP_BATCH_SIZE개씩 나눠 커밋하므로 테이블을 오래 잠그지 않습니다.
+PostgreSQL에서 classup_attendance를 월별 범위 파티션으로 바꿀 수 있습니다 (python -m classup.cleanup --partition).
+파티션 테이블이면 정리 시 다음 달 파티션을 미리 만들고, 이상 기록 보관 기간이 지난 월 파티션은 통째로 삭제합니다.
+"""
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import pytz
+from sqlalchemy import func, inspect, or_, not_, text
+from sqlalchemy.orm import Session
+
+from database import naive_kst
+from notifications.models import NotificationOutbox
+from .models import ClassUpAttendance, ClassUpDailySummary, ClassUpSyncLog, ClassUpSyncRollup
+from .sync_stats import compact_sync_logs
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# ============ 보관 정책 ============
+
+NORMAL_RETENTION_DAYS = int(os.getenv("CLASSUP_RETENTION_NORMAL_DAYS", "30"))
+ANOMALY_RETENTION_DAYS = int(os.getenv("CLASSUP_RETENTION_ANOMALY_DAYS", "365"))
+SYNC_LOG_RETENTION_DAYS = int(os.getenv("CLASSUP_RETENTION_SYNC_LOG_DAYS", "7"))
+ROLLUP_RETENTION_DAYS = int(os.getenv("CLASSUP_RETENTION_ROLLUP_DAYS", "90"))
+AGGREGATE_ROUTINE = os.getenv("CLASSUP_AGGREGATE_ROUTINE", "true").lower() in ("true", "1", "yes")
+OUTBOX_RETENTION_DAYS = int(os.getenv("NOTIFY_OUTBOX_RETENTION_DAYS", "7"))
+OUTBOX_FAILED_RETENTION_DAYS = int(os.getenv("NOTIFY_OUTBOX_FAILED_RETENTION_DAYS", "30"))
+
+# 이상 기록으로 오래 보관할 상태
+ANOMALY_STATUSES = [s.strip() for s in os.getenv("CLASSUP_ANOMALY_STATUSES", "강제퇴장").split(",") if s.strip()]
+
+# 한 번에 삭제할 행 수 / 배치 사이 대기 (초) - 운영 중 쓰기와 잠금 경합 완화
+BATCH_SIZE = int(os.getenv("CLASSUP_CLEANUP_BATCH_SIZE", "1000"))
+BATCH_PAUSE_SECONDS = 0.05
+
+# 미리 만들어 둘 월 파티션 수 (이번 달 이후)
+PARTITION_MONTHS_AHEAD = 2
+PARTITION_PREFIX = "classup_attendance_y"
+
+
+def get_policy() -> dict:
+    return {
+        "normal_days": NORMAL_RETENTION_DAYS,
+        "anomaly_days": ANOMALY_RETENTION_DAYS,
+        "sync_log_days": SYNC_LOG_RETENTION_DAYS,
+        "rollup_days": ROLLUP_RETENTION_DAYS,
+        "outbox_days": OUTBOX_RETENTION_DAYS,
+        "outbox_failed_days": OUTBOX_FAILED_RETENTION_DAYS,
+        "aggregate_routine": AGGREGATE_ROUTINE,
+        "anomaly_statuses": ANOMALY_STATUSES,
+        "batch_size": BATCH_SIZE,
+    }
+
+
+def anomaly_condition():
+    """오래 보관할 이상 기록 조건"""
+    return or_(
+        func.coalesce(ClassUpAttendance.is_late, False) == True,
+        ClassUpAttendance.status.in_(ANOMALY_STATUSES),
+        # 일정 검증을 하지 않은 기록(NULL)은 일반 기록 - NULL이 섞이면 not_()도 NULL이 되어 삭제 대상에서 빠짐
+        func.coalesce(ClassUpAttendance.is_schedule_valid, True) == False,
+        func.coalesce(ClassUpAttendance.return_alert_sent, False) == True,
+    )
+
+
+def _cutoff(days: int) -> datetime:
+    """보관 기한 시각 (tz 없는 KST - async 세션(asyncpg)에서도 바인딩 가능)"""
+    return naive_kst() - timedelta(days=days)
+
+
+# ============ 배치 삭제 ============
+
+def delete_in_batches(db: Session, model, *conditions, before_delete=None, batch_size: int = None) -> int:
+    """조건에 맞는 행을 id 순으로 batch_size개씩 삭제 (배치마다 커밋)
+
+    before_delete(rows)가 있으면 삭제 전에 같은 트랜잭션에서 호출합니다 (집계 등).
+    """
+    batch_size = batch_size or BATCH_SIZE
+    deleted = 0
+
+    while True:
+        if before_delete:
+            rows = db.query(model).filter(*conditions).order_by(model.id.asc()).limit(batch_size).all()
+            ids = [row.id for row in rows]
+        else:
+            rows = None
+            ids = [row_id for (row_id,) in db.query(model.id).filter(*conditions).order_by(model.id.asc()).limit(batch_size)]
+        if not ids:
+            break
+
+        try:
+            if before_delete:
+                before_delete(rows)
+            db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            break
+        time.sleep(BATCH_PAUSE_SECONDS)
+
+    return deleted
+
+
+def _local_date(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(KST)
+    return value.date()
+
+
+def aggregate_routine(db: Session, rows: List[ClassUpAttendance]) -> int:
+    """삭제할 일반 기록을 일별 집계에 합침. Returns: 갱신한 집계 행 수"""
+    groups: Dict[tuple, dict] = {}
+    for row in rows:
+        key = (_local_date(row.record_time), row.student_name, row.status)
+        group = groups.setdefault(key, {"count": 0, "first": row.record_time, "last": row.record_time,
+                                        "local_student_id": row.local_student_id})
+        group["count"] += 1
+        group["first"] = min(group["first"], row.record_time)
+        group["last"] = max(group["last"], row.record_time)
+        if row.local_student_id:
+            group["local_student_id"] = row.local_student_id
+
+    for (day, student_name, status), group in groups.items():
+        summary = db.query(ClassUpDailySummary).filter(
+            ClassUpDailySummary.date == day,
+            ClassUpDailySummary.student_name == student_name,
+            ClassUpDailySummary.status == status
+        ).first()
+        if summary is None:
+            summary = ClassUpDailySummary(date=day, student_name=student_name, status=status, count=0,
+                                          first_time=group["first"], last_time=group["last"])
+            db.add(summary)
+        summary.count = (summary.count or 0) + group["count"]
+        summary.first_time = min(summary.first_time, group["first"]) if summary.first_time else group["first"]
+        summary.last_time = max(summary.last_time, group["last"]) if summary.last_time else group["last"]
+        summary.local_student_id = summary.local_student_id or group["local_student_id"]
+
+    return len(groups)
+
+
+# ============ 파티션 (PostgreSQL) ============
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def is_partitioned(db: Session) -> bool:
+    if not _is_postgres(db):
+        return False
+    result = db.execute(text(
+        "SELECT c.relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relname = 'classup_attendance' AND n.nspname = current_schema()"
+    )).scalar()
+    return result == "p"
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _next_month(value: date) -> date:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month.year}m{month.month:02d}"
+
+
+def list_partitions(db: Session) -> List[str]:
+    rows = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'classup_attendance' ORDER BY c.relname"
+    )).fetchall()
+    return [name for (name,) in rows]
+
+
+def _create_partition(db: Session, month: date) -> bool:
+    name = _partition_name(month)
+    exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+    if exists:
+        return False
+    db.execute(text(
+        f'CREATE TABLE "{name}" PARTITION OF classup_attendance '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+    ))
+    return True
+
+
+def ensure_partitions(db: Session, months_ahead: int = PARTITION_MONTHS_AHEAD) -> int:
+    """이번 달 ~ months_ahead개월 뒤 파티션 생성 (기본 파티션에 쌓이지 않도록)"""
+    if not is_partitioned(db):
+        return 0
+    created = 0
+    month = _month_start(datetime.now(KST).date())
+    for _ in range(months_ahead + 1):
+        if _create_partition(db, month):
+            created += 1
+        month = _next_month(month)
+    db.commit()
+    if created:
+        logger.info(f"classup_attendance 월 파티션 {created}개 생성")
+    return created
+
+
+def drop_expired_partitions(db: Session) -> int:
+    """이상 기록 보관 기간이 지난 월 파티션 삭제 (통째로 DROP - 행 단위 삭제보다 훨씬 빠름)"""
+    if not is_partitioned(db):
+        return 0
+    cutoff = _cutoff(ANOMALY_RETENTION_DAYS).date()
+    dropped = 0
+    for name in list_partitions(db):
+        if not name.startswith(PARTITION_PREFIX):
+            continue
+        try:
+            year, month = name[len(PARTITION_PREFIX):].split("m")
+            upper = _next_month(date(int(year), int(month), 1))
+        except ValueError:
+            continue
+        if upper <= cutoff:
+            if AGGREGATE_ROUTINE:
+                # 남아 있는 일반 기록은 먼저 집계
+                delete_in_batches(
+                    db, ClassUpAttendance,
+                    ClassUpAttendance.record_time < upper,
+                    not_(anomaly_condition()),
+                    before_delete=lambda rows: aggregate_routine(db, rows)
+                )
+            db.execute(text(f'DROP TABLE "{name}"'))
+            db.commit()
+            dropped += 1
+            logger.info(f"만료 파티션 삭제: {name}")
+    return dropped
+
+
+def migrate_to_partitioned(db: Session) -> dict:
+    """classup_attendance를 record_time 기준 월별 범위 파티션 테이블로 변환 (한 트랜잭션)
+
+    기본 키는 (id, record_time)이 되고, id 시퀀스는 그대로 이어서 사용합니다.
+    변환 중에는 테이블이 잠기므로 운영 시간 외에 실행하세요.
+    """
+    if not _is_postgres(db):
+        raise RuntimeError("파티션은 PostgreSQL에서만 지원합니다.")
+    if is_partitioned(db):
+        return {"status": "already_partitioned", "partitions": list_partitions(db)}
+
+    bounds = db.execute(text("SELECT min(record_time), max(record_time) FROM classup_attendance")).fetchone()
+    today = datetime.now(KST).date()
+    first_month = _month_start(bounds[0].date() if bounds[0] else today)
+    last_month = _month_start(max(bounds[1].date() if bounds[1] else today, today))
+
+    try:
+        db.execute(text("LOCK TABLE classup_attendance IN ACCESS EXCLUSIVE MODE"))
+        db.execute(text("ALTER TABLE classup_attendance RENAME TO classup_attendance_legacy"))
+        db.execute(text(
+            "CREATE TABLE classup_attendance (LIKE classup_attendance_legacy INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (record_time)"
+        ))
+        db.execute(text("ALTER TABLE classup_attendance ADD PRIMARY KEY (id, record_time)"))
+
+        month = first_month
+        months = 0
+        while month <= last_month or months == 0:
+            _create_partition(db, month)
+            month = _next_month(month)
+            months += 1
+        for _ in range(PARTITION_MONTHS_AHEAD):
+            _create_partition(db, month)
+            month = _next_month(month)
+        db.execute(text("CREATE TABLE classup_attendance_default PARTITION OF classup_attendance DEFAULT"))
+
+        moved = db.execute(text("INSERT INTO classup_attendance SELECT * FROM classup_attendance_legacy")).rowcount
+        db.execute(text("ALTER SEQUENCE IF EXISTS classup_attendance_id_seq OWNED BY classup_attendance.id"))
+        db.execute(text("DROP TABLE classup_attendance_legacy"))
+
+        # 조회 패턴용 인덱스 (각 파티션에 자동 생성)
+        db.execute(text("CREATE INDEX ix_classup_attendance_id ON classup_attendance (id)"))
+        db.execute(text("CREATE INDEX ix_classup_attendance_record_time ON classup_attendance (record_time)"))
+        db.execute(text(
+            "CREATE INDEX ix_classup_attendance_name_status_time "
+            "ON classup_attendance (student_name, status, record_time)"
+        ))
+        db.execute(text(
+            "ALTER TABLE classup_attendance ADD CONSTRAINT classup_attendance_local_student_id_fkey "
+            "FOREIGN KEY (local_student_id) REFERENCES students (id)"
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    partitions = list_partitions(db)
+    logger.info(f"classup_attendance 파티션 변환 완료: {moved}행, 파티션 {len(partitions)}개")
+    return {"status": "partitioned", "rows": moved, "partitions": partitions}
+
+
+# ============ 정리 실행 ============
+
+def run_cleanup(db: Session) -> dict:
+    """보관 정책에 따라 ClassUp 데이터 정리 (매일 04:00 스케줄러 / POST /classup/cleanup)"""
+    started = time.perf_counter()
+    result = {
+        "sync_logs_compacted": 0,
+        "sync_logs_deleted": 0,
+        "rollups_deleted": 0,
+        "normal_records_deleted": 0,
+        "anomaly_records_deleted": 0,
+        "summaries_updated": 0,
+        "partitions_created": 0,
+        "partitions_dropped": 0,
+        "outbox_deleted": 0,
+    }
+
+    # 1. 동기화 로그: 유휴 로그 압축 → 오래된 개별 로그/롤업 삭제
+    result["sync_logs_compacted"] = compact_sync_logs(db)
+    result["sync_logs_deleted"] = delete_in_batches(
+        db, ClassUpSyncLog, ClassUpSyncLog.sync_time < _cutoff(SYNC_LOG_RETENTION_DAYS)
+    )
+    result["rollups_deleted"] = delete_in_batches(
+        db, ClassUpSyncRollup, ClassUpSyncRollup.bucket_start < _cutoff(ROLLUP_RETENTION_DAYS)
+    )
+
+    # 2. 파티션 유지 (PostgreSQL 파티션 테이블일 때만)
+    result["partitions_created"] = ensure_partitions(db)
+    result["partitions_dropped"] = drop_expired_partitions(db)
+
+    # 3. 일반 기록: 집계 후 삭제
+    def summarize(rows):
+        result["summaries_updated"] += aggregate_routine(db, rows)
+
+    result["normal_records_deleted"] = delete_in_batches(
+        db, ClassUpAttendance,
+        ClassUpAttendance.record_time < _cutoff(NORMAL_RETENTION_DAYS),
+        not_(anomaly_condition()),
+        before_delete=summarize if AGGREGATE_ROUTINE else None
+    )
+
+    # 4. 이상 기록: 보관 기간이 지난 것만 삭제
+    result["anomaly_records_deleted"] = delete_in_batches(
+        db, ClassUpAttendance,
+        ClassUpAttendance.record_time < _cutoff(ANOMALY_RETENTION_DAYS)
+    )
+
+    # 5. 알림 아웃박스: 전송 완료/최종 실패 행 삭제 (대기 중인 알림은 그대로)
+    result["outbox_deleted"] = delete_in_batches(
+        db, NotificationOutbox,
+        NotificationOutbox.status == "sent",
+        NotificationOutbox.sent_at < _cutoff(OUTBOX_RETENTION_DAYS)
+    ) + delete_in_batches(
+        db, NotificationOutbox,
+        NotificationOutbox.status == "failed",
+        NotificationOutbox.created_at < _cutoff(OUTBOX_FAILED_RETENTION_DAYS)
+    )
+
+    result["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+    result["policy"] = get_policy()
+    logger.info(f"ClassUp 데이터 정리 완료: {result}")
+    return result
+
+
+# ============ 저장소 통계 ============
+
+STATS_TABLES = [
+    "classup_attendance",
+    "classup_daily_summaries",
+    "classup_sync_logs",
+    "classup_sync_rollups",
+    "notification_outbox",
+]
+
+
+def _postgres_table_stats(db: Session, table: str) -> Optional[dict]:
+    """테이블(파티션 포함) 크기/행 수 - 파티션 테이블은 모든 파티션 합계"""
+    row = db.execute(text(
+        "SELECT "
+        "  coalesce(sum(pg_total_relation_size(t.relid)), 0), "
+        "  coalesce(sum(pg_relation_size(t.relid)), 0), "
+        "  coalesce(sum(pg_indexes_size(t.relid)), 0), "
+        "  coalesce(sum(s.n_live_tup), 0), "
+        "  coalesce(sum(s.n_dead_tup), 0), "
+        "  count(*) FILTER (WHERE t.isleaf) "
+        "FROM pg_partition_tree(to_regclass(:table)) t "
+        "LEFT JOIN pg_stat_user_tables s ON s.relid = t.relid"
+    ), {"table": table}).fetchone()
+    if row is None:
+        return None
+    total, data, indexes, live, dead, leaves = row
+    return {
+        "total_bytes": int(total),
+        "table_bytes": int(data),
+        "index_bytes": int(indexes),
+        "live_rows": int(live),
+        "dead_rows": int(dead),
+        "partitions": int(leaves) if leaves and leaves > 1 else 0,
+    }
+
+
+def _sqlite_table_stats(db: Session, table: str) -> dict:
+    stats = {"rows": db.execute(text(f'SELECT count(*) FROM "{table}"')).scalar()}
+    try:
+        # dbstat 가상 테이블 (SQLITE_ENABLE_DBSTAT_VTAB로 빌드된 경우)
+        table_bytes = db.execute(text("SELECT sum(pgsize) FROM dbstat WHERE name = :table"), {"table": table}).scalar()
+        index_bytes = db.execute(text(
+            "SELECT sum(pgsize) FROM dbstat WHERE name IN "
+            "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table)"
+        ), {"table": table}).scalar()
+        stats.update(table_bytes=int(table_bytes or 0), index_bytes=int(index_bytes or 0),
+                     total_bytes=int(table_bytes or 0) + int(index_bytes or 0))
+    except Exception:
+        db.rollback()
+    return stats
+
+
+def get_storage_stats(db: Session) -> dict:
+    """테이블별 저장소 통계 + 출입 기록 구성(이상/일반)과 보관 정책"""
+    existing = set(inspect(db.get_bind()).get_table_names())
+    postgres = _is_postgres(db)
+
+    tables = {}
+    for table in STATS_TABLES:
+        if table not in existing:
+            continue
+        try:
+            tables[table] = _postgres_table_stats(db, table) if postgres else _sqlite_table_stats(db, table)
+        except Exception as e:
+            db.rollback()
+            tables[table] = {"error": str(e)}
+
+    normal_cutoff = _cutoff(NORMAL_RETENTION_DAYS)
+    total = db.query(func.count(ClassUpAttendance.id)).scalar() or 0
+    anomalies = db.query(func.count(ClassUpAttendance.id)).filter(anomaly_condition()).scalar() or 0
+    oldest = db.query(func.min(ClassUpAttendance.record_time)).scalar()
+    expired_normal = db.query(func.count(ClassUpAttendance.id)).filter(
+        ClassUpAttendance.record_time < normal_cutoff,
+        not_(anomaly_condition())
+    ).scalar() or 0
+
+    stats = {
+        "dialect": db.get_bind().dialect.name,
+        "tables": tables,
+        "attendance": {
+            "total": total,
+            "anomaly": anomalies,
+            "normal": total - anomalies,
+            "pending_cleanup": expired_normal,
+            "oldest_record": oldest.isoformat() if oldest else None,
+            "partitioned": is_partitioned(db),
+        },
+        "policy": get_policy(),
+    }
+    if postgres:
+        stats["database_bytes"] = db.execute(text("SELECT pg_database_size(current_database())")).scalar()
+    else:
+        url = db.get_bind().url
+        if url.database and os.path.exists(url.database):
+            stats["database_bytes"] = os.path.getsize(url.database)
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="ClassUp 데이터 정리/파티션 관리")
+    parser.add_argument("--partition", action="store_true", help="classup_attendance를 월별 파티션 테이블로 변환 (PostgreSQL)")
+    parser.add_argument("--stats", action="store_true", help="저장소 통계만 출력")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.partition:
+            output = migrate_to_partitioned(session)
+        elif args.stats:
+            output = get_storage_stats(session)
+        else:
+            output = run_cleanup(session)
+        print(json.dumps(output, ensure_ascii=False, indent=2, default=str))
+    finally:
+        session.close()
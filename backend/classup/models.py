@@ -1,5 +1,5 @@
 """ClassUp 출입 기록 데이터베이스 모델"""
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Time
+from sqlalchemy import inspect, text, Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Time, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import pytz
@@ -38,6 +38,9 @@ class ClassUpAttendance(Base):
     return_alert_sent = Column(Boolean, default=False)      # 미복귀 알림 전송 여부
     is_schedule_valid = Column(Boolean, nullable=True)      # 일정 유효성 (정기외출/시간표 체크)
 
+    # 다중 계정 (classup-worker CLASSUP_SESSION_KEYS) - 기록을 가져온 세션 키 (지점)
+    source_account = Column(String, default="default")
+
     # 관계 설정
     student = relationship("Student", backref="classup_records", foreign_keys=[local_student_id])
 
@@ -58,3 +61,77 @@ class ClassUpSyncLog(Base):
 
     def __repr__(self):
         return f"<ClassUpSyncLog {self.sync_time} fetched={self.records_fetched}>"
+
+
+class ClassUpSyncRollup(Base):
+    """클래스업 동기화 사이클 집계 (분/시간 단위)
+
+    개별 로그(ClassUpSyncLog)는 새 기록/오류가 있는 사이클만 남기고, 모든 사이클은 여기에 집계됩니다.
+    """
+    __tablename__ = "classup_sync_rollups"
+    __table_args__ = (UniqueConstraint("source", "bucket_start", name="uq_classup_sync_rollup_bucket"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False, default="internal")  # internal(메인 서버)/external(classup-worker)/legacy(압축)
+    bucket_start = Column(DateTime, nullable=False, index=True)  # 구간 시작
+    bucket_seconds = Column(Integer, default=60)                 # 구간 길이
+    cycles = Column(Integer, default=0)                          # 사이클 수
+    idle_cycles = Column(Integer, default=0)                     # 새 기록 없는 정상 사이클 수
+    error_count = Column(Integer, default=0)                     # 오류 사이클 수
+    records_fetched = Column(Integer, default=0)                 # 구간 중 최대 조회 기록 수
+    new_records = Column(Integer, default=0)                     # 새로 추가된 기록 수
+    duration_count = Column(Integer, default=0)                  # 소요 시간 측정된 사이클 수
+    duration_total_ms = Column(Integer, default=0)
+    duration_min_ms = Column(Integer, nullable=True)
+    duration_max_ms = Column(Integer, nullable=True)
+    last_sync_time = Column(DateTime, nullable=True)             # 구간 내 마지막 사이클 시각
+    last_error = Column(String, nullable=True)
+
+    @property
+    def duration_avg_ms(self):
+        if not self.duration_count:
+            return None
+        return round(self.duration_total_ms / self.duration_count)
+
+    def __repr__(self):
+        return f"<ClassUpSyncRollup {self.source} {self.bucket_start} cycles={self.cycles}>"
+
+
+class ClassUpDailySummary(Base):
+    """보관 기간이 지나 삭제된 일반 출입 기록의 일별 집계 (학생/상태별 건수)"""
+    __tablename__ = "classup_daily_summaries"
+    __table_args__ = (UniqueConstraint("date", "student_name", "status", name="uq_classup_daily_summary"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    date = Column(Date, nullable=False, index=True)
+    student_name = Column(String, nullable=False)
+    local_student_id = Column(Integer, nullable=True)
+    status = Column(String, nullable=False)
+    count = Column(Integer, default=0)
+    first_time = Column(DateTime, nullable=True)            # 그날 첫 기록 시각
+    last_time = Column(DateTime, nullable=True)             # 그날 마지막 기록 시각
+
+    def __repr__(self):
+        return f"<ClassUpDailySummary {self.date} {self.student_name} {self.status} x{self.count}>"
+
+
+# 기존 테이블에 나중에 추가된 컬럼 (create(checkfirst=True)는 이미 있는 테이블을 바꾸지 않음)
+ADDED_COLUMNS = {
+    "classup_attendance": [
+        ("source_account", "VARCHAR DEFAULT 'default'"),
+    ],
+}
+
+
+def ensure_added_columns(engine, added_columns: dict = None):
+    """ADDED_COLUMNS(또는 넘긴 {테이블: [(컬럼, DDL)]}) 중 없는 컬럼 추가 (기존 행은 DEFAULT 값으로 채워짐)"""
+    inspector = inspect(engine)
+    for table, columns in (added_columns or ADDED_COLUMNS).items():
+        if not inspector.has_table(table):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        for name, ddl in columns:
+            if name in existing:
+                continue
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
@@ -0,0 +1,142 @@
+"""classup-worker → 메인 서버 새 출입 기록 알림 채널 (Postgres LISTEN/NOTIFY)
+
+classup-worker가 출입 기록을 커밋하면 같은 트랜잭션에서 pg_notify로 새 레코드 ID를 보내고,
+메인 서버는 전용 연결에서 LISTEN하여 해당 레코드만 즉시 처리합니다.
+SQLite(로컬 개발)나 psycopg2가 없으면 available=False가 되어 기존 폴링으로 동작합니다.
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Optional, Set
+
+from database import DATABASE_URL
+
+try:
+    import psycopg2
+    import psycopg2.extensions
+except ImportError:
+    psycopg2 = None
+
+logger = logging.getLogger(__name__)
+
+# classup-worker와 같은 채널 이름 사용 (CLASSUP_NOTIFY_CHANNEL)
+NOTIFY_CHANNEL = os.getenv("CLASSUP_NOTIFY_CHANNEL", "classup_attendance")
+
+
+def parse_payload(payload: str) -> Set[int]:
+    """알림 payload → 레코드 ID 집합 ("1,2,3" 또는 JSON 배열/{"ids": [...]})"""
+    payload = (payload or "").strip()
+    if not payload:
+        return set()
+    try:
+        if payload[0] in "[{":
+            data = json.loads(payload)
+            ids = data.get("ids", []) if isinstance(data, dict) else data
+        else:
+            ids = payload.split(",")
+        return {int(i) for i in ids if str(i).strip()}
+    except (ValueError, TypeError):
+        logger.warning(f"알림 payload 파싱 실패: {payload[:100]}")
+        return set()
+
+
+class AttendanceListener:
+    """LISTEN 전용 연결 - 이벤트 루프의 add_reader로 알림 수신"""
+
+    def __init__(self, channel: str = NOTIFY_CHANNEL, dsn: str = DATABASE_URL):
+        self.channel = channel
+        self.dsn = dsn.replace("postgresql+psycopg2://", "postgresql://", 1) if dsn else None
+        self.available = bool(psycopg2 and self.dsn and self.dsn.startswith("postgres"))
+        self._conn = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None
+
+    def _connect_blocking(self):
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    async def connect(self) -> bool:
+        """전용 연결 생성 후 LISTEN (실패 시 False - 호출 측은 폴링 유지)"""
+        if not self.available or self.connected:
+            return self.connected
+
+        self._loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        try:
+            self._conn = await self._loop.run_in_executor(None, self._connect_blocking)
+        except Exception as e:
+            logger.warning(f"LISTEN 연결 실패 - 폴링으로 동작: {e}")
+            self._conn = None
+            return False
+
+        try:
+            self._loop.add_reader(self._conn.fileno(), self._on_readable)
+        except NotImplementedError:
+            # Windows Proactor 루프 등 add_reader 미지원 - 이후 재연결 시도 없이 폴링으로 동작
+            logger.warning("이벤트 루프가 add_reader를 지원하지 않음 - LISTEN 없이 폴링으로 동작")
+            self.available = False
+            self.close()
+            return False
+        except Exception as e:
+            logger.warning(f"LISTEN 등록 실패 - 폴링으로 동작: {e}")
+            self.close()
+            return False
+        logger.info(f"LISTEN 시작: {self.channel}")
+        return True
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.warning(f"LISTEN 연결 끊김: {e}")
+            self.close()
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            ids = parse_payload(notify.payload)
+            if ids:
+                self._queue.put_nowait(ids)
+
+    async def wait(self, timeout: float) -> Set[int]:
+        """알림이 올 때까지 최대 timeout초 대기 후 누적된 레코드 ID 반환
+
+        연결이 없으면 재연결을 시도하고, 그래도 없으면 timeout만큼 대기 후 빈 집합 반환
+        """
+        if not self.connected and not await self.connect():
+            await asyncio.sleep(timeout)
+            return set()
+
+        ids: Set[int] = set()
+        try:
+            ids |= await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return ids
+
+        # 같은 시점에 온 알림은 한 번에 처리
+        while not self._queue.empty():
+            ids |= self._queue.get_nowait()
+        return ids
+
+    def close(self):
+        if self._conn is None:
+            return
+        try:
+            if self._loop:
+                self._loop.remove_reader(self._conn.fileno())
+        except Exception:
+            pass
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
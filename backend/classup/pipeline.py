@@ -0,0 +1,425 @@
+"""ClassUp 출입 기록 수집 파이프라인 - parse → dedupe → persist → enrich → notify
+
+process_attendance_record는 기록 한 건마다 중복 확인/저장/출석 연동/알림 저장을 차례로 끝내야 다음
+기록으로 넘어갑니다. 파이프라인은 단계 사이를 크기 제한 큐로 연결해 단계들이 겹쳐서 실행되게 합니다.
+
+- parse: 스크래핑 결과(dict 또는 AttendanceRecord) → 상태/상세 분리
+- dedupe: 입장 → 재입장 판정, 같은 (학생, 상태, 시각) 제외 (파이프라인 안에서 처리 중인 기록 포함)
+- persist: 학생 매칭/지각/예상 복귀/일정 검증 후 묶음(micro-batch) 단위로 한 번에 커밋
+  (묶음 커밋이 실패하면 한 건씩 다시 저장해 문제 기록만 오류로 처리)
+- enrich: Dittonweb 출석 기록 연동, 재입장-외출 연결 (학생별 순서가 중요하므로 단일 작업자)
+- notify: 알림 아웃박스 저장 (동시 NOTIFY_CONCURRENCY개)
+
+동기 SQLAlchemy 작업은 스레드에서 실행하므로 한 단계가 DB를 기다리는 동안 다른 단계와 이벤트 루프는
+멈추지 않습니다. 단계별 큐 깊이와 처리 지연은 stats()로 확인합니다.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Set
+
+import pytz
+
+from classup_core.bench import percentile
+from . import attendance_handler as handler
+from .models import ClassUpAttendance
+from .return_tracker import return_tracker
+from .scraper import AttendanceRecord
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 단계 사이 큐 크기 (가득 차면 앞 단계가 기다림)
+QUEUE_SIZE = int(os.getenv("CLASSUP_PIPELINE_QUEUE_SIZE", "500"))
+# persist/enrich 묶음 크기와 묶음을 채우려고 기다리는 최대 시간 (ms)
+BATCH_SIZE = int(os.getenv("CLASSUP_PIPELINE_BATCH_SIZE", "50"))
+BATCH_WAIT_MS = int(os.getenv("CLASSUP_PIPELINE_BATCH_WAIT_MS", "20"))
+# 알림 저장 동시 작업 수
+NOTIFY_CONCURRENCY = int(os.getenv("CLASSUP_PIPELINE_NOTIFY_CONCURRENCY", "8"))
+
+STAGES = ("parse", "dedupe", "persist", "enrich", "notify")
+
+
+class IngestItem:
+    """파이프라인을 지나는 기록 한 건"""
+
+    __slots__ = ("record", "status", "detail", "record_id", "expected_return", "validation_reason", "alerts",
+                 "claimed", "entry_day", "error", "submitted_at", "stage_started_at", "saved")
+
+    def __init__(self, record):
+        self.record = record
+        self.status: Optional[str] = None
+        self.detail: Optional[str] = None
+        self.record_id: Optional[int] = None
+        self.expected_return: Optional[datetime] = None
+        self.validation_reason = ""
+        self.alerts: List[dict] = []
+        self.claimed = False  # dedupe에서 처리 중 키를 등록했는지 (중복 항목이 원본의 키를 지우지 않도록)
+        self.entry_day: Optional[date] = None  # dedupe에서 커밋 전 입장으로 등록한 날짜
+        self.error: Optional[Exception] = None  # persist에서 이 기록만 저장 실패한 경우
+        self.submitted_at = time.perf_counter()
+        self.stage_started_at = self.submitted_at
+        self.saved: Optional[asyncio.Future] = None  # persist 결과 (저장된 ID 또는 None)
+
+
+class StageStats:
+    """단계별 처리 건수/오류/지연 (큐 대기 + 처리, 최근 1000건 기준 백분위)"""
+
+    def __init__(self):
+        self.processed = 0
+        self.errors = 0
+        self.batches = 0
+        self.latencies_ms = deque(maxlen=1000)
+
+    def observe(self, items: List[IngestItem]):
+        now = time.perf_counter()
+        self.batches += 1
+        for item in items:
+            self.processed += 1
+            self.latencies_ms.append((now - item.stage_started_at) * 1000)
+            item.stage_started_at = now
+
+    def to_dict(self, queue: Optional[asyncio.Queue]) -> dict:
+        latencies = list(self.latencies_ms)
+        return {
+            "queue_depth": queue.qsize() if queue is not None else 0,
+            "processed": self.processed,
+            "errors": self.errors,
+            "batches": self.batches,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "max_ms": round(max(latencies), 1) if latencies else 0.0,
+        }
+
+
+def _to_attendance_record(raw) -> AttendanceRecord:
+    if isinstance(raw, AttendanceRecord):
+        return raw
+    record_time = raw.get("record_time")
+    if isinstance(record_time, str):
+        record_time = datetime.fromisoformat(record_time)
+    return AttendanceRecord(
+        student_name=raw["student_name"],
+        phone_number=raw.get("phone_number", ""),
+        available_time=raw.get("available_time", ""),
+        status=raw["status"],
+        record_time=record_time
+    )
+
+
+class IngestPipeline:
+    """출입 기록 수집 파이프라인 (이벤트 루프 하나에서 start → ingest/submit → stop)
+
+    session_factory: 단계별 DB 세션 생성 함수 (기본값 database.SessionLocal)
+    """
+
+    def __init__(self, session_factory: Callable = None, queue_size: int = QUEUE_SIZE,
+                 batch_size: int = BATCH_SIZE, batch_wait_ms: int = BATCH_WAIT_MS,
+                 notify_concurrency: int = NOTIFY_CONCURRENCY):
+        if session_factory is None:
+            from database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.queue_size = queue_size
+        self.batch_size = max(batch_size, 1)
+        self.batch_wait = batch_wait_ms / 1000
+        self.notify_concurrency = max(notify_concurrency, 1)
+
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.stats_by_stage = {stage: StageStats() for stage in STAGES}
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight: Set[tuple] = set()       # dedupe 통과 후 아직 커밋 전인 (이름, 상태, 시각)
+        self._entries_seen: Set[str] = set()      # 오늘 파이프라인에서 커밋한 입장 학생 (DB 조회 없이 재입장 판정)
+        self._entries_pending: Set[str] = set()   # dedupe 통과 후 아직 커밋 전인 오늘 입장 학생
+        self._entries_day: Optional[date] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    # ==================== 수명 주기 ====================
+
+    def start(self):
+        if self._tasks:
+            return
+        self.queues = {stage: asyncio.Queue(maxsize=self.queue_size) for stage in STAGES}
+        self._tasks = [
+            asyncio.create_task(self._parse_stage()),
+            asyncio.create_task(self._batch_stage("dedupe", self._dedupe_batch, "persist")),
+            asyncio.create_task(self._batch_stage("persist", self._persist_batch, "enrich")),
+            asyncio.create_task(self._batch_stage("enrich", self._enrich_batch, "notify")),
+        ] + [asyncio.create_task(self._notify_worker()) for _ in range(self.notify_concurrency)]
+        logger.info(f"수집 파이프라인 시작 (묶음 {self.batch_size}건, 알림 동시 {self.notify_concurrency}개)")
+
+    async def drain(self):
+        """지금까지 넣은 기록이 알림 단계까지 끝날 때까지 대기"""
+        for stage in STAGES:
+            await self.queues[stage].join()
+
+    async def stop(self):
+        """남은 기록을 처리한 뒤 단계 태스크 종료"""
+        if not self._tasks:
+            return
+        await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ==================== 입력 ====================
+
+    async def submit(self, raw) -> asyncio.Future:
+        """기록 한 건 투입. Returns: persist 단계가 끝나면 저장된 ID(중복이면 None)로 완료되는 Future"""
+        item = IngestItem(raw)
+        item.saved = asyncio.get_running_loop().create_future()
+        await self.queues["parse"].put(item)
+        return item.saved
+
+    async def ingest(self, records: list) -> int:
+        """여러 건 투입 후 persist 단계까지 대기 (알림은 뒤에서 계속 진행)
+
+        저장에 실패한 기록이 있으면 나머지가 끝난 뒤 첫 오류를 다시 발생시킵니다 (호출 측이 다음 사이클에 재시도).
+        Returns: 새로 저장된 수
+        """
+        futures = [await self.submit(raw) for raw in records]
+        saved = await asyncio.gather(*futures, return_exceptions=True)
+        errors = [result for result in saved if isinstance(result, Exception)]
+        if errors:
+            raise errors[0]
+        return sum(1 for record_id in saved if record_id is not None)
+
+    def stats(self) -> dict:
+        return {stage: self.stats_by_stage[stage].to_dict(self.queues.get(stage)) for stage in STAGES}
+
+    # ==================== 단계 ====================
+
+    async def _parse_stage(self):
+        queue = self.queues["parse"]
+        while True:
+            item = await queue.get()
+            try:
+                item.record = _to_attendance_record(item.record)
+                # 상태 파싱 (예: "외출(점심식사)" -> status="외출", detail="점심식사")
+                item.status, item.detail = handler.parse_status(item.record.status)
+                self.stats_by_stage["parse"].observe([item])
+                await self.queues["dedupe"].put(item)
+            except Exception as e:
+                self.stats_by_stage["parse"].errors += 1
+                logger.error(f"파이프라인 parse 오류: {e}")
+                self._finish(item, error=e)
+            finally:
+                queue.task_done()
+
+    async def _next_batch(self, queue: asyncio.Queue) -> List[IngestItem]:
+        """첫 건이 올 때까지 기다린 뒤 batch_wait 동안 batch_size까지 모음"""
+        batch = [await queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_stage(self, stage: str, work: Callable[[List[IngestItem]], List[IngestItem]],
+                           next_stage: str):
+        """묶음 단위 단계 - work(batch)는 스레드에서 실행되고 다음 단계로 넘길 항목을 반환"""
+        queue = self.queues[stage]
+        while True:
+            batch = await self._next_batch(queue)
+            try:
+                passed = await asyncio.to_thread(work, batch)
+                self._after_batch(stage, batch, passed)
+                self.stats_by_stage[stage].observe(batch)
+                for item in passed:
+                    await self.queues[next_stage].put(item)
+            except Exception as e:
+                self.stats_by_stage[stage].errors += len(batch)
+                logger.error(f"파이프라인 {stage} 오류 ({len(batch)}건): {e}")
+                for item in batch:
+                    self._finish(item, error=e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _after_batch(self, stage: str, batch: List[IngestItem], passed: List[IngestItem]):
+        """이벤트 루프 쪽 후처리 (Future는 루프 스레드에서만 완료)"""
+        if stage == "dedupe":
+            for item in batch:
+                if item not in passed:
+                    self._finish(item)  # 중복
+        elif stage == "persist":
+            for item in passed:
+                # 외출/이동: 복귀 마감 타이머 등록 (타이머 힙은 루프 스레드에서만 변경)
+                if item.expected_return:
+                    return_tracker.add(item.record_id, item.expected_return)
+                self._finish(item, record_id=item.record_id)
+            for item in batch:
+                if item.error is not None:
+                    self.stats_by_stage[stage].errors += 1
+                    self._finish(item, error=item.error)
+
+    def _finish(self, item: IngestItem, record_id: int = None, error: Exception = None):
+        if item.claimed:
+            self._in_flight.discard((item.record.student_name, item.status, item.record.record_time))
+            item.claimed = False
+        if item.entry_day is not None:
+            # 커밋된 입장만 재입장 판정에 남김 (저장 실패/중복이면 다음 입장을 재입장으로 바꾸지 않음)
+            if item.entry_day == self._entries_day:
+                self._entries_pending.discard(item.record.student_name)
+                if record_id is not None:
+                    self._entries_seen.add(item.record.student_name)
+            item.entry_day = None
+        if item.saved is None or item.saved.done():
+            return
+        if error is not None:
+            item.saved.set_exception(error)
+        else:
+            item.saved.set_result(record_id)
+
+    def _dedupe_batch(self, batch: List[IngestItem]) -> List[IngestItem]:
+        db = self.session_factory()
+        try:
+            passed = []
+            today = datetime.now(KST).date()
+            if self._entries_day != today:
+                self._entries_day = today
+                self._entries_seen = set()
+                self._entries_pending = set()
+
+            for item in batch:
+                record = item.record
+                new_entry = False
+                # 입장 2회 이상시 재입장으로 처리 (커밋 전인 같은 날 입장도 포함)
+                if item.status == "입장":
+                    record_date = record.record_time.date() if record.record_time else today
+                    seen_today = record_date == today and (
+                        record.student_name in self._entries_seen or record.student_name in self._entries_pending
+                    )
+                    if seen_today or handler.has_entry_today(record.student_name, record_date, db):
+                        item.status = "재입장"
+                        logger.info(f"{record.student_name}: 오늘 입장 기록 있음 -> 재입장으로 변경")
+                    else:
+                        new_entry = record_date == today
+
+                # 중복 체크 (같은 학생, 같은 상태, 같은 시간 - 처리 중인 기록 포함)
+                key = (record.student_name, item.status, record.record_time)
+                if key in self._in_flight or db.query(ClassUpAttendance.id).filter(
+                    ClassUpAttendance.student_name == record.student_name,
+                    ClassUpAttendance.status == item.status,
+                    ClassUpAttendance.record_time == record.record_time
+                ).first() is not None:
+                    continue
+
+                self._in_flight.add(key)
+                item.claimed = True
+                if new_entry:
+                    self._entries_pending.add(record.student_name)
+                    item.entry_day = today
+                passed.append(item)
+            return passed
+        finally:
+            db.close()
+
+    def _persist_batch(self, batch: List[IngestItem]) -> List[IngestItem]:
+        """묶음 전체를 한 트랜잭션으로 저장 - 실패하면 한 건씩 다시 저장해 실패한 기록만 제외
+
+        한 건씩 저장에서도 실패한 기록은 item.error에 남기고 반환 목록에서 뺍니다.
+        """
+        try:
+            return self._persist_rows(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                raise
+            logger.warning(f"파이프라인 persist 묶음 저장 실패 - 한 건씩 재시도 ({len(batch)}건): {e}")
+
+        saved = []
+        for item in batch:
+            try:
+                saved.extend(self._persist_rows([item]))
+            except Exception as e:
+                item.error = e
+                logger.error(f"파이프라인 persist 오류 ({item.record.student_name}): {e}")
+        return saved
+
+    def _persist_rows(self, items: List[IngestItem]) -> List[IngestItem]:
+        """기록들을 한 트랜잭션으로 저장"""
+        db = self.session_factory()
+        try:
+            rows = []
+            for item in items:
+                row, _, item.validation_reason = handler.build_classup_record(
+                    item.record, item.status, item.detail, db
+                )
+                rows.append(row)
+            db.add_all(rows)
+            db.commit()
+
+            for item, row in zip(items, rows):
+                item.record_id = row.id
+                item.expected_return = row.expected_return_time
+            return items
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _enrich_batch(self, batch: List[IngestItem]) -> List[IngestItem]:
+        """Dittonweb 출석 기록 연동 (기록 순서대로)"""
+        db = self.session_factory()
+        try:
+            for item in batch:
+                row = db.get(ClassUpAttendance, item.record_id)
+                student = row.student if row else None
+                if row is None:
+                    continue
+                try:
+                    item.alerts = handler.sync_dittonweb_attendance(
+                        row, student, db, on_return_linked=lambda outing: return_tracker.discard(outing.id)
+                    )
+                except Exception as e:
+                    # 출석 연동 실패해도 기록은 저장됐으므로 알림은 계속 진행
+                    db.rollback()
+                    self.stats_by_stage["enrich"].errors += 1
+                    logger.error(f"Dittonweb 출석 연동 오류 ({item.record.student_name}): {e}")
+            return batch
+        finally:
+            db.close()
+
+    async def _notify_worker(self):
+        queue = self.queues["notify"]
+        while True:
+            item = await queue.get()
+            try:
+                await asyncio.to_thread(self._notify_blocking, item)
+                self.stats_by_stage["notify"].observe([item])
+            except Exception as e:
+                self.stats_by_stage["notify"].errors += 1
+                logger.error(f"Discord 알림 처리 오류 ({item.record_id}): {e}")
+            finally:
+                queue.task_done()
+
+    def _notify_blocking(self, item: IngestItem):
+        """알림 아웃박스 저장 (작업 스레드에서 자체 세션/이벤트 루프로 실행)"""
+        from .router import DISCORD_WEBHOOK_ALERT, send_discord_alert_extended, send_discord_notification
+
+        async def notify():
+            for alert in item.alerts:
+                await send_discord_notification(**alert, webhook_url=DISCORD_WEBHOOK_ALERT)
+            await send_discord_alert_extended(row, row.student, item.validation_reason, db)
+
+        db = self.session_factory()
+        try:
+            row = db.get(ClassUpAttendance, item.record_id)
+            if row is not None:
+                asyncio.run(notify())
+        finally:
+            db.close()
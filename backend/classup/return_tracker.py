@@ -0,0 +1,154 @@
+"""외출/이동 복귀 마감 시각 추적 (최소 힙)
+
+외출/이동 기록이 저장되면 예상 복귀 시각을 힙에 넣고, 재입장으로 연결되면 제거합니다.
+타이머 태스크는 가장 이른 마감 시각까지 잠들었다가 정확히 그 시각에 미복귀 알림을 보냅니다.
+서버 시작 시와 주기적으로(외부에서 저장된 기록 대비) DB에서 힙을 다시 만듭니다.
+"""
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+from sqlalchemy.orm import Session
+
+from .models import ClassUpAttendance
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# DB에서 힙을 다시 만드는 간격 (초) - 다른 프로세스가 저장한 외출 기록 반영
+REBUILD_INTERVAL_SECONDS = 600
+
+
+def _to_timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = KST.localize(value)
+    return value.timestamp()
+
+
+class ReturnDeadlineTracker:
+    """복귀 마감 시각 최소 힙 (제거는 지연 삭제)"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        self._deadlines: Dict[int, float] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def add(self, record_id: int, expected_return_time: datetime):
+        """외출/이동 기록의 복귀 마감 등록 (같은 기록이면 마감 갱신)"""
+        if record_id is None or expected_return_time is None:
+            return
+        deadline = _to_timestamp(expected_return_time)
+        self._deadlines[record_id] = deadline
+        heapq.heappush(self._heap, (deadline, record_id))
+        self._notify()
+
+    def discard(self, record_id: int):
+        """복귀 확인 또는 알림 완료 - 힙에서는 꺼낼 때 건너뜀"""
+        self._deadlines.pop(record_id, None)
+
+    def next_deadline(self) -> Optional[float]:
+        while self._heap:
+            deadline, record_id = self._heap[0]
+            if self._deadlines.get(record_id) == deadline:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: float = None) -> List[int]:
+        """마감이 지난 기록 ID 꺼내기"""
+        now = now or time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, record_id = heapq.heappop(self._heap)
+            if self._deadlines.get(record_id) == deadline:
+                del self._deadlines[record_id]
+                due.append(record_id)
+        return due
+
+    def rebuild(self, db: Session) -> int:
+        """복귀/알림 전 외출·이동 기록으로 힙 재구성"""
+        rows = db.query(ClassUpAttendance.id, ClassUpAttendance.expected_return_time).filter(
+            ClassUpAttendance.status.in_(["외출", "이동"]),
+            ClassUpAttendance.return_record_id == None,
+            ClassUpAttendance.return_alert_sent == False,
+            ClassUpAttendance.expected_return_time != None
+        ).all()
+
+        self._deadlines = {record_id: _to_timestamp(expected) for record_id, expected in rows}
+        self._heap = [(deadline, record_id) for record_id, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
+        self._notify()
+        return len(self._deadlines)
+
+    def _notify(self):
+        """타이머 태스크 깨우기 (더 이른 마감이 들어왔을 수 있음)"""
+        if not self._wake or not self._loop:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def run(self, db_session_factory, on_due):
+        """마감 타이머 루프
+
+        on_due(db, record_ids)는 마감된 기록의 미복귀 알림을 처리하는 코루틴입니다.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        last_rebuild = 0.0
+
+        try:
+            while True:
+                if time.monotonic() - last_rebuild >= REBUILD_INTERVAL_SECONDS:
+                    db = db_session_factory()
+                    try:
+                        count = self.rebuild(db)
+                        logger.info(f"복귀 마감 추적: {count}건")
+                    except Exception as e:
+                        logger.error(f"복귀 마감 힙 재구성 오류: {e}")
+                    finally:
+                        db.close()
+                    last_rebuild = time.monotonic()
+
+                due = self.pop_due()
+                if due:
+                    db = db_session_factory()
+                    try:
+                        await on_due(db, due)
+                    except Exception as e:
+                        logger.error(f"미복귀 알림 처리 오류: {e}")
+                    finally:
+                        db.close()
+                    continue
+
+                # 가장 이른 마감 또는 다음 재구성 시각까지 대기
+                timeout = REBUILD_INTERVAL_SECONDS - (time.monotonic() - last_rebuild)
+                deadline = self.next_deadline()
+                if deadline is not None:
+                    timeout = min(timeout, deadline - time.time())
+
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=max(timeout, 0.01))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wake = None
+            self._loop = None
+
+
+return_tracker = ReturnDeadlineTracker()
@@ -2,19 +2,26 @@
 import asyncio
 import os
 import logging
+import time
 from datetime import datetime, date, time as time_type
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 import pytz
-import httpx
 
-from database import get_db
+from database import get_async_db
 import models
+from classup_core.dedupe import RecordDeduper
+from classup_core.synclog import ROLLUP_SECONDS
+from notifications import build_embed, enqueue_notification_async
 from .scraper import ClassUpScraper, AttendanceRecord, has_saved_session, delete_session, SESSION_FILE
 from .models import ClassUpAttendance, ClassUpSyncLog
 from . import attendance_handler as handler
+from .pipeline import IngestPipeline
+from .return_tracker import return_tracker
+from .sync_stats import SyncStatsRecorder, account_sync_status, latest_sync_time, recent_rollups, rollup_to_dict
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -29,10 +36,19 @@ LATE_THRESHOLD = time_type(8, 0)  # 08:00 지각 기준
 _scraper_instance: Optional[ClassUpScraper] = None
 _sync_running = False
 _sync_task: Optional[asyncio.Task] = None
+_return_tracker_task: Optional[asyncio.Task] = None
 
 # 외부 Worker 사용 모드 (classup-worker 서비스가 별도로 동작할 때)
 EXTERNAL_WORKER_MODE = os.getenv("CLASSUP_WORKER_EXTERNAL", "").lower() in ("true", "1", "yes")
 
+# 외부 Worker 모드 알림 처리 주기 (초)
+# LISTEN/NOTIFY 사용 시 놓친 알림을 잡는 안전망 폴링 / LISTEN 불가(SQLite 등) 시 폴링
+NOTIFY_SAFETY_POLL_SECONDS = int(os.getenv("CLASSUP_NOTIFY_SAFETY_POLL_SECONDS", "60"))
+NOTIFY_FALLBACK_POLL_SECONDS = int(os.getenv("CLASSUP_NOTIFY_FALLBACK_POLL_SECONDS", "10"))
+
+# 스크래핑 엔진 (_fast_worker가 사용): "browser" (Playwright) / "http" (세션 쿠키 + httpx)
+SCRAPE_ENGINE = os.getenv("CLASSUP_SCRAPE_ENGINE", "browser").lower()
+
 # Discord 웹훅 URL (채널 분리) - Railway 환경변수로 설정 필수!
 # 경고 알림 전용 (외출 미복귀, 비정상 외출, 강제퇴장 다음날 알림 등)
 DISCORD_WEBHOOK_ALERT = os.getenv("DISCORD_WEBHOOK_ALERT", "")
@@ -43,40 +59,33 @@ DISCORD_WEBHOOK_GENERAL = os.getenv("DISCORD_WEBHOOK_GENERAL", "")
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "") or DISCORD_WEBHOOK_ALERT
 
 
-async def send_discord_notification(title: str, message: str, color: int = 0x5865F2, fields: list = None, webhook_url: str = None):
-    """Discord 웹훅으로 알림 전송
+async def send_discord_notification(title: str, message: str, color: int = 0x5865F2, fields: list = None,
+                                    webhook_url: str = None, category: str = None, urgent: bool = False):
+    """Discord 웹훅 알림을 아웃박스에 저장 (전송/재시도는 notifications dispatcher가 담당)
 
     Args:
         webhook_url: 사용할 웹훅 URL. None이면 기본값(DISCORD_WEBHOOK_ALERT) 사용
+        category: 알림 종류 (입장/외출/미복귀 등)
+        urgent: 긴급 알림 여부
     """
     url = webhook_url or DISCORD_WEBHOOK_ALERT
     if not url:
         logger.warning("Discord 웹훅 URL이 설정되지 않았습니다.")
         return None
 
-    embed = {
-        "title": title,
-        "description": message,
-        "color": color,
-        "timestamp": datetime.now(KST).isoformat()
-    }
-    if fields:
-        embed["fields"] = fields
-
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                url,
-                json={"embeds": [embed]}
-            )
-            return {"status": "success" if response.status_code == 204 else "error", "code": response.status_code}
-    except Exception as e:
-        logger.error(f"Discord 알림 전송 실패: {e}")
-        return {"status": "error", "message": str(e)}
+    outbox_id = await enqueue_notification_async(
+        url, build_embed(title, message, color, fields), category=category, urgent=urgent
+    )
+    if outbox_id is None:
+        return {"status": "error", "message": "알림 아웃박스 저장 실패"}
+    return {"status": "queued", "id": outbox_id}
 
 
 async def process_attendance_record(record: AttendanceRecord, db: Session) -> Optional[ClassUpAttendance]:
-    """출입 기록 처리 및 Dittonweb 연동 (전체 상태 타입 지원)"""
+    """출입 기록 한 건 처리 및 Dittonweb 연동 (전체 상태 타입 지원)
+
+    여러 건을 한꺼번에 처리할 때는 classup.pipeline.IngestPipeline을 사용합니다 (단계별 큐/묶음 커밋).
+    """
 
     # 상태 파싱 (예: "외출(점심식사)" -> status="외출", detail="점심식사")
     main_status, status_detail = handler.parse_status(record.status)
@@ -98,129 +107,22 @@ async def process_attendance_record(record: AttendanceRecord, db: Session) -> Op
     if existing:
         return None  # 이미 존재하는 기록
 
-    # 이름으로 Dittonweb 학생 매칭
-    student = db.query(models.Student).filter(
-        models.Student.name == record.student_name,
-        models.Student.status == "재원"
-    ).first()
-    student_id = student.id if student else None
-
-    # 지각 여부 판단 (입장만)
-    is_late = False
-    if main_status == "입장":
-        record_time = record.record_time
-        if record_time.tzinfo is None:
-            record_time = KST.localize(record_time)
-        is_late = record_time.time() > LATE_THRESHOLD
-
-    # 예상 복귀 시간 계산 (외출/이동)
-    expected_return = handler.calculate_expected_return(
-        record.record_time, main_status, status_detail, student_id, db
-    )
-
-    # 일정 유효성 검증
-    is_schedule_valid = None
-    validation_reason = ""
-    if main_status == "외출":
-        is_schedule_valid, validation_reason = handler.validate_outing_schedule(
-            record.record_time, status_detail, student_id, db
-        )
-    elif main_status == "퇴장":
-        is_schedule_valid, validation_reason = handler.validate_exit(
-            record.record_time, student_id, db
-        )
-
     # ClassUp 기록 저장
-    classup_record = ClassUpAttendance(
-        student_name=record.student_name,
-        phone_number=record.phone_number,
-        available_time=record.available_time,
-        status=main_status,
-        status_detail=status_detail,
-        record_time=record.record_time,
-        local_student_id=student_id,
-        is_late=is_late,
-        synced_to_attendance=False,
-        discord_notified=False,
-        expected_return_time=expected_return,
-        is_schedule_valid=is_schedule_valid
-    )
+    classup_record, student, validation_reason = handler.build_classup_record(record, main_status, status_detail, db)
     db.add(classup_record)
     db.commit()
     db.refresh(classup_record)
 
-    # Dittonweb 출석 기록 연동
-    today = datetime.now(KST).date()
+    # 외출/이동: 복귀 마감 타이머 등록
+    if classup_record.expected_return_time:
+        return_tracker.add(classup_record.id, classup_record.expected_return_time)
 
-    if student:
-        existing_attendance = db.query(models.AttendanceRecord).filter(
-            models.AttendanceRecord.student_id == student.id,
-            models.AttendanceRecord.date == today
-        ).first()
-
-        if main_status == "입장":
-            # 첫 입장: 출석 기록 생성
-            if not existing_attendance:
-                attendance_status = "지각" if is_late else "자습중"
-                new_attendance = models.AttendanceRecord(
-                    student_id=student.id,
-                    date=today,
-                    status=attendance_status,
-                    check_in_time=record.record_time.time() if record.record_time else None
-                )
-                db.add(new_attendance)
-                classup_record.synced_to_attendance = True
-                db.commit()
-
-        elif main_status == "재입장":
-            # 재입장: 상태를 "자습중"으로 변경, 외출 기록과 연결
-            outing_record = handler.link_return_to_outing(classup_record, db)
-
-            # 늦게 복귀했는지 체크
-            if outing_record and outing_record.expected_return_time:
-                return_time = record.record_time
-                if return_time.tzinfo is None:
-                    return_time = KST.localize(return_time)
-                expected_time = outing_record.expected_return_time
-                if expected_time.tzinfo is None:
-                    expected_time = KST.localize(expected_time)
-
-                if return_time > expected_time:
-                    # 늦게 복귀 - 지연 시간 계산
-                    delay_minutes = int((return_time - expected_time).total_seconds() / 60)
-                    classup_record.is_late = True  # 복귀 지각 표시
-
-                    # 늦은 복귀 알림 전송
-                    await send_discord_notification(
-                        title="⏰ 늦은 복귀 알림",
-                        message=f"**{record.student_name}** ({student.seat_number if student else '미등록'}) 학생이 예정보다 늦게 복귀했습니다.",
-                        color=0xFFA500,  # 주황색
-                        fields=[
-                            {"name": "학생", "value": record.student_name, "inline": True},
-                            {"name": "외출 유형", "value": outing_record.status_detail or outing_record.status, "inline": True},
-                            {"name": "예상 복귀", "value": expected_time.strftime("%H:%M"), "inline": True},
-                            {"name": "실제 복귀", "value": return_time.strftime("%H:%M"), "inline": True},
-                            {"name": "지연 시간", "value": f"{delay_minutes}분", "inline": True}
-                        ],
-                        webhook_url=DISCORD_WEBHOOK_ALERT
-                    )
-                    db.commit()
-
-            if existing_attendance and existing_attendance.status in ["외출", "이동", "일정중"]:
-                existing_attendance.status = "자습중"
-                db.commit()
-
-        elif main_status in ["외출", "이동"]:
-            # 외출/이동: 상태 변경
-            if existing_attendance:
-                existing_attendance.status = "일정중"
-                db.commit()
-
-        elif main_status in ["퇴장", "강제퇴장"]:
-            # 퇴장: 하원 처리
-            if existing_attendance:
-                existing_attendance.check_out_time = record.record_time.time() if record.record_time else None
-                db.commit()
+    # Dittonweb 출석 기록 연동 (늦은 복귀 알림 포함)
+    alerts = handler.sync_dittonweb_attendance(
+        classup_record, student, db, on_return_linked=lambda outing: return_tracker.discard(outing.id)
+    )
+    for alert in alerts:
+        await send_discord_notification(**alert, webhook_url=DISCORD_WEBHOOK_ALERT)
 
     # Discord 알림 전송 (확장된 버전)
     await send_discord_alert_extended(classup_record, student, validation_reason, db)
@@ -246,6 +148,7 @@ async def send_discord_alert(record: ClassUpAttendance, student, db: Session):
 
             await send_discord_notification(
                 title="지각 알림",
+                category="지각",
                 message=f"**{student_name}** ({seat_number}) 학생이 **{late_minutes}분** 지각했습니다.",
                 color=0xFF0000,  # 빨간색
                 fields=[
@@ -258,6 +161,7 @@ async def send_discord_alert(record: ClassUpAttendance, student, db: Session):
             # 정상 입장 알림 (녹색)
             await send_discord_notification(
                 title="입장 알림",
+                category="입장",
                 message=f"**{student_name}** ({seat_number}) 학생이 입장했습니다.",
                 color=0x00FF00,  # 녹색
                 fields=[
@@ -272,6 +176,7 @@ async def send_discord_alert(record: ClassUpAttendance, student, db: Session):
         color = 0xFFA500 if record.status == "퇴장" else 0xFF4500
         await send_discord_notification(
             title="퇴장 알림",
+            category="퇴장",
             message=f"**{student_name}** ({seat_number}) 학생이 {record.status}했습니다.",
             color=color,
             fields=[
@@ -323,6 +228,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
             late_minutes = (record_time.hour * 60 + record_time.minute) - (8 * 60)
             await send_discord_notification(
                 title="⚠️ 지각 알림",
+                category="지각",
                 message=f"**{student_name}** ({seat_number}) 학생이 **{late_minutes}분** 지각했습니다.",
                 color=COLORS["danger"],
                 fields=[
@@ -336,6 +242,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
             # 정상 입장 -> 일반 채널
             await send_discord_notification(
                 title="✅ 입장 알림",
+                category="입장",
                 message=f"**{student_name}** ({seat_number}) 학생이 입장했습니다.",
                 color=COLORS["success"],
                 fields=[
@@ -351,6 +258,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
         # 재입장 -> 일반 채널
         await send_discord_notification(
             title="🔄 재입장 알림",
+            category="재입장",
             message=f"**{student_name}** ({seat_number}) 학생이 복귀했습니다.",
             color=COLORS["info"],
             fields=[
@@ -367,6 +275,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
         if record.is_schedule_valid is False:
             await send_discord_notification(
                 title="🚨 조기 퇴장 경고",
+                category="조기퇴장",
                 message=f"**{student_name}** ({seat_number}) 학생이 정규 시간 전에 퇴장했습니다!",
                 color=COLORS["danger"],
                 fields=[
@@ -381,6 +290,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
             # 정상 퇴장 -> 일반 채널
             await send_discord_notification(
                 title="👋 퇴장 알림",
+                category="퇴장",
                 message=f"**{student_name}** ({seat_number}) 학생이 퇴장했습니다.",
                 color=COLORS["warning"],
                 fields=[
@@ -404,6 +314,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
         if record.is_schedule_valid is False:
             await send_discord_notification(
                 title="⚠️ 비정상 외출 알림",
+                category="비정상외출",
                 message=f"**{student_name}** ({seat_number}) 학생이 비정상 외출했습니다!",
                 color=COLORS["danger"],
                 fields=[
@@ -420,6 +331,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
             return_str = expected_return.strftime("%H:%M") if expected_return else "미정"
             await send_discord_notification(
                 title="🚶 외출 알림",
+                category="외출",
                 message=f"**{student_name}** ({seat_number}) 학생이 외출했습니다.",
                 color=COLORS["info"],
                 fields=[
@@ -438,6 +350,7 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
         return_str = expected_return.strftime("%H:%M") if expected_return else "미정"
         await send_discord_notification(
             title="🏢 이동 알림",
+            category="이동",
             message=f"**{student_name}** ({seat_number}) 학생이 다른 층으로 이동했습니다.",
             color=COLORS["purple"],
             fields=[
@@ -454,18 +367,25 @@ async def send_discord_alert_extended(record: ClassUpAttendance, student, valida
     db.commit()
 
 
-async def check_missing_returns(db: Session):
-    """복귀 미확인 학생 체크 및 알림 (경고 채널)"""
+async def check_missing_returns(db: Session, record_ids: list = None):
+    """복귀 미확인 학생 체크 및 알림 (경고 채널)
+
+    record_ids가 있으면 복귀 마감 타이머(return_tracker)가 넘긴 기록만 다시 확인합니다.
+    """
     now = datetime.now(KST)
 
-    # 오늘 날짜의 외출/이동 기록 중 복귀 안 된 것 조회
-    pending_returns = db.query(ClassUpAttendance).filter(
+    # 외출/이동 기록 중 복귀 안 된 것 조회
+    query = db.query(ClassUpAttendance).filter(
         ClassUpAttendance.status.in_(["외출", "이동"]),
         ClassUpAttendance.return_record_id == None,  # 복귀 안됨
         ClassUpAttendance.return_alert_sent == False,  # 알림 안 보냄
-        ClassUpAttendance.expected_return_time != None,  # 예상 복귀 시간 있음
-        ClassUpAttendance.expected_return_time < now  # 예상 시간 지남
-    ).all()
+        ClassUpAttendance.expected_return_time != None  # 예상 복귀 시간 있음
+    )
+    if record_ids:
+        query = query.filter(ClassUpAttendance.id.in_(record_ids))
+    else:
+        query = query.filter(ClassUpAttendance.expected_return_time < now)  # 예상 시간 지남
+    pending_returns = query.all()
 
     for record in pending_returns:
         student = db.query(models.Student).filter(
@@ -477,11 +397,15 @@ async def check_missing_returns(db: Session):
         detail = record.status_detail or record.status
 
         # 지연 시간 계산
-        delay_minutes = int((now - record.expected_return_time).total_seconds() / 60)
+        expected_time = record.expected_return_time
+        if expected_time.tzinfo is None:
+            expected_time = KST.localize(expected_time)
+        delay_minutes = max(int((now - expected_time).total_seconds() / 60), 0)
 
         # 미복귀 알림 -> 경고 채널
         await send_discord_notification(
             title="🚨 복귀 미확인 알림",
+            category="미복귀",
             message=f"**{student_name}** ({seat_number}) 학생이 아직 복귀하지 않았습니다!",
             color=0xFF0000,
             fields=[
@@ -500,18 +424,22 @@ async def check_missing_returns(db: Session):
     return len(pending_returns)
 
 
-async def process_unnotified_records(db: Session):
-    """외부 Worker가 저장한 레코드 중 Discord 알림 미전송 건 처리"""
-    from datetime import timedelta
+async def process_unnotified_records(db: Session, record_ids: set = None):
+    """외부 Worker가 저장한 레코드 중 Discord 알림 미전송 건 처리
 
-    # 오늘 날짜의 알림 미전송 레코드 조회
-    today = datetime.now(KST).date()
-    start_of_day = datetime.combine(today, time_type(0, 0)).replace(tzinfo=KST)
+    record_ids가 있으면 (LISTEN으로 받은) 해당 레코드만 처리합니다.
+    """
+    query = db.query(ClassUpAttendance).filter(ClassUpAttendance.discord_notified == False)
 
-    unnotified = db.query(ClassUpAttendance).filter(
-        ClassUpAttendance.discord_notified == False,
-        ClassUpAttendance.record_time >= start_of_day
-    ).order_by(ClassUpAttendance.record_time.asc()).limit(20).all()  # 한 번에 최대 20개
+    if record_ids:
+        query = query.filter(ClassUpAttendance.id.in_(record_ids))
+    else:
+        # 오늘 날짜의 알림 미전송 레코드 조회
+        today = datetime.now(KST).date()
+        start_of_day = datetime.combine(today, time_type(0, 0)).replace(tzinfo=KST)
+        query = query.filter(ClassUpAttendance.record_time >= start_of_day)
+
+    unnotified = query.order_by(ClassUpAttendance.record_time.asc()).limit(20).all()  # 한 번에 최대 20개
 
     processed = 0
     for record in unnotified:
@@ -528,6 +456,10 @@ async def process_unnotified_records(db: Session):
             if record.is_schedule_valid is False:
                 validation_reason = "일정 검증 미통과"
 
+            # 외부 Worker가 저장한 외출/이동 기록도 복귀 마감 타이머에 등록
+            if record.status in ["외출", "이동"] and record.expected_return_time and not record.return_record_id:
+                return_tracker.add(record.id, record.expected_return_time)
+
             # Discord 알림 전송
             await send_discord_alert_extended(record, student, validation_reason, db)
             processed += 1
@@ -541,37 +473,70 @@ async def process_unnotified_records(db: Session):
 
 
 async def external_worker_notification_loop(db_session_factory):
-    """외부 Worker 모드일 때 Discord 알림 처리 백그라운드 루프"""
+    """외부 Worker 모드일 때 Discord 알림 처리 백그라운드 루프
+
+    Postgres에서는 classup-worker의 NOTIFY로 새 레코드를 즉시 처리하고, 놓친 알림을 위해
+    NOTIFY_SAFETY_POLL_SECONDS마다 미전송 레코드를 폴링합니다.
+    SQLite(로컬 개발) 등 LISTEN을 쓸 수 없으면 NOTIFY_FALLBACK_POLL_SECONDS마다 폴링합니다.
+    """
     global _sync_running
+    import time
+    from .notify_channel import AttendanceListener
 
     logger.info("[외부 Worker 모드] Discord 알림 처리 루프 시작")
 
+    listener = AttendanceListener()
+    await listener.connect()
+    logger.info(f"[외부 Worker 모드] 새 기록 수신: {'LISTEN/NOTIFY' if listener.connected else '폴링'}")
+
+    last_poll = 0.0
+
     while _sync_running:
+        # 새 기록 알림 또는 다음 안전망 폴링 시각까지 대기
+        poll_interval = NOTIFY_SAFETY_POLL_SECONDS if listener.connected else NOTIFY_FALLBACK_POLL_SECONDS
+        wait_seconds = max(poll_interval - (time.monotonic() - last_poll), 0.1)
+        record_ids = await listener.wait(timeout=wait_seconds)
+
         try:
             db = db_session_factory()
             try:
-                # 미전송 알림 처리
-                processed = await process_unnotified_records(db)
+                # NOTIFY로 받은 레코드만 처리
+                processed = await process_unnotified_records(db, record_ids) if record_ids else 0
+
+                # 안전망 폴링 (LISTEN 연결이 없으면 짧은 주기)
+                poll_interval = NOTIFY_SAFETY_POLL_SECONDS if listener.connected else NOTIFY_FALLBACK_POLL_SECONDS
+                if time.monotonic() - last_poll >= poll_interval:
+                    last_poll = time.monotonic()
+                    processed += await process_unnotified_records(db)
+
                 if processed > 0:
                     logger.info(f"Discord 알림 {processed}건 전송 완료")
 
-                # 복귀 미확인 학생 체크
-                missing_count = await check_missing_returns(db)
-                if missing_count > 0:
-                    logger.info(f"복귀 미확인 알림 전송: {missing_count}명")
-
             finally:
                 db.close()
 
         except Exception as e:
             logger.error(f"알림 처리 루프 오류: {e}")
+            await asyncio.sleep(1)
 
-        # 10초 간격으로 체크
-        await asyncio.sleep(10)
-
+    listener.close()
     logger.info("[외부 Worker 모드] Discord 알림 처리 루프 종료")
 
 
+async def _alert_due_returns(db: Session, record_ids: list):
+    missing_count = await check_missing_returns(db, record_ids)
+    if missing_count > 0:
+        logger.info(f"복귀 미확인 알림 전송: {missing_count}명")
+
+
+def start_return_tracker(db_session_factory) -> asyncio.Task:
+    """복귀 마감 타이머 시작 - 예상 복귀 시각에 맞춰 미복귀 알림 (DB에서 힙 재구성 후 시작)"""
+    global _return_tracker_task
+    if _return_tracker_task is None or _return_tracker_task.done():
+        _return_tracker_task = asyncio.create_task(return_tracker.run(db_session_factory, _alert_due_returns))
+    return _return_tracker_task
+
+
 async def send_forced_exit_morning_alert(db: Session):
     """강제퇴장 다음날 아침 알림 - 매일 09:00에 실행 (경고 채널)"""
     from datetime import timedelta
@@ -603,6 +568,7 @@ async def send_forced_exit_morning_alert(db: Session):
     # Discord 알림 전송 (경고 채널)
     await send_discord_notification(
         title="📋 어제 강제퇴장 학생 목록",
+        category="강제퇴장",
         message=f"어제({yesterday.strftime('%Y-%m-%d')}) 강제퇴장 처리된 학생들입니다.\n**경고 조치가 필요합니다.**",
         color=0xFF4500,
         fields=[
@@ -633,42 +599,27 @@ def send_forced_exit_morning_alert_sync():
         db.close()
 
 
-def convert_late_to_studying_sync():
-    """지각 학생을 자습중으로 변경 (교시 시작 시 실행)
-
-    지각 처리 규칙:
-    - 지각은 해당 교시 동안만 "지각"으로 표시
-    - 다음 교시가 시작되면 "자습중"으로 자동 변경
-    """
-    from database import SessionLocal
-
-    db = SessionLocal()
-    try:
-        today = datetime.now(KST).date()
+# sync_classup_data_fast에서 처리 완료한 기록 키 (같은 행을 매번 DB에서 다시 확인하지 않도록)
+_record_deduper = RecordDeduper()
 
-        # 오늘 지각 상태인 출석 기록 조회
-        late_records = db.query(models.AttendanceRecord).filter(
-            models.AttendanceRecord.date == today,
-            models.AttendanceRecord.status == "지각"
-        ).all()
+# 내부 Worker 사이클 로그/롤업 기록기
+_sync_stats = SyncStatsRecorder("internal")
 
-        count = 0
-        for record in late_records:
-            record.status = "자습중"
-            count += 1
+# 수집 파이프라인 (parse → dedupe → persist → enrich → notify, 첫 동기화 때 현재 이벤트 루프에서 시작)
+_ingest_pipeline: Optional[IngestPipeline] = None
 
-        if count > 0:
-            db.commit()
-            logger.info(f"지각 → 자습중 변환: {count}명")
 
-    except Exception as e:
-        logger.error(f"지각 상태 변환 오류: {e}")
-    finally:
-        db.close()
+def get_ingest_pipeline() -> IngestPipeline:
+    global _ingest_pipeline
+    if _ingest_pipeline is None:
+        _ingest_pipeline = IngestPipeline()
+    if not _ingest_pipeline.running:
+        _ingest_pipeline.start()
+    return _ingest_pipeline
 
 
-async def sync_classup_data_fast(db: Session):
-    """클래스업 데이터 동기화 (Worker 결과 파일 읽기 - 빠름)"""
+async def _sync_from_result_file(record_stats) -> dict:
+    """Worker 결과 파일을 읽어 새 기록 저장 (record_stats: 동기화 로그/롤업 기록 코루틴)"""
     import json
     from pathlib import Path
 
@@ -682,41 +633,44 @@ async def sync_classup_data_fast(db: Session):
         result = json.load(f)
 
     if not result.get("success"):
-        raise Exception(result.get("error", "스크래핑 실패"))
-
-    # AttendanceRecord 객체로 변환
-    new_count = 0
-    for r in result["records"]:
-        record = AttendanceRecord(
-            student_name=r["student_name"],
-            phone_number=r.get("phone_number", ""),
-            available_time=r.get("available_time", ""),
-            status=r["status"],
-            record_time=datetime.fromisoformat(r["record_time"]) if r.get("record_time") else None
-        )
-        processed = await process_attendance_record(record, db)
-        if processed:
-            new_count += 1
-
-    # 동기화 로그 저장
-    sync_log = ClassUpSyncLog(
-        records_fetched=len(result["records"]),
-        new_records=new_count,
-        status="success"
-    )
-    db.add(sync_log)
-    db.commit()
+        error = result.get("error", "스크래핑 실패")
+        await record_stats(0, 0, error=error, duration_ms=result.get("elapsed_ms"))
+        raise Exception(error)
+
+    # 이전 동기화에서 이미 처리한 기록은 DB 조회 없이 건너뜀
+    pending = _record_deduper.new_records(result["records"])
+
+    # 파이프라인으로 저장 (저장까지 대기, 출석 연동/알림은 파이프라인 뒤 단계에서 계속)
+    new_count = await get_ingest_pipeline().ingest(pending) if pending else 0
+
+    # 동기화 로그 저장 (새 기록이 있을 때만 개별 로그, 나머지는 분 단위 롤업)
+    await record_stats(len(result["records"]), new_count, duration_ms=result.get("elapsed_ms"))
+    _record_deduper.mark_seen(pending)
 
     return {"fetched": len(result["records"]), "new": new_count}
 
 
-async def sync_classup_data(db: Session):
-    """클래스업 데이터 동기화 (호환성 유지)"""
-    return await sync_classup_data_fast(db)
+async def sync_classup_data_fast(db: Session):
+    """클래스업 데이터 동기화 (Worker 결과 파일 읽기 - 빠름)"""
+    async def record_stats(*args, **kwargs):
+        if _sync_stats.record(db, *args, **kwargs):
+            db.commit()
+
+    return await _sync_from_result_file(record_stats)
+
+
+async def sync_classup_data(db: AsyncSession):
+    """클래스업 데이터 1회 동기화 (수동 동기화 API용 AsyncSession)"""
+    async def record_stats(*args, **kwargs):
+        if await db.run_sync(_sync_stats.record, *args, **kwargs):
+            await db.commit()
+
+    return await _sync_from_result_file(record_stats)
 
 
 _worker_process = None
 
+
 async def continuous_sync_loop(db_session_factory):
     """3초 간격 연속 동기화 루프 (Worker 프로세스 - 매우 빠름)"""
     global _sync_running, _worker_process
@@ -736,8 +690,9 @@ async def continuous_sync_loop(db_session_factory):
         _worker_process = subprocess.Popen(
             [sys.executable, str(script_path)],
             cwd=str(Path(__file__).parent),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            # 출력은 읽지 않으므로 버림 (PIPE 버퍼가 차면 Worker가 멈춤) - 상태는 worker_status.json으로 확인
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
         )
         logger.info(f"Worker 프로세스 시작됨 (PID: {_worker_process.pid})")
@@ -761,32 +716,51 @@ async def continuous_sync_loop(db_session_factory):
         _sync_running = False
         return
 
-    # 메인 동기화 루프 - Worker가 2초마다 스크래핑, 우리는 3초마다 DB 저장
+    # 메인 동기화 루프 - Worker와 같은 시간표 기반 주기로 결과 파일을 읽어 DB 저장
+    from classup_core.schedule import AdaptiveScheduler
+    from timetable import get_timetable
+
+    scheduler = AdaptiveScheduler(timetable=get_timetable())
+    result_file = Path(__file__).parent / "scrape_result.json"
+    last_result_mtime = None
+
     while _sync_running:
+        cycle_started = time.monotonic()
         try:
             # Worker 프로세스 상태 확인
             if _worker_process.poll() is not None:
                 logger.error("Worker 프로세스 종료됨")
                 break
 
-            # DB에 새 데이터 저장
+            # DB에 새 데이터 저장 (결과 파일이 바뀌지 않았으면 저장 생략)
+            result_mtime = result_file.stat().st_mtime if result_file.exists() else None
             db = db_session_factory()
             try:
-                result = await sync_classup_data_fast(db)
-                logger.info(f"동기화 완료: {result}")
-
-                # 복귀 미확인 학생 체크 (30초마다 한 번씩)
-                missing_count = await check_missing_returns(db)
-                if missing_count > 0:
-                    logger.info(f"복귀 미확인 알림 전송: {missing_count}명")
+                if result_mtime != last_result_mtime:
+                    last_result_mtime = result_mtime
+                    result = await sync_classup_data_fast(db)
+                    scheduler.record_activity(result["new"] > 0)
+                    logger.info(f"동기화 완료: {result}")
             finally:
                 db.close()
 
         except Exception as e:
             logger.error(f"동기화 오류: {e}")
 
-        # 3초 대기 (Worker가 2초마다 스크래핑하므로 충분)
-        await asyncio.sleep(30)  # 30초 간격으로 동기화 (서버 부하 감소)
+        # Worker와 같은 스케줄러 주기 그대로 대기 (저장에 쓴 시간은 빼고, 중지 요청은 1초 안에 반영)
+        interval, _ = scheduler.next_interval()
+        deadline = cycle_started + interval
+        while _sync_running and time.monotonic() < deadline:
+            await asyncio.sleep(min(1.0, max(deadline - time.monotonic(), 0)))
+
+    # 진행 중인 롤업 구간 저장
+    db = db_session_factory()
+    try:
+        _sync_stats.flush(db)
+    except Exception as e:
+        logger.error(f"동기화 롤업 저장 오류: {e}")
+    finally:
+        db.close()
 
     # Worker 종료
     if _worker_process and _worker_process.poll() is None:
@@ -808,7 +782,7 @@ async def continuous_sync_loop(db_session_factory):
 # ============ API 엔드포인트 ============
 
 @router.get("/status")
-async def get_sync_status(db: Session = Depends(get_db)):
+async def get_sync_status(db: AsyncSession = Depends(get_async_db)):
     """동기화 상태 확인"""
     import json
     from pathlib import Path
@@ -816,19 +790,20 @@ async def get_sync_status(db: Session = Depends(get_db)):
     # 외부 Worker 모드 체크
     if EXTERNAL_WORKER_MODE:
         # DB에서 세션 확인
-        session = db.query(models.ClassUpSession).filter_by(session_key="default").first()
-        session_exists = session is not None
+        session_id = await db.scalar(
+            select(models.ClassUpSession.id).where(models.ClassUpSession.session_key == "default").limit(1)
+        )
+        session_exists = session_id is not None
 
-        # 최근 SyncLog로 Worker 상태 확인
-        recent_log = db.query(ClassUpSyncLog).order_by(
-            ClassUpSyncLog.sync_time.desc()
-        ).first()
+        # 최근 동기화 로그/롤업으로 Worker 상태 확인 (롤업은 구간이 끝날 때 저장되므로 구간 길이만큼 여유)
+        last_sync = await db.run_sync(latest_sync_time)
+        accounts = await db.run_sync(account_sync_status)
 
         worker_active = False
-        if recent_log:
+        if last_sync:
             from datetime import timedelta
-            time_diff = datetime.now(KST) - recent_log.sync_time.replace(tzinfo=KST)
-            worker_active = time_diff < timedelta(minutes=1)  # 1분 이내 로그 있으면 활성
+            time_diff = datetime.now(KST) - last_sync
+            worker_active = time_diff < timedelta(seconds=60 + 2 * ROLLUP_SECONDS)
 
         return {
             "running": True,  # 외부 Worker가 동작 중
@@ -836,7 +811,8 @@ async def get_sync_status(db: Session = Depends(get_db)):
             "logged_in": session_exists,
             "browser_active": worker_active,
             "session_saved": session_exists,
-            "last_sync": recent_log.sync_time.isoformat() if recent_log else None
+            "last_sync": last_sync.isoformat() if last_sync else None,
+            "accounts": accounts
         }
 
     status_file = Path(__file__).parent / "worker_status.json"
@@ -852,6 +828,7 @@ async def get_sync_status(db: Session = Depends(get_db)):
 
     return {
         "running": _sync_running,
+        "engine": SCRAPE_ENGINE,
         "logged_in": worker_active or has_saved_session(),
         "browser_active": worker_active,
         "session_saved": has_saved_session(),
@@ -897,6 +874,15 @@ async def start_sync(background_tasks: BackgroundTasks):
     if _sync_running:
         return {"status": "already_running", "message": "동기화가 이미 실행 중입니다."}
 
+    # 여러 워커 중 리더 프로세스에서만 스크래핑 (Chromium 중복 실행 방지)
+    from leader import get_elector
+    if not get_elector().is_leader:
+        return {
+            "status": "not_leader",
+            "message": "이 프로세스는 리더가 아닙니다. 동기화는 리더 프로세스에서만 시작됩니다.",
+            "leader": get_elector().status(),
+        }
+
     # 세션 확인
     if not has_saved_session():
         return {
@@ -909,6 +895,7 @@ async def start_sync(background_tasks: BackgroundTasks):
     # 백그라운드에서 동기화 루프 시작
     from database import SessionLocal
     _sync_task = asyncio.create_task(continuous_sync_loop(SessionLocal))
+    start_return_tracker(SessionLocal)
 
     return {"status": "started", "message": "클래스업 동기화가 시작되었습니다."}
 
@@ -916,7 +903,7 @@ async def start_sync(background_tasks: BackgroundTasks):
 @router.post("/stop")
 async def stop_sync():
     """클래스업 동기화 중지"""
-    global _sync_running, _sync_task, _worker_process
+    global _sync_running, _sync_task, _worker_process, _return_tracker_task
     import json
     from pathlib import Path
 
@@ -929,6 +916,14 @@ async def stop_sync():
         _sync_task.cancel()
         _sync_task = None
 
+    if _return_tracker_task:
+        _return_tracker_task.cancel()
+        _return_tracker_task = None
+
+    # 파이프라인에 남은 기록은 처리하고 종료
+    if _ingest_pipeline and _ingest_pipeline.running:
+        await _ingest_pipeline.stop()
+
     # Worker 프로세스 종료
     command_file = Path(__file__).parent / "worker_command.json"
     if _worker_process and _worker_process.poll() is None:
@@ -945,7 +940,7 @@ async def stop_sync():
 
 
 @router.post("/sync-once")
-async def sync_once(db: Session = Depends(get_db)):
+async def sync_once(db: AsyncSession = Depends(get_async_db)):
     """수동으로 1회 동기화"""
     try:
         result = await sync_classup_data(db)
@@ -955,8 +950,12 @@ async def sync_once(db: Session = Depends(get_db)):
 
 
 @router.post("/backup-session")
-async def backup_session_to_database():
-    """현재 세션을 DB에 백업 (classup-worker용)"""
+async def backup_session_to_database(session_key: str = "default"):
+    """현재 세션을 DB에 백업 (classup-worker용)
+
+    지점이 여러 개면 지점 계정으로 로그인한 뒤 session_key를 지정해 백업하고,
+    classup-worker의 CLASSUP_SESSION_KEYS에 같은 키를 추가합니다.
+    """
     if not has_saved_session():
         return {
             "status": "error",
@@ -965,11 +964,12 @@ async def backup_session_to_database():
 
     try:
         from .scraper import backup_session_to_db
-        success = backup_session_to_db()
+        success = backup_session_to_db(session_key)
         if success:
-            logger.info("세션 DB 백업 완료 (수동)")
+            logger.info(f"세션 DB 백업 완료 (수동): {session_key}")
             return {
                 "status": "success",
+                "session_key": session_key,
                 "message": "세션이 DB에 백업되었습니다. classup-worker가 이 세션을 사용할 수 있습니다."
             }
         else:
@@ -986,15 +986,18 @@ async def backup_session_to_database():
 async def get_records(
     target_date: date = None,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    account: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """클래스업 출입 기록 조회"""
-    query = db.query(ClassUpAttendance)
+    """클래스업 출입 기록 조회 (account: 세션 키로 지점 필터)"""
+    query = select(ClassUpAttendance)
 
     if target_date:
-        query = query.filter(func.date(ClassUpAttendance.record_time) == target_date)
+        query = query.where(func.date(ClassUpAttendance.record_time) == target_date)
+    if account:
+        query = query.where(ClassUpAttendance.source_account == account)
 
-    records = query.order_by(ClassUpAttendance.record_time.desc()).limit(limit).all()
+    records = (await db.scalars(query.order_by(ClassUpAttendance.record_time.desc()).limit(limit))).all()
 
     return [{
         "id": r.id,
@@ -1004,19 +1007,28 @@ async def get_records(
         "record_time": r.record_time.isoformat() if r.record_time else None,
         "is_late": r.is_late,
         "synced": r.synced_to_attendance,
-        "local_student_id": r.local_student_id
+        "local_student_id": r.local_student_id,
+        "source_account": r.source_account
     } for r in records]
 
 
 @router.get("/logs")
-async def get_sync_logs(limit: int = 20, db: Session = Depends(get_db)):
-    """동기화 로그 조회"""
-    logs = db.query(ClassUpSyncLog).order_by(
-        ClassUpSyncLog.sync_time.desc()
-    ).limit(limit).all()
+async def get_sync_logs(limit: int = 20, events: bool = False, db: AsyncSession = Depends(get_async_db)):
+    """동기화 로그 조회
+
+    기본은 구간별 롤업(사이클 수/오류 수/소요 시간)이고, events=true면 새 기록/오류가 있었던 개별 사이클 로그입니다.
+    """
+    if not events:
+        rollups = await db.run_sync(lambda session: recent_rollups(session, limit))
+        return [rollup_to_dict(r) for r in rollups]
+
+    logs = (await db.scalars(
+        select(ClassUpSyncLog).order_by(ClassUpSyncLog.sync_time.desc()).limit(limit)
+    )).all()
 
     return [{
         "id": l.id,
+        "kind": "event",
         "sync_time": l.sync_time.isoformat() if l.sync_time else None,
         "records_fetched": l.records_fetched,
         "new_records": l.new_records,
@@ -1025,29 +1037,34 @@ async def get_sync_logs(limit: int = 20, db: Session = Depends(get_db)):
     } for l in logs]
 
 
+@router.get("/pipeline")
+async def get_pipeline_stats():
+    """수집 파이프라인 단계별 큐 깊이/처리 건수/지연 (p50/p95/최대 ms)"""
+    if _ingest_pipeline is None:
+        return {"running": False, "stages": {}}
+    return {"running": _ingest_pipeline.running, "stages": _ingest_pipeline.stats()}
+
+
 @router.get("/today-summary")
-async def get_today_summary(db: Session = Depends(get_db)):
+async def get_today_summary(db: AsyncSession = Depends(get_async_db)):
     """오늘 출입 요약"""
     today = datetime.now(KST).date()
 
+    async def count(*conditions) -> int:
+        return await db.scalar(
+            select(func.count(ClassUpAttendance.id)).where(
+                func.date(ClassUpAttendance.record_time) == today, *conditions
+            )
+        )
+
     # 오늘 입장 기록
-    entry_count = db.query(ClassUpAttendance).filter(
-        func.date(ClassUpAttendance.record_time) == today,
-        ClassUpAttendance.status == "입장"
-    ).count()
+    entry_count = await count(ClassUpAttendance.status == "입장")
 
     # 오늘 퇴장 기록
-    exit_count = db.query(ClassUpAttendance).filter(
-        func.date(ClassUpAttendance.record_time) == today,
-        ClassUpAttendance.status.in_(["퇴장", "강제퇴장"])
-    ).count()
+    exit_count = await count(ClassUpAttendance.status.in_(["퇴장", "강제퇴장"]))
 
     # 오늘 지각 학생
-    late_count = db.query(ClassUpAttendance).filter(
-        func.date(ClassUpAttendance.record_time) == today,
-        ClassUpAttendance.status == "입장",
-        ClassUpAttendance.is_late == True
-    ).count()
+    late_count = await count(ClassUpAttendance.status == "입장", ClassUpAttendance.is_late == True)
 
     return {
         "date": today.isoformat(),
@@ -1060,17 +1077,30 @@ async def get_today_summary(db: Session = Depends(get_db)):
 # ============ 데이터 정리 API ============
 
 @router.get("/storage-stats")
-async def get_storage_stats_api(db: Session = Depends(get_db)):
+async def get_storage_stats_api(db: AsyncSession = Depends(get_async_db)):
     """ClassUp 저장소 통계 조회"""
     from .cleanup import get_storage_stats
-    return get_storage_stats(db)
+    return await db.run_sync(get_storage_stats)
 
 
 @router.post("/cleanup")
-async def run_cleanup_api(db: Session = Depends(get_db)):
-    """수동으로 ClassUp 데이터 정리 실행"""
+async def run_cleanup_api():
+    """수동으로 ClassUp 데이터 정리 실행
+
+    배치 사이 대기(time.sleep)가 있는 긴 작업이라 run_sync(이벤트 루프 스레드) 대신
+    별도 스레드에서 동기 Session으로 실행합니다.
+    """
+    from database import SessionLocal
     from .cleanup import run_cleanup
-    return run_cleanup(db)
+
+    def run() -> dict:
+        db = SessionLocal()
+        try:
+            return run_cleanup(db)
+        finally:
+            db.close()
+
+    return await asyncio.to_thread(run)
 
 
 # ============ 웹 로그인 API ============
@@ -186,11 +186,11 @@ def delete_session():
     return deleted
 
 
-def backup_session_to_db():
+def backup_session_to_db(session_key: str = "default"):
     """세션 파일을 DB에 백업 (로그인 성공 후 호출)"""
     try:
         from .session_db import save_session_to_db
-        return save_session_to_db()
+        return save_session_to_db(session_key)
     except Exception as e:
         logger.error(f"세션 DB 백업 실패: {e}")
         return False
@@ -0,0 +1,468 @@
+"""ClassUp 오프라인 재생 시뮬레이터 - 실제 사이트 없이 수집 파이프라인 종단 지연 측정
+
+구성:
+- SimClock: 가속 시계 (speed배) - 이벤트 시각이 되면 출입 기록 페이지에 행이 나타남
+- SimulatedClassUpServer: 로컬 HTTP 서버, 출입 기록 페이지(<table>)를 이벤트 스트림으로 생성
+- WebhookReceiver: Discord 웹훅 스텁 (수신 시각 기록, Discord와 같은 레이트 리밋 헤더/429 흉내)
+
+실제 fetch 백엔드(classup_core) → ScrapeLoop → 수집 파이프라인(classup.pipeline) → 알림 아웃박스 →
+dispatcher 경로를 그대로 돌리고, 이벤트→DB / 이벤트→Discord 지연 백분위와 처리량을 출력합니다.
+DB는 임시 SQLite를 사용합니다 (운영 DATABASE_URL은 무시).
+
+사용 예 (backend 디렉토리에서):
+    python -m classup.simulator --engine http --students 300 --burst-minutes 10 --speed 60
+    python -m classup.simulator --engine browser --events recorded.jsonl --speed 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytz
+
+KST = pytz.timezone('Asia/Seoul')
+
+ENTRANCE_PATH = "/user/entrance"
+NAME_PATTERN = re.compile(r"\*\*(.+?)\*\*")
+
+
+# ==================== 가속 시계 ====================
+
+class SimClock:
+    """시뮬레이션 시각 = 시작 시각 + 실제 경과 시간 × speed"""
+
+    def __init__(self, start: datetime, speed: float = 60.0):
+        self.start = start
+        self.speed = speed
+        self._origin: Optional[float] = None
+
+    def begin(self):
+        self._origin = time.monotonic()
+
+    def now(self) -> datetime:
+        if self._origin is None:
+            return self.start
+        return self.start + timedelta(seconds=(time.monotonic() - self._origin) * self.speed)
+
+    def real_time_of(self, sim_time: datetime) -> float:
+        """시뮬레이션 시각이 되는 실제 시각 (time.monotonic 기준)"""
+        return self._origin + (sim_time - self.start).total_seconds() / self.speed
+
+
+# ==================== 이벤트 스트림 ====================
+
+def synthetic_events(start: datetime, students: int, burst_minutes: float, outing_ratio: float = 0.2,
+                     seed: int = 0) -> List[dict]:
+    """등원 폭주 합성 이벤트 - students명이 burst_minutes 동안 입장, 일부는 쉬는시간 외출 후 재입장"""
+    rng = random.Random(seed)
+    events = []
+    for i in range(students):
+        name = f"시뮬{i + 1:04d}"
+        phone = f"010-0000-{i + 1:04d}"
+        arrival = start + timedelta(seconds=rng.uniform(0, burst_minutes * 60))
+        events.append({"student_name": name, "phone_number": phone, "status": "입장", "record_time": arrival})
+
+        if rng.random() < outing_ratio:
+            outing = arrival + timedelta(minutes=rng.uniform(20, 60))
+            events.append({"student_name": name, "phone_number": phone, "status": "외출(쉬는시간)", "record_time": outing})
+            events.append({"student_name": name, "phone_number": phone, "status": "입장",
+                           "record_time": outing + timedelta(minutes=rng.uniform(5, 15))})
+    return events
+
+
+def load_events(path: Path, start: datetime) -> List[dict]:
+    """녹화된 이벤트 로드 (JSONL 또는 scrape_result.json) - 첫 이벤트가 start가 되도록 시각 이동"""
+    text = path.read_text(encoding='utf-8')
+    if path.suffix == ".jsonl":
+        raw = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        data = json.loads(text)
+        raw = data.get("records", []) if isinstance(data, dict) else data
+
+    events = []
+    for item in raw:
+        record_time = datetime.fromisoformat(item["record_time"])
+        if record_time.tzinfo is None:
+            record_time = KST.localize(record_time)
+        events.append({
+            "student_name": item["student_name"],
+            "phone_number": item.get("phone_number", ""),
+            "status": item["status"],
+            "record_time": record_time,
+        })
+    if not events:
+        return events
+
+    shift = start - min(e["record_time"] for e in events)
+    for event in events:
+        event["record_time"] = (event["record_time"] + shift).astimezone(KST)
+    return events
+
+
+def event_key(name: str, status: str, record_time: datetime) -> tuple:
+    return name, status, record_time.astimezone(KST).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ==================== 출입 기록 페이지 서버 ====================
+
+class SimulatedClassUpServer:
+    """현재 시뮬레이션 시각까지 발생한 이벤트를 최신순 테이블로 보여주는 로컬 서버"""
+
+    def __init__(self, clock: SimClock, events: List[dict], page_size: int = 50):
+        self.clock = clock
+        self.events = sorted(events, key=lambda e: e["record_time"])
+        self.page_size = page_size
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def render(self) -> str:
+        now = self.clock.now()
+        visible = [e for e in self.events if e["record_time"] <= now][-self.page_size:]
+        rows = "".join(
+            "<tr>"
+            f"<td>{escape(e['student_name'])}</td><td>{escape(e['phone_number'])}</td><td>05:00-23:59</td>"
+            f"<td>{escape(e['status'])}</td><td>{e['record_time'].strftime('%Y-%m-%d %H:%M:%S')}</td>"
+            "</tr>"
+            for e in reversed(visible)
+        )
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>출입 기록</title></head><body>"
+            "<table><thead><tr><th>이름</th><th>휴대폰번호</th><th>입퇴실 가능 시간</th><th>상태</th><th>시간</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table></body></html>"
+        )
+
+    def start(self) -> str:
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != ENTRANCE_PATH:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                simulator.requests += 1
+                body = simulator.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_port}{ENTRANCE_PATH}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+# ==================== Discord 웹훅 스텁 ====================
+
+class WebhookReceiver:
+    """Discord 웹훅 스텁 - 채널(/webhook/<name>)별 수신 기록, limit건/window초 레이트 리밋"""
+
+    def __init__(self, limit: int = 5, window: float = 2.0):
+        self.limit = limit
+        self.window = window
+        self.received: List[dict] = []
+        self.rate_limited = 0
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.base_url: Optional[str] = None
+
+    def _admit(self, channel: str):
+        """(허용 여부, 남은 요청 수, 리셋까지 초)"""
+        now = time.monotonic()
+        with self._lock:
+            hits = [t for t in self._buckets.get(channel, []) if now - t < self.window]
+            if self.limit and len(hits) >= self.limit:
+                self._buckets[channel] = hits
+                return False, 0, self.window - (now - hits[0])
+            hits.append(now)
+            self._buckets[channel] = hits
+            remaining = self.limit - len(hits) if self.limit else 1
+            reset_after = self.window - (now - hits[0]) if hits else self.window
+            return True, remaining, reset_after
+
+    def start(self) -> str:
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                received_at = time.monotonic()
+                channel = self.path.rstrip("/").rsplit("/", 1)[-1]
+                length = int(self.headers.get("Content-Length", "0"))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+
+                allowed, remaining, reset_after = receiver._admit(channel)
+                if not allowed:
+                    receiver.rate_limited += 1
+                    body = json.dumps({"message": "You are being rate limited.", "retry_after": reset_after}).encode()
+                    self.send_response(429)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Retry-After", f"{reset_after:.3f}")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                with receiver._lock:
+                    receiver.received.append({"channel": channel, "at": received_at, "embeds": payload.get("embeds", [])})
+                self.send_response(204)
+                self.send_header("X-RateLimit-Remaining", str(remaining))
+                self.send_header("X-RateLimit-Reset-After", f"{reset_after:.3f}")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}/webhook"
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def embed_names(embed: dict) -> List[str]:
+    """알림 embed에서 **학생이름** 추출"""
+    texts = [embed.get("title", ""), embed.get("description", "")]
+    texts += [f.get("value", "") for f in embed.get("fields", [])]
+    return NAME_PATTERN.findall(" ".join(texts))
+
+
+# ==================== 실행 ====================
+
+class FixedScheduler:
+    """고정 간격 스케줄러 (시뮬레이션은 실제 시간표와 무관하게 계속 스크래핑)"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def next_interval(self):
+        return self.interval, "fast"
+
+    def record_activity(self, active: bool):
+        pass
+
+
+def percentile_summary(values: List[float]) -> dict:
+    from classup_core.bench import percentile
+
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 1),
+        "p90": round(percentile(values, 90), 1),
+        "p95": round(percentile(values, 95), 1),
+        "p99": round(percentile(values, 99), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def configure_environment(database_url: str, webhook_base: str):
+    """라우터/DB 모듈 import 전에 임시 DB와 웹훅 스텁 주소 지정"""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DISCORD_WEBHOOK_ALERT"] = f"{webhook_base}/alert"
+    os.environ["DISCORD_WEBHOOK_GENERAL"] = f"{webhook_base}/general"
+    os.environ["DISCORD_WEBHOOK_URL"] = ""
+
+
+async def run_simulation(args) -> dict:
+    start = KST.localize(datetime.combine(datetime.now(KST).date(), datetime.strptime(args.start, "%H:%M").time()))
+    clock = SimClock(start, args.speed)
+    if args.events:
+        events = load_events(args.events, start)
+    else:
+        events = synthetic_events(start, args.students, args.burst_minutes, args.outing_ratio, args.seed)
+    if not events:
+        raise SystemExit("재생할 이벤트가 없습니다.")
+
+    receiver = WebhookReceiver(args.webhook_limit, args.webhook_window)
+    webhook_base = receiver.start()
+    workdir = Path(tempfile.mkdtemp(prefix="classup-sim-"))
+    configure_environment(args.database_url or f"sqlite:///{workdir / 'sim.db'}", webhook_base)
+
+    # 환경변수 지정 후 import (모듈 import 시점에 DB/웹훅 설정을 읽음)
+    from database import Base, SessionLocal, engine
+    import models
+    from classup_core.backends import create_backend
+    from classup_core.runner import RestartPolicy, ScrapeLoop
+    from notifications import NotificationOutbox, get_dispatcher
+    from .pipeline import IngestPipeline
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        # 이름 매칭 경로도 실제처럼 타도록 학생 등록
+        names = sorted({e["student_name"] for e in events})
+        db.add_all([models.Student(name=name, seat_number=f"S{i + 1:04d}", status="재원") for i, name in enumerate(names)])
+        db.commit()
+    finally:
+        db.close()
+
+    site = SimulatedClassUpServer(clock, events, args.page_size)
+    url = site.start()
+    session_file = workdir / "classup_session.json"
+    session_file.write_text(json.dumps({"cookies": [], "origins": []}), encoding='utf-8')
+
+    by_key = {event_key(e["student_name"], e["status"], e["record_time"]): e for e in events}
+    ingested_at: Dict[tuple, float] = {}
+    loop = asyncio.get_running_loop()
+    dispatcher = get_dispatcher()
+    dispatcher.start()
+    pipeline = IngestPipeline(SessionLocal)
+    pipeline.start()
+
+    async def ingest(records: List[dict]) -> int:
+        saved = await pipeline.ingest(records)
+        now = time.monotonic()
+        for r in records:
+            ingested_at.setdefault(event_key(r["student_name"], r["status"], r["record_time"]), now)
+        return saved
+
+    def on_records(records, new_records):
+        if not new_records:
+            return 0
+        return asyncio.run_coroutine_threadsafe(ingest(new_records), loop).result(timeout=120)
+
+    stop = threading.Event()
+    backend = create_backend(args.engine, session_file, url=url)
+    scrape_loop = ScrapeLoop(
+        backend,
+        on_records=on_records,
+        scheduler=FixedScheduler(args.interval),
+        restart_policy=RestartPolicy(every_cycles=0, max_rss_mb=0),
+        should_stop=stop.is_set,
+    )
+
+    clock.begin()
+    last_event_real = clock.real_time_of(max(e["record_time"] for e in events))
+    scraper_thread = threading.Thread(target=scrape_loop.run, daemon=True)
+    scraper_thread.start()
+
+    def outbox_pending() -> int:
+        session = SessionLocal()
+        try:
+            return session.query(NotificationOutbox).filter(NotificationOutbox.status == "pending").count()
+        finally:
+            session.close()
+
+    # 마지막 이벤트 이후 스크래핑 두 번이 지나고 아웃박스가 빌 때까지 (최대 drain초) 대기
+    settle_at = last_event_real + 2 * args.interval
+    while time.monotonic() < last_event_real + args.drain:
+        await asyncio.sleep(0.5)
+        if time.monotonic() > settle_at:
+            await pipeline.drain()
+            if outbox_pending() == 0:
+                break
+
+    stop.set()
+    await loop.run_in_executor(None, scraper_thread.join, 30)
+    pipeline_stats = pipeline.stats()
+    await pipeline.stop()
+    dispatcher.stop()
+    site.stop()
+    receiver.stop()
+
+    return build_report(args, clock, events, by_key, ingested_at, receiver, scrape_loop, site, dispatcher.status(),
+                        pipeline_stats)
+
+
+def build_report(args, clock, events, by_key, ingested_at, receiver, scrape_loop, site, dispatcher_status,
+                 pipeline_stats: dict = None) -> dict:
+    event_real = {key: clock.real_time_of(event["record_time"]) for key, event in by_key.items()}
+
+    to_db = [(ingested_at[key] - event_real[key]) * 1000 for key in ingested_at if key in event_real]
+
+    # 알림 embed의 학생 이름으로 이벤트 매칭 (학생별 수집 순서대로)
+    pending_by_name: Dict[str, List[tuple]] = {}
+    for key in sorted(ingested_at, key=ingested_at.get):
+        pending_by_name.setdefault(key[0], []).append(key)
+    to_discord = []
+    embeds = 0
+    for message in sorted(receiver.received, key=lambda m: m["at"]):
+        for embed in message["embeds"]:
+            embeds += 1
+            for name in embed_names(embed):
+                if pending_by_name.get(name):
+                    key = pending_by_name[name].pop(0)
+                    to_discord.append((message["at"] - event_real[key]) * 1000)
+                    break
+
+    first_event = min(event_real.values())
+    last_ingest = max(ingested_at.values()) if ingested_at else first_event
+    span = max(last_ingest - first_event, 1e-6)
+
+    return {
+        "engine": args.engine,
+        "speed": args.speed,
+        "scrape_interval_s": args.interval,
+        "page_size": args.page_size,
+        "events": len(events),
+        "ingested": len(ingested_at),
+        "missed": len(events) - len(ingested_at),
+        "scrape_cycles": scrape_loop.cycle_count,
+        "page_requests": site.requests,
+        "event_to_db_ms": percentile_summary(to_db),
+        "event_to_discord_ms": percentile_summary(to_discord),
+        "throughput_records_per_s": round(len(ingested_at) / span, 1),
+        "discord": {
+            "messages": len(receiver.received),
+            "embeds": embeds,
+            "rate_limited": receiver.rate_limited,
+            "dispatcher": dispatcher_status,
+        },
+        "pipeline": pipeline_stats or {},
+        "sim_window": [clock.start.isoformat(), max(e["record_time"] for e in events).isoformat()],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ClassUp 오프라인 재생 시뮬레이터")
+    parser.add_argument("--engine", default="http", help="fetch 백엔드 (http/browser)")
+    parser.add_argument("--events", type=Path, help="녹화된 이벤트 (JSONL 또는 scrape_result.json), 생략 시 합성 이벤트")
+    parser.add_argument("--students", type=int, default=300, help="합성 이벤트 학생 수")
+    parser.add_argument("--burst-minutes", type=float, default=10, help="등원 폭주 구간 (시뮬레이션 분)")
+    parser.add_argument("--outing-ratio", type=float, default=0.2, help="외출 후 재입장하는 학생 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default="07:50", help="시뮬레이션 시작 시각 (HH:MM)")
+    parser.add_argument("--speed", type=float, default=60.0, help="시간 가속 배율")
+    parser.add_argument("--interval", type=float, default=1.0, help="스크래핑 간격 (실제 초)")
+    parser.add_argument("--page-size", type=int, default=50, help="출입 기록 페이지에 보이는 최근 행 수")
+    parser.add_argument("--webhook-limit", type=int, default=5, help="웹훅 스텁 레이트 리밋 (window당 요청 수, 0=무제한)")
+    parser.add_argument("--webhook-window", type=float, default=2.0)
+    parser.add_argument("--drain", type=float, default=60.0, help="마지막 이벤트 후 최대 대기 (실제 초)")
+    parser.add_argument("--database-url", help="사용할 DB (기본: 임시 SQLite)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_simulation(args))
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(output, encoding='utf-8')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""ClassUp 동기화 로그 기록/조회 (개별 로그 + 롤업)
+
+- 새 기록이 있거나 오류가 난 사이클만 classup_sync_logs에 개별 행으로 남깁니다.
+- 모든 사이클은 classup_core.synclog.SyncRollup으로 메모리에서 집계해 구간이 끝날 때 classup_sync_rollups에 저장합니다.
+- compact_sync_logs()는 이전 방식으로 쌓인 유휴 개별 로그를 롤업(source="legacy")으로 접고 삭제합니다.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import pytz
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from classup_core.synclog import SyncRollup, bucket_start, merge_into, should_log_cycle
+from database import naive_kst
+from .models import ClassUpSyncLog, ClassUpSyncRollup
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 유휴 개별 로그 압축 기준 (이보다 오래된 행만) / 한 번에 처리할 행 수
+COMPACT_AFTER_HOURS = 1
+COMPACT_BATCH_SIZE = 2000
+
+
+def save_rollup(db: Session, bucket: dict, source: str) -> ClassUpSyncRollup:
+    """구간 집계 저장 (같은 source/구간 행이 있으면 합침). 커밋은 호출 측"""
+    row = db.query(ClassUpSyncRollup).filter(
+        ClassUpSyncRollup.source == source,
+        ClassUpSyncRollup.bucket_start == bucket["bucket_start"]
+    ).first()
+    if row is None:
+        row = ClassUpSyncRollup(source=source)
+        db.add(row)
+    merge_into(row, bucket)
+    return row
+
+
+class SyncStatsRecorder:
+    """사이클 결과 기록기 - 개별 로그는 필요한 사이클만, 나머지는 롤업으로"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.rollup = SyncRollup()
+
+    def record(self, db: Session, records_fetched: int, new_records: int,
+               error: Optional[str] = None, duration_ms: Optional[int] = None) -> bool:
+        """사이클 한 번 기록 (세션에 추가만 함). Returns: DB에 쓸 것이 있었는지 (호출 측 커밋 필요)"""
+        now = datetime.now(KST)
+        dirty = False
+
+        if should_log_cycle(new_records, error):
+            db.add(ClassUpSyncLog(
+                sync_time=now,
+                records_fetched=records_fetched,
+                new_records=new_records,
+                errors=str(error)[:1000] if error else None,
+                status="error" if error else "success"
+            ))
+            dirty = True
+
+        closed = self.rollup.add(now, records_fetched, new_records, error, duration_ms)
+        if closed:
+            save_rollup(db, closed, self.source)
+            dirty = True
+        return dirty
+
+    def flush(self, db: Session):
+        """진행 중인 구간 저장 (루프 종료 시)"""
+        closed = self.rollup.flush()
+        if closed:
+            save_rollup(db, closed, self.source)
+            db.commit()
+
+
+def compact_sync_logs(db: Session, older_than_hours: int = COMPACT_AFTER_HOURS,
+                      batch_size: int = COMPACT_BATCH_SIZE) -> int:
+    """새 기록/오류 없는 개별 로그를 분 단위 롤업으로 접고 삭제 (배치 단위 커밋)
+
+    Returns: 삭제한 개별 로그 수
+    """
+    cutoff = datetime.now(KST) - timedelta(hours=older_than_hours)
+    compacted = 0
+
+    while True:
+        rows = db.query(ClassUpSyncLog).filter(
+            ClassUpSyncLog.sync_time < cutoff,
+            ClassUpSyncLog.status == "success",
+            ClassUpSyncLog.new_records == 0
+        ).order_by(ClassUpSyncLog.id.asc()).limit(batch_size).all()
+        if not rows:
+            break
+
+        buckets = {}
+        for row in rows:
+            sync_time = row.sync_time if row.sync_time.tzinfo else KST.localize(row.sync_time)
+            rollup = buckets.setdefault(bucket_start(sync_time, 60), SyncRollup(bucket_seconds=60))
+            rollup.add(sync_time, row.records_fetched or 0, 0)
+        for rollup in buckets.values():
+            save_rollup(db, rollup.flush(), "legacy")
+
+        db.query(ClassUpSyncLog).filter(
+            ClassUpSyncLog.id.in_([row.id for row in rows])
+        ).delete(synchronize_session=False)
+        db.commit()
+        compacted += len(rows)
+
+        if len(rows) < batch_size:
+            break
+
+    if compacted:
+        logger.info(f"동기화 로그 압축: 유휴 로그 {compacted}개 → 롤업")
+    return compacted
+
+
+def latest_sync_time(db: Session) -> Optional[datetime]:
+    """마지막 동기화 사이클 시각 (개별 로그/롤업 중 최신)"""
+    candidates = []
+    recent_log = db.query(ClassUpSyncLog.sync_time).order_by(ClassUpSyncLog.sync_time.desc()).first()
+    if recent_log and recent_log[0]:
+        candidates.append(recent_log[0])
+    recent_rollup = db.query(ClassUpSyncRollup.last_sync_time).filter(
+        ClassUpSyncRollup.source != "legacy"
+    ).order_by(ClassUpSyncRollup.bucket_start.desc()).first()
+    if recent_rollup and recent_rollup[0]:
+        candidates.append(recent_rollup[0])
+    if not candidates:
+        return None
+    latest = max(value.replace(tzinfo=None) for value in candidates)
+    return KST.localize(latest)
+
+
+def account_sync_status(db: Session) -> List[dict]:
+    """외부 워커 계정별 마지막 동기화 (롤업 source: external=default 계정, external:<세션 키>)"""
+    rows = db.query(
+        ClassUpSyncRollup.source,
+        func.max(ClassUpSyncRollup.last_sync_time),
+        func.sum(ClassUpSyncRollup.error_count),
+        func.sum(ClassUpSyncRollup.cycles),
+    ).filter(
+        ClassUpSyncRollup.source.like("external%"),
+        ClassUpSyncRollup.bucket_start >= naive_kst() - timedelta(hours=1)
+    ).group_by(ClassUpSyncRollup.source).all()
+
+    accounts = []
+    for source, last_sync, errors, cycles in rows:
+        accounts.append({
+            "account": source.split(":", 1)[1] if ":" in source else "default",
+            "last_sync": last_sync.isoformat() if last_sync else None,
+            "cycles_1h": int(cycles or 0),
+            "errors_1h": int(errors or 0),
+        })
+    return sorted(accounts, key=lambda a: a["account"])
+
+
+def recent_rollups(db: Session, limit: int = 20) -> List[ClassUpSyncRollup]:
+    return db.query(ClassUpSyncRollup).order_by(
+        ClassUpSyncRollup.bucket_start.desc()
+    ).limit(limit).all()
+
+
+def rollup_to_dict(row: ClassUpSyncRollup) -> dict:
+    """롤업 행 → API 응답 (기존 /logs 필드 포함)"""
+    return {
+        "id": row.id,
+        "kind": "rollup",
+        "source": row.source,
+        "sync_time": row.last_sync_time.isoformat() if row.last_sync_time else None,
+        "bucket_start": row.bucket_start.isoformat() if row.bucket_start else None,
+        "bucket_seconds": row.bucket_seconds,
+        "records_fetched": row.records_fetched,
+        "new_records": row.new_records,
+        "cycles": row.cycles,
+        "idle_cycles": row.idle_cycles,
+        "error_count": row.error_count,
+        "duration_min_ms": row.duration_min_ms,
+        "duration_avg_ms": row.duration_avg_ms,
+        "duration_max_ms": row.duration_max_ms,
+        "status": "error" if row.error_count and row.error_count == row.cycles else "success",
+        "errors": row.last_error,
+    }
@@ -0,0 +1,41 @@
+"""ClassUp 스크래퍼 코어
+
+메인 서버 내부 Worker(classup/_fast_worker.py 등)와 독립 워커(classup-worker)가 공유하는
+fetch 백엔드 / 파서 / 중복 제거 / 컴파일된 시간표 / 시간표 기반 스케줄러 / 스크래핑 루프(계정 여러 개 포함) / 동기화 로그 집계 / 중단 구간 백필입니다.
+FastAPI/DB에 의존하지 않으므로 독립 워커에서도 그대로 import할 수 있습니다.
+"""
+from .backfill import BackfillRunner, OutageDetector
+from .backends import FetchBackend, FetchError, SessionExpired, create_backend
+from .dedupe import RecordDeduper, record_key
+from .index import RecentRecordIndex, StudentIndex
+from .multi import MultiAccountLoop
+from .parser import parse_datetime, parse_rows, record_to_json, rows_from_html, rows_from_json
+from .runner import RestartPolicy, ScrapeLoop
+from .schedule import AdaptiveScheduler
+from .synclog import SyncRollup
+from .timetable import Timetable, default_timetable
+
+__all__ = [
+    "AdaptiveScheduler",
+    "BackfillRunner",
+    "FetchBackend",
+    "FetchError",
+    "MultiAccountLoop",
+    "OutageDetector",
+    "RecentRecordIndex",
+    "RecordDeduper",
+    "RestartPolicy",
+    "ScrapeLoop",
+    "SessionExpired",
+    "StudentIndex",
+    "SyncRollup",
+    "Timetable",
+    "create_backend",
+    "default_timetable",
+    "parse_datetime",
+    "parse_rows",
+    "record_key",
+    "record_to_json",
+    "rows_from_html",
+    "rows_from_json",
+]
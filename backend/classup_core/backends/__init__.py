@@ -0,0 +1,45 @@
+"""fetch 백엔드 - 출입 기록 테이블 행을 가져오는 교체 가능한 구현
+
+- "browser"/"playwright": Playwright sync API (기본값, shared_browser를 넘기면 공유 브라우저의 계정별 컨텍스트)
+- "playwright-async": Playwright async API (asyncio 루프 안에서 사용)
+- "http": 저장된 세션 쿠키 + httpx (브라우저 없음)
+
+백엔드 모듈은 선택 의존성(playwright/httpx)을 쓰므로 create_backend에서 지연 import합니다.
+"""
+from pathlib import Path
+
+from .base import CLASSUP_URL, CLASSUP_LOGIN_URL, USER_AGENT, FetchBackend, FetchError, SessionExpired
+
+ENGINES = ("browser", "playwright", "playwright-async", "http")
+
+
+def create_backend(engine: str, session_file: Path, **kwargs):
+    """엔진 이름으로 fetch 백엔드 생성"""
+    engine = (engine or "browser").lower()
+
+    if engine in ("browser", "playwright"):
+        if kwargs.get("shared_browser") is not None:
+            from .shared import SharedBrowserBackend
+            return SharedBrowserBackend(session_file, **kwargs)
+        from .playwright_sync import PlaywrightSyncBackend
+        return PlaywrightSyncBackend(session_file, **kwargs)
+    if engine == "playwright-async":
+        from .playwright_async import PlaywrightAsyncBackend
+        return PlaywrightAsyncBackend(session_file, **kwargs)
+    if engine == "http":
+        from .http import HttpBackend
+        return HttpBackend(session_file, **kwargs)
+
+    raise ValueError(f"알 수 없는 스크래핑 엔진: {engine} (지원: {', '.join(ENGINES)})")
+
+
+__all__ = [
+    "CLASSUP_URL",
+    "CLASSUP_LOGIN_URL",
+    "USER_AGENT",
+    "ENGINES",
+    "FetchBackend",
+    "FetchError",
+    "SessionExpired",
+    "create_backend",
+]
@@ -0,0 +1,56 @@
+"""fetch 백엔드 공통 인터페이스
+
+백엔드는 출입 기록 테이블의 행(셀 텍스트 목록)만 가져오고, 파싱/중복 제거/저장은
+ScrapeLoop와 소비자가 담당합니다.
+"""
+from typing import List, Optional
+
+CLASSUP_URL = "https://academy.classup.io/user/entrance"
+CLASSUP_LOGIN_URL = "https://academy.classup.io/login"
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class SessionExpired(Exception):
+    """세션 만료 (로그인 페이지로 리다이렉트) - 재로그인 또는 세션 갱신 필요"""
+
+
+class FetchError(Exception):
+    """일시적인 조회 실패 (페이지 크래시, 타임아웃 등)"""
+
+
+class FetchBackend:
+    """sync fetch 백엔드 기본 클래스"""
+
+    name = "base"
+    # 주기적 재시작 간격 (사이클 수, 0이면 재시작 없음)
+    restart_every = 0
+
+    def __init__(self):
+        self.last_metrics: Optional[dict] = None
+
+    def start(self) -> bool:
+        raise NotImplementedError
+
+    def fetch_rows(self) -> List[List[str]]:
+        """출입 기록 행 조회. 세션 만료 시 SessionExpired, 일시 오류 시 FetchError"""
+        raise NotImplementedError
+
+    def refresh_session(self) -> bool:
+        """세션 파일을 다시 읽어 재시작 (HTTP 백엔드는 Playwright로 세션 갱신)"""
+        return self.restart()
+
+    def restart(self) -> bool:
+        self.stop()
+        return self.start()
+
+    def recycle(self) -> bool:
+        """메모리 정리를 위한 교체 (브라우저 백엔드는 대기 인스턴스를 미리 준비한 뒤 교체)"""
+        return self.restart()
+
+    def memory_rss_kb(self) -> Optional[int]:
+        """백엔드가 띄운 프로세스(브라우저)의 RSS 합계 (KB, 측정 불가면 None)"""
+        return None
+
+    def stop(self):
+        raise NotImplementedError
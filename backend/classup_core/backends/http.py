@@ -0,0 +1,168 @@
+"""HTTP 백엔드 - 브라우저 없이 저장된 세션 쿠키로 출입 기록 조회
+
+Playwright storage_state(classup_session.json)의 쿠키를 keep-alive httpx 클라이언트에 올려
+평문 HTTP로 조회합니다. Playwright는 세션 갱신(refresh_session)에만 사용합니다.
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import httpx
+
+from ..parser import rows_from_html, rows_from_json
+from .base import CLASSUP_URL, USER_AGENT, FetchBackend, FetchError, SessionExpired
+from .playwright_sync import DEFAULT_LAUNCH_ARGS
+
+logger = logging.getLogger(__name__)
+
+# 출입 기록을 가져올 주소 (JSON API가 있으면 환경변수로 지정)
+ENTRANCE_DATA_URL = os.getenv("CLASSUP_ENTRANCE_DATA_URL", CLASSUP_URL)
+
+
+def load_storage_state(session_file: Path) -> Optional[dict]:
+    """Playwright storage_state 파일 로드"""
+    if not session_file.exists():
+        return None
+    with open(session_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cookies_from_storage_state(storage_state: dict) -> httpx.Cookies:
+    """storage_state의 쿠키를 httpx 쿠키 저장소로 변환"""
+    cookies = httpx.Cookies()
+    for cookie in storage_state.get("cookies", []):
+        cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", "").lstrip("."),
+            path=cookie.get("path", "/")
+        )
+    return cookies
+
+
+def refresh_session_with_browser(session_file: Path, url: str = CLASSUP_URL) -> Optional[dict]:
+    """Playwright로 출입 기록 페이지를 한 번 열어 세션(쿠키) 갱신
+
+    Returns: 갱신된 storage_state (로그인 페이지로 가면 None - 재로그인 필요)
+    """
+    from playwright.sync_api import sync_playwright
+
+    playwright = None
+    browser = None
+    try:
+        playwright = sync_playwright().start()
+        browser = playwright.chromium.launch(headless=True, args=DEFAULT_LAUNCH_ARGS)
+        context = browser.new_context(
+            locale='ko-KR',
+            timezone_id='Asia/Seoul',
+            storage_state=str(session_file) if session_file.exists() else None
+        )
+        page = context.new_page()
+        page.goto(url, wait_until='networkidle', timeout=30000)
+
+        if "login" in page.url.lower():
+            logger.warning("세션 갱신 실패 - 로그인 필요")
+            return None
+
+        storage_state = context.storage_state(path=str(session_file))
+        logger.info("Playwright로 세션 갱신 완료")
+        return storage_state
+
+    except Exception as e:
+        logger.error(f"세션 갱신 오류: {e}")
+        return None
+
+    finally:
+        for closeable in (browser,):
+            try:
+                if closeable:
+                    closeable.close()
+            except Exception:
+                pass
+        try:
+            if playwright:
+                playwright.stop()
+        except Exception:
+            pass
+
+
+class HttpBackend(FetchBackend):
+    """저장된 세션 쿠키를 재사용하는 브라우저 없는 백엔드 (keep-alive 연결 풀)"""
+
+    name = "http"
+    restart_every = 0
+
+    def __init__(self, session_file: Path, url: str = ENTRANCE_DATA_URL,
+                 on_session_refreshed: Callable[[dict], None] = None):
+        super().__init__()
+        self.session_file = Path(session_file)
+        self.url = url
+        self.on_session_refreshed = on_session_refreshed
+        self.client: Optional[httpx.Client] = None
+
+    def start(self) -> bool:
+        """세션 파일에서 쿠키를 읽어 클라이언트 생성"""
+        storage_state = load_storage_state(self.session_file)
+        if not storage_state:
+            logger.error("세션 파일 없음")
+            return False
+
+        self.stop()
+        self.client = httpx.Client(
+            cookies=cookies_from_storage_state(storage_state),
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept-Language": "ko-KR,ko;q=0.9",
+            },
+            follow_redirects=True,
+            timeout=httpx.Timeout(15.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=2, max_connections=4),
+        )
+        logger.info(f"HTTP 클라이언트 준비 완료 (쿠키 {len(storage_state.get('cookies', []))}개)")
+        return True
+
+    def fetch_rows(self) -> List[List[str]]:
+        if self.client is None and not self.start():
+            raise SessionExpired("세션 파일 없음")
+
+        started = time.perf_counter()
+        try:
+            response = self.client.get(self.url)
+        except httpx.HTTPError as e:
+            raise FetchError(str(e))
+
+        self.last_metrics = {
+            "duration_ms": int((time.perf_counter() - started) * 1000),
+            "bytes": len(response.content),
+            "requests": 1 + len(response.history),
+            "blocked": 0,
+        }
+
+        if response.status_code in (401, 403) or "login" in str(response.url).lower():
+            raise SessionExpired("세션 만료")
+        if response.status_code >= 400:
+            raise FetchError(f"HTTP {response.status_code}")
+
+        if "json" in response.headers.get("content-type", ""):
+            return rows_from_json(response.json())
+        return rows_from_html(response.text)
+
+    def refresh_session(self) -> bool:
+        """세션 파일 재적재 후에도 만료면 Playwright로 갱신"""
+        storage_state = refresh_session_with_browser(self.session_file)
+        if storage_state is None:
+            return False
+        if self.on_session_refreshed:
+            self.on_session_refreshed(storage_state)
+        return self.start()
+
+    def stop(self):
+        if self.client:
+            try:
+                self.client.close()
+            except Exception:
+                pass
+            self.client = None
@@ -0,0 +1,124 @@
+"""Playwright async API 백엔드 - asyncio 이벤트 루프 안에서 브라우저 유지"""
+import logging
+from pathlib import Path
+from typing import List
+
+from ..lean import CycleMetrics, context_options, apply_lean_profile_async
+from ..parser import ROWS_SCRIPT, ROW_SELECTOR
+from .base import CLASSUP_URL, USER_AGENT, FetchError, SessionExpired
+from .playwright_sync import DEFAULT_LAUNCH_ARGS, BROWSER_RESTART_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class PlaywrightAsyncBackend:
+    """PlaywrightSyncBackend와 같은 동작의 async 버전 (모든 메서드 await)"""
+
+    name = "playwright-async"
+    restart_every = BROWSER_RESTART_INTERVAL
+
+    def __init__(self, session_file: Path, url: str = CLASSUP_URL, launch_args: list = None):
+        self.session_file = Path(session_file)
+        self.url = url
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.is_initialized = False
+        self.metrics = CycleMetrics()
+        self.last_metrics = None
+
+    async def start(self) -> bool:
+        from playwright.async_api import async_playwright
+
+        try:
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True, args=self.launch_args)
+            await self.new_page()
+            logger.info("브라우저 시작 완료 (async)")
+            return True
+        except Exception as e:
+            logger.error(f"브라우저 시작 실패 (async): {e}")
+            await self.stop()
+            return False
+
+    async def new_page(self):
+        """새 컨텍스트/페이지 생성 (경량 프로필 적용)"""
+        if self.context:
+            try:
+                await self.context.close()
+            except Exception:
+                pass
+
+        self.context = await self.browser.new_context(**context_options(
+            user_agent=USER_AGENT,
+            ignore_https_errors=True,
+            storage_state=str(self.session_file) if self.session_file.exists() else None
+        ))
+        await apply_lean_profile_async(self.context, self.metrics)
+        self.page = await self.context.new_page()
+        self.page.on("requestfinished", self.metrics.on_request_finished)
+        self.is_initialized = False
+
+    async def _open_page(self):
+        await self.page.goto(self.url, wait_until='networkidle', timeout=30000)
+        if "login" in self.page.url.lower():
+            raise SessionExpired("세션 만료")
+        for _ in range(2):
+            await self.page.keyboard.press("Escape")
+            await self.page.wait_for_timeout(100)
+        await self.page.wait_for_selector("table", timeout=10000)
+        self.is_initialized = True
+
+    async def fetch_rows(self) -> List[List[str]]:
+        from playwright.async_api import Error as PlaywrightError
+
+        self.metrics.begin()
+        try:
+            if not self.is_initialized:
+                await self._open_page()
+            else:
+                await self.page.reload(wait_until='networkidle', timeout=15000)
+
+            if "login" in self.page.url.lower():
+                self.is_initialized = False
+                raise SessionExpired("세션 만료")
+
+            await self.page.keyboard.press("Escape")
+            return await self.page.eval_on_selector_all(ROW_SELECTOR, ROWS_SCRIPT)
+
+        except PlaywrightError as e:
+            error_msg = str(e).lower()
+            if "crash" in error_msg or "closed" in error_msg or "target" in error_msg:
+                logger.warning(f"페이지 크래시 감지, 컨텍스트 재생성: {e}")
+                await self.new_page()
+            raise FetchError(str(e))
+
+        finally:
+            self.last_metrics = await self.metrics.end_async()
+
+    async def restart(self) -> bool:
+        await self.stop()
+        return await self.start()
+
+    async def refresh_session(self) -> bool:
+        return await self.restart()
+
+    async def stop(self):
+        for closeable in (self.page, self.context, self.browser):
+            try:
+                if closeable:
+                    await closeable.close()
+            except Exception:
+                pass
+        try:
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception:
+            pass
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.is_initialized = False
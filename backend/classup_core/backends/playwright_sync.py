@@ -0,0 +1,293 @@
+"""Playwright sync API 백엔드 - 브라우저를 유지하며 출입 기록 페이지 새로고침
+
+Playwright sync 객체는 만든 스레드에서만 쓸 수 있으므로 브라우저 한 세대마다 전용 스레드(BrowserThread)를 두고
+조회/종료를 그 스레드에 넘겨 실행합니다. 재활용 시 대기 브라우저는 새 BrowserThread에서 출입 페이지까지
+준비하고, 그동안 스크래핑은 기존 브라우저로 계속합니다. 준비가 끝나면 다음 조회 직전에 한 번에 교체합니다.
+"""
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from ..lean import CycleMetrics, context_options, apply_lean_profile, attach_metrics
+from ..memory import child_tree_rss_kb
+from ..parser import ROWS_SCRIPT, ROW_SELECTOR
+from .base import CLASSUP_URL, USER_AGENT, FetchBackend, FetchError, SessionExpired
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAUNCH_ARGS = ['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
+
+# 고정 주기 브라우저 재시작 간격 (0이면 사용 안 함 - 기본은 RSS 기준 재활용, runner.RestartPolicy)
+BROWSER_RESTART_INTERVAL = int(os.getenv("CLASSUP_BROWSER_RESTART_INTERVAL", "0"))
+
+
+def _close_all(*closeables):
+    for closeable in closeables:
+        try:
+            if closeable:
+                closeable.close()
+        except Exception:
+            pass
+
+
+class BrowserThread:
+    """Playwright 드라이버/Chromium 한 세대를 소유하는 전용 스레드
+
+    submit/call로 넘긴 함수는 모두 같은 스레드에서 순서대로 실행됩니다.
+    """
+
+    def __init__(self, name: str = "classup-browser"):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.playwright = None
+        self.browser = None
+
+    def submit(self, fn: Callable, *args) -> Future:
+        return self._executor.submit(fn, *args)
+
+    def call(self, fn: Callable, *args):
+        """이 스레드에서 fn 실행 후 결과 반환 (예외는 호출 측으로 전달)"""
+        return self.submit(fn, *args).result()
+
+    def launch(self, launch_args: list):
+        """드라이버 + Chromium 시작 (이 스레드 안에서 호출)"""
+        from playwright.sync_api import sync_playwright
+
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(headless=True, args=launch_args)
+        return self.browser
+
+    def close(self, *closeables, wait: bool = True):
+        """closeables와 브라우저/드라이버를 이 스레드에서 닫고 스레드 종료 (wait=False면 기다리지 않음)"""
+        def run():
+            _close_all(*closeables, self.browser)
+            try:
+                if self.playwright:
+                    self.playwright.stop()
+            except Exception:
+                pass
+            self.browser = None
+            self.playwright = None
+
+        self.submit(run)
+        self._executor.shutdown(wait=wait)
+
+
+class _Standby:
+    """준비 중인 대기 브라우저 (BrowserThread + 준비 결과 Future)"""
+
+    def __init__(self, thread: BrowserThread, future: Future, metrics: CycleMetrics, rss_before: Optional[int]):
+        self.thread = thread
+        self.future = future
+        self.metrics = metrics
+        self.rss_before = rss_before
+        self.started = time.perf_counter()
+
+
+class PlaywrightSyncBackend(FetchBackend):
+    """Chromium 한 개 + 컨텍스트/페이지 한 개를 유지하는 백엔드"""
+
+    name = "playwright"
+    restart_every = BROWSER_RESTART_INTERVAL
+
+    def __init__(self, session_file: Path, url: str = CLASSUP_URL, launch_args: list = None):
+        super().__init__()
+        self.session_file = Path(session_file)
+        self.url = url
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+        self.thread: Optional[BrowserThread] = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.is_initialized = False
+        self.metrics = CycleMetrics()
+        self._standby: Optional[_Standby] = None
+
+    def call(self, fn: Callable, *args):
+        """브라우저 스레드에서 fn 실행 (self.page 등 Playwright 객체를 직접 다룰 때)"""
+        if self.thread is None:
+            raise FetchError("브라우저가 시작되지 않음")
+        return self.thread.call(fn, *args)
+
+    def start(self) -> bool:
+        """브라우저 시작"""
+        try:
+            self.thread = BrowserThread()
+            self.browser = self.thread.call(self.thread.launch, self.launch_args)
+            self.thread.call(self._create_context)
+            logger.info("브라우저 시작 완료")
+            return True
+        except Exception as e:
+            logger.error(f"브라우저 시작 실패: {e}")
+            self.stop()
+            return False
+
+    def _new_context(self, browser, metrics: CycleMetrics = None):
+        """컨텍스트/페이지 생성 (경량 프로필 적용)"""
+        metrics = metrics or self.metrics
+        context = browser.new_context(**context_options(
+            user_agent=USER_AGENT,
+            ignore_https_errors=True,
+            storage_state=str(self.session_file) if self.session_file.exists() else None
+        ))
+        apply_lean_profile(context, metrics)
+        page = context.new_page()
+        attach_metrics(page, metrics)
+        return context, page
+
+    def _create_context(self):
+        """현재 브라우저에 새 컨텍스트/페이지 생성 (브라우저 스레드에서 호출)"""
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+
+        self.context, self.page = self._new_context(self.browser)
+        self.is_initialized = False
+
+    def _dismiss_popups(self, times: int = 1, page=None):
+        page = page or self.page
+        for _ in range(times):
+            page.keyboard.press("Escape")
+            page.wait_for_timeout(100)
+
+    def _load_entrance(self, page):
+        """출입 기록 페이지 로드 후 테이블이 보일 때까지 대기"""
+        page.goto(self.url, wait_until='networkidle', timeout=30000)
+        if "login" in page.url.lower():
+            raise SessionExpired("세션 만료")
+        self._dismiss_popups(2, page)
+        page.wait_for_selector("table", timeout=10000)
+
+    def _open_page(self):
+        """출입 기록 페이지 최초 로드"""
+        self._load_entrance(self.page)
+        self.is_initialized = True
+        logger.info(f"페이지 초기화 완료: {self.page.url}")
+
+    def memory_rss_kb(self) -> Optional[int]:
+        """Playwright 드라이버 + Chromium 프로세스 트리 RSS"""
+        if not self.browser:
+            return None
+        return child_tree_rss_kb()
+
+    def recycle(self) -> bool:
+        """새 스레드에서 대기 브라우저를 출입 페이지까지 준비 시작 (기다리지 않음)
+
+        준비가 끝나면 다음 fetch_rows 직전에 교체하고, 실패하면 기존 브라우저를 유지합니다.
+        """
+        if not self.thread or not self.browser:
+            return self.restart()
+        if self._standby is not None:
+            return True
+
+        standby = BrowserThread("classup-browser-standby")
+        metrics = CycleMetrics()
+
+        def prepare():
+            browser = standby.launch(self.launch_args)
+            context, page = self._new_context(browser, metrics)
+            self._load_entrance(page)
+            return context, page
+
+        self._standby = _Standby(standby, standby.submit(prepare), metrics, self.memory_rss_kb())
+        logger.info("대기 브라우저 준비 시작 - 준비 중에도 기존 브라우저로 스크래핑")
+        return True
+
+    def _promote_standby(self):
+        """준비가 끝난 대기 브라우저로 교체 (조회 사이에만 호출되므로 조회 중인 페이지가 바뀌지 않음)"""
+        standby = self._standby
+        if standby is None or not standby.future.done():
+            return
+        self._standby = None
+        try:
+            context, page = standby.future.result()
+        except Exception as e:
+            logger.warning(f"대기 브라우저 준비 실패 - 기존 브라우저 유지: {e}")
+            standby.thread.close(wait=False)
+            return
+
+        old_thread, old_page, old_context = self.thread, self.page, self.context
+        self.thread, self.browser, self.context, self.page = standby.thread, standby.thread.browser, context, page
+        self.metrics = standby.metrics
+        self.is_initialized = True
+        if old_thread:
+            old_thread.close(old_page, old_context, wait=False)
+
+        standby_ms = int((time.perf_counter() - standby.started) * 1000)
+        rss_after = self.memory_rss_kb()
+        if standby.rss_before is not None and rss_after is not None:
+            logger.info(f"브라우저 교체 완료: 대기 인스턴스 준비 {standby_ms}ms, "
+                        f"RSS {standby.rss_before / 1024:.0f}MB → {rss_after / 1024:.0f}MB")
+        else:
+            logger.info(f"브라우저 교체 완료: 대기 인스턴스 준비 {standby_ms}ms")
+
+    def extract_rows(self) -> List[List[str]]:
+        """현재 페이지의 테이블 행을 한 번의 evaluate로 추출"""
+        return self.call(self._extract_rows)
+
+    def _extract_rows(self) -> List[List[str]]:
+        return self.page.eval_on_selector_all(ROW_SELECTOR, ROWS_SCRIPT)
+
+    def fetch_rows(self) -> List[List[str]]:
+        self._promote_standby()
+        return self.call(self._fetch_rows)
+
+    def _fetch_rows(self) -> List[List[str]]:
+        from playwright.sync_api import Error as PlaywrightError
+
+        self.metrics.begin()
+        try:
+            if not self.is_initialized:
+                self._open_page()
+            else:
+                self.page.reload(wait_until='networkidle', timeout=15000)
+
+            if "login" in self.page.url.lower():
+                self.is_initialized = False
+                raise SessionExpired("세션 만료")
+
+            self._dismiss_popups()
+            return self._extract_rows()
+
+        except PlaywrightError as e:
+            error_msg = str(e).lower()
+            if "crash" in error_msg or "closed" in error_msg or "target" in error_msg:
+                logger.warning(f"페이지 크래시 감지, 컨텍스트 재생성: {e}")
+                self._create_context()
+            raise FetchError(str(e))
+
+        finally:
+            self.last_metrics = self.metrics.end()
+
+    def fetch_all_pages(self, max_pages: int = 20) -> List[List[str]]:
+        """페이지네이션을 따라가며 모든 행 수집 (1회성 조회용)"""
+        rows = self.fetch_rows()
+
+        def follow():
+            for _ in range(max_pages - 1):
+                next_btn = self.page.query_selector('button:has-text(">"), a:has-text(">"), .pagination-next')
+                if not next_btn or next_btn.get_attribute('disabled'):
+                    break
+                next_btn.click()
+                self.page.wait_for_timeout(1000)
+                rows.extend(self._extract_rows())
+
+        self.call(follow)
+        return rows
+
+    def stop(self):
+        """브라우저 종료 (준비 중인 대기 브라우저 포함)"""
+        if self._standby is not None:
+            self._standby.thread.close(wait=False)
+            self._standby = None
+        if self.thread is not None:
+            self.thread.close(self.page, self.context)
+        self.thread = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.is_initialized = False
@@ -0,0 +1,197 @@
+"""여러 계정(세션 키)이 Chromium 하나를 나눠 쓰는 백엔드
+
+계정마다 브라우저를 띄우면 지점 수만큼 Chromium 메모리가 늘어납니다. SharedBrowser가 브라우저
+한 개를 유지하고, 계정별 SharedBrowserBackend는 그 안에 격리된 컨텍스트(쿠키/스토리지 분리)와
+페이지 하나만 만듭니다. Playwright 객체는 SharedBrowser의 BrowserThread 하나에서만 다루고,
+계정들은 같은 스레드(classup_core.multi.MultiAccountLoop)에서 번갈아 조회를 넘깁니다.
+"""
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from ..lean import CycleMetrics
+from ..memory import child_tree_rss_kb
+from .base import CLASSUP_URL, SessionExpired
+from .playwright_sync import DEFAULT_LAUNCH_ARGS, BrowserThread, PlaywrightSyncBackend, _close_all, _Standby
+
+logger = logging.getLogger(__name__)
+
+
+class SharedBrowser:
+    """계정 백엔드들이 공유하는 Playwright/Chromium (붙은 백엔드가 없으면 종료)"""
+
+    def __init__(self, launch_args: list = None):
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+        self.thread: Optional[BrowserThread] = None
+        self.browser = None
+        self.members: List["SharedBrowserBackend"] = []
+        self._standby: Optional[_Standby] = None
+
+    def attach(self, backend: "SharedBrowserBackend"):
+        """백엔드 등록 (첫 등록 시 브라우저 시작)"""
+        if self.browser is None:
+            self.thread = BrowserThread("classup-shared-browser")
+            self.browser = self.thread.call(self.thread.launch, self.launch_args)
+            logger.info("공유 브라우저 시작 완료")
+        if backend not in self.members:
+            self.members.append(backend)
+
+    def detach(self, backend: "SharedBrowserBackend"):
+        """백엔드 해제 (마지막 백엔드면 브라우저 종료)"""
+        if backend in self.members:
+            self.members.remove(backend)
+        if not self.members:
+            self.stop()
+
+    def memory_rss_kb(self) -> Optional[int]:
+        if not self.browser:
+            return None
+        return child_tree_rss_kb()
+
+    def recycle(self) -> bool:
+        """새 스레드에서 대기 브라우저에 모든 계정의 컨텍스트를 준비(출입 페이지 로드) 시작 (기다리지 않음)
+
+        준비가 끝나면 다음 조회 직전에 promote()가 한 번에 교체합니다. 출입 페이지 로드는 계정별로 격리되어
+        한 계정이 실패(세션 만료 등)해도 나머지 계정은 준비된 페이지로 교체되고, 실패한 계정만 다음 조회 때
+        다시 로드합니다(세션 만료면 재로그인 필요로 표시). 브라우저/컨텍스트 생성이 실패하면 기존 브라우저를 유지합니다.
+        """
+        if not self.thread or not self.browser:
+            return False
+        if self._standby is not None:
+            return True
+
+        standby = BrowserThread("classup-shared-standby")
+        members = list(self.members)
+
+        def prepare():
+            browser = standby.launch(self.launch_args)
+            prepared = []
+            for member in members:
+                metrics = CycleMetrics()
+                context, page = member._new_context(browser, metrics)
+                try:
+                    member._load_entrance(page)
+                    error = None
+                except Exception as e:
+                    error = e
+                prepared.append((member, context, page, metrics, error))
+            return prepared
+
+        self._standby = _Standby(standby, standby.submit(prepare), None, self.memory_rss_kb())
+        logger.info(f"공유 대기 브라우저 준비 시작 (계정 {len(members)}개) - 준비 중에도 기존 브라우저로 스크래핑")
+        return True
+
+    def promote(self):
+        """준비가 끝난 대기 브라우저로 모든 계정을 교체 (계정 조회 사이에만 호출)"""
+        standby = self._standby
+        if standby is None or not standby.future.done():
+            return
+        self._standby = None
+        try:
+            prepared = standby.future.result()
+        except Exception as e:
+            logger.warning(f"공유 대기 브라우저 준비 실패 - 기존 브라우저 유지: {e}")
+            standby.thread.close(wait=False)
+            return
+
+        old_thread = self.thread
+        self.thread, self.browser = standby.thread, standby.thread.browser
+        failed = 0
+        for member, context, page, metrics, error in prepared:
+            if member not in self.members:
+                continue
+            expired = isinstance(error, SessionExpired)
+            member._swap(self.thread, context, page, metrics, ready=error is None, session_expired=expired)
+            if error is not None:
+                failed += 1
+                logger.warning(f"공유 브라우저 교체 - {member.session_file.name} 준비 실패 "
+                               f"({'세션 만료 - 재로그인 필요' if expired else error}), 다음 조회 때 다시 로드")
+        if old_thread:
+            old_thread.close(wait=False)  # 이전 컨텍스트는 이전 브라우저와 함께 닫힘
+
+        standby_ms = int((time.perf_counter() - standby.started) * 1000)
+        rss_after = self.memory_rss_kb()
+        accounts = f"계정 {len(prepared)}개" + (f", 준비 실패 {failed}개" if failed else "")
+        if standby.rss_before is not None and rss_after is not None:
+            logger.info(f"공유 브라우저 교체 완료 ({accounts}): 대기 인스턴스 준비 {standby_ms}ms, "
+                        f"RSS {standby.rss_before / 1024:.0f}MB → {rss_after / 1024:.0f}MB")
+        else:
+            logger.info(f"공유 브라우저 교체 완료 ({accounts}): 대기 인스턴스 준비 {standby_ms}ms")
+
+    def stop(self):
+        if self._standby is not None:
+            self._standby.thread.close(wait=False)
+            self._standby = None
+        if self.thread is not None:
+            self.thread.close()
+        self.thread = None
+        self.browser = None
+        self.members = []
+
+
+class SharedBrowserBackend(PlaywrightSyncBackend):
+    """공유 브라우저 안의 계정별 컨텍스트/페이지 하나 - 조회/세션 처리는 PlaywrightSyncBackend와 같음"""
+
+    name = "playwright-shared"
+
+    def __init__(self, session_file: Path, shared_browser: SharedBrowser, url: str = CLASSUP_URL,
+                 launch_args: list = None):
+        super().__init__(session_file, url=url, launch_args=launch_args)
+        self.shared = shared_browser
+        self.needs_login = False  # 브라우저 교체 중 세션 만료 확인 - 다음 조회에서 SessionExpired
+
+    def start(self) -> bool:
+        try:
+            self.shared.attach(self)
+            self.thread = self.shared.thread
+            self.browser = self.shared.browser
+            self.thread.call(self._create_context)
+            return True
+        except Exception as e:
+            logger.error(f"컨텍스트 시작 실패 ({self.session_file.name}): {e}")
+            self.stop()
+            return False
+
+    def _swap(self, thread: BrowserThread, context, page, metrics: CycleMetrics,
+              ready: bool = True, session_expired: bool = False):
+        """공유 브라우저 교체 시 준비된 컨텍스트로 전환 (이전 컨텍스트는 이전 브라우저와 함께 닫힘)
+
+        ready=False면 출입 페이지를 다음 조회 때 다시 로드합니다.
+        """
+        self.thread, self.browser, self.context, self.page = thread, thread.browser, context, page
+        self.metrics = metrics
+        self.is_initialized = ready
+        self.needs_login = session_expired
+
+    def _promote_standby(self):
+        self.shared.promote()
+        if self.needs_login:
+            self.needs_login = False
+            raise SessionExpired("세션 만료 (브라우저 교체 중 확인)")
+
+    def memory_rss_kb(self) -> Optional[int]:
+        """공유 브라우저 전체 RSS (계정별로 나눌 수 없음)"""
+        return self.shared.memory_rss_kb()
+
+    def recycle(self) -> bool:
+        # 메모리는 브라우저 단위이므로 모든 계정을 함께 교체 (대기 브라우저를 띄울 수 없으면 이 계정 컨텍스트만 새로 만듦)
+        if self.shared.recycle():
+            return True
+        if self.browser is None:
+            return self.start()
+        self.call(self._create_context)
+        return True
+
+    def stop(self):
+        if self.thread is not None:
+            try:
+                self.thread.call(_close_all, self.page, self.context)
+            except Exception:
+                pass
+        self.thread = None
+        self.page = None
+        self.context = None
+        self.browser = None
+        self.is_initialized = False
+        self.shared.detach(self)
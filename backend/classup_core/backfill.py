@@ -0,0 +1,287 @@
+"""과거 출입 기록 백필 - 워커/세션 중단 구간의 기록 복구
+
+스크래퍼는 현재 화면(최근 기록)만 읽으므로 세션 만료나 재배포로 멈춘 동안의 기록은 다시 볼 수 없습니다.
+백필은 브라우저 하나, 컨텍스트 하나에 페이지를 여러 개 열어 (날짜, 페이지) 조회를 동시에 수행하고
+중단 구간에 해당하는 기록만 모아 반환합니다. 저장(중복 제거/일괄 INSERT)은 호출 측이 담당합니다.
+
+날짜별 조회 주소는 CLASSUP_BACKFILL_URL_TEMPLATE로 지정합니다 ({date}=YYYY-MM-DD, {page}=1부터).
+템플릿 유무와 관계없이 현재 출입 화면(CLASSUP_URL)은 항상 함께 조회하므로, 템플릿이 없거나 사이트와 맞지 않아도
+화면에 남아 있는 최근 구간은 복구됩니다. 시각만 있는 셀은 조회한 날짜의 기록으로 해석하고,
+같은 행이 다른 날짜에도 나오면 (날짜 파라미터가 무시된 것) 그 화면의 기록은 버립니다.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .backends.base import CLASSUP_URL, USER_AGENT, SessionExpired
+from .backends.playwright_sync import DEFAULT_LAUNCH_ARGS
+from .lean import apply_lean_profile_async, context_options
+from .parser import KST, ROW_SELECTOR, ROWS_SCRIPT, parse_rows
+
+logger = logging.getLogger(__name__)
+
+# 날짜/페이지별 조회 주소 (비워 두면 현재 출입 화면만 조회)
+BACKFILL_URL_TEMPLATE = os.getenv("CLASSUP_BACKFILL_URL_TEMPLATE", "")
+# 동시에 여는 페이지 수
+BACKFILL_CONCURRENCY = int(os.getenv("CLASSUP_BACKFILL_CONCURRENCY", "4"))
+# 날짜당 최대 페이지 수
+BACKFILL_MAX_PAGES = int(os.getenv("CLASSUP_BACKFILL_MAX_PAGES", "30"))
+# 백필할 최대 기간 (일) - 오래 멈춰 있었어도 이 기간까지만 복구
+BACKFILL_MAX_DAYS = int(os.getenv("CLASSUP_BACKFILL_MAX_DAYS", "3"))
+
+
+class BackfillProgress:
+    """백필 진행 상황 (헬스 서버/API에서 조회, 다른 스레드에서 읽어도 안전한 단순 필드)"""
+
+    def __init__(self):
+        self.status = "idle"  # idle/running/done/error
+        self.window: Optional[Tuple[datetime, datetime]] = None
+        self.pages_queued = 0
+        self.pages_done = 0
+        self.rows = 0
+        self.records = 0
+        self.inserted = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def reset(self, start: datetime, end: datetime):
+        self.__init__()
+        self.status = "running"
+        self.window = (start, end)
+        self.started_at = time.monotonic()
+
+    def to_dict(self) -> dict:
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "status": self.status,
+            "window": [t.isoformat() for t in self.window] if self.window else None,
+            "pages_queued": self.pages_queued,
+            "pages_done": self.pages_done,
+            "rows": self.rows,
+            "records": self.records,
+            "inserted": self.inserted,
+            "elapsed_s": round(elapsed, 1),
+            "pages_per_s": round(self.pages_done / elapsed, 2) if elapsed else 0.0,
+            "records_per_s": round(self.records / elapsed, 1) if elapsed else 0.0,
+            "error": self.error,
+        }
+
+
+def clamp_window(start: datetime, end: datetime, max_days: int = BACKFILL_MAX_DAYS) -> Tuple[datetime, datetime]:
+    """백필 구간을 최근 max_days일로 제한"""
+    return max(start, end - timedelta(days=max_days)), end
+
+
+def dates_in_window(start: datetime, end: datetime) -> List[date]:
+    days = []
+    current = start.date()
+    while current <= end.date():
+        days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+async def fetch_window(session_file: Path, start: datetime, end: datetime, progress: BackfillProgress = None,
+                       concurrency: int = BACKFILL_CONCURRENCY, url_template: str = BACKFILL_URL_TEMPLATE,
+                       max_pages: int = BACKFILL_MAX_PAGES, launch_args: list = None) -> List[dict]:
+    """[start, end] 구간의 기록을 (날짜, 페이지) 단위로 동시 조회
+
+    한 날짜의 페이지는 앞 페이지에 행이 있을 때만 다음 페이지를 큐에 넣으므로,
+    동시성은 여러 날짜와 (날짜별) 연속 페이지 사이에서 생깁니다.
+    page_no 0은 현재 출입 화면(CLASSUP_URL, 오늘 날짜)입니다.
+    """
+    from playwright.async_api import async_playwright
+
+    progress = progress or BackfillProgress()
+    queue: "asyncio.Queue[Tuple[date, int]]" = asyncio.Queue()
+    outstanding = 0  # 큐에 있거나 조회 중인 페이지 수
+
+    def enqueue(day: date, page_no: int):
+        nonlocal outstanding
+        queue.put_nowait((day, page_no))
+        outstanding += 1
+        progress.pages_queued += 1
+
+    enqueue(datetime.now(KST).date(), 0)
+    if url_template:
+        for day in dates_in_window(start, end):
+            enqueue(day, 1)
+    else:
+        logger.info("CLASSUP_BACKFILL_URL_TEMPLATE 미설정 - 현재 출입 화면만 조회")
+
+    current_records: List[dict] = []
+    # 날짜별 화면: 행 서명 → (날짜, 기록) / 두 날짜 이상에서 나온 서명
+    page_records: Dict[tuple, Tuple[date, List[dict]]] = {}
+    ignored: Set[tuple] = set()
+
+    def in_window(rows, day: date) -> List[dict]:
+        records = [record for record in parse_rows(rows, day) if start <= record["record_time"] <= end]
+        progress.records += len(records)
+        return records
+
+    async def handle(page, day: date, page_no: int):
+        url = url_template.format(date=day.isoformat(), page=page_no) if page_no else CLASSUP_URL
+        await page.goto(url, wait_until='networkidle', timeout=30000)
+        if "login" in page.url.lower():
+            raise SessionExpired("세션 만료")
+        await page.keyboard.press("Escape")
+        try:
+            await page.wait_for_selector("table", timeout=10000)
+        except Exception:
+            return
+        rows = await page.eval_on_selector_all(ROW_SELECTOR, ROWS_SCRIPT)
+        progress.pages_done += 1
+        progress.rows += len(rows)
+
+        if not rows:
+            return
+        if page_no == 0:
+            current_records.extend(in_window(rows, day))
+            return
+
+        signature = tuple(tuple(row) for row in rows)
+        if signature in page_records:
+            if page_records[signature][0] != day and signature not in ignored:
+                ignored.add(signature)
+                logger.warning(f"백필 - {day} 화면이 {page_records[signature][0]}와 같음 (날짜 파라미터 무시됨) - 제외")
+            return  # 마지막 페이지 지남 (또는 파라미터가 무시되어 같은 화면 반복)
+        page_records[signature] = (day, in_window(rows, day))
+
+        if page_no < max_pages:
+            enqueue(day, page_no + 1)
+
+    async def worker(page):
+        nonlocal outstanding
+        while True:
+            try:
+                day, page_no = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                # 다른 워커가 다음 페이지를 넣을 수 있으므로 진행 중인 조회가 끝날 때까지 대기
+                if outstanding == 0:
+                    return
+                await asyncio.sleep(0.05)
+                continue
+            try:
+                await handle(page, day, page_no)
+            except SessionExpired:
+                raise
+            except Exception as e:
+                logger.warning(f"백필 페이지 조회 실패 ({day} p{page_no}): {e}")
+            finally:
+                outstanding -= 1
+
+    playwright = await async_playwright().start()
+    browser = None
+    try:
+        browser = await playwright.chromium.launch(headless=True, args=launch_args or DEFAULT_LAUNCH_ARGS)
+        context = await browser.new_context(**context_options(
+            user_agent=USER_AGENT,
+            ignore_https_errors=True,
+            storage_state=str(session_file) if Path(session_file).exists() else None
+        ))
+        await apply_lean_profile_async(context)
+        pages = [await context.new_page() for _ in range(max(concurrency, 1))]
+        await asyncio.gather(*(worker(page) for page in pages))
+    finally:
+        if browser:
+            await browser.close()
+        await playwright.stop()
+
+    records = list(current_records)
+    for signature, (_, page) in page_records.items():
+        if signature not in ignored:
+            records.extend(page)
+    progress.records = len(records)
+    return records
+
+
+# 이 시간(초) 이상 스크래핑이 끊겼다가 복구되면 백필
+OUTAGE_MIN_SECONDS = int(os.getenv("CLASSUP_BACKFILL_MIN_OUTAGE_SECONDS", "120"))
+
+
+class OutageDetector:
+    """사이클 성공/실패로 중단 구간 감지 - 복구된 첫 성공 사이클에서 (시작, 끝) 반환"""
+
+    def __init__(self, min_seconds: int = OUTAGE_MIN_SECONDS, margin: timedelta = timedelta(minutes=1)):
+        self.min_seconds = min_seconds
+        self.margin = margin
+        self.last_success: Optional[datetime] = None
+        self.failing_since: Optional[datetime] = None
+
+    def seed(self, last_seen: Optional[datetime]):
+        """시작 시 마지막으로 동기화된 시각 지정 (프로세스가 내려가 있던 구간도 중단으로 처리)"""
+        if last_seen is not None:
+            self.failing_since = last_seen
+
+    def observe(self, success: bool, now: datetime) -> Optional[Tuple[datetime, datetime]]:
+        if not success:
+            if self.failing_since is None:
+                self.failing_since = self.last_success or now
+            return None
+
+        window = None
+        if self.failing_since is not None and (now - self.failing_since).total_seconds() >= self.min_seconds:
+            window = (self.failing_since - self.margin, now)
+        self.failing_since = None
+        self.last_success = now
+        return window
+
+
+class BackfillRunner:
+    """백필 작업 실행기 - 한 번에 하나만, 별도 스레드(자체 이벤트 루프)에서 실행
+
+    save(records) -> int 는 중복 제거 후 저장한 기록 수를 반환합니다.
+    """
+
+    def __init__(self, session_file: Path, save: Callable[[List[dict]], int],
+                 before_start: Callable[[], None] = None):
+        self.session_file = Path(session_file)
+        self.save = save
+        self.before_start = before_start
+        self.progress = BackfillProgress()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, start: datetime, end: datetime) -> dict:
+        """백필 동기 실행 (현재 스레드)"""
+        start, end = clamp_window(start, end)
+        self.progress.reset(start, end)
+        logger.info(f"백필 시작: {start.isoformat()} ~ {end.isoformat()}")
+        try:
+            if self.before_start:
+                self.before_start()
+            records = asyncio.run(fetch_window(self.session_file, start, end, self.progress))
+            self.progress.inserted = self.save(records)
+            self.progress.status = "done"
+        except Exception as e:
+            self.progress.status = "error"
+            self.progress.error = str(e)
+            logger.error(f"백필 실패: {e}")
+        finally:
+            self.progress.finished_at = time.monotonic()
+
+        summary = self.progress.to_dict()
+        logger.info(
+            f"백필 종료: 페이지 {summary['pages_done']}개, 기록 {summary['records']}개 중 {summary['inserted']}개 저장 "
+            f"({summary['elapsed_s']}초, {summary['pages_per_s']}페이지/초, {summary['records_per_s']}건/초)"
+        )
+        return summary
+
+    def start(self, start: datetime, end: datetime) -> bool:
+        """백그라운드 스레드에서 백필 시작 (이미 실행 중이면 False)"""
+        if self.running:
+            return False
+        self._thread = threading.Thread(target=self.run, args=(start, end), daemon=True, name="classup-backfill")
+        self._thread.start()
+        return True
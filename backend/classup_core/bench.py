@@ -0,0 +1,136 @@
+"""스크래퍼 벤치마크 - 같은 조건에서 fetch 백엔드/파서 비교
+
+사용 예 (backend 디렉토리에서):
+    python -m classup_core.bench --engine browser --cycles 30
+    python -m classup_core.bench --engine http --cycles 30
+    python -m classup_core.bench --engine parse --html classup/debug_page.html --cycles 1000
+
+사이클별 소요 시간(p50/p95), 행 수, 전송 바이트/요청/차단 수, 프로세스 트리 RSS를 출력합니다.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Optional
+
+from .backends import ENGINES, create_backend
+from .memory import process_tree_rss_kb
+from .parser import parse_rows, rows_from_html
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SESSION_FILE = BACKEND_DIR / "classup" / "classup_session.json"
+DEFAULT_HTML_FILE = BACKEND_DIR / "classup" / "debug_page.html"
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(engine: str, samples: list, rss_kb: Optional[int]) -> dict:
+    durations = [s["duration_ms"] for s in samples]
+    return {
+        "engine": engine,
+        "cycles": len(samples),
+        "p50_ms": round(percentile(durations, 50), 1),
+        "p95_ms": round(percentile(durations, 95), 1),
+        "mean_ms": round(statistics.mean(durations), 1) if durations else 0,
+        "rows": samples[-1]["rows"] if samples else 0,
+        "records": samples[-1]["records"] if samples else 0,
+        "bytes_avg": int(statistics.mean(s.get("bytes", 0) for s in samples)) if samples else 0,
+        "requests_avg": round(statistics.mean(s.get("requests", 0) for s in samples), 1) if samples else 0,
+        "blocked_avg": round(statistics.mean(s.get("blocked", 0) for s in samples), 1) if samples else 0,
+        "rss_kb": rss_kb,
+    }
+
+
+def bench_parse(html_file: Path, cycles: int) -> dict:
+    """저장된 HTML로 파싱 단계만 측정 (네트워크/세션 불필요)"""
+    html = html_file.read_text(encoding="utf-8")
+    samples = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        rows = rows_from_html(html)
+        records = parse_rows(rows)
+        samples.append({
+            "duration_ms": (time.perf_counter() - started) * 1000,
+            "rows": len(rows),
+            "records": len(records),
+        })
+    return summarize("parse", samples, process_tree_rss_kb())
+
+
+def _sample(backend, rows: list, started: float) -> dict:
+    sample = dict(backend.last_metrics or {})
+    sample["duration_ms"] = (time.perf_counter() - started) * 1000
+    sample["rows"] = len(rows)
+    sample["records"] = len(parse_rows(rows))
+    return sample
+
+
+def bench_backend(engine: str, session_file: Path, cycles: int, interval: float) -> dict:
+    """sync 백엔드로 실제 페이지 조회 측정 (첫 페이지 로드는 제외)"""
+    backend = create_backend(engine, session_file)
+    if not backend.start():
+        raise SystemExit(f"{engine} 백엔드 시작 실패")
+
+    samples = []
+    try:
+        backend.fetch_rows()  # 워밍업 (최초 goto)
+        for _ in range(cycles):
+            started = time.perf_counter()
+            rows = backend.fetch_rows()
+            samples.append(_sample(backend, rows, started))
+            time.sleep(interval)
+        rss_kb = process_tree_rss_kb()
+    finally:
+        backend.stop()
+    return summarize(engine, samples, rss_kb)
+
+
+async def bench_backend_async(engine: str, session_file: Path, cycles: int, interval: float) -> dict:
+    """async 백엔드 측정"""
+    backend = create_backend(engine, session_file)
+    if not await backend.start():
+        raise SystemExit(f"{engine} 백엔드 시작 실패")
+
+    samples = []
+    try:
+        await backend.fetch_rows()
+        for _ in range(cycles):
+            started = time.perf_counter()
+            rows = await backend.fetch_rows()
+            samples.append(_sample(backend, rows, started))
+            await asyncio.sleep(interval)
+        rss_kb = process_tree_rss_kb()
+    finally:
+        await backend.stop()
+    return summarize(engine, samples, rss_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ClassUp 스크래퍼 벤치마크")
+    parser.add_argument("--engine", default="browser", choices=ENGINES + ("parse",))
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.0, help="사이클 사이 대기 (초)")
+    parser.add_argument("--session", type=Path, default=DEFAULT_SESSION_FILE)
+    parser.add_argument("--html", type=Path, default=DEFAULT_HTML_FILE)
+    args = parser.parse_args()
+
+    if args.engine == "parse":
+        report = bench_parse(args.html, args.cycles)
+    elif args.engine == "playwright-async":
+        report = asyncio.run(bench_backend_async(args.engine, args.session, args.cycles, args.interval))
+    else:
+        report = bench_backend(args.engine, args.session, args.cycles, args.interval)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""스크래핑 결과 중복 제거 단계
+
+ClassUp 출입 기록 페이지는 매 사이클 같은 행을 다시 보여주므로, 이전 사이클에서
+이미 처리한 행을 메모리에서 걸러 저장 단계(DB)에는 새 행만 전달합니다.
+저장에 실패한 행은 표시하지 않으므로 다음 사이클에 다시 전달됩니다.
+"""
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+
+
+def record_key(record: dict) -> Tuple[str, str, str]:
+    """기록 식별 키 (이름, 원본 상태, 기록 시간)"""
+    record_time = record.get("record_time")
+    if hasattr(record_time, "isoformat"):
+        record_time = record_time.isoformat()
+    return record["student_name"], record["status"], record_time
+
+
+class RecordDeduper:
+    """최근 처리한 기록 키 집합 (최대 max_keys개, 오래된 순으로 제거)"""
+
+    def __init__(self, max_keys: int = 5000):
+        self.max_keys = max_keys
+        self._seen: "OrderedDict[Tuple, None]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def new_records(self, records: Iterable[dict]) -> List[dict]:
+        """아직 처리하지 않은 기록만 반환 (같은 배치 안의 중복도 제거)"""
+        result = []
+        batch_keys = set()
+        for record in records:
+            key = record_key(record)
+            if key in self._seen or key in batch_keys:
+                continue
+            batch_keys.add(key)
+            result.append(record)
+        return result
+
+    def mark_seen(self, records: Iterable[dict]):
+        """저장 완료된 기록 표시"""
+        for record in records:
+            key = record_key(record)
+            self._seen[key] = None
+            self._seen.move_to_end(key)
+        while len(self._seen) > self.max_keys:
+            self._seen.popitem(last=False)
+
+    def clear(self):
+        self._seen.clear()
@@ -0,0 +1,133 @@
+"""학생 매칭/중복 확인용 메모리 인덱스
+
+저장 단계에서 기록마다 실행하던 학생 조회(이름 → LIKE 전화번호 검색)와 ±1분 중복 조회를
+DB 왕복 없이 처리합니다. DB에 의존하지 않으며, 소비자가 행을 넘겨 빌드/갱신합니다.
+
+- StudentIndex: NFC 정규화 이름 → 학생 ID, 전화번호 뒤 4자리 → 학생 ID 후보
+- RecentRecordIndex: 분 단위 버킷별 (이름, 상태) → 기록 시각 (보존 기간/최대 개수 제한)
+"""
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def normalize_name(name: str) -> str:
+    """이름 정규화 (NFC + 공백 제거) - macOS/웹에서 자모 분리된 이름도 같은 키로"""
+    return unicodedata.normalize("NFC", name or "").strip()
+
+
+def phone_suffix(phone: str) -> Optional[str]:
+    """전화번호 숫자 뒤 4자리 (4자리 미만이면 None)"""
+    digits = "".join(ch for ch in (phone or "") if ch.isdigit())
+    return digits[-4:] if len(digits) >= 4 else None
+
+
+class StudentIndex:
+    """학생 매칭 인덱스
+
+    rows: (id, name, student_phone, parent_phone, status) 목록
+    이름 매칭은 재원생만, 전화번호 매칭은 전체 학생 대상 (기존 match_student와 동일)
+    """
+
+    def __init__(self, active_status: str = "재원"):
+        self.active_status = active_status
+        self.by_name: Dict[str, int] = {}
+        self.by_phone_suffix: Dict[str, List[int]] = {}
+        self.signature = None
+        self.built_at = 0.0
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def build(self, rows: Iterable[Tuple], signature=None):
+        by_name: Dict[str, int] = {}
+        by_phone_suffix: Dict[str, List[int]] = {}
+
+        for student_id, name, student_phone, parent_phone, status in sorted(rows, key=lambda r: r[0]):
+            if status == self.active_status:
+                by_name.setdefault(normalize_name(name), student_id)
+            for phone in (student_phone, parent_phone):
+                suffix = phone_suffix(phone)
+                if suffix:
+                    candidates = by_phone_suffix.setdefault(suffix, [])
+                    if student_id not in candidates:
+                        candidates.append(student_id)
+
+        self.by_name = by_name
+        self.by_phone_suffix = by_phone_suffix
+        self.signature = signature
+        self.built_at = time.monotonic()
+
+    def match(self, name: str, phone: str = None) -> Optional[int]:
+        """이름 우선, 없으면 전화번호 뒤 4자리로 학생 ID 조회"""
+        student_id = self.by_name.get(normalize_name(name))
+        if student_id is not None:
+            return student_id
+
+        suffix = phone_suffix(phone)
+        if suffix:
+            candidates = self.by_phone_suffix.get(suffix)
+            if candidates:
+                return candidates[0]
+        return None
+
+
+class RecentRecordIndex:
+    """최근 저장된 (이름, 상태, 기록 시각) 집합 - ±window 중복 확인
+
+    분 단위 버킷으로 저장하고 인접 버킷만 확인하므로 조회는 O(1)입니다.
+    retention보다 오래된 버킷과 max_keys를 넘는 오래된 기록은 제거합니다.
+    """
+
+    def __init__(self, window: timedelta = timedelta(minutes=1),
+                 retention: timedelta = timedelta(hours=36), max_keys: int = 20000):
+        self.window = window
+        self.retention = retention
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[int, Dict[Tuple[str, str], List[datetime]]]" = OrderedDict()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def _bucket(record_time: datetime) -> int:
+        return int(record_time.timestamp() // 60)
+
+    def contains(self, name: str, status: str, record_time: datetime) -> bool:
+        key = (normalize_name(name), status)
+        span = int(self.window.total_seconds() // 60) + 1
+        center = self._bucket(record_time)
+        for bucket in range(center - span, center + span + 1):
+            for seen in self._buckets.get(bucket, {}).get(key, ()):
+                if abs(seen - record_time) <= self.window:
+                    return True
+        return False
+
+    def add(self, name: str, status: str, record_time: datetime):
+        bucket = self._bucket(record_time)
+        if bucket not in self._buckets:
+            # 기록은 대부분 시간 순으로 들어오므로 순서가 어긋날 때만 정렬 (넣기 전 마지막 버킷과 비교)
+            out_of_order = bool(self._buckets) and bucket < next(reversed(self._buckets))
+            self._buckets[bucket] = {}
+            if out_of_order:
+                self._buckets = OrderedDict(sorted(self._buckets.items()))
+        self._buckets[bucket].setdefault((normalize_name(name), status), []).append(record_time)
+        self._size += 1
+        self._evict()
+
+    def _evict(self):
+        """가장 최근 버킷 기준 retention보다 오래된 버킷, max_keys 초과분을 오래된 순으로 제거"""
+        oldest_allowed = next(reversed(self._buckets)) - int(self.retention.total_seconds() // 60)
+        while self._buckets:
+            bucket = next(iter(self._buckets))
+            if bucket >= oldest_allowed and self._size <= self.max_keys:
+                break
+            removed = self._buckets.pop(bucket)
+            self._size -= sum(len(times) for times in removed.values())
+
+    def clear(self):
+        self._buckets.clear()
+        self._size = 0
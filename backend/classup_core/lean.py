@@ -0,0 +1,174 @@
+"""ClassUp 스크래핑용 경량 브라우저 컨텍스트
+
+이미지/폰트/스타일시트/분석 스크립트 등 표 데이터와 무관한 요청을 라우트에서 차단하고,
+작은 뷰포트와 애니메이션 비활성화로 페이지 새로고침 비용을 줄입니다.
+사이클별 전송 바이트/요청 수/차단 수/소요 시간을 측정해 효과를 확인할 수 있습니다.
+"""
+import os
+import time
+from urllib.parse import urlparse
+
+
+def _env_list(name: str, default: str) -> list:
+    return [v.strip().lower() for v in os.getenv(name, default).split(",") if v.strip()]
+
+
+# 경량 프로필 사용 여부
+LEAN_CONTEXT = os.getenv("CLASSUP_LEAN_CONTEXT", "true").lower() in ("true", "1", "yes")
+
+# 차단할 리소스 타입 (Playwright request.resource_type)
+BLOCKED_RESOURCE_TYPES = set(_env_list(
+    "CLASSUP_BLOCK_RESOURCE_TYPES", "image,media,font,stylesheet"
+))
+
+# 허용 호스트 (접미사 일치) - 기본은 비어 있음(차단 목록만 적용)
+# 지정하면 목록 밖 호스트는 모두 차단되므로 로그인/CDN 호스트까지 함께 넣어야 함
+ALLOWED_HOSTS = _env_list("CLASSUP_ALLOWED_HOSTS", "")
+
+# 항상 차단할 호스트 (접미사 일치, 허용 목록보다 우선)
+BLOCKED_HOSTS = _env_list(
+    "CLASSUP_BLOCKED_HOSTS",
+    "google-analytics.com,googletagmanager.com,doubleclick.net,facebook.net,"
+    "hotjar.com,channel.io,sentry.io,clarity.ms,amplitude.com,mixpanel.com"
+)
+
+LEAN_VIEWPORT = {'width': 800, 'height': 600}
+
+# CSS 애니메이션/트랜지션 비활성화
+DISABLE_ANIMATIONS_SCRIPT = """
+(() => {
+  const style = document.createElement('style');
+  style.textContent = '*, *::before, *::after { animation: none !important; transition: none !important; caret-color: transparent !important; }';
+  const inject = () => (document.head || document.documentElement).appendChild(style);
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', inject);
+  } else {
+    inject();
+  }
+})();
+"""
+
+
+def _host_matches(host: str, suffixes: list) -> bool:
+    return any(host == s or host.endswith("." + s) for s in suffixes)
+
+
+def should_block(url: str, resource_type: str) -> bool:
+    """요청 차단 여부"""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+
+    host = (urlparse(url).hostname or "").lower()
+    if not host:
+        return False
+    if _host_matches(host, BLOCKED_HOSTS):
+        return True
+    if ALLOWED_HOSTS and not _host_matches(host, ALLOWED_HOSTS):
+        return True
+    return False
+
+
+def context_options(**overrides) -> dict:
+    """browser.new_context() 옵션 (경량 프로필 적용)"""
+    options = {
+        'viewport': LEAN_VIEWPORT if LEAN_CONTEXT else {'width': 1920, 'height': 1080},
+        'locale': 'ko-KR',
+        'timezone_id': 'Asia/Seoul',
+    }
+    if LEAN_CONTEXT:
+        options['reduced_motion'] = 'reduce'
+        options['device_scale_factor'] = 1
+    options.update(overrides)
+    return options
+
+
+class CycleMetrics:
+    """스크래핑 사이클별 네트워크/시간 지표"""
+
+    def __init__(self):
+        self.blocked = 0
+        self._finished = []
+        self._started = None
+
+    def begin(self):
+        self.blocked = 0
+        self._finished = []
+        self._started = time.perf_counter()
+
+    def on_request_finished(self, request):
+        self._finished.append(request)
+
+    def end(self) -> dict:
+        """사이클 종료 - 전송 바이트는 이벤트 핸들러 밖에서 계산 (sync API)"""
+        transferred = 0
+        for request in self._finished:
+            try:
+                sizes = request.sizes()
+                transferred += sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+            except Exception:
+                pass
+        return self._summary(transferred)
+
+    async def end_async(self) -> dict:
+        """end()의 async API 버전"""
+        transferred = 0
+        for request in self._finished:
+            try:
+                sizes = await request.sizes()
+                transferred += sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+            except Exception:
+                pass
+        return self._summary(transferred)
+
+    def _summary(self, transferred: int) -> dict:
+        metrics = {
+            "duration_ms": int((time.perf_counter() - self._started) * 1000) if self._started else 0,
+            "bytes": transferred,
+            "requests": len(self._finished),
+            "blocked": self.blocked,
+        }
+        self._finished = []
+        return metrics
+
+
+def apply_lean_profile(context, metrics: CycleMetrics = None):
+    """컨텍스트에 리소스 차단 라우트와 애니메이션 비활성화 적용 (sync API)"""
+    if not LEAN_CONTEXT:
+        return
+
+    def handle_route(route):
+        request = route.request
+        if should_block(request.url, request.resource_type):
+            if metrics:
+                metrics.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", handle_route)
+    context.add_init_script(DISABLE_ANIMATIONS_SCRIPT)
+
+
+def apply_lean_profile_async(context, metrics: CycleMetrics = None):
+    """apply_lean_profile의 async API 버전 (await 필요)"""
+    async def handle_route(route):
+        request = route.request
+        if should_block(request.url, request.resource_type):
+            if metrics:
+                metrics.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def apply():
+        if not LEAN_CONTEXT:
+            return
+        await context.route("**/*", handle_route)
+        await context.add_init_script(DISABLE_ANIMATIONS_SCRIPT)
+
+    return apply()
+
+
+def attach_metrics(page, metrics: CycleMetrics):
+    """페이지 요청 완료 이벤트를 지표에 연결"""
+    page.on("requestfinished", metrics.on_request_finished)
@@ -0,0 +1,59 @@
+"""프로세스 메모리 측정 (/proc 기반, Linux)
+
+Playwright 드라이버와 Chromium은 워커 프로세스의 자식으로 뜨므로, 자식 프로세스 트리의
+RSS 합계를 브라우저 메모리 사용량으로 봅니다. /proc가 없으면(Windows 등) None을 반환합니다.
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROC = Path("/proc")
+
+
+def _snapshot() -> Optional[Tuple[Dict[int, List[int]], Dict[int, int]]]:
+    """(부모 pid → 자식 pid 목록, pid → RSS KB)"""
+    if not PROC.exists():
+        return None
+
+    children: Dict[int, List[int]] = {}
+    rss: Dict[int, int] = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            status = (entry / "status").read_text()
+        except OSError:
+            continue
+        fields = dict(line.split(":", 1) for line in status.splitlines() if ":" in line)
+        ppid = int(fields.get("PPid", "0").strip())
+        children.setdefault(ppid, []).append(int(entry.name))
+        rss[int(entry.name)] = int(fields.get("VmRSS", "0 kB").split()[0])
+    return children, rss
+
+
+def _tree_rss(children: Dict[int, List[int]], rss: Dict[int, int], roots: List[int]) -> int:
+    total = 0
+    stack = list(roots)
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total
+
+
+def process_tree_rss_kb(pid: int = None) -> Optional[int]:
+    """pid와 모든 자식 프로세스(브라우저 포함)의 RSS 합계 (KB)"""
+    snapshot = _snapshot()
+    if snapshot is None:
+        return None
+    children, rss = snapshot
+    return _tree_rss(children, rss, [pid or os.getpid()])
+
+
+def child_tree_rss_kb(pid: int = None) -> Optional[int]:
+    """pid 자신을 뺀 자식 프로세스 트리 RSS 합계 (KB) - Playwright 드라이버 + Chromium"""
+    snapshot = _snapshot()
+    if snapshot is None:
+        return None
+    children, rss = snapshot
+    return _tree_rss(children, rss, children.get(pid or os.getpid(), []))
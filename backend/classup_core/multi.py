@@ -0,0 +1,110 @@
+"""여러 계정(지점)의 ScrapeLoop를 한 스레드에서 번갈아 실행
+
+계정마다 ScrapeLoop(시간표 스케줄러/중복 제거/재활용 정책)를 그대로 두고, 다음 사이클 시각이
+가장 이른 계정부터 실행합니다. 시각이 같으면 먼저 등록된 순서가 아니라 마지막으로 실행된 지
+오래된 순서로 돌아가므로 한 계정이 다른 계정을 굶기지 않습니다. 사이클은 직렬로 실행되므로
+한 계정의 느린 사이클은 다른 계정의 다음 사이클을 그만큼 늦춥니다.
+"""
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+import pytz
+
+from .runner import ScrapeLoop
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+class MultiAccountLoop:
+    """계정 키 → ScrapeLoop. health()로 계정별 상태를 다른 스레드(헬스 서버)에서 조회할 수 있습니다."""
+
+    def __init__(self, loops: Dict[str, ScrapeLoop], should_stop: Callable[[], bool] = None):
+        self.loops = loops
+        self.should_stop = should_stop or (lambda: False)
+        self._health: Dict[str, dict] = {
+            key: {
+                "cycles": 0,
+                "mode": None,
+                "running": False,
+                "session_expired": False,
+                "consecutive_failures": 0,
+                "last_success_at": None,
+                "last_error": None,
+                "last_error_at": None,
+                "last_new": 0,
+                "last_elapsed_ms": None,
+                "next_in_s": 0.0,
+            }
+            for key in loops
+        }
+        self._next_at: Dict[str, float] = {}
+
+    def health(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        snapshot = {}
+        for key, state in self._health.items():
+            entry = dict(state)
+            if key in self._next_at:
+                entry["next_in_s"] = round(max(self._next_at[key] - now, 0.0), 1)
+            snapshot[key] = entry
+        return snapshot
+
+    def _record(self, key: str, loop: ScrapeLoop, result: dict):
+        state = self._health[key]
+        state["cycles"] = loop.cycle_count
+        state["running"] = loop._started
+        state["session_expired"] = loop.session_expired
+        state["consecutive_failures"] = loop.consecutive_failures
+        state["last_elapsed_ms"] = result.get("elapsed_ms")
+        if result["success"]:
+            state["last_success_at"] = datetime.now(KST).isoformat()
+            state["last_new"] = result["new"]
+        else:
+            state["last_error"] = result["error"]
+            state["last_error_at"] = datetime.now(KST).isoformat()
+
+    def _sleep_until(self, deadline: float) -> bool:
+        while time.monotonic() < deadline:
+            if self.should_stop():
+                return False
+            time.sleep(min(1.0, max(deadline - time.monotonic(), 0)))
+        return not self.should_stop()
+
+    def run(self):
+        """중지 요청까지 다음 사이클 시각이 가장 이른 계정부터 실행"""
+        order = itertools.count()
+        now = time.monotonic()
+        heap = [(now, next(order), key) for key in self.loops]
+        heapq.heapify(heap)
+        paused: Dict[str, bool] = {key: False for key in self.loops}
+
+        try:
+            while heap and not self.should_stop():
+                due, _, key = heapq.heappop(heap)
+                if not self._sleep_until(due):
+                    break
+
+                loop = self.loops[key]
+                if paused[key] and loop.scheduler.next_interval()[1] == "paused":
+                    deadline, mode = loop.next_deadline()
+                else:
+                    if paused[key]:
+                        logger.info(f"[{key}] 운영 시간 - 스크래핑 재개")
+                    result = loop.run_cycle()
+                    self._record(key, loop, result)
+                    deadline, mode = loop.next_deadline()
+
+                paused[key] = mode == "paused"
+                self._health[key]["mode"] = mode
+                self._health[key]["running"] = loop._started
+                self._next_at[key] = deadline
+                heapq.heappush(heap, (deadline, next(order), key))
+        finally:
+            for loop in self.loops.values():
+                loop.stop_backend()
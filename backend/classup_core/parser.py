@@ -0,0 +1,136 @@
+"""ClassUp 출입 기록 파서 - 모든 스크래퍼가 공유하는 유일한 파싱 단계
+
+입력은 출입 기록 테이블의 행(셀 텍스트 목록)이며, 어떤 fetch 백엔드(Playwright/HTTP)에서
+가져왔는지와 무관하게 같은 기록 형식으로 변환합니다.
+"""
+from datetime import date, datetime
+from html.parser import HTMLParser
+from typing import List, Optional
+
+import pytz
+
+KST = pytz.timezone('Asia/Seoul')
+
+# JSON 응답의 필드 이름 후보 (HTTP 백엔드가 JSON API를 조회할 때)
+JSON_FIELD_ALIASES = {
+    "name": ("name", "studentName", "student_name", "userName"),
+    "phone": ("phone", "phoneNumber", "phone_number", "mobile"),
+    "available_time": ("availableTime", "available_time", "entranceTime"),
+    "status": ("status", "statusName", "state"),
+    "record_time": ("recordTime", "record_time", "createdAt", "created_at", "time"),
+}
+
+# 브라우저에서 테이블 행을 한 번에 추출하는 스크립트 (셀마다 inner_text 왕복 방지)
+ROWS_SCRIPT = """
+rows => rows.map(row => Array.from(row.querySelectorAll('td')).map(td => (td.innerText || '').trim()))
+"""
+ROW_SELECTOR = 'table tbody tr, table tr'
+
+
+def parse_datetime(datetime_str: str, day: Optional[date] = None) -> Optional[datetime]:
+    """날짜/시간 문자열 파싱
+
+    "2025-11-30 08:00:00" 또는 "08:00:00"/"08:00" 형식을 지원합니다.
+    시각만 있으면 day(조회한 화면의 날짜, 생략 시 오늘)의 기록으로 봅니다.
+    """
+    try:
+        datetime_str = datetime_str.strip()
+        if " " in datetime_str:
+            dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
+        else:
+            fmt = "%H:%M:%S" if datetime_str.count(":") == 2 else "%H:%M"
+            time_part = datetime.strptime(datetime_str, fmt).time()
+            dt = datetime.combine(day or datetime.now(KST).date(), time_part)
+        return KST.localize(dt) if dt.tzinfo is None else dt
+    except Exception:
+        return None
+
+
+class EntranceTableParser(HTMLParser):
+    """HTML 문서의 <table> 행을 셀 텍스트 목록으로 수집"""
+
+    def __init__(self):
+        super().__init__()
+        self.rows: List[List[str]] = []
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row = []
+        elif tag == "td" and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag == "td" and self._cell is not None:
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def rows_from_html(html: str) -> List[List[str]]:
+    """HTML 테이블 행 추출"""
+    parser = EntranceTableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+def rows_from_json(data) -> List[List[str]]:
+    """JSON 응답을 테이블 행과 같은 형태로 변환"""
+    if isinstance(data, dict):
+        for key in ("data", "list", "items", "content", "records"):
+            if isinstance(data.get(key), list):
+                data = data[key]
+                break
+        else:
+            return []
+
+    rows = []
+    for item in data:
+        if isinstance(item, list):
+            rows.append([str(v) for v in item])
+        elif isinstance(item, dict):
+            rows.append([
+                str(next((item[k] for k in JSON_FIELD_ALIASES[field] if item.get(k) is not None), ""))
+                for field in ("name", "phone", "available_time", "status", "record_time")
+            ])
+    return rows
+
+
+def parse_rows(rows: List[List[str]], day: Optional[date] = None) -> List[dict]:
+    """셀 목록을 출입 기록으로 변환 (day: 시각만 있는 셀에 붙일 날짜, 생략 시 오늘)
+
+    Returns: [{"student_name", "phone_number", "available_time", "status", "record_time"(datetime)}]
+    """
+    records = []
+    for cells in rows:
+        if len(cells) < 5:
+            continue
+        name = cells[0].strip()
+        status = cells[3].strip()
+        record_time = parse_datetime(cells[4], day)
+
+        if name and status and record_time:
+            records.append({
+                "student_name": name,
+                "phone_number": cells[1].strip(),
+                "available_time": cells[2].strip(),
+                "status": status,
+                "record_time": record_time
+            })
+    return records
+
+
+def record_to_json(record: dict) -> dict:
+    """결과 파일 저장용 (record_time을 ISO 문자열로)"""
+    data = dict(record)
+    if isinstance(data.get("record_time"), datetime):
+        data["record_time"] = data["record_time"].isoformat()
+    return data
@@ -0,0 +1,249 @@
+"""스크래핑 루프 - fetch → parse → dedupe → 저장 콜백 → 대기
+
+백엔드 수명 주기(시작/주기적 재시작/세션 갱신/운영 시간 외 정지)와 시간표 기반 대기를
+한 곳에서 처리합니다. 저장 방식(결과 파일/DB)은 on_records 콜백으로 주입합니다.
+"""
+import logging
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+
+from .backends.base import FetchError, SessionExpired
+from .dedupe import RecordDeduper
+from .parser import parse_rows
+from .schedule import AdaptiveScheduler
+
+logger = logging.getLogger(__name__)
+
+# 브라우저 프로세스 트리 RSS가 이 값(MB)을 넘으면 재활용 (0이면 사용 안 함)
+BROWSER_MAX_RSS_MB = int(os.getenv("CLASSUP_BROWSER_MAX_RSS_MB", "600"))
+# RSS 측정 간격 (사이클 수) - /proc 전체를 훑으므로 매 사이클 측정하지 않음
+RSS_CHECK_EVERY = int(os.getenv("CLASSUP_BROWSER_RSS_CHECK_EVERY", "10"))
+
+
+class RestartPolicy:
+    """백엔드 재활용 조건
+
+    every_cycles: 고정 주기 재활용 간격 (None이면 백엔드 기본값, 0이면 사용 안 함)
+    max_rss_mb: 백엔드 프로세스 트리 RSS 상한 (MB, 0이면 사용 안 함)
+    rss_check_every: RSS 측정 간격 (사이클 수)
+    max_consecutive_failures: 연속 실패가 이 횟수에 도달하면 재활용
+    """
+
+    def __init__(self, every_cycles: Optional[int] = None, max_consecutive_failures: int = 20,
+                 max_rss_mb: int = BROWSER_MAX_RSS_MB, rss_check_every: int = RSS_CHECK_EVERY):
+        self.every_cycles = every_cycles
+        self.max_consecutive_failures = max_consecutive_failures
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_every = max(rss_check_every, 1)
+
+    def interval_for(self, backend) -> int:
+        return backend.restart_every if self.every_cycles is None else self.every_cycles
+
+
+class ScrapeLoop:
+    """fetch 백엔드 하나를 돌리는 공용 스크래핑 루프
+
+    on_records(records, new_records) -> int
+        records는 이번 사이클에 파싱된 전체 기록, new_records는 중복 제거 후 새 기록입니다.
+        저장한 새 기록 수를 반환합니다. 예외가 나면 새 기록을 처리 완료로 표시하지 않아
+        다음 사이클에 다시 전달됩니다.
+    before_restart()
+        백엔드 재시작/세션 갱신 직전 호출 (예: DB에서 세션 파일 재적재)
+    on_cycle(result)
+        사이클 결과 통지 (상태 파일/로그/지표)
+    """
+
+    def __init__(self, backend, on_records: Callable[[List[dict], List[dict]], int],
+                 scheduler: AdaptiveScheduler = None, deduper: RecordDeduper = None,
+                 restart_policy: RestartPolicy = None, should_stop: Callable[[], bool] = None,
+                 before_restart: Callable[[], None] = None, on_cycle: Callable[[dict], None] = None,
+                 stop_on_session_expired: bool = False):
+        self.backend = backend
+        self.on_records = on_records
+        self.scheduler = scheduler or AdaptiveScheduler()
+        self.deduper = deduper if deduper is not None else RecordDeduper()
+        self.restart_policy = restart_policy or RestartPolicy()
+        self.should_stop = should_stop or (lambda: False)
+        self.before_restart = before_restart
+        self.on_cycle = on_cycle
+        self.stop_on_session_expired = stop_on_session_expired
+
+        self.cycle_count = 0
+        self.consecutive_failures = 0
+        self.session_expired = False
+        self.last_rss_kb: Optional[int] = None
+        self._started = False
+        self._cycle_ended_at: Optional[float] = None
+        self._recycled_at: Optional[float] = None
+
+    # ==================== 백엔드 수명 주기 ====================
+
+    def start_backend(self) -> bool:
+        if self.before_restart:
+            self.before_restart()
+        self._started = self.backend.start()
+        return self._started
+
+    def stop_backend(self):
+        if self._started:
+            self.backend.stop()
+            self._started = False
+
+    def restart_backend(self) -> bool:
+        self.stop_backend()
+        return self.start_backend()
+
+    def recycle_backend(self, reason: str) -> bool:
+        """대기 인스턴스를 준비한 뒤 교체 (실패하면 재시작)"""
+        logger.info(f"백엔드 재활용: {reason}")
+        self._recycled_at = time.perf_counter()
+        if self.before_restart:
+            self.before_restart()
+        if self.backend.recycle():
+            self._started = True
+            return True
+        logger.warning("대기 인스턴스 교체 실패 - 백엔드 재시작")
+        return self.restart_backend()
+
+    def _refresh_session(self) -> bool:
+        if self.before_restart:
+            self.before_restart()
+        self._started = self.backend.refresh_session()
+        return self._started
+
+    # ==================== 사이클 ====================
+
+    def _fetch(self) -> List[List[str]]:
+        try:
+            return self.backend.fetch_rows()
+        except SessionExpired:
+            logger.warning("세션 만료 감지 - 세션 갱신 시도")
+            if not self._refresh_session():
+                raise
+            return self.backend.fetch_rows()
+
+    def run_cycle(self) -> dict:
+        """한 사이클 수행
+
+        Returns: {"success", "records", "new", "error", "session_expired", "elapsed_ms", "metrics", "cycle"}
+        """
+        if not self._started and not self.start_backend():
+            self.consecutive_failures += 1
+            return {"success": False, "records": [], "new": 0, "error": "백엔드 시작 실패",
+                    "session_expired": False, "elapsed_ms": 0, "metrics": None, "cycle": self.cycle_count}
+
+        self.cycle_count += 1
+        started = time.perf_counter()
+        result = {"success": False, "records": [], "new": 0, "error": None,
+                  "session_expired": False, "cycle": self.cycle_count}
+
+        try:
+            records = parse_rows(self._fetch())
+            new_records = self.deduper.new_records(records)
+            saved = self.on_records(records, new_records)
+            self.deduper.mark_seen(new_records)
+
+            result.update(success=True, records=records, new=saved or 0)
+            self.consecutive_failures = 0
+            self.session_expired = False
+
+            if self._recycled_at is not None:
+                logger.info(f"재활용 후 첫 스크래핑까지 {(time.perf_counter() - self._recycled_at) * 1000:.0f}ms")
+                self._recycled_at = None
+
+        except SessionExpired as e:
+            result.update(error=str(e) or "세션 만료", session_expired=True)
+            self.session_expired = True
+            self.consecutive_failures += 1
+
+        except FetchError as e:
+            result["error"] = str(e)
+            self.consecutive_failures += 1
+
+        except Exception as e:
+            logger.error(f"사이클 처리 오류: {e}")
+            result["error"] = str(e)
+            self.consecutive_failures += 1
+
+        result["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+        result["metrics"] = self.backend.last_metrics
+        result["rss_kb"] = self.last_rss_kb
+
+        # 첫 사이클은 기존 기록 전체가 새 기록이므로 활동으로 보지 않음
+        self.scheduler.record_activity(self.cycle_count > 1 and result["new"] > 0)
+
+        if self.on_cycle:
+            self.on_cycle(result)
+
+        self._cycle_ended_at = time.monotonic()
+        self._maybe_restart()
+        return result
+
+    def _maybe_restart(self):
+        """재활용 조건 확인 - 다음 사이클 전 대기 시간 동안 대기 인스턴스를 준비해 교체"""
+        policy = self.restart_policy
+        every = policy.interval_for(self.backend)
+
+        if self.consecutive_failures >= policy.max_consecutive_failures:
+            logger.warning(f"연속 실패 {self.consecutive_failures}회")
+            self.recycle_backend("연속 실패")
+            self.consecutive_failures = 0
+            return
+        if every and self.cycle_count % every == 0:
+            self.recycle_backend(f"{self.cycle_count}회 스크래핑 완료")
+            return
+
+        if policy.max_rss_mb and self.cycle_count % policy.rss_check_every == 0:
+            self.last_rss_kb = self.backend.memory_rss_kb()
+            if self.last_rss_kb is not None and self.last_rss_kb >= policy.max_rss_mb * 1024:
+                self.recycle_backend(f"브라우저 RSS {self.last_rss_kb / 1024:.0f}MB ≥ {policy.max_rss_mb}MB")
+
+    # ==================== 대기 ====================
+
+    def next_deadline(self) -> Tuple[float, str]:
+        """다음 사이클 시각 (time.monotonic 기준)과 스케줄 모드 - 운영 시간 외면 백엔드를 내림
+
+        직전 사이클 종료 시각 기준이므로 재활용 준비에 쓴 시간은 대기 시간에서 빠집니다.
+        여러 루프를 한 스레드에서 번갈아 돌리는 MultiAccountLoop도 이 값으로 순서를 정합니다.
+        """
+        interval, mode = self.scheduler.next_interval()
+        if mode == "paused" and self._started:
+            logger.info("운영 시간 외 - 백엔드 정지 후 대기")
+            self.stop_backend()
+
+        base = self._cycle_ended_at if self._cycle_ended_at is not None else time.monotonic()
+        self._cycle_ended_at = None
+        return base + interval, mode
+
+    def wait(self) -> bool:
+        """다음 사이클까지 대기 (운영 시간 외에는 백엔드를 내리고 대기)
+
+        Returns: 계속 실행해야 하면 True, 중지 요청이면 False
+        """
+        while not self.should_stop():
+            deadline, mode = self.next_deadline()
+            while time.monotonic() < deadline:
+                if self.should_stop():
+                    return False
+                time.sleep(min(1.0, max(deadline - time.monotonic(), 0)))
+
+            if mode != "paused":
+                return True
+            if self.scheduler.next_interval()[1] != "paused":
+                logger.info("운영 시간 - 스크래핑 재개")
+                return True
+        return False
+
+    def run(self):
+        """중지 요청 또는 (stop_on_session_expired일 때) 세션 만료까지 반복"""
+        try:
+            while not self.should_stop():
+                result = self.run_cycle()
+                if result["session_expired"] and self.stop_on_session_expired:
+                    logger.error("세션 만료 - 루프 종료")
+                    break
+                if not self.wait():
+                    break
+        finally:
+            self.stop_backend()
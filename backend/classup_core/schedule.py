@@ -0,0 +1,107 @@
+"""시간표 기반 적응형 스크래핑 스케줄러
+
+등원(08:00 전후), 교시 시작/종료, 식사 후 복귀 시각 근처에는 빠르게(약 1초),
+교시 중간에는 느리게, 운영 시간(05:00-23:59) 밖에서는 일시 정지합니다.
+새 기록이 감지되면 일정 시간 동안 빠른 주기로 전환합니다.
+교시/경계는 컴파일된 Timetable(timetable.py)에서 조회하며, 주지 않으면 기본 시간표를 씁니다.
+
+프로필은 CLASSUP_SCRAPE_PROFILE 환경변수(JSON)로 덮어쓸 수 있습니다.
+예: {"fast": 1, "normal": 5, "slow": 15, "window_minutes": 5, "arrival": ["07:40", "08:30"]}
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta, time as time_type
+from typing import Optional, Tuple
+
+import pytz
+
+from .timetable import Timetable, default_timetable
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+DEFAULT_PROFILE = {
+    "fast": 1,                    # 등원/교시 경계/식사 복귀 근처 (초)
+    "normal": 5,                  # 쉬는시간/식사시간 (초)
+    "slow": 15,                   # 교시 중간, 운영 시간 중 비수업 시간 (초)
+    "window_minutes": 5,          # 교시 경계 전후 빠른 주기 구간 (분)
+    "arrival": ["07:40", "08:30"],  # 등원 집중 구간
+    "open": "05:00",              # 입퇴실 가능 시간 (available_time)
+    "close": "23:59",
+    "activity_boost_seconds": 60,  # 새 기록 감지 후 빠른 주기 유지 시간
+    "max_pause_seconds": 300,     # 운영 시간 외 한 번에 대기할 최대 시간
+}
+
+
+def _parse_hhmm(value: str) -> time_type:
+    hour, minute = value.split(":")
+    return time_type(int(hour), int(minute))
+
+
+def load_profile() -> dict:
+    """기본 프로필 + CLASSUP_SCRAPE_PROFILE 덮어쓰기"""
+    profile = dict(DEFAULT_PROFILE)
+    raw = os.getenv("CLASSUP_SCRAPE_PROFILE")
+    if raw:
+        try:
+            profile.update(json.loads(raw))
+        except ValueError:
+            logger.warning(f"CLASSUP_SCRAPE_PROFILE 파싱 실패 - 기본 프로필 사용: {raw}")
+    return profile
+
+
+class AdaptiveScheduler:
+    """시간표와 관측된 활동량으로 다음 스크래핑까지의 대기 시간 결정"""
+
+    def __init__(self, profile: dict = None, timetable: Timetable = None):
+        self.profile = profile or load_profile()
+        self.timetable = timetable or default_timetable()
+
+        self.open_time = _parse_hhmm(self.profile["open"])
+        self.close_time = _parse_hhmm(self.profile["close"])
+        self.arrival = tuple(_parse_hhmm(t) for t in self.profile["arrival"])
+        # 교시 시작/종료, 쉬는시간/식사시간 경계 = 입퇴장이 몰리는 시각 (식사 후 복귀는 3교시/6교시 시작)
+        self.window = timedelta(minutes=self.profile["window_minutes"])
+        self._boost_until: Optional[datetime] = None
+
+    def record_activity(self, changed: bool, now: datetime = None):
+        """사이클 결과 반영 - 새 기록이 있으면 빠른 주기 유지"""
+        if changed:
+            now = now or datetime.now(KST)
+            self._boost_until = now + timedelta(seconds=self.profile["activity_boost_seconds"])
+
+    def _near_boundary(self, now: datetime) -> bool:
+        distance = self.timetable.nearest_boundary_minutes(now)
+        return distance is not None and timedelta(minutes=distance) <= self.window
+
+    def _seconds_until_open(self, now: datetime) -> float:
+        open_at = now.replace(hour=self.open_time.hour, minute=self.open_time.minute, second=0, microsecond=0)
+        if open_at <= now:
+            open_at += timedelta(days=1)
+        return (open_at - now).total_seconds()
+
+    def next_interval(self, now: datetime = None) -> Tuple[float, str]:
+        """(대기 초, 모드) 반환. 모드: fast / normal / slow / paused"""
+        now = now or datetime.now(KST)
+        current = now.time()
+
+        if not (self.open_time <= current <= self.close_time):
+            wait = min(self._seconds_until_open(now), self.profile["max_pause_seconds"])
+            return max(wait, 1), "paused"
+
+        if self._boost_until and now < self._boost_until:
+            return self.profile["fast"], "fast"
+
+        if self.arrival[0] <= current <= self.arrival[1] or self._near_boundary(now):
+            return self.profile["fast"], "fast"
+
+        if self.timetable.period_at(current):
+            return self.profile["slow"], "slow"
+
+        # 쉬는시간/식사시간: 외출/복귀가 이어지므로 보통 주기
+        if self.timetable.opening <= current <= self.timetable.closing:
+            return self.profile["normal"], "normal"
+
+        return self.profile["slow"], "slow"
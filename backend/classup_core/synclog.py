@@ -0,0 +1,107 @@
+"""동기화 사이클 집계 (롤업)
+
+매 사이클마다 classup_sync_logs에 한 행씩 커밋하면 5초 간격 기준 하루 ~17,000행이 쌓입니다.
+새 기록이 있거나 오류가 난 사이클만 개별 로그로 남기고, 모든 사이클은 분(또는 시간) 단위
+롤업(사이클 수/유휴·오류 수/소요 시간 최소·평균·최대)으로 메모리에서 모아 구간이 끝날 때 한 번 저장합니다.
+DB에 의존하지 않으므로 메인 서버와 독립 워커가 각자의 모델로 저장합니다.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+# 롤업 구간 길이 (초) - 60이면 분 단위, 3600이면 시간 단위
+ROLLUP_SECONDS = int(os.getenv("CLASSUP_SYNC_ROLLUP_SECONDS", "60"))
+
+
+def bucket_start(value: datetime, bucket_seconds: int = ROLLUP_SECONDS) -> datetime:
+    """구간 시작 시각 (value와 같은 tz)"""
+    offset = int(value.timestamp()) % bucket_seconds
+    return value.replace(microsecond=0) - timedelta(seconds=offset)
+
+
+def should_log_cycle(new_records: int, error: Optional[str]) -> bool:
+    """개별 로그로 남길 사이클인지 (새 기록 또는 오류)"""
+    return bool(new_records) or bool(error)
+
+
+class SyncRollup:
+    """현재 구간의 사이클 집계
+
+    add()는 구간이 바뀌면 끝난 구간의 집계(dict)를 반환하고, 호출 측은 그것을 저장합니다.
+    """
+
+    def __init__(self, bucket_seconds: int = ROLLUP_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self._current: Optional[dict] = None
+
+    def add(self, sync_time: datetime, records_fetched: int = 0, new_records: int = 0,
+            error: Optional[str] = None, duration_ms: Optional[int] = None) -> Optional[dict]:
+        """사이클 한 번 집계. Returns: 끝난 구간 집계 (없으면 None)"""
+        start = bucket_start(sync_time, self.bucket_seconds)
+        closed = None
+        if self._current and self._current["bucket_start"] != start:
+            closed = self._current
+            self._current = None
+        if self._current is None:
+            self._current = {
+                "bucket_start": start,
+                "bucket_seconds": self.bucket_seconds,
+                "cycles": 0,
+                "idle_cycles": 0,
+                "error_count": 0,
+                "records_fetched": 0,
+                "new_records": 0,
+                "duration_count": 0,
+                "duration_total_ms": 0,
+                "duration_min_ms": None,
+                "duration_max_ms": None,
+                "last_sync_time": None,
+                "last_error": None,
+            }
+
+        bucket = self._current
+        bucket["cycles"] += 1
+        bucket["records_fetched"] = max(bucket["records_fetched"], records_fetched or 0)
+        bucket["new_records"] += new_records or 0
+        bucket["last_sync_time"] = sync_time
+        if error:
+            bucket["error_count"] += 1
+            bucket["last_error"] = str(error)[:500]
+        elif not new_records:
+            bucket["idle_cycles"] += 1
+        if duration_ms is not None:
+            bucket["duration_count"] += 1
+            bucket["duration_total_ms"] += duration_ms
+            bucket["duration_min_ms"] = duration_ms if bucket["duration_min_ms"] is None else min(bucket["duration_min_ms"], duration_ms)
+            bucket["duration_max_ms"] = duration_ms if bucket["duration_max_ms"] is None else max(bucket["duration_max_ms"], duration_ms)
+        return closed
+
+    def flush(self) -> Optional[dict]:
+        """진행 중인 구간 집계를 꺼냄 (종료 시)"""
+        closed, self._current = self._current, None
+        return closed
+
+
+def merge_into(row, bucket: dict):
+    """롤업 모델 행에 구간 집계 합치기 (재시작으로 같은 구간이 두 번 저장되는 경우 대비)
+
+    row는 새로 만든 행이어도 되고(필드가 None/0), 이미 저장된 같은 구간 행이어도 됩니다.
+    """
+    row.bucket_start = bucket["bucket_start"]
+    row.bucket_seconds = bucket["bucket_seconds"]
+    for field in ("cycles", "idle_cycles", "error_count", "new_records", "duration_count", "duration_total_ms"):
+        setattr(row, field, (getattr(row, field) or 0) + bucket[field])
+    row.records_fetched = max(row.records_fetched or 0, bucket["records_fetched"])
+
+    if bucket["duration_min_ms"] is not None:
+        row.duration_min_ms = bucket["duration_min_ms"] if row.duration_min_ms is None else min(row.duration_min_ms, bucket["duration_min_ms"])
+        row.duration_max_ms = bucket["duration_max_ms"] if row.duration_max_ms is None else max(row.duration_max_ms, bucket["duration_max_ms"])
+    if row.last_sync_time is None or _wall_clock(bucket["last_sync_time"]) >= _wall_clock(row.last_sync_time):
+        row.last_sync_time = bucket["last_sync_time"]
+    if bucket["last_error"]:
+        row.last_error = bucket["last_error"]
+
+
+def _wall_clock(value: datetime) -> datetime:
+    """DB에서 naive로 읽힌 KST 시각과 비교할 수 있도록 tz 제거"""
+    return value.replace(tzinfo=None)
@@ -0,0 +1,234 @@
+"""컴파일된 학원 시간표 (교시/쉬는시간/식사시간)
+
+시간표 슬롯 목록을 정렬된 경계 배열로 컴파일해 bisect로 조회합니다 (슬롯 수 n에 대해 O(log n)).
+백엔드(main.py, ClassUp 처리), 디스코드 봇, 종소리 스케줄러, 스크래핑 스케줄러가 같은 시간표를 씁니다.
+DB에 의존하지 않으며, DB에 저장된 시간표는 backend/timetable 패키지가 읽어 여기로 넘깁니다.
+
+조회는 분 단위입니다(초는 버림). 종료 시각도 포함하므로 "10:00" 종료 교시는 10:00:59까지 해당됩니다.
+
+슬롯 형식: {"kind": "period" | "break" | "lunch" | "dinner", "period": 교시 번호(교시만),
+           "name": 표시 이름, "start": "HH:MM", "end": "HH:MM"}
+"""
+from bisect import bisect_right
+from datetime import datetime, time as time_type
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+PERIOD = "period"
+WINDOW_KINDS = ("break", "lunch", "dinner")
+SLOT_KINDS = (PERIOD,) + WINDOW_KINDS
+
+# 기본 시간표 (DB가 비어 있으면 이 값으로 채움)
+DEFAULT_SLOTS = [
+    {"kind": "period", "period": 1, "name": "1교시", "start": "08:00", "end": "10:00"},
+    {"kind": "break", "period": None, "name": "1교시 쉬는시간", "start": "10:00", "end": "10:20"},
+    {"kind": "period", "period": 2, "name": "2교시", "start": "10:20", "end": "12:00"},
+    {"kind": "lunch", "period": None, "name": "점심시간", "start": "12:00", "end": "13:00"},
+    {"kind": "period", "period": 3, "name": "3교시", "start": "13:00", "end": "15:00"},
+    {"kind": "break", "period": None, "name": "3교시 쉬는시간", "start": "15:00", "end": "15:20"},
+    {"kind": "period", "period": 4, "name": "4교시", "start": "15:20", "end": "16:40"},
+    {"kind": "break", "period": None, "name": "4교시 쉬는시간", "start": "16:40", "end": "16:50"},
+    {"kind": "period", "period": 5, "name": "5교시", "start": "16:50", "end": "18:00"},
+    {"kind": "dinner", "period": None, "name": "저녁시간", "start": "18:00", "end": "19:00"},
+    {"kind": "period", "period": 6, "name": "6교시", "start": "19:00", "end": "20:20"},
+    {"kind": "break", "period": None, "name": "6교시 쉬는시간", "start": "20:20", "end": "20:30"},
+    {"kind": "period", "period": 7, "name": "7교시", "start": "20:30", "end": "22:00"},
+]
+
+TimeLike = Union[time_type, datetime, str]
+
+
+class Slot(NamedTuple):
+    kind: str
+    period: Optional[int]
+    name: str
+    start: time_type
+    end: time_type
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "period": self.period,
+            "name": self.name,
+            "start": self.start.strftime("%H:%M"),
+            "end": self.end.strftime("%H:%M"),
+        }
+
+
+def parse_hhmm(value: str) -> time_type:
+    hour, minute = value.strip().split(":")[:2]
+    return time_type(int(hour), int(minute))
+
+
+def _minute(value: TimeLike) -> int:
+    """time/datetime/"HH:MM" → 자정 기준 분"""
+    if isinstance(value, str):
+        value = parse_hhmm(value)
+    elif isinstance(value, datetime):
+        value = value.time()
+    return value.hour * 60 + value.minute
+
+
+def _time_of(minute: int) -> time_type:
+    return time_type(minute // 60, minute % 60)
+
+
+def _slot_from_dict(raw: dict) -> Slot:
+    kind = raw.get("kind")
+    if kind not in SLOT_KINDS:
+        raise ValueError(f"알 수 없는 시간표 구분: {kind}")
+    start = raw["start"] if isinstance(raw["start"], time_type) else parse_hhmm(raw["start"])
+    end = raw["end"] if isinstance(raw["end"], time_type) else parse_hhmm(raw["end"])
+    if end <= start:
+        raise ValueError(f"시간표 종료 시각이 시작 시각보다 빠름: {raw}")
+    period = raw.get("period")
+    if kind == PERIOD and not period:
+        raise ValueError(f"교시 번호 없음: {raw}")
+    if kind != PERIOD:
+        period = None
+    name = raw.get("name") or (f"{period}교시" if kind == PERIOD else kind)
+    return Slot(kind, int(period) if period else None, name, start, end)
+
+
+class _Intervals:
+    """겹치지 않는 구간 목록 - 시작 분 배열에서 bisect로 포함 구간 조회"""
+
+    def __init__(self, slots: List[Slot]):
+        self.slots = sorted(slots, key=lambda s: s.start)
+        self.starts = [_minute(s.start) for s in self.slots]
+        self.ends = [_minute(s.end) for s in self.slots]
+        for i in range(1, len(self.slots)):
+            # 경계 분 공유(앞 구간 종료 = 뒤 구간 시작)는 허용, 그 이상 겹치면 거부
+            if self.starts[i] < self.ends[i - 1]:
+                raise ValueError(f"시간표 구간 겹침: {self.slots[i - 1].name} / {self.slots[i].name}")
+
+    def at(self, minute: int) -> Optional[Slot]:
+        i = bisect_right(self.starts, minute) - 1
+        if i >= 0 and minute <= self.ends[i]:
+            return self.slots[i]
+        return None
+
+    def next_after(self, minute: int) -> Optional[Slot]:
+        i = bisect_right(self.starts, minute)
+        return self.slots[i] if i < len(self.slots) else None
+
+
+class Timetable:
+    """시간표 슬롯을 컴파일한 조회 객체 (생성 후 변경하지 않음)
+
+    교시끼리, 쉬는시간/식사시간끼리는 겹칠 수 없으며 위반 시 ValueError.
+    """
+
+    def __init__(self, slots: Iterable[dict], version=None):
+        parsed = [_slot_from_dict(raw) for raw in slots]
+        periods = [s for s in parsed if s.kind == PERIOD]
+        if not periods:
+            raise ValueError("교시가 하나도 없는 시간표")
+        numbers = [s.period for s in periods]
+        if len(set(numbers)) != len(numbers):
+            raise ValueError(f"교시 번호 중복: {sorted(numbers)}")
+
+        self.version = version
+        self.slots: Tuple[Slot, ...] = tuple(sorted(parsed, key=lambda s: (s.start, s.end)))
+        self._periods = _Intervals(periods)
+        self._windows = _Intervals([s for s in parsed if s.kind in WINDOW_KINDS])
+        self._by_number: Dict[int, Slot] = {s.period: s for s in periods}
+
+        # 경계 분 → 이벤트 이름 (시작/종료, 등원/하원)
+        events: Dict[int, List[str]] = {}
+        first, last = self._periods.slots[0], self._periods.slots[-1]
+        events.setdefault(_minute(first.start), []).append("등원 시작")
+        for slot in self._periods.slots:
+            events.setdefault(_minute(slot.start), []).append(f"{slot.name} 시작")
+            ending = f"{slot.name} 종료" + (" (하원)" if slot is last else "")
+            events.setdefault(_minute(slot.end), []).append(ending)
+        for slot in self._windows.slots:
+            events.setdefault(_minute(slot.start), [])
+            events.setdefault(_minute(slot.end), [])
+        self._boundary_minutes = sorted(events)
+        self._boundary_events = [events[m] for m in self._boundary_minutes]
+
+        self.opening: time_type = first.start
+        self.closing: time_type = last.end
+
+    def __repr__(self):
+        return f"<Timetable version={self.version!r} slots={len(self.slots)}>"
+
+    # --- 교시 ---
+    @property
+    def period_numbers(self) -> List[int]:
+        return [s.period for s in self._periods.slots]
+
+    def period_slots(self) -> List[Slot]:
+        """교시 슬롯 (시작 시각 순)"""
+        return list(self._periods.slots)
+
+    def period_at(self, at: TimeLike) -> Optional[Slot]:
+        """해당 시각이 속한 교시 슬롯"""
+        return self._periods.at(_minute(at))
+
+    def current_period(self, at: TimeLike) -> Optional[int]:
+        """해당 시각의 교시 번호 (교시 시간이 아니면 None)"""
+        slot = self._periods.at(_minute(at))
+        return slot.period if slot else None
+
+    def period_range(self, period: int) -> Optional[Tuple[time_type, time_type]]:
+        """교시 번호 → (시작, 종료)"""
+        slot = self._by_number.get(period)
+        return (slot.start, slot.end) if slot else None
+
+    def period_hhmm(self, period: int) -> Optional[Tuple[str, str]]:
+        """교시 번호 → ("HH:MM", "HH:MM")"""
+        span = self.period_range(period)
+        return (span[0].strftime("%H:%M"), span[1].strftime("%H:%M")) if span else None
+
+    def period_ranges(self) -> Dict[int, Tuple[str, str]]:
+        """{교시 번호: ("HH:MM", "HH:MM")} - 기존 PERIOD_SCHEDULE 형식"""
+        return {s.period: self.period_hhmm(s.period) for s in self._periods.slots}
+
+    def next_period(self, at: TimeLike) -> Optional[Slot]:
+        """해당 시각 이후(같은 분 제외)에 시작하는 첫 교시"""
+        return self._periods.next_after(_minute(at))
+
+    # --- 쉬는시간/식사시간 ---
+    def window_at(self, at: TimeLike, kind: str = None) -> Optional[Slot]:
+        """해당 시각이 속한 쉬는시간/식사시간 슬롯 (kind를 주면 그 구분만)"""
+        slot = self._windows.at(_minute(at))
+        if slot and kind and slot.kind != kind:
+            return None
+        return slot
+
+    def windows(self, kind: str) -> List[Slot]:
+        return [s for s in self._windows.slots if s.kind == kind]
+
+    # --- 경계 ---
+    def next_boundary(self, at: TimeLike) -> Optional[Tuple[time_type, List[str]]]:
+        """해당 시각 이후(같은 분 제외) 첫 경계 시각과 이벤트 이름 (없으면 None)"""
+        i = bisect_right(self._boundary_minutes, _minute(at))
+        if i >= len(self._boundary_minutes):
+            return None
+        return _time_of(self._boundary_minutes[i]), list(self._boundary_events[i])
+
+    def nearest_boundary_minutes(self, at: TimeLike) -> Optional[int]:
+        """가장 가까운 경계까지의 거리 (분)"""
+        minute = _minute(at)
+        i = bisect_right(self._boundary_minutes, minute)
+        candidates = self._boundary_minutes[max(i - 1, 0):i + 1]
+        return min((abs(minute - m) for m in candidates), default=None)
+
+    def boundaries(self) -> List[time_type]:
+        return [_time_of(m) for m in self._boundary_minutes]
+
+    def bell_events(self) -> List[Tuple[str, str]]:
+        """[("HH:MM", "이벤트 / 이벤트"), ...] - 종을 울릴 교시 시작/종료 시각"""
+        return [
+            (_time_of(m).strftime("%H:%M"), " / ".join(names))
+            for m, names in zip(self._boundary_minutes, self._boundary_events)
+            if names
+        ]
+
+    def to_dicts(self) -> List[dict]:
+        return [s.to_dict() for s in self.slots]
+
+
+def default_timetable() -> Timetable:
+    return Timetable(DEFAULT_SLOTS, version="default")
@@ -1,7 +1,15 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 import os
+import pytz
+
+from db_pool import apply_sqlite_profile, engine_options, register_engine
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 # Database URL from environment variable (PostgreSQL for Railway)
 # Falls back to SQLite for local development
@@ -13,7 +21,8 @@ if DATABASE_URL:
     if DATABASE_URL.startswith("postgres://"):
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-    engine = create_engine(DATABASE_URL)
+    # 풀 크기/오버플로/재활용/pre-ping/문장 타임아웃은 DB_POOL_* 환경변수 (db_pool.py)
+    engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 else:
     # Local development with SQLite
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -21,8 +30,12 @@ else:
     SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
     engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+        SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL)
     )
+    # WAL/synchronous=NORMAL/busy_timeout 등 (백엔드와 봇이 같은 파일에 동시에 쓰므로)
+    apply_sqlite_profile(engine)
+
+register_engine("main", engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -34,3 +47,77 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ==================== Async (async def 엔드포인트용) ====================
+# async def 엔드포인트에서 동기 Session을 쓰면 쿼리마다 이벤트 루프 전체가 멈추므로 AsyncSession 사용
+# 드라이버: PostgreSQL은 asyncpg, SQLite는 aiosqlite (첫 사용 시 엔진 생성 - 드라이버가 없으면 그때 ImportError)
+
+def _async_url(url: str) -> str:
+    """동기 URL → async 드라이버 URL (asyncpg는 sslmode 대신 ssl 파라미터)"""
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        url = "postgresql+asyncpg://" + url.split("://", 1)[1]
+        return url.replace("sslmode=", "ssl=")
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL or SQLALCHEMY_DATABASE_URL)
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+def naive_kst(value: Optional[datetime] = None) -> datetime:
+    """DB에 바인딩할 시각 → tzinfo 없는 KST (value가 없으면 현재 시각)
+
+    asyncpg는 tz-aware datetime을 timestamp without time zone 컬럼에 바인딩하지 못하므로
+    (psycopg2는 세션 타임존으로 변환해 받아 줌) async 세션으로 쓰거나 비교하는 값은 모두 이 함수를 거칩니다.
+    tz-aware 값은 KST로 바꾼 뒤 tzinfo를 떼고, naive 값은 이미 KST 벽시계 시각으로 보고 그대로 둡니다.
+    """
+    if value is None:
+        return datetime.now(KST).replace(tzinfo=None)
+    if value.tzinfo is not None:
+        return value.astimezone(KST).replace(tzinfo=None)
+    return value
+
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+        apply_sqlite_profile(_async_engine)
+        register_engine("async", _async_engine)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    """SessionLocal의 async 버전 (expire_on_commit=False - 커밋 후 속성 접근 시 추가 I/O 없음)"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory()
+
+
+async def get_async_db() -> AsyncIterator["AsyncSession"]:
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def dispose_async_engine():
+    """종료 시 async 연결 풀 정리"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
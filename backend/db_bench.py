@@ -0,0 +1,299 @@
+"""DB 벤치마크 - 동기 Session vs AsyncSession 혼합 부하, SQLite 동시 쓰기
+
+async def 엔드포인트에서 동기 Session으로 쿼리하면 그동안 이벤트 루프가 멈춰 다른 요청(가벼운 요청 포함)이 함께 늦어집니다.
+세 가지 방식으로 측정합니다 (backend 디렉토리에서, async 비교는 DATABASE_URL 환경변수로 대상 DB 지정):
+
+    # 프로세스 내부: 일일 리포트 집계를 동시에 N개 실행하면서 이벤트 루프 지연(heartbeat)을 측정
+    python db_bench.py loop --concurrency 20 --rounds 5
+
+    # 실행 중인 서버: 무거운 요청(/reports/daily)과 가벼운 요청(/)을 섞어 보내고 가벼운 요청 지연을 측정
+    # 변경 전/후 빌드를 각각 띄워 같은 옵션으로 실행해 비교
+    python db_bench.py http --url http://localhost:8000 --concurrency 20 --seconds 15
+
+    # SQLite 동시 쓰기: 여러 프로세스(백엔드/봇/워커 역할)가 입장 처리 트랜잭션을 동시에 실행
+    # 기본 설정(rollback journal)과 성능 프로필(WAL 등, db_pool.py)을 같은 조건의 임시 파일에서 비교
+    python db_bench.py sqlite-writers --writers 4 --transactions 500 --readers 2
+
+출력: 모드별 총 소요 시간, 이벤트 루프 지연/가벼운 요청 지연 p50/p95/최대 (ms),
+      SQLite는 초당 트랜잭션, 트랜잭션 지연, "database is locked" 실패 수
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime
+
+from classup_core.bench import percentile
+
+HEARTBEAT_MS = 5
+
+
+def _latency_summary(values: list) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "max_ms": round(max(values), 1) if values else 0.0,
+        "mean_ms": round(statistics.mean(values), 1) if values else 0.0,
+    }
+
+
+async def _heartbeat(samples: list, stop: asyncio.Event):
+    """HEARTBEAT_MS마다 깨어나 예정보다 늦은 만큼을 루프 지연으로 기록"""
+    interval = HEARTBEAT_MS / 1000
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max((time.perf_counter() - started - interval) * 1000, 0.0))
+
+
+def _sync_report(db, today: date) -> dict:
+    """변경 전 /reports/daily와 같은 동기 쿼리 (행 전체 로드 후 파이썬에서 집계)"""
+    import models
+
+    counts = {}
+    for record in db.query(models.AttendanceRecord).filter(models.AttendanceRecord.date == today).all():
+        counts[record.status] = counts.get(record.status, 0) + 1
+    return {
+        "total_students": db.query(models.Student).filter(models.Student.status == "재원").count(),
+        "attendance": counts,
+        "patrol_count": len(db.query(models.Patrol).filter(models.Patrol.patrol_date == today).all()),
+        "penalties": len(db.query(models.Penalty).filter(models.Penalty.date == today).all()),
+    }
+
+
+async def bench_loop(concurrency: int, rounds: int) -> dict:
+    from database import AsyncSessionLocal, SessionLocal, dispose_async_engine
+    from routers.discord_alerts import _daily_report_stats
+
+    today = date.today()
+
+    async def sync_task():
+        db = SessionLocal()
+        try:
+            _sync_report(db, today)
+        finally:
+            db.close()
+
+    async def async_task():
+        db = AsyncSessionLocal()
+        try:
+            await _daily_report_stats(db, today)
+        finally:
+            await db.close()
+
+    results = {}
+    for name, task in (("sync_session", sync_task), ("async_session", async_task)):
+        lags, stop = [], asyncio.Event()
+        beat = asyncio.create_task(_heartbeat(lags, stop))
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(task() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await beat
+        results[name] = {
+            "queries": concurrency * rounds,
+            "elapsed_s": round(elapsed, 2),
+            "loop_lag": _latency_summary(lags),
+        }
+    await dispose_async_engine()
+    return results
+
+
+async def bench_http(url: str, concurrency: int, seconds: float, heavy_path: str, light_path: str) -> dict:
+    import httpx
+
+    heavy, light = [], []
+    deadline = time.perf_counter() + seconds
+
+    async def worker(client, path: str, samples: list):
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            samples.append((time.perf_counter() - started) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        await asyncio.gather(
+            *(worker(client, heavy_path, heavy) for _ in range(concurrency)),
+            *(worker(client, light_path, light) for _ in range(2)),
+        )
+    return {
+        "heavy": {"path": heavy_path, **_latency_summary(heavy), "rps": round(len(heavy) / seconds, 1)},
+        "light": {"path": light_path, **_latency_summary(light), "rps": round(len(light) / seconds, 1)},
+    }
+
+
+# ==================== SQLite 동시 쓰기 ====================
+
+BENCH_STUDENTS = 200
+
+
+def _sqlite_engine(path: str, profile: bool):
+    from sqlalchemy import create_engine
+    from db_pool import apply_sqlite_profile, engine_options
+
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_profile(engine, enabled=profile)
+    return engine
+
+
+def _prepare_sqlite(path: str, profile: bool):
+    """임시 DB에 학생/출석/ClassUp 출입 테이블 생성 + 학생 채우기"""
+    import models
+    from classup.models import ClassUpAttendance
+    from database import Base
+
+    engine = _sqlite_engine(path, profile)
+    tables = [models.Student.__table__, models.AttendanceRecord.__table__, ClassUpAttendance.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(models.Student.__table__.insert(), [
+            {"id": i, "name": f"학생{i}", "seat_number": str(i), "status": "재원"}
+            for i in range(1, BENCH_STUDENTS + 1)
+        ])
+    engine.dispose()
+
+
+def _sqlite_writer(path: str, profile: bool, worker_id: int, transactions: int) -> dict:
+    """입장 처리와 같은 쓰기: ClassUp 출입 기록 저장 + 학생 일일 출석 생성/갱신을 한 트랜잭션으로"""
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+    import models
+    from classup.models import ClassUpAttendance
+
+    engine = _sqlite_engine(path, profile)
+    Session = sessionmaker(bind=engine, autoflush=True)
+    latencies, locked = [], 0
+    for i in range(transactions):
+        student_id = (worker_id * transactions + i) % BENCH_STUDENTS + 1
+        now = datetime.now()
+        started = time.perf_counter()
+        db = Session()
+        try:
+            db.add(ClassUpAttendance(
+                student_name=f"학생{student_id}", status="입장", record_time=now, local_student_id=student_id,
+            ))
+            record = db.query(models.AttendanceRecord).filter(
+                models.AttendanceRecord.student_id == student_id,
+                models.AttendanceRecord.date == now.date(),
+                models.AttendanceRecord.period.is_(None),
+            ).first()
+            if record:
+                record.status = "자습중"
+                record.check_in_time = now.time()
+            else:
+                db.add(models.AttendanceRecord(
+                    student_id=student_id, date=now.date(), status="자습중", check_in_time=now.time(),
+                ))
+            db.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            db.rollback()
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            locked += 1
+        finally:
+            db.close()
+    engine.dispose()
+    return {"latencies": latencies, "locked": locked}
+
+
+def _sqlite_reader(path: str, profile: bool, queries: int) -> dict:
+    """대시보드/봇 조회와 같은 읽기 (오늘 출입/출석 집계)"""
+    from sqlalchemy import func
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+    import models
+    from classup.models import ClassUpAttendance
+
+    engine = _sqlite_engine(path, profile)
+    Session = sessionmaker(bind=engine)
+    latencies, locked = [], 0
+    for _ in range(queries):
+        started = time.perf_counter()
+        db = Session()
+        try:
+            db.query(func.count(ClassUpAttendance.id)).scalar()
+            db.query(models.AttendanceRecord.status, func.count()).group_by(models.AttendanceRecord.status).all()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError:
+            locked += 1
+        finally:
+            db.close()
+    engine.dispose()
+    return {"latencies": latencies, "locked": locked}
+
+
+def _run_job(job):
+    kind, args = job
+    return kind, (_sqlite_writer if kind == "writer" else _sqlite_reader)(*args)
+
+
+def bench_sqlite_writers(writers: int, transactions: int, readers: int) -> dict:
+    results = {}
+    for name, profile in (("default", False), ("profile", True)):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "bench.db")
+            _prepare_sqlite(path, profile)
+            jobs = [("writer", (path, profile, i, transactions)) for i in range(writers)]
+            jobs += [("reader", (path, profile, transactions)) for _ in range(readers)]
+
+            started = time.perf_counter()
+            with multiprocessing.get_context("spawn").Pool(len(jobs)) as pool:
+                outputs = pool.map(_run_job, jobs)
+            elapsed = time.perf_counter() - started
+
+        write_latencies = [ms for kind, out in outputs if kind == "writer" for ms in out["latencies"]]
+        read_latencies = [ms for kind, out in outputs if kind == "reader" for ms in out["latencies"]]
+        results[name] = {
+            "elapsed_s": round(elapsed, 2),
+            "commits": len(write_latencies),
+            "commits_per_s": round(len(write_latencies) / elapsed, 1) if elapsed else 0.0,
+            "write_locked": sum(out["locked"] for kind, out in outputs if kind == "writer"),
+            "write": _latency_summary(write_latencies),
+            "read_locked": sum(out["locked"] for kind, out in outputs if kind == "reader"),
+            "read": _latency_summary(read_latencies),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 벤치마크 (async 혼합 부하 / SQLite 동시 쓰기)")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    loop_parser = sub.add_parser("loop", help="프로세스 내부 이벤트 루프 지연 측정")
+    loop_parser.add_argument("--concurrency", type=int, default=20)
+    loop_parser.add_argument("--rounds", type=int, default=5)
+
+    http_parser = sub.add_parser("http", help="실행 중인 서버에 혼합 부하")
+    http_parser.add_argument("--url", default="http://localhost:8000")
+    http_parser.add_argument("--concurrency", type=int, default=20)
+    http_parser.add_argument("--seconds", type=float, default=15)
+    http_parser.add_argument("--heavy", default="/reports/daily")
+    http_parser.add_argument("--light", default="/")
+
+    sqlite_parser = sub.add_parser("sqlite-writers", help="SQLite 기본 설정 vs 성능 프로필 동시 쓰기")
+    sqlite_parser.add_argument("--writers", type=int, default=4)
+    sqlite_parser.add_argument("--transactions", type=int, default=500, help="쓰기 프로세스당 트랜잭션 수")
+    sqlite_parser.add_argument("--readers", type=int, default=2)
+
+    args = parser.parse_args()
+    if args.mode == "loop":
+        result = asyncio.run(bench_loop(args.concurrency, args.rounds))
+    elif args.mode == "sqlite-writers":
+        result = bench_sqlite_writers(args.writers, args.transactions, args.readers)
+    else:
+        result = asyncio.run(bench_http(args.url, args.concurrency, args.seconds, args.heavy, args.light))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
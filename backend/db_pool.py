@@ -0,0 +1,243 @@
+"""DB 연결 풀 설정/계측 (메인 서버, 디스코드 봇, classup-worker 공용)
+
+같은 Railway PostgreSQL에 여러 프로세스가 붙으므로 풀 크기/오버플로/재활용/pre-ping과
+문장별 타임아웃을 환경변수로 맞추고, 풀 고갈(체크아웃 대기)을 관리자 API에서 볼 수 있게 합니다.
+
+    DB_POOL_SIZE=5                 # 상시 유지 연결 수
+    DB_MAX_OVERFLOW=10             # 풀이 찼을 때 추가로 여는 연결 수
+    DB_POOL_TIMEOUT=30             # 연결을 기다리는 최대 시간 (초, 넘으면 TimeoutError)
+    DB_POOL_RECYCLE=1800           # 이 시간(초)보다 오래된 연결은 재연결 (-1=사용 안 함)
+    DB_POOL_PRE_PING=true          # 체크아웃 시 연결 확인 (끊긴 연결 자동 교체)
+    DB_STATEMENT_TIMEOUT_MS=60000  # PostgreSQL 문장별 타임아웃 (0=사용 안 함)
+
+SQLite(로컬 개발/단일 서버)는 풀 크기/타임아웃 설정 대신 연결마다 성능 프로필 PRAGMA를 적용합니다.
+백엔드/디스코드 봇이 같은 파일에 쓰므로 기본 저널(rollback journal)이면 입장 몰림 때 "database is locked"가 납니다.
+
+    SQLITE_PROFILE=true            # false면 PRAGMA를 적용하지 않음 (기존 동작)
+    SQLITE_JOURNAL_MODE=WAL        # 읽기와 쓰기가 서로 막지 않음 (쓰기끼리는 여전히 하나씩)
+    SQLITE_SYNCHRONOUS=NORMAL      # WAL에서는 NORMAL로도 손상 없음 (전원 차단 시 마지막 커밋만 유실 가능)
+    SQLITE_BUSY_TIMEOUT_MS=5000    # 잠금이 풀릴 때까지 기다리는 시간
+    SQLITE_MMAP_SIZE=268435456     # 메모리 맵 읽기 (바이트)
+    SQLITE_CACHE_SIZE=-65536       # 페이지 캐시 (음수 = KiB)
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("true", "1", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "60000"))
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "true").lower() in ("true", "1", "yes")
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+
+# 대기 시간 분포 계산에 쓰는 최근 체크아웃 수
+WAIT_SAMPLES = 1000
+
+_ENGINES: Dict[str, object] = {}
+
+
+class PoolMetrics:
+    """체크아웃 대기 시간/타임아웃 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self._waits.append(wait_ms)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts, timeouts = self.checkouts, self.timeouts
+            total, peak = self.wait_total_ms, self.wait_max_ms
+
+        def pct(p: float) -> float:
+            return round(waits[min(int(p / 100 * len(waits)), len(waits) - 1)], 2) if waits else 0.0
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_avg_ms": round(total / checkouts, 2) if checkouts else 0.0,
+            "wait_p50_ms": pct(50),
+            "wait_p95_ms": pct(95),
+            "wait_max_ms": round(peak, 2),
+        }
+
+
+class _WaitTimed:
+    """체크아웃(_do_get) 소요 시간 = 풀에서 연결을 기다린 시간 (새 연결 생성 포함)"""
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        # recreate()(dispose/무효화 후)로 새 풀이 만들어지면 집계도 새로 시작
+        if "_metrics" not in self.__dict__:
+            self.__dict__["_metrics"] = PoolMetrics()
+        return self.__dict__["_metrics"]
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(0.0, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - started) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimed, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimed, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine / create_async_engine 키워드 인자 (URL 종류에 맞춰)"""
+    poolclass = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+    if url.startswith("sqlite"):
+        options = {"poolclass": poolclass, "pool_pre_ping": DB_POOL_PRE_PING}
+        if not is_async:
+            options["connect_args"] = {"check_same_thread": False}
+        return options
+
+    options = {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if DB_STATEMENT_TIMEOUT_MS > 0 and url.startswith("postgresql"):
+        if is_async:
+            # asyncpg: 연결 시 서버 설정으로 전달
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def register_engine(name: str, engine) -> None:
+    """풀 지표 API에 노출할 엔진 등록 (AsyncEngine이면 sync_engine의 풀을 봄)"""
+    _ENGINES[name] = engine
+
+
+def pool_status(engine) -> dict:
+    pool = getattr(engine, "sync_engine", engine).pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # overflow(): 음수면 아직 열지 않은 기본 연결 수, 양수면 초과로 연 연결 수
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+    metrics: Optional[PoolMetrics] = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.to_dict())
+    return status
+
+
+def pool_metrics() -> dict:
+    """등록된 엔진별 풀 상태 {이름: {...}}"""
+    return {
+        "settings": {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout_s": DB_POOL_TIMEOUT,
+            "pool_recycle_s": DB_POOL_RECYCLE,
+            "pre_ping": DB_POOL_PRE_PING,
+            "statement_timeout_ms": DB_STATEMENT_TIMEOUT_MS,
+            "sqlite_profile": dict(sqlite_pragmas()) if SQLITE_PROFILE else None,
+        },
+        "engines": {name: pool_status(engine) for name, engine in _ENGINES.items()},
+    }
+
+
+# ==================== SQLite 성능 프로필 ====================
+
+def sqlite_pragmas() -> List[Tuple[str, object]]:
+    """연결마다 적용할 PRAGMA 목록 (busy_timeout을 먼저 - WAL 전환도 잠금을 기다리게)"""
+    return [
+        ("busy_timeout", SQLITE_BUSY_TIMEOUT_MS),
+        ("journal_mode", SQLITE_JOURNAL_MODE),
+        ("synchronous", SQLITE_SYNCHRONOUS),
+        ("mmap_size", SQLITE_MMAP_SIZE),
+        ("cache_size", SQLITE_CACHE_SIZE),
+    ]
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def apply_sqlite_profile(engine, enabled: bool = SQLITE_PROFILE) -> bool:
+    """SQLite 엔진이면 새 연결마다 프로필 PRAGMA 적용 (AsyncEngine은 sync_engine에 등록). 적용 여부 반환"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not enabled or sync_engine.dialect.name != "sqlite":
+        return False
+    event.listen(sync_engine, "connect", _apply_pragmas)
+    return True
+
+
+def sqlite_maintenance(engine, mode: str = "PASSIVE", analyze: bool = False) -> Optional[dict]:
+    """WAL 체크포인트(+ ANALYZE). SQLite가 아니면 None
+
+    PASSIVE는 진행 중인 읽기/쓰기를 기다리지 않고 가능한 만큼만 옮기고,
+    TRUNCATE는 모두 옮긴 뒤 WAL 파일을 0으로 줄입니다 (한가한 새벽에 사용).
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return None
+
+    started = time.perf_counter()
+    with sync_engine.connect() as conn:
+        busy, wal_pages, checkpointed = conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one()
+        if analyze:
+            conn.exec_driver_sql("ANALYZE")
+            conn.exec_driver_sql("PRAGMA optimize")
+            conn.commit()
+    return {
+        "mode": mode,
+        "busy": bool(busy),
+        "wal_pages": wal_pages,
+        "checkpointed_pages": checkpointed,
+        "analyzed": analyze,
+        "duration_ms": int((time.perf_counter() - started) * 1000),
+    }
@@ -3,13 +3,14 @@
 """
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func
 from datetime import datetime, date
 from typing import List
 import json
 
 from . import kiosk_models, kiosk_schemas
-from database import SessionLocal
+from database import SessionLocal, get_async_db, naive_kst
 
 router = APIRouter(prefix="/api/kiosk", tags=["Kiosk"])
 
@@ -26,7 +27,7 @@ def get_db():
 async def receive_attendance_webhook(
     payload: kiosk_schemas.WebhookPayload,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     키오스크 출석 웹훅 수신
@@ -45,7 +46,8 @@ async def receive_attendance_webhook(
         )
         db.add(webhook_log)
 
-        # 출석 데이터 저장
+        # 출석 데이터 저장 (asyncpg - 시각은 tz 없는 KST로)
+        received_at = naive_kst()
         attendance_record = kiosk_models.KioskAttendance(
             kiosk_id=payload.id,
             student_id=payload.data.studentId,
@@ -53,16 +55,15 @@ async def receive_attendance_webhook(
             attendance_type=payload.data.type or "attendance",
             fingerprint_hash=payload.data.fingerprint[:50] if payload.data.fingerprint else None,  # 보안상 일부만
             device_id=payload.data.deviceId,
-            timestamp=datetime.fromisoformat(payload.timestamp.replace('Z', '+00:00')) if payload.timestamp else datetime.now(),
-            received_at=datetime.now(),
+            timestamp=naive_kst(datetime.fromisoformat(payload.timestamp.replace('Z', '+00:00'))) if payload.timestamp else received_at,
+            received_at=received_at,
             raw_data=payload.dict(),
             synced="received",
             source=payload.source
         )
 
         db.add(attendance_record)
-        db.commit()
-        db.refresh(attendance_record)
+        await db.commit()
 
         print(f"✅ 출석 데이터 수신: {payload.data.studentName} ({payload.data.type})")
 
@@ -70,10 +71,12 @@ async def receive_attendance_webhook(
             success=True,
             message="출석 데이터 수신 완료",
             id=attendance_record.id,
-            received_at=datetime.now().isoformat()
+            received_at=received_at.isoformat()
         )
 
     except Exception as e:
+        await db.rollback()
+
         # 에러 로그 저장
         error_log = kiosk_models.KioskWebhookLog(
             method=request.method,
@@ -85,7 +88,7 @@ async def receive_attendance_webhook(
             error_message=str(e)
         )
         db.add(error_log)
-        db.commit()
+        await db.commit()
 
         print(f"❌ 출석 데이터 수신 실패: {str(e)}")
 
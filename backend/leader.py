@@ -0,0 +1,258 @@
+"""백그라운드 작업 리더 선출 (uvicorn 워커/레플리카 중 한 프로세스만 스케줄러·루프 실행)
+
+API는 모든 프로세스가 처리하지만 APScheduler 예약 작업, 순찰 모니터, 알림 dispatcher,
+ClassUp 동기화/알림 루프는 리더 한 곳에서만 돌아야 중복 전환/중복 Discord 알림/Chromium 중복 실행이 없습니다.
+
+- PostgreSQL: 전용 연결에서 pg_try_advisory_lock (세션 잠금 → 프로세스가 죽어 연결이 끊기면 자동 해제)
+- SQLite(로컬 개발): 잠금 파일 flock (Windows는 msvcrt.locking, 프로세스 종료 시 OS가 해제)
+
+리더가 아닌 프로세스는 LEADER_RETRY_SECONDS마다 잠금을 다시 시도하므로 리더가 죽으면 그 안에 넘겨받습니다.
+리더는 같은 간격으로 잠금 연결을 확인하고, 끊겼으면 즉시 백그라운드 작업을 멈추고 다시 후보가 됩니다.
+"""
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Optional, Union
+
+from database import DATABASE_URL
+
+try:
+    import psycopg2
+    import psycopg2.extensions
+except ImportError:
+    psycopg2 = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+# false면 선출 없이 항상 리더 (단일 프로세스 배포)
+LEADER_ELECTION = os.getenv("LEADER_ELECTION", "true").lower() in ("true", "1", "yes")
+# advisory lock 키 (같은 DB를 쓰는 다른 앱과 겹치지 않게)
+LEADER_LOCK_KEY = int(os.getenv("LEADER_LOCK_KEY", "720451"))
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "10"))
+LEADER_LOCK_FILE = os.getenv(
+    "LEADER_LOCK_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "leader.lock")
+)
+
+Callback = Callable[[], Union[None, Awaitable[None]]]
+
+
+class AdvisoryLock:
+    """PostgreSQL 세션 advisory lock (전용 autocommit 연결 유지)"""
+
+    def __init__(self, dsn: str, key: int = LEADER_LOCK_KEY):
+        self.dsn = dsn.replace("postgresql+psycopg2://", "postgresql://", 1)
+        self.key = key
+        self._conn = None
+
+    def acquire(self) -> bool:
+        if self._conn is None:
+            self._conn = psycopg2.connect(self.dsn, application_name="leader-election")
+            self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (self.key,))
+                return bool(cur.fetchone()[0])
+        except Exception:
+            self.release()
+            raise
+
+    def alive(self) -> bool:
+        """잠금 연결이 살아 있는지 (끊겼으면 서버가 이미 잠금을 풀었음)"""
+        if self._conn is None or self._conn.closed:
+            return False
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def release(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+class FileLock:
+    """잠금 파일 배타 잠금 (같은 호스트의 프로세스끼리만 유효)"""
+
+    def __init__(self, path: str = LEADER_LOCK_FILE):
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        handle = open(self.path, "a+")
+        try:
+            if fcntl:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{socket.gethostname()}:{os.getpid()}\n")
+        handle.flush()
+        self._file = handle
+        return True
+
+    def alive(self) -> bool:
+        return self._file is not None and not self._file.closed
+
+    def release(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+
+class LeaderElector:
+    """잠금을 잡은 프로세스만 on_elected 실행, 잃으면 on_demoted 실행"""
+
+    def __init__(self, lock=None, retry_seconds: float = LEADER_RETRY_SECONDS, enabled: bool = LEADER_ELECTION):
+        self.enabled = enabled
+        self.lock = lock or self._default_lock()
+        self.retry_seconds = retry_seconds
+        self.is_leader = False
+        self.elections = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _default_lock():
+        if DATABASE_URL and DATABASE_URL.startswith("postgres"):
+            if psycopg2 is None:
+                logger.warning("psycopg2 없음 - advisory lock 대신 잠금 파일로 리더 선출 (같은 호스트에서만 유효)")
+                return FileLock()
+            return AdvisoryLock(DATABASE_URL)
+        return FileLock()
+
+    @property
+    def backend(self) -> str:
+        if not self.enabled:
+            return "disabled"
+        return "advisory_lock" if isinstance(self.lock, AdvisoryLock) else "lock_file"
+
+    async def _call(self, callback: Optional[Callback]):
+        if callback is None:
+            return
+        result = callback()
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def _safe_call(self, callback: Optional[Callback], name: str) -> bool:
+        """콜백 실행 - 예외는 로그만 남기고 False (선출 루프가 죽지 않게)"""
+        try:
+            await self._call(callback)
+            return True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"리더 {name} 콜백 실패")
+            return False
+
+    async def _demote(self, on_demoted: Optional[Callback]):
+        """백그라운드 작업 중지 후 잠금 해제 (다시 후보로)"""
+        self.is_leader = False
+        await self._safe_call(on_demoted, "on_demoted")
+        self.lock.release()
+
+    async def _try_acquire(self) -> bool:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self.lock.acquire)
+        except Exception as e:
+            logger.warning(f"리더 잠금 시도 실패: {e}")
+            return False
+
+    async def run(self, on_elected: Callback, on_demoted: Optional[Callback] = None):
+        """선출 루프 - 취소될 때까지 잠금 시도/유지 확인 반복"""
+        if not self.enabled:
+            # 선출 없이 항상 리더 - 시작이 실패하면 retry_seconds 뒤 다시 시작
+            while True:
+                self.is_leader = True
+                self.elections += 1
+                if await self._safe_call(on_elected, "on_elected"):
+                    return
+                self.is_leader = False
+                await self._safe_call(on_demoted, "on_demoted")
+                await asyncio.sleep(self.retry_seconds)
+
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                if not self.is_leader:
+                    if await self._try_acquire():
+                        self.is_leader = True
+                        self.elections += 1
+                        logger.info(f"리더로 선출됨 ({self.backend}, pid={os.getpid()}) - 백그라운드 작업 시작")
+                        if not await self._safe_call(on_elected, "on_elected"):
+                            logger.error("백그라운드 작업 시작 실패 - 리더 자격 반납 후 재선출 대기")
+                            await self._demote(on_demoted)
+                elif not await loop.run_in_executor(None, self.lock.alive):
+                    logger.error("리더 잠금 연결 끊김 - 백그라운드 작업 중지 후 재선출 대기")
+                    await self._demote(on_demoted)
+                await asyncio.sleep(self.retry_seconds)
+        finally:
+            if self.is_leader:
+                self.is_leader = False
+                await self._safe_call(on_demoted, "on_demoted")
+            self.lock.release()
+
+    def start(self, on_elected: Callback, on_demoted: Optional[Callback] = None) -> asyncio.Task:
+        """현재 이벤트 루프에서 선출 태스크 시작 (FastAPI startup)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(on_elected, on_demoted))
+        return self._task
+
+    async def stop(self):
+        """선출 태스크 취소 - 리더였으면 on_demoted 실행 후 잠금 해제"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "is_leader": self.is_leader,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "elections": self.elections,
+            "retry_seconds": self.retry_seconds,
+        }
+
+
+_elector: Optional[LeaderElector] = None
+
+
+def get_elector() -> LeaderElector:
+    global _elector
+    if _elector is None:
+        _elector = LeaderElector()
+    return _elector
+
+
+def is_leader() -> bool:
+    return _elector is not None and _elector.is_leader
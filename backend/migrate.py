@@ -0,0 +1,63 @@
+"""스키마 부트스트랩 (테이블 생성 + 추가 컬럼 + 기본 시간표 등록)
+
+예전에는 main.py import 시점에 실행되어 uvicorn 워커마다, 그리고 main을 import하는 스크립트(db_bench 등)마다
+DB 왕복을 수십 번 한 뒤에야 앱이 뜰 수 있었습니다. 이제는 배포 시 한 번 명시적으로 실행합니다.
+
+    python migrate.py          # 배포 시작 명령에서 uvicorn 전에 실행 (Dockerfile)
+
+로컬 개발은 AUTO_MIGRATE=true(기본값)면 서버 시작(startup) 때 같은 작업을 실행합니다.
+모든 단계가 checkfirst/존재 확인이라 여러 번 실행해도 안전합니다.
+"""
+import time
+
+import models
+from database import engine, SessionLocal
+
+from kiosk import kiosk_models
+from classup.models import ClassUpAttendance, ClassUpDailySummary, ClassUpSyncLog, ClassUpSyncRollup, ensure_added_columns
+from ai_chat.models import ChatSession, ChatMessage, DailyUsage
+from notifications import NotificationOutbox
+from timetable import TimetableSlot, seed_default_slots
+from transitions import TransitionRun
+
+
+def migrate(bind=engine) -> float:
+    """테이블/컬럼 생성 + 기본 시간표 등록. 소요 시간(초) 반환"""
+    started = time.perf_counter()
+
+    models.Base.metadata.create_all(bind=bind)
+    kiosk_models.Base.metadata.create_all(bind=bind)  # 키오스크 테이블 생성
+
+    # ClassUp 테이블 생성
+    ClassUpAttendance.__table__.create(bind=bind, checkfirst=True)
+    ClassUpSyncLog.__table__.create(bind=bind, checkfirst=True)
+    ClassUpSyncRollup.__table__.create(bind=bind, checkfirst=True)
+    ClassUpDailySummary.__table__.create(bind=bind, checkfirst=True)
+    ensure_added_columns(bind)
+    ensure_added_columns(bind, models.ADDED_COLUMNS)
+
+    # 알림 아웃박스 테이블 생성
+    NotificationOutbox.__table__.create(bind=bind, checkfirst=True)
+
+    # AI Chat 테이블 생성
+    ChatSession.__table__.create(bind=bind, checkfirst=True)
+    ChatMessage.__table__.create(bind=bind, checkfirst=True)
+    DailyUsage.__table__.create(bind=bind, checkfirst=True)
+
+    # 상태 전환 실행 기록 테이블 생성
+    TransitionRun.__table__.create(bind=bind, checkfirst=True)
+
+    # 시간표 테이블 생성 (비어 있으면 기본 시간표 등록)
+    TimetableSlot.__table__.create(bind=bind, checkfirst=True)
+    db = SessionLocal(bind=bind)
+    try:
+        seed_default_slots(db)
+    finally:
+        db.close()
+
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    elapsed = migrate()
+    print(f"[마이그레이션] 완료: 테이블/컬럼/기본 시간표 ({elapsed:.2f}초)")
@@ -136,6 +136,8 @@ class Outing(Base):
 
     status = Column(String, default="승인")
 
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     
 
     student = relationship("Student", back_populates="outings")
@@ -186,6 +188,8 @@ class RecurringOuting(Base):
 
     is_active = Column(Integer, default=1)
 
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     
 
     student = relationship("Student", back_populates="recurring_outings")
@@ -326,6 +330,8 @@ class AttendanceRecord(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    carried_forward = Column(Boolean, default=False)  # 교시 시작 시 이전 교시에서 이월된 행 (감독자가 저장하면 False)
+
     
 
     student = relationship("Student", back_populates="attendance_records")
@@ -416,6 +422,7 @@ class DiamondCounseling(Base):
 
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # 페어 상담 (자동 생성된 다른 선생님 상담 - 1↔3, 2↔4 쌍)
     paired_counseling_id = Column(Integer, ForeignKey("diamond_counselings.id"), nullable=True)
@@ -444,6 +451,7 @@ class CounselingSession(Base):
     completed_at = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     diamond_counseling = relationship("DiamondCounseling", back_populates="sessions")
@@ -607,3 +615,16 @@ class ClassUpSession(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+
+
+# 기존 테이블에 나중에 추가된 컬럼 (create_all은 이미 있는 테이블을 바꾸지 않음)
+ADDED_COLUMNS = {
+    "attendance_records": [
+        ("carried_forward", "BOOLEAN DEFAULT FALSE"),
+    ],
+    # 타임라인 캐시 변경 확인용 (timetable.service._schedule_signature)
+    "outings": [("updated_at", "TIMESTAMP")],
+    "recurring_outings": [("updated_at", "TIMESTAMP")],
+    "diamond_counselings": [("updated_at", "TIMESTAMP")],
+    "counseling_sessions": [("updated_at", "TIMESTAMP")],
+}
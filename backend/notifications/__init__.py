@@ -0,0 +1,9 @@
+# 알림 아웃박스 모듈 (Discord 웹훅 전송 큐)
+from .models import NotificationOutbox
+from .outbox import build_embed, enqueue_notification, enqueue_notification_async
+from .dispatcher import NotificationDispatcher, get_dispatcher
+
+__all__ = [
+    'NotificationOutbox', 'build_embed', 'enqueue_notification', 'enqueue_notification_async', 'NotificationDispatcher',
+    'get_dispatcher',
+]
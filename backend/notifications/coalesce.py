@@ -0,0 +1,51 @@
+"""알림 묶음 단계 - 같은 웹훅으로 가는 알림을 embed 최대 10개의 메시지로 합침
+
+Discord 웹훅 메시지 한 건은 embed 10개, embed 텍스트 합계 6000자까지 허용됩니다.
+"""
+from collections import OrderedDict
+from typing import Iterable, List
+
+# Discord 웹훅 메시지당 제한
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+def embed_size(embed: dict) -> int:
+    """Discord가 합계 제한에 포함하는 embed 텍스트 길이"""
+    size = len(embed.get("title") or "") + len(embed.get("description") or "")
+    for field in embed.get("fields") or []:
+        size += len(str(field.get("name") or "")) + len(str(field.get("value") or ""))
+    footer = embed.get("footer") or {}
+    author = embed.get("author") or {}
+    return size + len(footer.get("text") or "") + len(author.get("name") or "")
+
+
+def coalesce(due: Iterable, waiting: Iterable = ()) -> List[list]:
+    """전송할 알림 묶음 목록
+
+    due: 전송 시각이 된 알림 (긴급 우선 순서), waiting: 아직 묶음 창이 안 끝난 같은 웹훅 알림
+    웹훅별로 due 다음 waiting 순서로 채우며, due가 하나도 없는 묶음은 보내지 않습니다.
+    """
+    by_webhook: "OrderedDict[str, list]" = OrderedDict()
+    due_ids = set()
+    for item in due:
+        by_webhook.setdefault(item.webhook_url, []).append(item)
+        due_ids.add(item.id)
+    for item in waiting:
+        if item.webhook_url in by_webhook and item.id not in due_ids:
+            by_webhook[item.webhook_url].append(item)
+
+    groups = []
+    for items in by_webhook.values():
+        group, chars = [], 0
+        for item in items:
+            size = embed_size(item.embed or {})
+            if group and (len(group) >= MAX_EMBEDS_PER_MESSAGE or chars + size > MAX_EMBED_CHARS_PER_MESSAGE):
+                groups.append(group)
+                group, chars = [], 0
+            group.append(item)
+            chars += size
+        if group:
+            groups.append(group)
+
+    return [group for group in groups if any(item.id in due_ids for item in group)]
@@ -0,0 +1,287 @@
+"""알림 dispatcher - 아웃박스의 대기 알림을 Discord 웹훅으로 전송
+
+하나의 keep-alive httpx 클라이언트를 재사용하고, 웹훅별 레이트 리밋 버킷
+(X-RateLimit-Remaining / X-RateLimit-Reset-After, 429 retry_after)을 지킵니다.
+같은 웹훅으로 가는 알림은 묶음 창(NOTIFY_COALESCE_WINDOW_SECONDS) 동안 모아 embed 최대 10개의
+한 메시지로 보내고, 긴급 알림은 창 없이 즉시 보냅니다.
+일시 오류(429/5xx/타임아웃)는 지수 백오프로 재시도하고, 4xx 등 영구 오류는 failed로 남깁니다.
+아웃박스 조회/커밋은 동기 세션이므로 asyncio.to_thread로 실행해 이벤트 루프(API 요청 처리)를 막지 않습니다.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+import pytz
+
+from database import SessionLocal
+from .coalesce import coalesce
+from .models import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 한 번에 가져올 대기 알림 수
+BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", "50"))
+# 최대 전송 시도 횟수 (넘으면 failed)
+MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "8"))
+# 재시도 백오프 상한 (초)
+MAX_BACKOFF_SECONDS = 300
+# 새 알림이 없을 때 아웃박스 확인 간격 (초) - 호출 측 트랜잭션으로 저장된 알림 대비
+IDLE_POLL_SECONDS = 2.0
+
+
+class WebhookBucket:
+    """웹훅별 레이트 리밋 상태"""
+
+    def __init__(self):
+        self.blocked_until = 0.0  # time.monotonic() 기준
+
+    def wait_seconds(self) -> float:
+        return max(self.blocked_until - time.monotonic(), 0.0)
+
+    def update(self, response: httpx.Response):
+        """응답 헤더로 남은 요청 수/리셋 시간 반영"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            try:
+                if int(remaining) <= 0:
+                    self.block(float(reset_after))
+            except ValueError:
+                pass
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def retry_after_seconds(response: httpx.Response) -> float:
+    """429 응답의 대기 시간 (본문 retry_after 우선, 없으면 Retry-After 헤더)"""
+    try:
+        return float(response.json().get("retry_after"))
+    except Exception:
+        pass
+    try:
+        return float(response.headers.get("Retry-After", "1"))
+    except ValueError:
+        return 1.0
+
+
+def backoff_seconds(attempts: int) -> float:
+    return min(2 ** attempts, MAX_BACKOFF_SECONDS) + random.uniform(0, 1)
+
+
+class NotificationDispatcher:
+    """아웃박스 전송 백그라운드 태스크"""
+
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self.buckets: Dict[str, WebhookBucket] = {}
+        self.global_blocked_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._running = False
+        self.sent_count = 0
+        self.messages_sent = 0
+        self.failed_count = 0
+
+    # ==================== 수명 주기 ====================
+
+    def start(self):
+        """현재 이벤트 루프에서 dispatcher 태스크 시작 (FastAPI startup)"""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info("알림 dispatcher 시작")
+
+    def stop(self):
+        self._running = False
+        self.wake()
+
+    def wake(self):
+        """새 알림 저장 시 호출 - 다른 스레드(스케줄러 등)에서도 안전"""
+        if not self._loop or not self._wake:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        return {
+            "running": self._running,
+            "sent": self.sent_count,
+            "messages": self.messages_sent,
+            "failed": self.failed_count,
+            "blocked_webhooks": sum(1 for b in self.buckets.values() if b.blocked_until > now),
+        }
+
+    # ==================== 전송 루프 ====================
+
+    async def _run(self):
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+        )
+        try:
+            while self._running:
+                try:
+                    wait = await self._dispatch_due()
+                except Exception as e:
+                    logger.error(f"알림 전송 루프 오류: {e}")
+                    wait = IDLE_POLL_SECONDS
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            await self.client.aclose()
+            self.client = None
+            logger.info("알림 dispatcher 종료")
+
+    def _bucket(self, webhook_url: str) -> WebhookBucket:
+        if webhook_url not in self.buckets:
+            self.buckets[webhook_url] = WebhookBucket()
+        return self.buckets[webhook_url]
+
+    @staticmethod
+    def _load_due(db, now: datetime):
+        """전송 시각이 된 알림 + 같은 웹훅의 묶음 창 대기 알림 (워커 스레드에서 실행)"""
+        due = db.query(NotificationOutbox).filter(
+            NotificationOutbox.status == "pending",
+            NotificationOutbox.next_attempt_at <= now
+        ).order_by(NotificationOutbox.urgent.desc(), NotificationOutbox.id.asc()).limit(BATCH_SIZE).all()
+
+        # 같은 웹훅의 대기 알림은 (창이 아직 안 끝났어도) 한 메시지로 묶어 보냄
+        waiting = []
+        webhooks = {item.webhook_url for item in due if not item.urgent}
+        if webhooks:
+            waiting = db.query(NotificationOutbox).filter(
+                NotificationOutbox.status == "pending",
+                NotificationOutbox.urgent == False,
+                NotificationOutbox.webhook_url.in_(webhooks),
+                NotificationOutbox.next_attempt_at > now
+            ).order_by(NotificationOutbox.id.asc()).limit(BATCH_SIZE).all()
+        return due, waiting
+
+    @staticmethod
+    def _next_due(db):
+        return db.query(NotificationOutbox.next_attempt_at).filter(
+            NotificationOutbox.status == "pending"
+        ).order_by(NotificationOutbox.next_attempt_at.asc()).first()
+
+    async def _dispatch_due(self) -> float:
+        """전송 시각이 된 알림 전송. Returns: 다음 확인까지 대기 초
+
+        세션은 한 번에 한 스레드에서만 쓰이고(조회/커밋은 순서대로 to_thread), 커밋 후 만료하지 않아
+        묶음 전송 중 속성 접근이 이벤트 루프에서 DB를 다시 읽지 않습니다.
+        """
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            due, waiting = await asyncio.to_thread(self._load_due, db, datetime.now(KST))
+
+            for group in coalesce(due, waiting):
+                if not self._running:
+                    break
+                await self._send(group)
+                await asyncio.to_thread(db.commit)
+
+            next_due = await asyncio.to_thread(self._next_due, db)
+        finally:
+            await asyncio.to_thread(db.close)
+
+        if len(due) >= BATCH_SIZE:
+            return 0
+        if next_due and next_due[0]:
+            next_at = next_due[0] if next_due[0].tzinfo else KST.localize(next_due[0])
+            return min(max((next_at - datetime.now(KST)).total_seconds(), 0.05), IDLE_POLL_SECONDS)
+        return IDLE_POLL_SECONDS
+
+    async def _post(self, webhook_url: str, payload: dict) -> httpx.Response:
+        """레이트 리밋 버킷을 지켜 웹훅 POST"""
+        bucket = self._bucket(webhook_url)
+        wait = max(bucket.wait_seconds(), self.global_blocked_until - time.monotonic())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        response = await self.client.post(webhook_url, json=payload)
+        bucket.update(response)
+        if response.status_code == 429:
+            retry_after = retry_after_seconds(response)
+            if response.headers.get("X-RateLimit-Global"):
+                self.global_blocked_until = time.monotonic() + retry_after
+            bucket.block(retry_after)
+        return response
+
+    async def _send(self, group: List[NotificationOutbox]):
+        """알림 묶음을 한 메시지(embed 최대 10개)로 전송하고 결과를 모두에 반영"""
+        for item in group:
+            item.attempts = (item.attempts or 0) + 1
+        attempts = max(item.attempts for item in group)
+
+        try:
+            response = await self._post(group[0].webhook_url, {"embeds": [item.embed for item in group]})
+        except httpx.HTTPError as e:
+            self._retry(group, f"{type(e).__name__}: {e}", backoff_seconds(attempts))
+            return
+
+        if response.status_code < 300:
+            sent_at = datetime.now(KST)
+            for item in group:
+                item.status = "sent"
+                item.sent_at = sent_at
+                item.last_error = None
+            self.sent_count += len(group)
+            self.messages_sent += 1
+        elif response.status_code == 429:
+            # 레이트 리밋은 시도 횟수에 포함하지 않음
+            for item in group:
+                item.attempts -= 1
+            self._retry(group, "429 rate limited", retry_after_seconds(response))
+        elif response.status_code >= 500:
+            self._retry(group, f"HTTP {response.status_code}", backoff_seconds(attempts))
+        else:
+            error = f"HTTP {response.status_code}: {response.text[:200]}"
+            for item in group:
+                item.status = "failed"
+                item.last_error = error
+            self.failed_count += len(group)
+            logger.error(f"Discord 알림 전송 실패 ({[item.id for item in group]}): {error}")
+
+    def _retry(self, group: List[NotificationOutbox], error: str, delay: float):
+        next_attempt_at = datetime.now(KST) + timedelta(seconds=delay)
+        for item in group:
+            item.last_error = error
+            if item.attempts >= MAX_ATTEMPTS:
+                item.status = "failed"
+                self.failed_count += 1
+                logger.error(f"Discord 알림 최종 실패 ({item.id}, {item.attempts}회): {error}")
+            else:
+                item.next_attempt_at = next_attempt_at
+        logger.warning(f"Discord 알림 재시도 예약 ({len(group)}건, {delay:.1f}초 후): {error}")
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = NotificationDispatcher()
+    return _dispatcher
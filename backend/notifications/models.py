@@ -0,0 +1,31 @@
+"""알림 아웃박스 데이터베이스 모델"""
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON
+from datetime import datetime
+import pytz
+
+from database import Base
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+class NotificationOutbox(Base):
+    """전송 대기 중인 Discord 웹훅 알림 (dispatcher가 전송/재시도)"""
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    webhook_url = Column(String, nullable=False)            # 전송할 웹훅 URL
+    embed = Column(JSON, nullable=False)                    # Discord embed 객체
+    category = Column(String, nullable=True)                # 알림 종류 (입장/외출/미복귀/리포트 등)
+    urgent = Column(Boolean, default=False)                 # 긴급 알림 여부
+
+    # 전송 상태
+    status = Column(String, default="pending", index=True)  # pending/sent/failed
+    attempts = Column(Integer, default=0)                   # 전송 시도 횟수
+    next_attempt_at = Column(DateTime, nullable=True, index=True)  # 다음 전송 시도 시각
+    last_error = Column(Text, nullable=True)                # 마지막 오류
+
+    created_at = Column(DateTime, default=lambda: datetime.now(KST))
+    sent_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<NotificationOutbox {self.id} {self.category} {self.status}>"
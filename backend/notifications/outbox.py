@@ -0,0 +1,91 @@
+"""알림 아웃박스 - 호출 측은 저장만 하고 전송은 dispatcher가 담당"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytz
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from .models import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 같은 웹훅 알림을 모아 한 메시지로 보내는 창 (초, 0이면 묶지 않음)
+COALESCE_WINDOW_SECONDS = float(os.getenv("NOTIFY_COALESCE_WINDOW_SECONDS", "5"))
+
+# 묶음 창 없이 즉시 보내는 알림 종류
+URGENT_CATEGORIES = {
+    v.strip() for v in os.getenv("NOTIFY_URGENT_CATEGORIES", "강제퇴장,조기퇴장,비정상외출,미복귀").split(",") if v.strip()
+}
+
+
+def build_embed(title: str, message: str, color: int = 0x5865F2, fields: list = None) -> dict:
+    """Discord embed 생성 (timestamp는 이벤트 발생 시각)"""
+    embed = {
+        "title": title,
+        "description": message,
+        "color": color,
+        "timestamp": datetime.now(KST).isoformat()
+    }
+    if fields:
+        embed["fields"] = fields
+    return embed
+
+
+def enqueue_notification(webhook_url: str, embed: dict, category: str = None,
+                         urgent: bool = False, db: Session = None) -> Optional[int]:
+    """알림을 아웃박스에 저장하고 dispatcher를 깨움
+
+    긴급 알림(urgent 또는 URGENT_CATEGORIES)은 즉시, 그 외는 묶음 창이 지난 뒤 전송됩니다.
+
+    db를 넘기면 호출 측 트랜잭션에 포함되어 호출 측 commit 시 함께 저장됩니다.
+    Returns: 아웃박스 ID (db를 넘긴 경우 flush 후 ID)
+    """
+    if not webhook_url:
+        logger.warning("Discord 웹훅 URL이 설정되지 않았습니다.")
+        return None
+
+    urgent = urgent or category in URGENT_CATEGORIES
+    now = datetime.now(KST)
+    next_attempt_at = now if urgent else now + timedelta(seconds=COALESCE_WINDOW_SECONDS)
+
+    own_session = db is None
+    session = SessionLocal() if own_session else db
+    try:
+        item = NotificationOutbox(
+            webhook_url=webhook_url,
+            embed=embed,
+            category=category,
+            urgent=urgent,
+            status="pending",
+            next_attempt_at=next_attempt_at
+        )
+        session.add(item)
+        if own_session:
+            session.commit()
+        else:
+            session.flush()
+        outbox_id = item.id
+    except Exception as e:
+        logger.error(f"알림 아웃박스 저장 실패: {e}")
+        if own_session:
+            session.rollback()
+        return None
+    finally:
+        if own_session:
+            session.close()
+
+    from .dispatcher import get_dispatcher
+    get_dispatcher().wake()
+    return outbox_id
+
+
+async def enqueue_notification_async(webhook_url: str, embed: dict, category: str = None,
+                                     urgent: bool = False) -> Optional[int]:
+    """async 함수용 enqueue_notification - 자체 세션 저장을 워커 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+    return await asyncio.to_thread(enqueue_notification, webhook_url, embed, category, urgent)
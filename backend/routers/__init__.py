@@ -0,0 +1,21 @@
+# 메인 API 라우터 모듈 (main.py에서 분리 - 도메인별 엔드포인트)
+from .system import router as system_router
+from .students import router as students_router
+from .attendance import router as attendance_router
+from .counseling import router as counseling_router
+from .student_portal import router as student_portal_router
+from .statistics import router as statistics_router
+from .ai import router as ai_router
+from .discord_alerts import router as discord_alerts_router
+from .messages import router as messages_router
+
+# 등록 순서 = 기존 main.py 정의 순서 (같은 경로 패턴의 매칭 우선순위 유지)
+ROUTERS = [
+    system_router, students_router, attendance_router, counseling_router, student_portal_router,
+    statistics_router, ai_router, discord_alerts_router, messages_router,
+]
+
+__all__ = [
+    'ROUTERS', 'ai_router', 'attendance_router', 'counseling_router', 'discord_alerts_router', 'messages_router',
+    'statistics_router', 'student_portal_router', 'students_router', 'system_router',
+]
@@ -0,0 +1,592 @@
+"""출결/자습 태도 체크/자습 감독/순찰 시작·종료/학교 출석 API"""
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date, datetime
+import models, schemas
+from database import get_db
+
+from timetable import get_timeline_index, get_timetable
+from patrol_scheduler import patrol_monitor
+
+from .deps import get_current_period, get_period_time_range, validate_period_timing
+
+router = APIRouter(tags=["출결 관리"])
+
+# ==================== 출결 관리 API ====================
+
+@router.post("/attendance-records/", response_model=schemas.AttendanceRecord)
+def create_attendance_record(
+    record: schemas.AttendanceRecordCreate,
+    db: Session = Depends(get_db)
+):
+    """異쒓껐 湲곕줉 ?앹꽦"""
+    db_record = models.AttendanceRecord(**record.dict())
+    db.add(db_record)
+    db.commit()
+    db.refresh(db_record)
+    return db_record
+
+
+@router.get("/attendance-records/today", response_model=List[schemas.AttendanceRecord])
+def get_today_attendance(db: Session = Depends(get_db)):
+    """?ㅻ뒛 異쒓껐 ?꾪솴 議고쉶"""
+    today = date.today()
+    records = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.date == today
+    ).all()
+    return records
+
+
+@router.get("/attendance-records/", response_model=List[schemas.AttendanceRecord])
+def get_attendance_records(
+    date_filter: Optional[date] = None,
+    student_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """異쒓껐 湲곕줉 議고쉶 (?좎쭨 ?먮뒗 ?숈깮蹂?"""
+    query = db.query(models.AttendanceRecord)
+    
+    if date_filter:
+        query = query.filter(models.AttendanceRecord.date == date_filter)
+    if student_id:
+        query = query.filter(models.AttendanceRecord.student_id == student_id)
+    
+    return query.all()
+
+
+@router.get("/attendance-records/student/{student_id}", response_model=List[schemas.AttendanceRecord])
+def get_student_attendance_history(student_id: int, db: Session = Depends(get_db)):
+    """학생별 출석 이력"""
+    records = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.student_id == student_id
+    ).order_by(models.AttendanceRecord.date.desc()).all()
+    return records
+
+
+@router.get("/attendance-records/period/{period}", response_model=List[schemas.AttendanceRecord])
+def get_period_attendance(period: int, db: Session = Depends(get_db)):
+    """특정 교시의 오늘 출석 현황"""
+    today = date.today()
+    records = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.date == today,
+        models.AttendanceRecord.period == period
+    ).all()
+    return records
+
+
+@router.post("/attendance-records/period/bulk")
+def bulk_update_period_attendance(
+    period: int,
+    attendance_updates: List[dict] = Body(...),
+    force: bool = Query(default=False),
+    db: Session = Depends(get_db)
+):
+    """교시별 출석 일괄 업데이트 (시간 검증 포함)"""
+
+    # 시간 검증 (force=False일 때만)
+    if not force:
+        validation = validate_period_timing(period)
+        if not validation["is_current"]:
+            # 경고 반환 (프론트에서 사용자 확인 후 force=True로 재요청)
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "type": "period_mismatch",
+                    "message": validation["warning_message"],
+                    "current_period": validation["current_period"]
+                }
+            )
+
+    today = date.today()
+
+    for update in attendance_updates:
+        student_id = update.get("student_id")
+        status = update.get("status")
+
+        existing = db.query(models.AttendanceRecord).filter(
+            models.AttendanceRecord.student_id == student_id,
+            models.AttendanceRecord.date == today,
+            models.AttendanceRecord.period == period
+        ).first()
+
+        if existing:
+            existing.status = status
+            existing.carried_forward = False
+        else:
+            new_record = models.AttendanceRecord(
+                student_id=student_id,
+                date=today,
+                period=period,
+                status=status,
+                carried_forward=False
+            )
+            db.add(new_record)
+
+    db.commit()
+    return {"message": f"{period}교시 출석이 업데이트되었습니다.", "updated_count": len(attendance_updates)}
+
+
+@router.get("/attendance-records/today/by-period")
+def get_today_attendance_by_period(db: Session = Depends(get_db)):
+    """오늘 교시별 전체 출석 현황
+
+    이전 교시 이월은 교시 시작 시 period_carry_forward 전환이 행으로 만들어 두므로 여기서는 그대로 읽기만 함
+    (아직 시작하지 않은 교시는 None)
+    """
+    today = date.today()
+    period_numbers = get_timetable(db).period_numbers
+
+    students = db.query(models.Student).filter(
+        models.Student.status == "재원"
+    ).all()
+
+    # 오늘 교시 기록 한 번에 조회 → (학생, 교시) 조회 테이블
+    records = db.query(
+        models.AttendanceRecord.student_id,
+        models.AttendanceRecord.period,
+        models.AttendanceRecord.status,
+        models.AttendanceRecord.carried_forward
+    ).filter(
+        models.AttendanceRecord.date == today,
+        models.AttendanceRecord.period.isnot(None)
+    ).order_by(models.AttendanceRecord.id).all()
+    by_key = {(r.student_id, r.period): r for r in records}
+
+    result = []
+    for student in students:
+        periods, carried = {}, []
+        for period in period_numbers:
+            record = by_key.get((student.id, period))
+            periods[period] = record.status if record else None
+            if record and record.carried_forward:
+                carried.append(period)
+
+        result.append({
+            "student_id": student.id,
+            "name": student.name,
+            "seat_number": student.seat_number,
+            "periods": periods,
+            "carried_periods": carried
+        })
+
+    return result
+
+
+@router.get("/attendance-records/check-completion/{period}")
+def check_attendance_completion(period: int, db: Session = Depends(get_db)):
+    """
+    교시별 출석 확인 완료 여부 체크
+
+    Returns:
+        {
+            "period": int,
+            "is_completed": bool,
+            "completed_at": datetime | None,
+            "total_students": int,
+            "checked_students": int,
+            "carried_students": int
+        }
+
+    이월 행(carried_forward)은 감독자가 확인한 기록이 아니므로 checked_students에서 제외
+    """
+    today = date.today()
+
+    # 재원 중인 학생 수
+    total_students = db.query(models.Student).filter(
+        models.Student.status == "재원"
+    ).count()
+
+    # 해당 교시 출석 기록 (감독자 확인 / 이월)
+    period_records = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.date == today,
+        models.AttendanceRecord.period == period
+    ).all()
+    checked_records = [r for r in period_records if not r.carried_forward]
+
+    checked_students = len(checked_records)
+    carried_students = len(period_records) - checked_students
+
+    # 최소 1명 이상 출석 기록이 있으면 완료로 간주
+    is_completed = checked_students > 0
+
+    # 가장 최근 출석 기록 시간
+    completed_at = None
+    if checked_records:
+        latest_record = max(checked_records, key=lambda r: r.created_at if r.created_at else datetime.min)
+        completed_at = latest_record.created_at
+
+    return {
+        "period": period,
+        "is_completed": is_completed,
+        "completed_at": completed_at,
+        "total_students": total_students,
+        "checked_students": checked_students,
+        "carried_students": carried_students
+    }
+
+
+# ==================== 자습 태도 체크 API ====================
+
+@router.post("/study-attitude-checks/", response_model=schemas.StudyAttitudeCheck)
+def create_attitude_check(
+    check: schemas.StudyAttitudeCheckCreate,
+    db: Session = Depends(get_db)
+):
+    """?먯뒿 ?쒕룄 泥댄겕 湲곕줉"""
+    db_check = models.StudyAttitudeCheck(**check.dict())
+    db.add(db_check)
+    db.commit()
+    db.refresh(db_check)
+    return db_check
+
+
+@router.get("/study-attitude-checks/today", response_model=List[schemas.StudyAttitudeCheck])
+def get_today_attitude_checks(db: Session = Depends(get_db)):
+    """?ㅻ뒛 ?쒕룄 泥댄겕 湲곕줉 議고쉶"""
+    today = date.today()
+    checks = db.query(models.StudyAttitudeCheck).filter(
+        models.StudyAttitudeCheck.check_date == today
+    ).all()
+    return checks
+
+
+@router.get("/study-attitude-checks/student/{student_id}", response_model=List[schemas.StudyAttitudeCheck])
+def get_student_attitude_history(student_id: int, db: Session = Depends(get_db)):
+    """?숈깮蹂??쒕룄 泥댄겕 ?대젰"""
+    checks = db.query(models.StudyAttitudeCheck).filter(
+        models.StudyAttitudeCheck.student_id == student_id
+    ).order_by(models.StudyAttitudeCheck.check_date.desc(), models.StudyAttitudeCheck.check_time.desc()).all()
+    return checks
+
+
+@router.get("/study-attitude-checks/patrol/{patrol_id}", response_model=List[schemas.StudyAttitudeCheck])
+def get_patrol_attitude_checks(patrol_id: int, db: Session = Depends(get_db)):
+    """순찰별 태도 체크 목록 조회"""
+    checks = db.query(models.StudyAttitudeCheck).filter(
+        models.StudyAttitudeCheck.patrol_id == patrol_id
+    ).order_by(models.StudyAttitudeCheck.check_time.desc()).all()
+    return checks
+
+
+@router.delete("/study-attitude-checks/{check_id}")
+def delete_attitude_check(check_id: int, db: Session = Depends(get_db)):
+    """태도 체크 삭제 (순찰 제출 전까지만 가능)"""
+    check = db.query(models.StudyAttitudeCheck).filter(
+        models.StudyAttitudeCheck.id == check_id
+    ).first()
+
+    if not check:
+        raise HTTPException(status_code=404, detail="태도 체크를 찾을 수 없습니다")
+
+    # 해당 순찰이 아직 종료되지 않았는지 확인
+    if check.patrol_id:
+        patrol = db.query(models.Patrol).filter(
+            models.Patrol.id == check.patrol_id
+        ).first()
+        if patrol and patrol.end_time:
+            raise HTTPException(status_code=400, detail="이미 제출된 순찰의 체크는 삭제할 수 없습니다")
+
+    db.delete(check)
+    db.commit()
+    return {"message": "태도 체크가 삭제되었습니다", "deleted_id": check_id}
+
+
+# ==================== 자습 감독 통합 API ====================
+
+@router.get("/supervision/current-status", response_model=schemas.SupervisionDashboard)
+def get_supervision_status(db: Session = Depends(get_db)):
+    """?꾩옱 ?쒓컙 湲곗? ?꾩껜 ?숈깮 ?곹깭 議고쉶"""
+    now = datetime.now()
+    today = now.date()
+    
+    # 紐⑤뱺 ?ъ썝 ?숈깮 議고쉶
+    students = db.query(models.Student).filter(
+        models.Student.status == "재원"
+    ).all()
+    
+    student_statuses = []
+    present_count = 0
+    absent_count = 0
+    on_schedule_count = 0
+    
+    current_p = get_current_period()
+    # 외출/정기외출/상담 일정은 일일 타임라인에서 조회 (학생마다 쿼리하지 않음)
+    timeline = get_timeline_index(db, today)
+
+    for student in students:
+        # 1. Get attendance - prioritize current period, then most recent
+        attendance = None
+        if current_p:
+            attendance = db.query(models.AttendanceRecord).filter(
+                models.AttendanceRecord.student_id == student.id,
+                models.AttendanceRecord.date == today,
+                models.AttendanceRecord.period == current_p
+            ).first()
+        if not attendance:
+            attendance = db.query(models.AttendanceRecord).filter(
+                models.AttendanceRecord.student_id == student.id,
+                models.AttendanceRecord.date == today
+            ).order_by(models.AttendanceRecord.period.desc()).first()
+        
+        # 2. ?꾩옱 ?쇱젙 議고쉶
+        # 외출 > 정기외출 > 상담 순으로 대표 일정
+        current_schedule = None
+        scheduled = timeline.first_at(student.id, now, ("outing", "recurring_outing", "counseling"))
+        if scheduled:
+            current_schedule = scheduled.to_dict()
+
+        # 3. 理쒓렐 ?쒕룄 泥댄겕 議고쉶 (?ㅻ뒛)
+        # 태도 체크 - 현재 교시와 전 교시만 표시
+        current_period = get_current_period()
+        recent_checks = []
+
+        if current_period:
+            periods_to_check = [current_period]
+            if current_period > 1:
+                periods_to_check.append(current_period - 1)
+
+            time_ranges = []
+            for p in periods_to_check:
+                start_t, end_t = get_period_time_range(p)
+                if start_t and end_t:
+                    time_ranges.append((start_t, end_t))
+
+            all_checks = db.query(models.StudyAttitudeCheck).filter(
+                models.StudyAttitudeCheck.student_id == student.id,
+                models.StudyAttitudeCheck.check_date == today
+            ).order_by(models.StudyAttitudeCheck.check_time.desc()).all()
+
+            for check in all_checks:
+                for start_t, end_t in time_ranges:
+                    if start_t <= check.check_time <= end_t:
+                        recent_checks.append(check)
+                        break
+                if len(recent_checks) >= 3:
+                    break
+        else:
+            recent_checks = db.query(models.StudyAttitudeCheck).filter(
+                models.StudyAttitudeCheck.student_id == student.id,
+                models.StudyAttitudeCheck.check_date == today
+            ).order_by(models.StudyAttitudeCheck.check_time.desc()).limit(3).all()
+        
+        # 4. ?곹깭 ?먮떒
+        if not attendance:
+            status = "absent"
+            color = "red"
+            absent_count += 1
+        elif attendance.status == "지각":
+            status = "late"
+            color = "orange"
+            present_count += 1
+        elif current_schedule:
+            status = "on_schedule"
+            color = "yellow"
+            on_schedule_count += 1
+        elif recent_checks and any(c.attitude_type != "?뺤긽" for c in recent_checks):
+            status = "attitude_warning"
+            color = "purple"
+            present_count += 1
+        else:
+            status = "studying"
+            color = "green"
+            present_count += 1
+        
+        student_statuses.append({
+            "id": student.id,
+            "name": student.name,
+            "seat_number": student.seat_number,
+            "current_status": status,
+            "status_color": color,
+            "attendance_today": attendance,
+            "current_schedule": current_schedule,
+            "recent_attitude_checks": recent_checks
+        })
+    
+    return {
+        "students": student_statuses,
+        "current_time": now,
+        "total_students": len(students),
+        "present_count": present_count,
+        "absent_count": absent_count,
+        "on_schedule_count": on_schedule_count
+    }
+
+
+# ==================== 순찰 시작/종료 API ====================
+
+@router.post("/patrols/start")
+def start_patrol(db: Session = Depends(get_db)):
+    """?쒖같 ?쒖옉"""
+    now = datetime.now()
+    
+    # ?ㅻ뒛 吏꾪뻾 以묒씤 ?쒖같???덈뒗吏 ?뺤씤
+    existing_patrol = db.query(models.Patrol).filter(
+        models.Patrol.patrol_date == now.date(),
+        models.Patrol.end_time == None
+    ).first()
+    
+    if existing_patrol:
+        return {
+            "patrol_id": existing_patrol.id,
+            "message": "?대? 吏꾪뻾 以묒씤 ?쒖같???덉뒿?덈떎.",
+            "start_time": str(existing_patrol.start_time)
+        }
+    
+    # 새 순찰 시작
+    new_patrol = models.Patrol(
+        patrol_date=now.date(),
+        start_time=now.time(),
+        notes=""
+    )
+    db.add(new_patrol)
+    db.commit()
+    db.refresh(new_patrol)
+
+    # 순찰 알림 상태 초기화
+    patrol_monitor.reset_alerts()
+
+    return {
+        "patrol_id": new_patrol.id,
+        "message": "순찰이 시작되었습니다.",
+        "start_time": str(new_patrol.start_time)
+    }
+
+
+@router.post("/patrols/{patrol_id}/end")
+def end_patrol(patrol_id: int, notes: str = "", inspector_name: str = "", db: Session = Depends(get_db)):
+    """?쒖같 醫낅즺"""
+    patrol = db.query(models.Patrol).filter(models.Patrol.id == patrol_id).first()
+    
+    if not patrol:
+        raise HTTPException(status_code=404, detail="?쒖같??李얠쓣 ???놁뒿?덈떎.")
+    
+    if patrol.end_time:
+        raise HTTPException(status_code=400, detail="?대? 醫낅즺???쒖같?낅땲??")
+    
+    now = datetime.now()
+    patrol.end_time = now.time()
+    patrol.notes = notes
+    patrol.inspector_name = inspector_name
+
+    db.commit()
+    db.refresh(patrol)
+
+    # 순찰 알림 상태 초기화
+    patrol_monitor.reset_alerts()
+
+    #???쒖같?먯꽌 泥댄겕???쒕룄 湲곕줉 ??議고쉶
+    check_count = db.query(models.StudyAttitudeCheck).filter(
+        models.StudyAttitudeCheck.patrol_id == patrol_id
+    ).count()
+    
+    return {
+        "patrol_id": patrol.id,
+        "message": "?쒖같??醫낅즺?섏뿀?듬땲??",
+        "start_time": str(patrol.start_time),
+        "end_time": str(patrol.end_time),
+        "attitude_checks_count": check_count
+    }
+
+
+@router.post("/patrols/{patrol_id}/force-end")
+def force_end_patrol(patrol_id: int, notes: str = "강제종료 - 페이지 이탈", db: Session = Depends(get_db)):
+    """순찰 강제종료 (페이지 이탈 시 자동 호출)"""
+    patrol = db.query(models.Patrol).filter(models.Patrol.id == patrol_id).first()
+
+    if not patrol:
+        return {"message": "순찰을 찾을 수 없습니다."}
+
+    if patrol.end_time:
+        return {"message": "이미 종료된 순찰입니다."}
+
+    now = datetime.now()
+    patrol.end_time = now.time()
+    patrol.notes = notes
+
+    db.commit()
+
+    return {
+        "patrol_id": patrol.id,
+        "message": "순찰이 강제종료되었습니다.",
+        "end_time": str(patrol.end_time)
+    }
+
+
+@router.get("/patrols/current")
+def get_current_patrol(db: Session = Depends(get_db)):
+    """?꾩옱 吏꾪뻾 以묒씤 ?쒖같 議고쉶"""
+    from datetime import date
+    today = date.today()
+    
+    patrol = db.query(models.Patrol).filter(
+        models.Patrol.patrol_date == today,
+        models.Patrol.end_time == None
+    ).first()
+    
+    if not patrol:
+        return {"patrol_id": None, "is_active": False}
+    
+    # ???쒖같?먯꽌 泥댄겕???쒕룄 湲곕줉??
+    check_count = db.query(models.StudyAttitudeCheck).filter(
+        models.StudyAttitudeCheck.patrol_id == patrol.id
+    ).count()
+    
+    return {
+        "patrol_id": patrol.id,
+        "is_active": True,
+        "start_time": str(patrol.start_time),
+        "check_count": check_count
+    }
+
+
+# ==================== School Attendance API ====================
+
+@router.get("/school-attendance/today")
+def get_today_school_attendance(db: Session = Depends(get_db)):
+    """Get today's school attendance list (student IDs who are at school)"""
+    today = date.today()
+    records = db.query(models.SchoolAttendance).filter(
+        models.SchoolAttendance.date == today
+    ).all()
+    return {"student_ids": [r.student_id for r in records]}
+
+
+@router.post("/school-attendance/{student_id}")
+def mark_school_attendance(student_id: int, db: Session = Depends(get_db)):
+    """Mark a student as attending school today"""
+    today = date.today()
+
+    existing = db.query(models.SchoolAttendance).filter(
+        models.SchoolAttendance.student_id == student_id,
+        models.SchoolAttendance.date == today
+    ).first()
+
+    if existing:
+        return {"message": "Already marked", "student_id": student_id}
+
+    new_record = models.SchoolAttendance(
+        student_id=student_id,
+        date=today
+    )
+    db.add(new_record)
+    db.commit()
+    return {"message": "Marked as at school", "student_id": student_id}
+
+
+@router.delete("/school-attendance/{student_id}")
+def unmark_school_attendance(student_id: int, db: Session = Depends(get_db)):
+    """Unmark a student's school attendance for today"""
+    today = date.today()
+
+    record = db.query(models.SchoolAttendance).filter(
+        models.SchoolAttendance.student_id == student_id,
+        models.SchoolAttendance.date == today
+    ).first()
+
+    if not record:
+        return {"message": "Not found", "student_id": student_id}
+
+    db.delete(record)
+    db.commit()
+    return {"message": "Unmarked", "student_id": student_id}
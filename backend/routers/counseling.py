@@ -0,0 +1,734 @@
+"""다이아몬드 상담 시스템 API (상담사, 정기 상담, 상담 세션, 설문지, 일정 변경 요청)"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date, datetime, timedelta
+import models, schemas
+from database import get_db
+
+from timetable import invalidate_timelines, refresh_student_timeline
+
+router = APIRouter(tags=["상담"])
+
+# ==================== 다이아몬드 상담 시스템 API ====================
+
+# --- Counselor (상담사) Endpoints ---
+@router.post("/counselors/", response_model=schemas.Counselor)
+def create_counselor(counselor: schemas.CounselorCreate, db: Session = Depends(get_db)):
+    """상담사 생성"""
+    db_counselor = models.Counselor(**counselor.dict())
+    db.add(db_counselor)
+    db.commit()
+    db.refresh(db_counselor)
+    return db_counselor
+
+
+@router.get("/counselors/", response_model=List[schemas.Counselor])
+def read_counselors(is_active: Optional[bool] = None, db: Session = Depends(get_db)):
+    """상담사 목록 조회"""
+    query = db.query(models.Counselor)
+    if is_active is not None:
+        query = query.filter(models.Counselor.is_active == is_active)
+    return query.all()
+
+
+@router.put("/counselors/{counselor_id}", response_model=schemas.Counselor)
+def update_counselor(counselor_id: int, counselor_update: schemas.CounselorUpdate, db: Session = Depends(get_db)):
+    """상담사 정보 수정"""
+    db_counselor = db.query(models.Counselor).filter(models.Counselor.id == counselor_id).first()
+    if not db_counselor:
+        raise HTTPException(status_code=404, detail="상담사를 찾을 수 없습니다")
+
+    update_data = counselor_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_counselor, key, value)
+
+    db.commit()
+    db.refresh(db_counselor)
+    return db_counselor
+
+
+# --- DiamondCounseling (정기 상담 스케줄) Endpoints ---
+@router.post("/diamond-counselings/")
+def create_diamond_counseling(counseling: schemas.DiamondCounselingCreate, db: Session = Depends(get_db)):
+    """
+    다이아몬드 상담 생성 (자동 페어링 - 다른 선생님)
+    - week_pattern "1_3" 선택 → 1주차: 선택한 선생님, 3주차: 다른 선생님
+    - week_pattern "2_4" 선택 → 2주차: 선택한 선생님, 4주차: 다른 선생님
+
+    예: 1_3 패턴에 김현철 선택 → 1주차 김현철, 3주차 정현재
+    """
+    # week_pattern 파싱 (1_3 → [1, 3] 또는 2_4 → [2, 4])
+    weeks = [int(w) for w in counseling.week_pattern.split("_")]
+    first_week = weeks[0]  # 1 또는 2
+    second_week = weeks[1]  # 3 또는 4
+
+    # 다른 상담사 찾기
+    all_counselors = db.query(models.Counselor).filter(models.Counselor.is_active == True).all()
+    paired_counselor = None
+    for c in all_counselors:
+        if c.id != counseling.counselor_id:
+            paired_counselor = c
+            break
+
+    # 첫 번째 주차 상담 생성 (선택한 선생님)
+    first_counseling = models.DiamondCounseling(
+        student_id=counseling.student_id,
+        counselor_id=counseling.counselor_id,
+        week_number=first_week,
+        day_of_week=counseling.day_of_week,
+        start_time=counseling.start_time,
+        is_active=True
+    )
+    db.add(first_counseling)
+    db.commit()
+    db.refresh(first_counseling)
+
+    result = {
+        "message": "상담 스케줄이 생성되었습니다",
+        "first_counseling": first_counseling,
+        "second_counseling": None
+    }
+
+    if paired_counselor:
+        # 두 번째 주차 상담 생성 (다른 선생님)
+        second_counseling = models.DiamondCounseling(
+            student_id=counseling.student_id,
+            counselor_id=paired_counselor.id,
+            week_number=second_week,
+            day_of_week=counseling.day_of_week,
+            start_time=counseling.start_time,
+            is_active=True,
+            paired_counseling_id=first_counseling.id
+        )
+        db.add(second_counseling)
+        db.commit()
+        db.refresh(second_counseling)
+
+        # 첫 번째 상담에 페어 ID 연결
+        first_counseling.paired_counseling_id = second_counseling.id
+        db.commit()
+        db.refresh(first_counseling)
+
+        result["message"] = "상담 스케줄이 생성되었습니다 (두 선생님 배정)"
+        result["second_counseling"] = second_counseling
+
+    refresh_student_timeline(db, counseling.student_id)
+    return result
+
+
+@router.get("/diamond-counselings/")
+def read_diamond_counselings(
+    student_id: Optional[int] = None,
+    counselor_id: Optional[int] = None,
+    is_active: Optional[bool] = True,
+    db: Session = Depends(get_db)
+):
+    """다이아몬드 상담 목록 조회"""
+    query = db.query(models.DiamondCounseling)
+
+    if student_id:
+        query = query.filter(models.DiamondCounseling.student_id == student_id)
+    if counselor_id:
+        query = query.filter(models.DiamondCounseling.counselor_id == counselor_id)
+    if is_active is not None:
+        query = query.filter(models.DiamondCounseling.is_active == is_active)
+
+    counselings = query.all()
+
+    # 상세 정보 추가
+    result = []
+    for c in counselings:
+        student = db.query(models.Student).filter(models.Student.id == c.student_id).first()
+        counselor = db.query(models.Counselor).filter(models.Counselor.id == c.counselor_id).first()
+        result.append({
+            **c.__dict__,
+            "student_name": student.name if student else None,
+            "counselor_name": counselor.name if counselor else None
+        })
+
+    return result
+
+
+@router.get("/diamond-counselings/counselor/{counselor_id}/week/{week_number}")
+def get_counselor_weekly_schedule(counselor_id: int, week_number: int, db: Session = Depends(get_db)):
+    """상담사별 주차 스케줄 조회 (week_number: 1-4)"""
+    counselings = db.query(models.DiamondCounseling).filter(
+        models.DiamondCounseling.counselor_id == counselor_id,
+        models.DiamondCounseling.is_active == True,
+        models.DiamondCounseling.week_number == week_number
+    ).order_by(
+        models.DiamondCounseling.day_of_week,
+        models.DiamondCounseling.start_time
+    ).all()
+
+    result = []
+    for c in counselings:
+        student = db.query(models.Student).filter(models.Student.id == c.student_id).first()
+        result.append({
+            **c.__dict__,
+            "student_name": student.name if student else None
+        })
+
+    return result
+
+
+@router.put("/diamond-counselings/{counseling_id}")
+def update_diamond_counseling(counseling_id: int, counseling_update: schemas.DiamondCounselingUpdate, db: Session = Depends(get_db)):
+    """다이아몬드 상담 스케줄 수정"""
+    counseling = db.query(models.DiamondCounseling).filter(
+        models.DiamondCounseling.id == counseling_id
+    ).first()
+
+    if not counseling:
+        raise HTTPException(status_code=404, detail="상담을 찾을 수 없습니다")
+
+    # 업데이트할 필드만 적용
+    if counseling_update.counselor_id is not None:
+        counseling.counselor_id = counseling_update.counselor_id
+    if counseling_update.day_of_week is not None:
+        counseling.day_of_week = counseling_update.day_of_week
+    if counseling_update.start_time is not None:
+        counseling.start_time = counseling_update.start_time
+    if counseling_update.is_active is not None:
+        counseling.is_active = counseling_update.is_active
+
+    db.commit()
+    db.refresh(counseling)
+    refresh_student_timeline(db, counseling.student_id)
+
+    # 학생 이름 포함해서 반환
+    student = db.query(models.Student).filter(models.Student.id == counseling.student_id).first()
+    counselor = db.query(models.Counselor).filter(models.Counselor.id == counseling.counselor_id).first()
+
+    return {
+        **counseling.__dict__,
+        "student_name": student.name if student else None,
+        "counselor_name": counselor.name if counselor else None
+    }
+
+
+@router.delete("/diamond-counselings/{counseling_id}")
+def delete_diamond_counseling(counseling_id: int, db: Session = Depends(get_db)):
+    """다이아몬드 상담 비활성화 (페어도 함께)"""
+    counseling = db.query(models.DiamondCounseling).filter(
+        models.DiamondCounseling.id == counseling_id
+    ).first()
+
+    if not counseling:
+        raise HTTPException(status_code=404, detail="상담을 찾을 수 없습니다")
+
+    # 페어 상담도 비활성화
+    if counseling.paired_counseling_id:
+        paired = db.query(models.DiamondCounseling).filter(
+            models.DiamondCounseling.id == counseling.paired_counseling_id
+        ).first()
+        if paired:
+            paired.is_active = False
+
+    counseling.is_active = False
+    db.commit()
+    refresh_student_timeline(db, counseling.student_id)
+
+    return {"message": "상담 스케줄이 비활성화되었습니다"}
+
+
+# --- CounselingSession (상담 세션) Endpoints ---
+@router.post("/counseling-sessions/generate-monthly")
+def generate_monthly_sessions(request: schemas.GenerateMonthlySessionsRequest, db: Session = Depends(get_db)):
+    """월별 상담 세션 자동 생성"""
+    from calendar import monthrange
+
+    year = request.year
+    month = request.month
+
+    # 해당 월의 주차별 날짜 계산
+    _, last_day = monthrange(year, month)
+
+    # 활성 상담 조회
+    active_counselings = db.query(models.DiamondCounseling).filter(
+        models.DiamondCounseling.is_active == True
+    ).all()
+
+    created_sessions = []
+
+    for counseling in active_counselings:
+        # week_number로 직접 사용
+        week = counseling.week_number
+
+        # 해당 주차의 해당 요일 찾기
+        week_count = 0
+
+        for day in range(1, last_day + 1):
+            check_date = date(year, month, day)
+            if check_date.weekday() == counseling.day_of_week:
+                week_count += 1
+                if week_count == week:
+                    # 이미 세션이 있는지 확인
+                    existing = db.query(models.CounselingSession).filter(
+                        models.CounselingSession.diamond_counseling_id == counseling.id,
+                        models.CounselingSession.scheduled_date == check_date
+                    ).first()
+
+                    if not existing:
+                        student = db.query(models.Student).filter(models.Student.id == counseling.student_id).first()
+                        counselor = db.query(models.Counselor).filter(models.Counselor.id == counseling.counselor_id).first()
+
+                        new_session = models.CounselingSession(
+                            diamond_counseling_id=counseling.id,
+                            student_id=counseling.student_id,
+                            counselor_id=counseling.counselor_id,
+                            scheduled_date=check_date,
+                            scheduled_time=counseling.start_time,
+                            status="scheduled"
+                        )
+                        db.add(new_session)
+                        created_sessions.append({
+                            "student_id": counseling.student_id,
+                            "student_name": student.name if student else None,
+                            "counselor_id": counseling.counselor_id,
+                            "counselor_name": counselor.name if counselor else None,
+                            "date": str(check_date),
+                            "time": counseling.start_time,
+                            "week_number": week
+                        })
+                    break
+
+    db.commit()
+    invalidate_timelines()
+
+    return {
+        "message": f"{year}년 {month}월 상담 세션이 생성되었습니다",
+        "created_count": len(created_sessions),
+        "sessions": created_sessions
+    }
+
+
+@router.get("/counseling-sessions/")
+def read_counseling_sessions(
+    student_id: Optional[int] = None,
+    counselor_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """상담 세션 목록 조회"""
+    query = db.query(models.CounselingSession)
+
+    if student_id:
+        query = query.filter(models.CounselingSession.student_id == student_id)
+    if counselor_id:
+        query = query.filter(models.CounselingSession.counselor_id == counselor_id)
+    if status:
+        query = query.filter(models.CounselingSession.status == status)
+    if start_date:
+        query = query.filter(models.CounselingSession.scheduled_date >= start_date)
+    if end_date:
+        query = query.filter(models.CounselingSession.scheduled_date <= end_date)
+
+    sessions = query.order_by(models.CounselingSession.scheduled_date.desc()).all()
+
+    result = []
+    for s in sessions:
+        student = db.query(models.Student).filter(models.Student.id == s.student_id).first()
+        counselor = db.query(models.Counselor).filter(models.Counselor.id == s.counselor_id).first()
+        survey = db.query(models.CounselingSurvey).filter(models.CounselingSurvey.session_id == s.id).first()
+
+        result.append({
+            **s.__dict__,
+            "student_name": student.name if student else None,
+            "counselor_name": counselor.name if counselor else None,
+            "has_survey": survey is not None
+        })
+
+    return result
+
+
+@router.get("/counseling-sessions/week/{date_str}")
+def get_weekly_sessions(date_str: str, db: Session = Depends(get_db)):
+    """주간 상담 세션 조회"""
+    target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+
+    # 해당 주의 월요일과 일요일 계산
+    monday = target_date - timedelta(days=target_date.weekday())
+    sunday = monday + timedelta(days=6)
+
+    sessions = db.query(models.CounselingSession).filter(
+        models.CounselingSession.scheduled_date >= monday,
+        models.CounselingSession.scheduled_date <= sunday
+    ).order_by(
+        models.CounselingSession.scheduled_date,
+        models.CounselingSession.scheduled_time
+    ).all()
+
+    result = []
+    for s in sessions:
+        student = db.query(models.Student).filter(models.Student.id == s.student_id).first()
+        counselor = db.query(models.Counselor).filter(models.Counselor.id == s.counselor_id).first()
+
+        result.append({
+            **s.__dict__,
+            "student_name": student.name if student else None,
+            "counselor_name": counselor.name if counselor else None
+        })
+
+    return result
+
+
+@router.post("/counseling-sessions/{session_id}/complete")
+def complete_session(session_id: int, db: Session = Depends(get_db)):
+    """상담 세션 완료 처리"""
+    session = db.query(models.CounselingSession).filter(
+        models.CounselingSession.id == session_id
+    ).first()
+
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+
+    session.status = "completed"
+    session.completed_at = datetime.now()
+    db.commit()
+    db.refresh(session)
+
+    return {"message": "상담이 완료 처리되었습니다", "session": session}
+
+
+# --- CounselingSurvey (상담 설문지) Endpoints ---
+@router.post("/counseling-surveys/", response_model=schemas.CounselingSurvey)
+def create_counseling_survey(survey: schemas.CounselingSurveyCreate, db: Session = Depends(get_db)):
+    """상담 설문지 제출"""
+    # 세션 존재 확인
+    session = db.query(models.CounselingSession).filter(
+        models.CounselingSession.id == survey.session_id
+    ).first()
+
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+
+    # 이미 설문이 있는지 확인
+    existing = db.query(models.CounselingSurvey).filter(
+        models.CounselingSurvey.session_id == survey.session_id
+    ).first()
+
+    if existing:
+        raise HTTPException(status_code=400, detail="이미 설문이 제출되었습니다")
+
+    db_survey = models.CounselingSurvey(**survey.dict())
+    db.add(db_survey)
+
+    # 세션도 완료 처리
+    session.status = "completed"
+    session.completed_at = datetime.now()
+
+    db.commit()
+    db.refresh(db_survey)
+
+    return db_survey
+
+
+@router.get("/counseling-surveys/session/{session_id}", response_model=schemas.CounselingSurvey)
+def get_survey_by_session(session_id: int, db: Session = Depends(get_db)):
+    """세션별 설문지 조회"""
+    survey = db.query(models.CounselingSurvey).filter(
+        models.CounselingSurvey.session_id == session_id
+    ).first()
+
+    if not survey:
+        raise HTTPException(status_code=404, detail="설문지를 찾을 수 없습니다")
+
+    return survey
+
+
+@router.get("/counseling-surveys/")
+def get_all_surveys(
+    counseling_type: Optional[str] = None,
+    counselor_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """모든 상담 설문 조회 (필터 가능)"""
+    query = db.query(models.CounselingSurvey)
+
+    if counseling_type:
+        query = query.filter(models.CounselingSurvey.counseling_type == counseling_type)
+    if counselor_id:
+        query = query.filter(models.CounselingSurvey.counselor_id == counselor_id)
+
+    surveys = query.order_by(models.CounselingSurvey.submitted_at.desc()).all()
+
+    result = []
+    for s in surveys:
+        student = db.query(models.Student).filter(models.Student.id == s.student_id).first()
+        counselor = db.query(models.Counselor).filter(models.Counselor.id == s.counselor_id).first()
+        session = db.query(models.CounselingSession).filter(models.CounselingSession.id == s.session_id).first()
+
+        result.append({
+            **s.__dict__,
+            "student_name": student.name if student else None,
+            "student_seat": student.seat_number if student else None,
+            "counselor_name": counselor.name if counselor else None,
+            "session_date": str(session.scheduled_date) if session else None
+        })
+
+    return result
+
+
+@router.get("/counseling-surveys/student/{student_id}")
+def get_student_surveys(student_id: int, db: Session = Depends(get_db)):
+    """학생별 설문지 이력 조회"""
+    surveys = db.query(models.CounselingSurvey).filter(
+        models.CounselingSurvey.student_id == student_id
+    ).order_by(models.CounselingSurvey.submitted_at.desc()).all()
+
+    result = []
+    for s in surveys:
+        counselor = db.query(models.Counselor).filter(models.Counselor.id == s.counselor_id).first()
+        session = db.query(models.CounselingSession).filter(models.CounselingSession.id == s.session_id).first()
+
+        result.append({
+            **s.__dict__,
+            "counselor_name": counselor.name if counselor else None,
+            "session_date": str(session.scheduled_date) if session else None
+        })
+
+    return result
+
+
+@router.post("/counseling-surveys/submit-standalone")
+def submit_standalone_survey(survey: schemas.CounselingSurveyStandaloneCreate, db: Session = Depends(get_db)):
+    """독립 설문 제출 - 세션 없이 직접 제출 후 매칭되는 다이아몬드 상담 세션 자동 완료"""
+    from datetime import timedelta
+
+    # 해당 날짜가 속한 주의 시작일(월요일)과 종료일(일요일) 계산
+    counseling_date = survey.counseling_date
+    days_since_monday = counseling_date.weekday()  # 월요일=0
+    week_start = counseling_date - timedelta(days=days_since_monday)
+    week_end = week_start + timedelta(days=6)
+
+    matched_session = None
+    session_id = None
+
+    # 매칭되는 세션 찾기 (같은 학생, 같은 상담사, 같은 주)
+    matching_sessions = db.query(models.CounselingSession).filter(
+        models.CounselingSession.student_id == survey.student_id,
+        models.CounselingSession.counselor_id == survey.counselor_id,
+        models.CounselingSession.scheduled_date >= week_start,
+        models.CounselingSession.scheduled_date <= week_end,
+        models.CounselingSession.status != 'completed'
+    ).all()
+
+    if matching_sessions:
+        # 매칭되는 세션이 있으면 첫 번째 세션 사용
+        matched_session = matching_sessions[0]
+        session_id = matched_session.id
+
+        # 해당 세션에 이미 설문이 있는지 확인
+        existing_survey = db.query(models.CounselingSurvey).filter(
+            models.CounselingSurvey.session_id == session_id
+        ).first()
+
+        if existing_survey:
+            raise HTTPException(status_code=400, detail="해당 세션에 이미 설문이 제출되어 있습니다")
+
+    # session_id가 없으면 새 세션을 생성하거나 오류 처리
+    if not session_id:
+        # 임시 세션 없이 설문만 저장 (session_id 없이)
+        # 하지만 현재 모델에서 session_id가 필수이므로, 세션을 먼저 생성
+        # 다이아몬드 상담이 아닌 경우에도 기록을 위해 임시 세션 생성
+        new_session = models.CounselingSession(
+            diamond_counseling_id=None,
+            student_id=survey.student_id,
+            counselor_id=survey.counselor_id,
+            scheduled_date=survey.counseling_date,
+            scheduled_time="00:00",  # 임시
+            week_number=0,  # 임시
+            status="completed",
+            completed_at=datetime.now()
+        )
+        db.add(new_session)
+        db.flush()  # ID 할당을 위해
+        session_id = new_session.id
+    else:
+        # 매칭된 세션 완료 처리
+        matched_session.status = "completed"
+        matched_session.completed_at = datetime.now()
+
+    # 설문 저장
+    db_survey = models.CounselingSurvey(
+        session_id=session_id,
+        student_id=survey.student_id,
+        counselor_id=survey.counselor_id,
+        counseling_type=survey.counseling_type,
+        overall_achievement=survey.overall_achievement,
+        allcare_satisfaction=survey.allcare_satisfaction,
+        allcare_satisfaction_reason=survey.allcare_satisfaction_reason,
+        korean_notes=survey.korean_notes,
+        math_notes=survey.math_notes,
+        english_notes=survey.english_notes,
+        inquiry_notes=survey.inquiry_notes,
+        other_notes=survey.other_notes
+    )
+    db.add(db_survey)
+    db.commit()
+    db.refresh(db_survey)
+
+    result = {
+        "survey_id": db_survey.id,
+        "message": "설문이 제출되었습니다"
+    }
+
+    if matched_session:
+        result["matched_session"] = {
+            "id": matched_session.id,
+            "scheduled_date": str(matched_session.scheduled_date),
+            "student_id": matched_session.student_id,
+            "counselor_id": matched_session.counselor_id
+        }
+
+    return result
+
+
+# --- ScheduleChangeRequest (일정 변경 요청) Endpoints ---
+@router.post("/schedule-change-requests/", response_model=schemas.ScheduleChangeRequest)
+def create_schedule_change_request(request: schemas.ScheduleChangeRequestCreate, db: Session = Depends(get_db)):
+    """일정 변경 요청 생성"""
+    # 세션 존재 확인
+    session = db.query(models.CounselingSession).filter(
+        models.CounselingSession.id == request.session_id
+    ).first()
+
+    if not session:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+
+    db_request = models.ScheduleChangeRequest(**request.dict())
+    db.add(db_request)
+    db.commit()
+    db.refresh(db_request)
+
+    return db_request
+
+
+@router.get("/schedule-change-requests/")
+def read_schedule_change_requests(
+    status: Optional[str] = None,
+    student_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """일정 변경 요청 목록 조회"""
+    query = db.query(models.ScheduleChangeRequest)
+
+    if status:
+        query = query.filter(models.ScheduleChangeRequest.status == status)
+    if student_id:
+        query = query.filter(models.ScheduleChangeRequest.student_id == student_id)
+
+    requests = query.order_by(models.ScheduleChangeRequest.created_at.desc()).all()
+
+    result = []
+    for r in requests:
+        student = db.query(models.Student).filter(models.Student.id == r.student_id).first()
+        session = db.query(models.CounselingSession).filter(models.CounselingSession.id == r.session_id).first()
+        counselor = None
+        if session:
+            counselor = db.query(models.Counselor).filter(models.Counselor.id == session.counselor_id).first()
+
+        result.append({
+            **r.__dict__,
+            "student_name": student.name if student else None,
+            "original_date": session.scheduled_date if session else None,
+            "original_time": session.scheduled_time if session else None,
+            "counselor_name": counselor.name if counselor else None
+        })
+
+    return result
+
+
+@router.post("/schedule-change-requests/{request_id}/approve")
+def approve_schedule_change(
+    request_id: int,
+    process_data: schemas.ScheduleChangeRequestProcess,
+    db: Session = Depends(get_db)
+):
+    """일정 변경 요청 승인"""
+    change_request = db.query(models.ScheduleChangeRequest).filter(
+        models.ScheduleChangeRequest.id == request_id
+    ).first()
+
+    if not change_request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    if change_request.status != "pending":
+        raise HTTPException(status_code=400, detail="이미 처리된 요청입니다")
+
+    # 요청 승인
+    change_request.status = "approved"
+    change_request.processed_by = process_data.processed_by
+    change_request.processed_at = datetime.now()
+
+    # 세션 일정 변경
+    session = db.query(models.CounselingSession).filter(
+        models.CounselingSession.id == change_request.session_id
+    ).first()
+
+    if session:
+        if change_request.requested_date:
+            session.scheduled_date = change_request.requested_date
+        if change_request.requested_time:
+            session.scheduled_time = change_request.requested_time
+        session.status = "rescheduled"
+
+    db.commit()
+    if session:
+        refresh_student_timeline(db, session.student_id)
+
+    return {"message": "일정 변경이 승인되었습니다"}
+
+
+@router.post("/schedule-change-requests/{request_id}/reject")
+def reject_schedule_change(
+    request_id: int,
+    process_data: schemas.ScheduleChangeRequestProcess,
+    db: Session = Depends(get_db)
+):
+    """일정 변경 요청 거절"""
+    change_request = db.query(models.ScheduleChangeRequest).filter(
+        models.ScheduleChangeRequest.id == request_id
+    ).first()
+
+    if not change_request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    if change_request.status != "pending":
+        raise HTTPException(status_code=400, detail="이미 처리된 요청입니다")
+
+    change_request.status = "rejected"
+    change_request.processed_by = process_data.processed_by
+    change_request.processed_at = datetime.now()
+    change_request.rejection_reason = process_data.rejection_reason
+    change_request.alternative_times = process_data.alternative_times
+
+    db.commit()
+
+    return {"message": "일정 변경 요청이 거절되었습니다"}
+
+
+# --- 초기 데이터 생성 엔드포인트 ---
+@router.post("/counselors/init")
+def init_counselors(db: Session = Depends(get_db)):
+    """초기 상담사 데이터 생성 (김현철, 정현재)"""
+    counselors_data = [
+        {"name": "김현철"},
+        {"name": "정현재"}
+    ]
+
+    created = []
+    for data in counselors_data:
+        existing = db.query(models.Counselor).filter(models.Counselor.name == data["name"]).first()
+        if not existing:
+            counselor = models.Counselor(**data)
+            db.add(counselor)
+            created.append(data["name"])
+
+    db.commit()
+
+    return {"message": f"상담사 생성 완료: {created}" if created else "이미 존재하는 상담사입니다"}
@@ -0,0 +1,55 @@
+"""라우터 공용 교시 헬퍼 (현재 교시, 교시 시간 범위, 교시 검증)"""
+from datetime import datetime
+from typing import Optional
+
+import pytz
+
+from timetable import get_timetable
+
+
+def get_current_period() -> Optional[int]:
+    """Get current period based on time"""
+    return get_timetable().current_period(datetime.now())
+
+def get_period_time_range(period: int):
+    """Get start and end time for a period"""
+    span = get_timetable().period_range(period)
+    if span:
+        return span
+    return None, None
+
+# Timezone support
+KST = pytz.timezone('Asia/Seoul')
+
+def validate_period_timing(requested_period: int) -> dict:
+    """
+    요청된 교시가 현재 시간과 맞는지 검증
+
+    Returns:
+        {
+            "is_current": bool,  # 현재 교시인가?
+            "current_period": int | None,  # 현재 교시 (없으면 None)
+            "warning_message": str | None  # 경고 메시지
+        }
+    """
+    current = get_current_period()
+
+    if current is None:
+        return {
+            "is_current": False,
+            "current_period": None,
+            "warning_message": "현재는 교시 시간이 아닙니다 (쉬는시간/점심/저녁시간)"
+        }
+
+    if current != requested_period:
+        return {
+            "is_current": False,
+            "current_period": current,
+            "warning_message": f"현재는 {current}교시입니다. {requested_period}교시로 기록하시겠습니까?"
+        }
+
+    return {
+        "is_current": True,
+        "current_period": current,
+        "warning_message": None
+    }
@@ -0,0 +1,336 @@
+"""Discord 알림 API + 일일 리포트"""
+from fastapi import APIRouter, Depends, Body
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime
+import models
+from database import get_async_db, get_db
+import pytz
+import os
+
+from notifications import NotificationOutbox, build_embed, enqueue_notification_async, get_dispatcher
+
+router = APIRouter(tags=["Discord 알림"])
+
+# ==================== Discord 알림 API ====================
+
+DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
+
+async def send_discord_notification(title: str, message: str, color: int = 0x5865F2, fields: list = None):
+    """Discord 웹훅 알림을 아웃박스에 저장 (전송/재시도는 notifications dispatcher가 담당)"""
+    if not DISCORD_WEBHOOK_URL:
+        return {"status": "error", "message": "Discord 웹훅 URL이 설정되지 않았습니다."}
+
+    outbox_id = await enqueue_notification_async(DISCORD_WEBHOOK_URL, build_embed(title, message, color, fields))
+    if outbox_id is None:
+        return {"status": "error", "message": "알림 아웃박스 저장 실패"}
+    return {"status": "queued", "id": outbox_id}
+
+
+@router.get("/discord/outbox")
+def get_notification_outbox_status(db: Session = Depends(get_db)):
+    """알림 아웃박스 상태 (대기/전송/실패 건수, dispatcher 상태)"""
+    counts = dict(
+        db.query(NotificationOutbox.status, func.count(NotificationOutbox.id))
+        .group_by(NotificationOutbox.status).all()
+    )
+    return {"counts": counts, "dispatcher": get_dispatcher().status()}
+
+
+@router.post("/discord/notify")
+async def send_custom_notification(
+    title: str = Body(...),
+    message: str = Body(...),
+    color: int = Body(0x5865F2)
+):
+    """커스텀 Discord 알림 전송"""
+    result = await send_discord_notification(title, message, color)
+    return result
+
+
+@router.post("/discord/patrol-reminder")
+async def send_patrol_reminder(db: AsyncSession = Depends(get_async_db)):
+    """순찰 리마인더 알림 전송"""
+    KST = pytz.timezone('Asia/Seoul')
+    now = datetime.now(KST)
+    today = now.date()
+
+    # 마지막 순찰 기록 조회
+    last_patrol = await db.scalar(
+        select(models.Patrol)
+        .where(models.Patrol.patrol_date == today)
+        .order_by(models.Patrol.end_time.desc())
+        .limit(1)
+    )
+
+    if last_patrol and last_patrol.end_time:
+        last_time = datetime.combine(today, last_patrol.end_time)
+        last_time = KST.localize(last_time)
+        elapsed = (now - last_time).total_seconds() / 60
+
+        if elapsed >= 25:
+            result = await send_discord_notification(
+                "⚠️ 순찰 지연 경고",
+                f"마지막 순찰 후 **{int(elapsed)}분**이 경과했습니다!\n순찰을 즉시 진행해주세요.",
+                color=0xFF0000,  # 빨간색
+                fields=[
+                    {"name": "마지막 순찰", "value": last_patrol.end_time.strftime("%H:%M"), "inline": True},
+                    {"name": "경과 시간", "value": f"{int(elapsed)}분", "inline": True}
+                ]
+            )
+            return {"status": "warning_sent", "elapsed_minutes": int(elapsed), "result": result}
+        elif elapsed >= 15:
+            result = await send_discord_notification(
+                "🔔 순찰 리마인더",
+                f"마지막 순찰 후 **{int(elapsed)}분**이 경과했습니다.\n순찰을 돌아주세요!",
+                color=0xFFA500,  # 주황색
+                fields=[
+                    {"name": "마지막 순찰", "value": last_patrol.end_time.strftime("%H:%M"), "inline": True},
+                    {"name": "경과 시간", "value": f"{int(elapsed)}분", "inline": True}
+                ]
+            )
+            return {"status": "reminder_sent", "elapsed_minutes": int(elapsed), "result": result}
+        else:
+            return {"status": "ok", "elapsed_minutes": int(elapsed), "message": "순찰 시간 정상"}
+    else:
+        # 오늘 순찰 기록이 없는 경우
+        result = await send_discord_notification(
+            "📋 순찰 시작 알림",
+            "오늘 첫 순찰을 시작해주세요!",
+            color=0x5865F2
+        )
+        return {"status": "first_patrol_needed", "result": result}
+
+
+@router.post("/discord/late-notification")
+async def send_late_notification(
+    student_name: str = Body(...),
+    seat_number: str = Body(...),
+    minutes_late: int = Body(...),
+    db: Session = Depends(get_db)
+):
+    """지각 알림 전송"""
+    result = await send_discord_notification(
+        "⏰ 지각 알림",
+        f"**{student_name}** 학생({seat_number})이 **{minutes_late}분** 지각했습니다.",
+        color=0xFFA500,
+        fields=[
+            {"name": "학생", "value": student_name, "inline": True},
+            {"name": "좌석", "value": seat_number, "inline": True},
+            {"name": "지각 시간", "value": f"{minutes_late}분", "inline": True}
+        ]
+    )
+    return result
+
+
+@router.post("/discord/penalty-alert")
+async def send_penalty_alert(
+    student_name: str = Body(...),
+    seat_number: str = Body(...),
+    total_penalty: int = Body(...),
+    reason: str = Body(None),
+    db: Session = Depends(get_db)
+):
+    """벌점 경고 알림 전송 (10점 이상)"""
+    if total_penalty >= 10:
+        result = await send_discord_notification(
+            "🚨 벌점 경고",
+            f"**{student_name}** 학생({seat_number})의 누적 벌점이 **{total_penalty}점**입니다!",
+            color=0xFF0000,
+            fields=[
+                {"name": "학생", "value": student_name, "inline": True},
+                {"name": "좌석", "value": seat_number, "inline": True},
+                {"name": "누적 벌점", "value": f"{total_penalty}점", "inline": True},
+                {"name": "최근 사유", "value": reason or "없음", "inline": False}
+            ]
+        )
+        return result
+    return {"status": "ok", "message": "벌점이 10점 미만입니다."}
+
+
+@router.post("/discord/attendance-check-reminder")
+async def send_attendance_check_reminder(
+    period: int = Body(...),
+    db: Session = Depends(get_db)
+):
+    """출석 체크 리마인더 (교시 시작 후 10분 이내 출석확인이 없을 때)"""
+    KST = pytz.timezone('Asia/Seoul')
+    today = datetime.now(KST).date()
+
+    # 해당 교시 출석 기록 확인
+    attendance_count = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.date == today,
+        models.AttendanceRecord.period == period
+    ).count()
+
+    if attendance_count == 0:
+        result = await send_discord_notification(
+            "📢 출석 체크 리마인더",
+            f"**{period}교시** 출석 체크가 아직 진행되지 않았습니다!\n출석 확인을 진행해주세요.",
+            color=0xFFA500,
+            fields=[
+                {"name": "교시", "value": f"{period}교시", "inline": True},
+                {"name": "상태", "value": "미확인", "inline": True}
+            ]
+        )
+        return {"status": "reminder_sent", "period": period, "result": result}
+
+    return {"status": "ok", "period": period, "attendance_count": attendance_count}
+
+
+@router.get("/discord/test")
+async def test_discord_webhook():
+    """Discord 웹훅 테스트"""
+    result = await send_discord_notification(
+        "✅ 테스트 알림",
+        "Discord 웹훅이 정상적으로 연결되었습니다!",
+        color=0x00FF00
+    )
+    return result
+
+
+# ============ Phase 5: 일일 리포트 자동 생성 ============
+
+async def _count_by(db: AsyncSession, column, keys: list, *conditions) -> dict:
+    """GROUP BY 집계 → {키: 개수} (keys에 없는 값은 버림)"""
+    rows = await db.execute(select(column, func.count()).where(*conditions).group_by(column))
+    counts = dict.fromkeys(keys, 0)
+    for value, count in rows:
+        if value in counts:
+            counts[value] = count
+    return counts
+
+
+async def _daily_report_stats(db: AsyncSession, today: date) -> dict:
+    """일일 리포트 공통 집계 (재원생/출석/순찰/태도/벌점)"""
+    total_students = await db.scalar(
+        select(func.count()).select_from(models.Student).where(models.Student.status == "재원")
+    )
+    attendance_stats = await _count_by(
+        db, models.AttendanceRecord.status, ["자습중", "지각", "결석", "일정중", "학교", "조퇴"],
+        models.AttendanceRecord.date == today
+    )
+    patrol_count = await db.scalar(
+        select(func.count()).select_from(models.Patrol).where(models.Patrol.patrol_date == today)
+    )
+    attitude_stats = await _count_by(
+        db, models.StudyAttitudeCheck.attitude_type, ["정상", "졸음", "딴짓", "이탈", "기타"],
+        models.StudyAttitudeCheck.check_date == today
+    )
+    penalty_count, penalty_total = (await db.execute(
+        select(func.count(models.Penalty.id), func.coalesce(func.sum(models.Penalty.points), 0))
+        .where(models.Penalty.date == today)
+    )).one()
+
+    return {
+        "total_students": total_students or 0,
+        "attendance": attendance_stats,
+        "patrol_count": patrol_count or 0,
+        "attitude": attitude_stats,
+        "penalty_count": penalty_count,
+        "penalty_total_points": penalty_total,
+    }
+
+
+@router.get("/reports/daily")
+async def generate_daily_report(db: AsyncSession = Depends(get_async_db)):
+    """일일 리포트 생성 - 오늘의 출결, 순찰, 벌점 현황 요약"""
+    KST = pytz.timezone('Asia/Seoul')
+    today = datetime.now(KST).date()
+    today_str = today.strftime("%Y년 %m월 %d일")
+
+    stats = await _daily_report_stats(db, today)
+
+    # 벌점 10점 이상 학생
+    high_penalty_students = (await db.execute(
+        select(
+            models.Student.name,
+            models.Student.seat_number,
+            func.sum(models.Penalty.points).label('total')
+        ).join(models.Penalty).group_by(
+            models.Student.id
+        ).having(
+            func.sum(models.Penalty.points) >= 10
+        )
+    )).all()
+
+    # 리포트 데이터 구성
+    report = {
+        "date": today_str,
+        "total_students": stats["total_students"],
+        "attendance": stats["attendance"],
+        "patrol_count": stats["patrol_count"],
+        "attitude": stats["attitude"],
+        "penalty_count": stats["penalty_count"],
+        "penalty_total_points": stats["penalty_total_points"],
+        "high_penalty_students": [
+            {"name": s.name, "seat": s.seat_number, "points": s.total}
+            for s in high_penalty_students
+        ]
+    }
+
+    return report
+
+
+@router.post("/reports/daily/discord")
+async def send_daily_report_to_discord(db: AsyncSession = Depends(get_async_db)):
+    """일일 리포트를 Discord로 전송"""
+    KST = pytz.timezone('Asia/Seoul')
+    today = datetime.now(KST).date()
+    today_str = today.strftime("%Y년 %m월 %d일")
+    weekday_names = ["월", "화", "수", "목", "금", "토", "일"]
+    weekday = weekday_names[today.weekday()]
+
+    stats = await _daily_report_stats(db, today)
+    attendance_stats = stats["attendance"]
+    attitude_stats = stats["attitude"]
+
+    # 문제 학생 목록 (태도 불량) - 학생 정보 함께 조회
+    problem_students = (await db.execute(
+        select(models.StudyAttitudeCheck.attitude_type, models.Student.name, models.Student.seat_number)
+        .join(models.Student, models.Student.id == models.StudyAttitudeCheck.student_id)
+        .where(
+            models.StudyAttitudeCheck.check_date == today,
+            models.StudyAttitudeCheck.attitude_type.in_(["졸음", "딴짓", "이탈"])
+        )
+    )).all()
+
+    # Discord 메시지 구성
+    attendance_text = f"✅ 자습중: {attendance_stats['자습중']}명\n"
+    attendance_text += f"⏰ 지각: {attendance_stats['지각']}명\n"
+    attendance_text += f"❌ 결석: {attendance_stats['결석']}명\n"
+    attendance_text += f"📅 일정중: {attendance_stats['일정중']}명\n"
+    attendance_text += f"🏫 학교: {attendance_stats['학교']}명"
+
+    attitude_text = f"✅ 정상: {attitude_stats['정상']}명\n"
+    attitude_text += f"😴 졸음: {attitude_stats['졸음']}명\n"
+    attitude_text += f"📱 딴짓: {attitude_stats['딴짓']}명\n"
+    attitude_text += f"🚶 이탈: {attitude_stats['이탈']}명"
+
+    # 문제 학생 텍스트
+    problem_text = "없음"
+    if problem_students:
+        problem_list = [
+            f"• {check.name}({check.seat_number}): {check.attitude_type}"
+            for check in problem_students[:5]  # 최대 5명만 표시
+        ]
+        problem_text = "\n".join(problem_list)
+        if len(problem_students) > 5:
+            problem_text += f"\n... 외 {len(problem_students) - 5}명"
+
+    fields = [
+        {"name": "📊 출석 현황", "value": attendance_text, "inline": True},
+        {"name": "👀 학습 태도", "value": attitude_text, "inline": True},
+        {"name": "📋 운영 정보", "value": f"순찰 횟수: {stats['patrol_count']}회\n벌점 부여: {stats['penalty_count']}건 ({stats['penalty_total_points']}점)", "inline": False},
+        {"name": "⚠️ 주의 학생", "value": problem_text, "inline": False}
+    ]
+
+    result = await send_discord_notification(
+        f"📈 {today_str} ({weekday}) 일일 리포트",
+        f"오늘 하루의 디턴독학재수학원 운영 현황입니다.\n총 재원생: **{stats['total_students']}명**",
+        color=0x5865F2,
+        fields=fields
+    )
+
+    return {"status": "success", "report_date": today_str, "discord_result": result}
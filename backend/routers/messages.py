@@ -0,0 +1,191 @@
+"""문자/카카오톡 발송 API (Solapi)"""
+from fastapi import APIRouter, Depends, HTTPException, Body
+from sqlalchemy.orm import Session
+from typing import List
+import models
+from database import get_db
+
+from solapi_service import get_message_service
+
+router = APIRouter(tags=["문자 발송"])
+
+# ==================== 문자/카카오톡 발송 API (Solapi) ====================
+
+@router.get("/messages/status")
+def get_message_service_status():
+    """Solapi 서비스 상태 확인"""
+    return {
+        "available": get_message_service().is_available(),
+        "message": "Solapi 서비스가 정상적으로 연결되었습니다." if get_message_service().is_available() else "Solapi 서비스를 사용할 수 없습니다. API 키를 확인해주세요."
+    }
+
+
+@router.get("/messages/balance")
+def get_message_balance():
+    """잔액 조회"""
+    return get_message_service().get_balance()
+
+
+@router.post("/messages/send-sms")
+def send_sms_message(
+    to: str = Body(..., description="수신번호 (01012345678)"),
+    text: str = Body(..., description="메시지 내용"),
+    from_number: str = Body(None, description="발신번호 (등록된 번호)")
+):
+    """
+    SMS 발송 (80바이트 이하)
+    - to: 수신번호 (하이픈 없이)
+    - text: 메시지 내용
+    - from_number: 발신번호 (Solapi에 등록된 번호, 선택)
+    """
+    result = get_message_service().send_sms(to, text, from_number)
+    return result
+
+
+@router.post("/messages/send-lms")
+def send_lms_message(
+    to: str = Body(..., description="수신번호"),
+    text: str = Body(..., description="메시지 내용 (장문)"),
+    subject: str = Body(None, description="제목"),
+    from_number: str = Body(None, description="발신번호")
+):
+    """
+    LMS 발송 (장문, 2000바이트까지)
+    """
+    result = get_message_service().send_lms(to, text, subject, from_number)
+    return result
+
+
+@router.post("/messages/send-to-parent")
+def send_message_to_parent(
+    student_id: int = Body(..., description="학생 ID"),
+    text: str = Body(..., description="메시지 내용"),
+    from_number: str = Body(None, description="발신번호"),
+    db: Session = Depends(get_db)
+):
+    """
+    학생의 학부모에게 문자 발송
+    학생 정보에서 parent_phone 조회 후 발송
+    """
+    student = db.query(models.Student).filter(models.Student.id == student_id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="학생을 찾을 수 없습니다")
+
+    if not student.parent_phone:
+        raise HTTPException(status_code=400, detail="학부모 연락처가 등록되어 있지 않습니다")
+
+    # 메시지에 학생 이름 추가
+    full_text = f"[디턴독학재수학원] {student.name} 학생 학부모님께,\n\n{text}"
+
+    # 80바이트 초과 시 LMS로 발송
+    if len(full_text.encode('utf-8')) > 80:
+        result = get_message_service().send_lms(student.parent_phone, full_text, "디턴독학재수학원 알림", from_number)
+    else:
+        result = get_message_service().send_sms(student.parent_phone, full_text, from_number)
+
+    return {
+        "student_name": student.name,
+        "parent_phone": student.parent_phone[:3] + "****" + student.parent_phone[-4:],  # 번호 마스킹
+        "result": result
+    }
+
+
+@router.post("/messages/send-bulk-to-parents")
+def send_bulk_messages_to_parents(
+    student_ids: List[int] = Body(..., description="학생 ID 목록"),
+    text: str = Body(..., description="메시지 내용"),
+    from_number: str = Body(None, description="발신번호"),
+    db: Session = Depends(get_db)
+):
+    """
+    여러 학생의 학부모에게 일괄 문자 발송
+    """
+    students = db.query(models.Student).filter(models.Student.id.in_(student_ids)).all()
+
+    if not students:
+        raise HTTPException(status_code=404, detail="학생을 찾을 수 없습니다")
+
+    messages = []
+    skipped = []
+
+    for student in students:
+        if not student.parent_phone:
+            skipped.append({"id": student.id, "name": student.name, "reason": "학부모 연락처 없음"})
+            continue
+
+        full_text = f"[디턴독학재수학원] {student.name} 학생 학부모님께,\n\n{text}"
+        msg = {
+            "to": student.parent_phone.replace('-', ''),
+            "text": full_text
+        }
+        if from_number:
+            msg["from"] = from_number.replace('-', '')
+
+        # 장문 여부 체크
+        if len(full_text.encode('utf-8')) > 80:
+            msg["type"] = "LMS"
+            msg["subject"] = "디턴독학재수학원 알림"
+
+        messages.append(msg)
+
+    if not messages:
+        raise HTTPException(status_code=400, detail="발송할 대상이 없습니다")
+
+    result = get_message_service().send_bulk(messages)
+
+    return {
+        "sent_count": len(messages),
+        "skipped": skipped,
+        "result": result
+    }
+
+
+@router.post("/messages/send-friendtalk")
+def send_kakao_friendtalk(
+    to: str = Body(..., description="수신번호 (01012345678)"),
+    text: str = Body(..., description="메시지 내용"),
+    image_url: str = Body(None, description="이미지 URL (선택)"),
+    from_number: str = Body(None, description="발신번호 (친구톡 실패 시 SMS 대체 발송용)")
+):
+    """
+    카카오 친구톡 발송 (채널 친구에게만 발송 가능, 템플릿 불필요)
+    """
+    return get_message_service().send_kakao_friendtalk(
+        to=to,
+        text=text,
+        image_url=image_url,
+        from_number=from_number
+    )
+
+
+@router.post("/messages/send-friendtalk-to-parent")
+def send_friendtalk_to_parent(
+    student_id: int = Body(..., description="학생 ID"),
+    text: str = Body(..., description="메시지 내용"),
+    image_url: str = Body(None, description="이미지 URL (선택)"),
+    from_number: str = Body(None, description="발신번호"),
+    db: Session = Depends(get_db)
+):
+    """
+    학생의 학부모에게 카카오 친구톡 발송
+    """
+    student = db.query(models.Student).filter(models.Student.id == student_id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="학생을 찾을 수 없습니다")
+    if not student.parent_phone:
+        raise HTTPException(status_code=400, detail="학부모 연락처가 등록되어 있지 않습니다")
+
+    full_text = f"[디턴독학재수학원] {student.name} 학생 학부모님께,\n\n{text}"
+
+    result = get_message_service().send_kakao_friendtalk(
+        to=student.parent_phone,
+        text=full_text,
+        image_url=image_url,
+        from_number=from_number
+    )
+
+    return {
+        "student_name": student.name,
+        "parent_phone": student.parent_phone,
+        "result": result
+    }
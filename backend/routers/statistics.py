@@ -0,0 +1,339 @@
+"""통계 및 대시보드 API"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+import models
+from database import get_db
+
+router = APIRouter(tags=["통계"])
+
+# =================
+# Statistics API (통계 및 대시보드)
+# =================
+
+@router.get("/statistics/today-summary")
+def get_today_summary(db: Session = Depends(get_db)):
+    """오늘의 전체 요약 통계"""
+    today = date.today()
+
+    # 전체 재원 학생 수
+    total_students = db.query(models.Student).filter(
+        models.Student.status == "재원"
+    ).count()
+
+    # 오늘 출석 기록
+    attendance_records = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.date == today
+    ).all()
+
+    # 출석 상태별 카운트
+    present_count = sum(1 for r in attendance_records if r.status in ["자습중", "일정중"])
+    late_count = sum(1 for r in attendance_records if r.status == "지각")
+    absent_count = sum(1 for r in attendance_records if r.status == "결석")
+    school_count = sum(1 for r in attendance_records if r.status == "학교")
+
+    # 출석률 계산
+    attendance_rate = round((present_count / total_students * 100), 1) if total_students > 0 else 0
+    late_rate = round((late_count / total_students * 100), 1) if total_students > 0 else 0
+
+    # 오늘 순찰 횟수
+    patrol_count = db.query(models.Patrol).filter(
+        models.Patrol.patrol_date == today
+    ).count()
+
+    # 진행 중인 순찰
+    active_patrol = db.query(models.Patrol).filter(
+        models.Patrol.patrol_date == today,
+        models.Patrol.end_time == None
+    ).first()
+
+    # 오늘의 태도 체크 통계
+    attitude_checks = db.query(models.StudyAttitudeCheck).join(
+        models.Patrol
+    ).filter(
+        models.Patrol.patrol_date == today
+    ).all()
+
+    attitude_stats = {
+        "정상": sum(1 for c in attitude_checks if c.attitude_type == "정상"),
+        "졸음": sum(1 for c in attitude_checks if c.attitude_type == "졸음"),
+        "딴짓": sum(1 for c in attitude_checks if c.attitude_type == "딴짓"),
+        "이탈": sum(1 for c in attitude_checks if c.attitude_type == "이탈"),
+        "기타": sum(1 for c in attitude_checks if c.attitude_type == "기타"),
+    }
+
+    return {
+        "date": today,
+        "total_students": total_students,
+        "attendance": {
+            "present": present_count,
+            "late": late_count,
+            "absent": absent_count,
+            "school": school_count,
+            "attendance_rate": attendance_rate,
+            "late_rate": late_rate
+        },
+        "patrol": {
+            "count": patrol_count,
+            "active": active_patrol is not None,
+            "active_id": active_patrol.id if active_patrol else None
+        },
+        "attitude": attitude_stats
+    }
+
+
+@router.get("/statistics/attendance-trend")
+def get_attendance_trend(days: int = 7, db: Session = Depends(get_db)):
+    """출석률 추이 (최근 N일)"""
+    today = date.today()
+    start_date = today - timedelta(days=days - 1)
+
+    # 전체 재원 학생 수
+    total_students = db.query(models.Student).filter(
+        models.Student.status == "재원"
+    ).count()
+
+    # 날짜별 출석 데이터
+    trend_data = []
+    for i in range(days):
+        target_date = start_date + timedelta(days=i)
+
+        # 해당 날짜의 출석 기록
+        records = db.query(models.AttendanceRecord).filter(
+            models.AttendanceRecord.date == target_date
+        ).all()
+
+        present = sum(1 for r in records if r.status in ["자습중", "일정중"])
+        late = sum(1 for r in records if r.status == "지각")
+        absent = sum(1 for r in records if r.status == "결석")
+
+        attendance_rate = round((present / total_students * 100), 1) if total_students > 0 else 0
+        late_rate = round((late / total_students * 100), 1) if total_students > 0 else 0
+
+        trend_data.append({
+            "date": target_date.isoformat(),
+            "attendance_rate": attendance_rate,
+            "late_rate": late_rate,
+            "present_count": present,
+            "late_count": late,
+            "absent_count": absent
+        })
+
+    return {
+        "period": f"최근 {days}일",
+        "total_students": total_students,
+        "trend": trend_data
+    }
+
+
+@router.get("/statistics/patrol-history")
+def get_patrol_history(limit: int = 10, offset: int = 0, db: Session = Depends(get_db)):
+    """순찰 이력 조회 (페이지네이션)"""
+    # 최근 순찰 기록 조회 (최신순)
+    patrols = db.query(models.Patrol).order_by(
+        models.Patrol.patrol_date.desc(),
+        models.Patrol.start_time.desc()
+    ).offset(offset).limit(limit).all()
+
+    result = []
+    for patrol in patrols:
+        # 해당 순찰의 태도 체크 통계
+        attitude_checks = db.query(models.StudyAttitudeCheck).filter(
+            models.StudyAttitudeCheck.patrol_id == patrol.id
+        ).all()
+
+        attitude_summary = {
+            "정상": sum(1 for c in attitude_checks if c.attitude_type == "정상"),
+            "졸음": sum(1 for c in attitude_checks if c.attitude_type == "졸음"),
+            "딴짓": sum(1 for c in attitude_checks if c.attitude_type == "딴짓"),
+            "이탈": sum(1 for c in attitude_checks if c.attitude_type == "이탈"),
+            "기타": sum(1 for c in attitude_checks if c.attitude_type == "기타"),
+        }
+
+        # 순찰 소요 시간 계산
+        duration_minutes = None
+        if patrol.end_time and patrol.start_time:
+            start_dt = datetime.combine(patrol.patrol_date, patrol.start_time)
+            end_dt = datetime.combine(patrol.patrol_date, patrol.end_time)
+            duration = end_dt - start_dt
+            duration_minutes = int(duration.total_seconds() / 60)
+
+        result.append({
+            "id": patrol.id,
+            "date": patrol.patrol_date.isoformat(),
+            "start_time": patrol.start_time.strftime("%H:%M") if patrol.start_time else None,
+            "end_time": patrol.end_time.strftime("%H:%M") if patrol.end_time else None,
+            "duration_minutes": duration_minutes,
+            "inspector_name": patrol.inspector_name,
+            "notes": patrol.notes,
+            "attitude_summary": attitude_summary,
+            "total_checks": len(attitude_checks),
+            "is_active": patrol.end_time is None
+        })
+
+    # 전체 순찰 수
+    total_count = db.query(models.Patrol).count()
+
+    return {
+        "patrols": result,
+        "total": total_count,
+        "limit": limit,
+        "offset": offset
+    }
+
+
+@router.get("/statistics/weekly-report")
+def get_weekly_report(db: Session = Depends(get_db)):
+    """주간 리포트 (최근 7일)"""
+    today = date.today()
+    week_start = today - timedelta(days=6)
+
+    # 전체 재원 학생 수
+    total_students = db.query(models.Student).filter(
+        models.Student.status == "재원"
+    ).count()
+
+    # 주간 출석 데이터
+    week_attendance = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.date >= week_start,
+        models.AttendanceRecord.date <= today
+    ).all()
+
+    # 주간 순찰 데이터
+    week_patrols = db.query(models.Patrol).filter(
+        models.Patrol.patrol_date >= week_start,
+        models.Patrol.patrol_date <= today
+    ).all()
+
+    # 주간 태도 체크
+    week_attitudes = db.query(models.StudyAttitudeCheck).join(
+        models.Patrol
+    ).filter(
+        models.Patrol.patrol_date >= week_start,
+        models.Patrol.patrol_date <= today
+    ).all()
+
+    # 통계 계산
+    avg_attendance_rate = 0
+    avg_late_rate = 0
+    if total_students > 0:
+        present_avg = sum(1 for r in week_attendance if r.status in ["자습중", "일정중"]) / 7
+        late_avg = sum(1 for r in week_attendance if r.status == "지각") / 7
+        avg_attendance_rate = round((present_avg / total_students * 100), 1)
+        avg_late_rate = round((late_avg / total_students * 100), 1)
+
+    attitude_summary = {
+        "정상": sum(1 for c in week_attitudes if c.attitude_type == "정상"),
+        "졸음": sum(1 for c in week_attitudes if c.attitude_type == "졸음"),
+        "딴짓": sum(1 for c in week_attitudes if c.attitude_type == "딴짓"),
+        "이탈": sum(1 for c in week_attitudes if c.attitude_type == "이탈"),
+        "기타": sum(1 for c in week_attitudes if c.attitude_type == "기타"),
+    }
+
+    return {
+        "period": {
+            "start": week_start.isoformat(),
+            "end": today.isoformat()
+        },
+        "total_students": total_students,
+        "attendance": {
+            "avg_rate": avg_attendance_rate,
+            "avg_late_rate": avg_late_rate,
+            "total_records": len(week_attendance)
+        },
+        "patrol": {
+            "total_count": len(week_patrols),
+            "avg_per_day": round(len(week_patrols) / 7, 1)
+        },
+        "attitude": attitude_summary
+    }
+
+
+@router.get("/statistics/monthly-report")
+def get_monthly_report(db: Session = Depends(get_db)):
+    """월간 리포트 (최근 30일)"""
+    today = date.today()
+    month_start = today - timedelta(days=29)
+
+    # 전체 재원 학생 수
+    total_students = db.query(models.Student).filter(
+        models.Student.status == "재원"
+    ).count()
+
+    # 월간 출석 데이터
+    month_attendance = db.query(models.AttendanceRecord).filter(
+        models.AttendanceRecord.date >= month_start,
+        models.AttendanceRecord.date <= today
+    ).all()
+
+    # 월간 순찰 데이터
+    month_patrols = db.query(models.Patrol).filter(
+        models.Patrol.patrol_date >= month_start,
+        models.Patrol.patrol_date <= today
+    ).all()
+
+    # 월간 태도 체크
+    month_attitudes = db.query(models.StudyAttitudeCheck).join(
+        models.Patrol
+    ).filter(
+        models.Patrol.patrol_date >= month_start,
+        models.Patrol.patrol_date <= today
+    ).all()
+
+    # 통계 계산
+    avg_attendance_rate = 0
+    avg_late_rate = 0
+    if total_students > 0:
+        present_avg = sum(1 for r in month_attendance if r.status in ["자습중", "일정중"]) / 30
+        late_avg = sum(1 for r in month_attendance if r.status == "지각") / 30
+        avg_attendance_rate = round((present_avg / total_students * 100), 1)
+        avg_late_rate = round((late_avg / total_students * 100), 1)
+
+    attitude_summary = {
+        "정상": sum(1 for c in month_attitudes if c.attitude_type == "정상"),
+        "졸음": sum(1 for c in month_attitudes if c.attitude_type == "졸음"),
+        "딴짓": sum(1 for c in month_attitudes if c.attitude_type == "딴짓"),
+        "이탈": sum(1 for c in month_attitudes if c.attitude_type == "이탈"),
+        "기타": sum(1 for c in month_attitudes if c.attitude_type == "기타"),
+    }
+
+    # 주별 추이 데이터 (4주)
+    weekly_trend = []
+    for week_num in range(4):
+        week_start_date = month_start + timedelta(days=week_num * 7)
+        week_end_date = min(week_start_date + timedelta(days=6), today)
+
+        week_records = [r for r in month_attendance
+                       if week_start_date <= r.date <= week_end_date]
+
+        present = sum(1 for r in week_records if r.status in ["자습중", "일정중"])
+        late = sum(1 for r in week_records if r.status == "지각")
+
+        week_rate = round((present / (total_students * 7) * 100), 1) if total_students > 0 else 0
+
+        weekly_trend.append({
+            "week": week_num + 1,
+            "start": week_start_date.isoformat(),
+            "end": week_end_date.isoformat(),
+            "attendance_rate": week_rate,
+            "late_count": late
+        })
+
+    return {
+        "period": {
+            "start": month_start.isoformat(),
+            "end": today.isoformat()
+        },
+        "total_students": total_students,
+        "attendance": {
+            "avg_rate": avg_attendance_rate,
+            "avg_late_rate": avg_late_rate,
+            "total_records": len(month_attendance)
+        },
+        "patrol": {
+            "total_count": len(month_patrols),
+            "avg_per_day": round(len(month_patrols) / 30, 1)
+        },
+        "attitude": attitude_summary,
+        "weekly_trend": weekly_trend
+    }
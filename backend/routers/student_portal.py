@@ -0,0 +1,486 @@
+"""학생 포털 API (로그인, 학생 요청, 물품 관리, 휴대폰 제출)"""
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date, datetime
+import models, schemas
+from database import get_db
+
+from .deps import validate_period_timing
+
+router = APIRouter(tags=["학생 포털"])
+
+# =================
+# Student Portal API (학생 포털)
+# =================
+
+@router.post("/student-portal/login", response_model=schemas.StudentPortalLoginResponse)
+def student_portal_login(login_data: schemas.StudentPortalLogin, db: Session = Depends(get_db)):
+    """학생 포털 로그인 (이름 + 좌석번호 인증)"""
+    # 학생 조회
+    student = db.query(models.Student).filter(
+        models.Student.name == login_data.name,
+        models.Student.seat_number == login_data.seat_number,
+        models.Student.status == "재원"
+    ).first()
+
+    if not student:
+        raise HTTPException(status_code=401, detail="이름 또는 좌석번호가 일치하지 않습니다")
+
+    return {
+        "student_id": student.id,
+        "name": student.name,
+        "seat_number": student.seat_number,
+        "token": None  # 필요 시 JWT 토큰 추가
+    }
+
+
+# =================
+# Student Request API (학생 요청 시스템)
+# =================
+
+@router.post("/student-requests/", response_model=schemas.StudentRequest)
+def create_student_request(request: schemas.StudentRequestCreate, db: Session = Depends(get_db)):
+    """학생 요청 생성"""
+    # 학생 존재 확인
+    student = db.query(models.Student).filter(models.Student.id == request.student_id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="학생을 찾을 수 없습니다")
+
+    db_request = models.StudentRequest(**request.dict())
+    db.add(db_request)
+    db.commit()
+    db.refresh(db_request)
+    return db_request
+
+
+@router.get("/student-requests/my/{student_id}", response_model=List[schemas.StudentRequestWithDetails])
+def get_my_requests(student_id: int, status: Optional[str] = None, db: Session = Depends(get_db)):
+    """내 요청 목록 조회 (학생용)"""
+    query = db.query(models.StudentRequest).filter(models.StudentRequest.student_id == student_id)
+
+    if status:
+        query = query.filter(models.StudentRequest.status == status)
+
+    requests = query.order_by(models.StudentRequest.created_at.desc()).all()
+
+    # 학생 정보 추가
+    result = []
+    for req in requests:
+        req_dict = schemas.StudentRequest.model_validate(req).model_dump()
+        req_dict["student_name"] = req.student.name
+        req_dict["student_seat_number"] = req.student.seat_number
+        result.append(schemas.StudentRequestWithDetails(**req_dict))
+
+    return result
+
+
+@router.delete("/student-requests/{request_id}")
+def cancel_student_request(request_id: int, student_id: int, db: Session = Depends(get_db)):
+    """학생 요청 취소 (대기 상태만 가능)"""
+    request = db.query(models.StudentRequest).filter(
+        models.StudentRequest.id == request_id,
+        models.StudentRequest.student_id == student_id
+    ).first()
+
+    if not request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    if request.status != "대기":
+        raise HTTPException(status_code=400, detail="대기 상태인 요청만 취소할 수 있습니다")
+
+    db.delete(request)
+    db.commit()
+    return {"message": "요청이 취소되었습니다"}
+
+
+# =================
+# Admin Student Request API (관리자용)
+# =================
+
+@router.get("/student-requests/", response_model=List[schemas.StudentRequestWithDetails])
+def get_all_student_requests(
+    status: Optional[str] = None,
+    request_type: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """전체 학생 요청 목록 (관리자용)"""
+    query = db.query(models.StudentRequest)
+
+    if status:
+        query = query.filter(models.StudentRequest.status == status)
+    if request_type:
+        query = query.filter(models.StudentRequest.request_type == request_type)
+
+    requests = query.order_by(models.StudentRequest.created_at.desc()).all()
+
+    # 학생 정보 추가
+    result = []
+    for req in requests:
+        req_dict = schemas.StudentRequest.model_validate(req).model_dump()
+        req_dict["student_name"] = req.student.name
+        req_dict["student_seat_number"] = req.student.seat_number
+        result.append(schemas.StudentRequestWithDetails(**req_dict))
+
+    return result
+
+
+@router.get("/student-requests/pending", response_model=List[schemas.StudentRequestWithDetails])
+def get_pending_requests(db: Session = Depends(get_db)):
+    """대기 중인 요청 목록"""
+    requests = db.query(models.StudentRequest).filter(
+        models.StudentRequest.status == "대기"
+    ).order_by(
+        models.StudentRequest.priority.desc(),  # 긴급 우선
+        models.StudentRequest.created_at
+    ).all()
+
+    # 학생 정보 추가
+    result = []
+    for req in requests:
+        req_dict = schemas.StudentRequest.model_validate(req).model_dump()
+        req_dict["student_name"] = req.student.name
+        req_dict["student_seat_number"] = req.student.seat_number
+        result.append(schemas.StudentRequestWithDetails(**req_dict))
+
+    return result
+
+
+@router.put("/student-requests/{request_id}/approve")
+def approve_student_request(
+    request_id: int,
+    update: schemas.StudentRequestUpdate,
+    db: Session = Depends(get_db)
+):
+    """학생 요청 승인"""
+    request = db.query(models.StudentRequest).filter(models.StudentRequest.id == request_id).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    request.status = "승인"
+    request.processed_at = datetime.now()
+    if update.processed_by:
+        request.processed_by = update.processed_by
+    if update.admin_note:
+        request.admin_note = update.admin_note
+
+    db.commit()
+    db.refresh(request)
+    return {"message": "요청이 승인되었습니다", "request": request}
+
+
+@router.put("/student-requests/{request_id}/reject")
+def reject_student_request(
+    request_id: int,
+    update: schemas.StudentRequestUpdate,
+    db: Session = Depends(get_db)
+):
+    """학생 요청 거부"""
+    request = db.query(models.StudentRequest).filter(models.StudentRequest.id == request_id).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    request.status = "거부"
+    request.processed_at = datetime.now()
+    if update.processed_by:
+        request.processed_by = update.processed_by
+    if update.admin_note:
+        request.admin_note = update.admin_note
+
+    db.commit()
+    db.refresh(request)
+    return {"message": "요청이 거부되었습니다", "request": request}
+
+
+@router.put("/student-requests/{request_id}/complete")
+def complete_student_request(
+    request_id: int,
+    update: schemas.StudentRequestUpdate,
+    db: Session = Depends(get_db)
+):
+    """학생 요청 완료 처리"""
+    request = db.query(models.StudentRequest).filter(models.StudentRequest.id == request_id).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    request.status = "완료"
+    if update.processed_by:
+        request.processed_by = update.processed_by
+    if update.admin_note:
+        request.admin_note = update.admin_note
+
+    db.commit()
+    db.refresh(request)
+    return {"message": "요청이 완료되었습니다", "request": request}
+
+
+@router.put("/student-requests/{request_id}/deliver")
+def deliver_student_request(
+    request_id: int,
+    delivered_by: str,
+    item_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """학생 요청 가져다줬다 확인"""
+    request = db.query(models.StudentRequest).filter(models.StudentRequest.id == request_id).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    request.delivered = True
+    request.delivered_at = datetime.now()
+    request.delivered_by = delivered_by
+
+    # 물품 ID 연결 (보조배터리 등)
+    if item_id:
+        item = db.query(models.Item).filter(models.Item.id == item_id).first()
+        if item:
+            request.item_id = item_id
+            item.is_available = False  # 물품을 대여중으로 표시
+
+    # 보조배터리인 경우 상태를 "배달완료"로 변경
+    if request.request_type == "보조배터리":
+        request.status = "배달완료"
+
+    db.commit()
+    db.refresh(request)
+    return {"message": "가져다줬습니다", "request": request}
+
+
+@router.put("/student-requests/{request_id}/return")
+def return_student_request(
+    request_id: int,
+    db: Session = Depends(get_db)
+):
+    """보조배터리 반납 확인"""
+    request = db.query(models.StudentRequest).filter(models.StudentRequest.id == request_id).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="요청을 찾을 수 없습니다")
+
+    if request.request_type != "보조배터리":
+        raise HTTPException(status_code=400, detail="보조배터리 요청만 반납할 수 있습니다")
+
+    request.returned = True
+    request.returned_at = datetime.now()
+    request.status = "완료"
+
+    # 물품을 다시 사용 가능하도록 표시
+    if request.item_id:
+        item = db.query(models.Item).filter(models.Item.id == request.item_id).first()
+        if item:
+            item.is_available = True
+
+    db.commit()
+    db.refresh(request)
+    return {"message": "반납 완료되었습니다", "request": request}
+
+
+# =================
+# Item Management API (물품 관리)
+# =================
+
+@router.post("/items/", response_model=schemas.Item)
+def create_item(item: schemas.ItemCreate, db: Session = Depends(get_db)):
+    """물품 등록"""
+    db_item = models.Item(**item.dict())
+    db.add(db_item)
+    db.commit()
+    db.refresh(db_item)
+    return db_item
+
+
+@router.get("/items/", response_model=List[schemas.Item])
+def get_items(
+    category: Optional[str] = None,
+    available_only: bool = False,
+    db: Session = Depends(get_db)
+):
+    """물품 목록 조회"""
+    query = db.query(models.Item)
+
+    if category:
+        query = query.filter(models.Item.category == category)
+
+    if available_only:
+        query = query.filter(models.Item.is_available == True)
+
+    return query.order_by(models.Item.category, models.Item.name).all()
+
+
+@router.get("/items/{item_id}", response_model=schemas.Item)
+def get_item(item_id: int, db: Session = Depends(get_db)):
+    """물품 상세 조회"""
+    item = db.query(models.Item).filter(models.Item.id == item_id).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="물품을 찾을 수 없습니다")
+    return item
+
+
+@router.put("/items/{item_id}", response_model=schemas.Item)
+def update_item(item_id: int, item_update: schemas.ItemUpdate, db: Session = Depends(get_db)):
+    """물품 정보 수정"""
+    item = db.query(models.Item).filter(models.Item.id == item_id).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="물품을 찾을 수 없습니다")
+
+    update_data = item_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(item, field, value)
+
+    db.commit()
+    db.refresh(item)
+    return item
+
+
+@router.delete("/items/{item_id}")
+def delete_item(item_id: int, db: Session = Depends(get_db)):
+    """물품 삭제"""
+    item = db.query(models.Item).filter(models.Item.id == item_id).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="물품을 찾을 수 없습니다")
+
+    # 대여 중인 물품은 삭제 불가
+    if not item.is_available:
+        raise HTTPException(status_code=400, detail="대여 중인 물품은 삭제할 수 없습니다")
+
+    db.delete(item)
+    db.commit()
+    return {"message": "물품이 삭제되었습니다"}
+
+
+@router.get("/items/rentals/active")
+def get_active_rentals(db: Session = Depends(get_db)):
+    """현재 대여 중인 물품 목록"""
+    # 배달완료 상태이면서 아직 반납되지 않은 요청들
+    active_rentals = db.query(models.StudentRequest).filter(
+        models.StudentRequest.status == "배달완료",
+        models.StudentRequest.returned == False,
+        models.StudentRequest.item_id.isnot(None)
+    ).all()
+
+    result = []
+    for rental in active_rentals:
+        item = db.query(models.Item).filter(models.Item.id == rental.item_id).first()
+        student = db.query(models.Student).filter(models.Student.id == rental.student_id).first()
+
+        result.append({
+            "request_id": rental.id,
+            "item_id": rental.item_id,
+            "item_name": item.name if item else None,
+            "item_category": item.category if item else None,
+            "student_name": student.name if student else None,
+            "student_seat": student.seat_number if student else None,
+            "cable_type": rental.cable_type,
+            "delivered_at": rental.delivered_at,
+            "return_due_period": rental.return_due_period,
+            "delivered_by": rental.delivered_by
+        })
+
+    return result
+
+
+# =================
+# Phone Submission API (휴대폰 제출 관리 - 교시별)
+# =================
+
+@router.post("/phone-submissions/period/bulk")
+def bulk_update_phone_submissions(
+    period: int,
+    checked_by: str = Body(default="감독자"),
+    submissions: List[schemas.PhoneSubmissionUpdate] = Body(...),
+    force: bool = Query(default=False),
+    db: Session = Depends(get_db)
+):
+    """교시별 휴대폰 제출 상태 일괄 업데이트 (시간 검증 포함)"""
+
+    # 시간 검증 (force=False일 때만)
+    if not force:
+        validation = validate_period_timing(period)
+        if not validation["is_current"]:
+            # 경고 반환 (프론트에서 사용자 확인 후 force=True로 재요청)
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "type": "period_mismatch",
+                    "message": validation["warning_message"],
+                    "current_period": validation["current_period"]
+                }
+            )
+
+    today = date.today()
+
+    for update in submissions:
+        student_id = update.student_id
+        is_submitted = update.is_submitted
+
+        # 기존 레코드 찾기
+        existing = db.query(models.PhoneSubmission).filter(
+            models.PhoneSubmission.student_id == student_id,
+            models.PhoneSubmission.date == today,
+            models.PhoneSubmission.period == period
+        ).first()
+
+        if existing:
+            existing.is_submitted = is_submitted
+            existing.checked_by = checked_by
+        else:
+            new_record = models.PhoneSubmission(
+                student_id=student_id,
+                date=today,
+                period=period,
+                is_submitted=is_submitted,
+                checked_by=checked_by
+            )
+            db.add(new_record)
+
+    db.commit()
+    return {"message": f"{period}교시 휴대폰 제출 상태가 저장되었습니다"}
+
+
+@router.get("/phone-submissions/today/by-period", response_model=List[schemas.PhoneSubmissionWithDetails])
+def get_today_phone_submissions_by_period(db: Session = Depends(get_db)):
+    """오늘 교시별 휴대폰 제출 기록 조회 (학생별로 그룹화)"""
+    today = date.today()
+
+    # 오늘의 모든 제출 기록 조회
+    submissions = db.query(models.PhoneSubmission).filter(
+        models.PhoneSubmission.date == today
+    ).order_by(models.PhoneSubmission.period).all()
+
+    # 학생별로 교시 정보 구성
+    student_records = {}
+    for sub in submissions:
+        if sub.student_id not in student_records:
+            student_records[sub.student_id] = {
+                "student_id": sub.student_id,
+                "student_name": sub.student.name,
+                "student_seat_number": sub.student.seat_number,
+                "periods": {}
+            }
+        student_records[sub.student_id]["periods"][sub.period] = sub.is_submitted
+
+    # 결과 변환
+    result = []
+    for student_id, data in student_records.items():
+        result.append({
+            "student_id": data["student_id"],
+            "student_name": data["student_name"],
+            "student_seat_number": data["student_seat_number"],
+            "is_submitted": data["periods"].get(1, True)  # 기본값 True
+        })
+
+    return result
+
+
+@router.delete("/phone-submissions/{submission_id}")
+def delete_phone_submission(submission_id: int, db: Session = Depends(get_db)):
+    """휴대폰 제출 기록 삭제"""
+    submission = db.query(models.PhoneSubmission).filter(
+        models.PhoneSubmission.id == submission_id
+    ).first()
+
+    if not submission:
+        raise HTTPException(status_code=404, detail="제출 기록을 찾을 수 없습니다")
+
+    db.delete(submission)
+    db.commit()
+    return {"message": "삭제되었습니다"}
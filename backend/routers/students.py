@@ -0,0 +1,406 @@
+"""학생/벌점/일정/외출/순찰 기록/정기 외출/정기 상담/문의/등록 API"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import models, schemas
+from database import get_db
+
+from timetable import refresh_student_timeline
+
+router = APIRouter(tags=["학생 관리"])
+
+# --- Student Endpoints ---
+@router.post("/students/", response_model=schemas.Student)
+def create_student(student: schemas.StudentCreate, db: Session = Depends(get_db)):
+    db_student = models.Student(**student.dict())
+    db.add(db_student)
+    db.commit()
+    db.refresh(db_student)
+    return db_student
+
+@router.get("/students/", response_model=List[schemas.Student])
+def read_students(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    students = db.query(models.Student).offset(skip).limit(limit).all()
+    return students
+
+@router.get("/students/{student_id}", response_model=schemas.StudentDetail)
+def read_student(student_id: int, db: Session = Depends(get_db)):
+    student = db.query(models.Student).filter(models.Student.id == student_id).first()
+    if student is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return student
+
+@router.put("/students/{student_id}", response_model=schemas.Student)
+def update_student(student_id: int, student_update: schemas.StudentUpdate, db: Session = Depends(get_db)):
+    db_student = db.query(models.Student).filter(models.Student.id == student_id).first()
+    if db_student is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    
+    update_data = student_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_student, key, value)
+    
+    db.add(db_student)
+    db.commit()
+    db.refresh(db_student)
+    refresh_student_timeline(db, db_student.id)
+    return db_student
+
+@router.delete("/students/{student_id}")
+def delete_student(student_id: int, db: Session = Depends(get_db)):
+    db_student = db.query(models.Student).filter(models.Student.id == student_id).first()
+    if db_student is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    
+    db.delete(db_student)
+    db.commit()
+    refresh_student_timeline(db, student_id)
+    return {"message": "Student deleted successfully"}
+
+# --- Penalty Endpoints ---
+@router.post("/penalties/", response_model=schemas.Penalty)
+def create_penalty(penalty: schemas.PenaltyCreate, db: Session = Depends(get_db)):
+    db_penalty = models.Penalty(**penalty.dict())
+    db.add(db_penalty)
+    db.commit()
+    db.refresh(db_penalty)
+    return db_penalty
+
+@router.get("/students/{student_id}/penalties", response_model=List[schemas.Penalty])
+def read_student_penalties(student_id: int, db: Session = Depends(get_db)):
+    penalties = db.query(models.Penalty).filter(models.Penalty.student_id == student_id).all()
+    return penalties
+
+@router.get("/penalties/", response_model=List[schemas.Penalty])
+def read_penalties(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    penalties = db.query(models.Penalty).order_by(models.Penalty.date.desc()).offset(skip).limit(limit).all()
+    return penalties
+
+# --- Schedule Endpoints ---
+@router.post("/schedules/", response_model=schemas.Schedule)
+def create_schedule(schedule: schemas.ScheduleCreate, db: Session = Depends(get_db)):
+    db_schedule = models.Schedule(**schedule.dict())
+    db.add(db_schedule)
+    db.commit()
+    db.refresh(db_schedule)
+    return db_schedule
+
+@router.get("/schedules/", response_model=List[schemas.Schedule])
+def read_schedules(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    schedules = db.query(models.Schedule).order_by(models.Schedule.date.asc()).offset(skip).limit(limit).all()
+    return schedules
+
+@router.put("/schedules/{schedule_id}", response_model=schemas.Schedule)
+def update_schedule(schedule_id: int, schedule_update: schemas.ScheduleUpdate, db: Session = Depends(get_db)):
+    db_schedule = db.query(models.Schedule).filter(models.Schedule.id == schedule_id).first()
+    if db_schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    
+    update_data = schedule_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_schedule, key, value)
+    
+    db.add(db_schedule)
+    db.commit()
+    db.refresh(db_schedule)
+    return db_schedule
+
+@router.delete("/schedules/{schedule_id}")
+def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
+    db_schedule = db.query(models.Schedule).filter(models.Schedule.id == schedule_id).first()
+    if db_schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    
+    db.delete(db_schedule)
+    db.commit()
+    return {"message": "Schedule deleted successfully"}
+
+# --- Outing Endpoints ---
+@router.post("/outings/", response_model=schemas.Outing)
+def create_outing(outing: schemas.OutingCreate, db: Session = Depends(get_db)):
+    db_outing = models.Outing(**outing.dict())
+    db.add(db_outing)
+    db.commit()
+    db.refresh(db_outing)
+    refresh_student_timeline(db, db_outing.student_id)
+    return db_outing
+
+@router.get("/outings/", response_model=List[schemas.Outing])
+def read_outings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    outings = db.query(models.Outing).order_by(models.Outing.date.asc()).offset(skip).limit(limit).all()
+    return outings
+
+@router.put("/outings/{outing_id}", response_model=schemas.Outing)
+def update_outing(outing_id: int, outing_update: schemas.OutingUpdate, db: Session = Depends(get_db)):
+    db_outing = db.query(models.Outing).filter(models.Outing.id == outing_id).first()
+    if db_outing is None:
+        raise HTTPException(status_code=404, detail="Outing not found")
+    
+    update_data = outing_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_outing, key, value)
+    
+    db.add(db_outing)
+    db.commit()
+    db.refresh(db_outing)
+    refresh_student_timeline(db, db_outing.student_id)
+    return db_outing
+
+@router.delete("/outings/{outing_id}")
+def delete_outing(outing_id: int, db: Session = Depends(get_db)):
+    db_outing = db.query(models.Outing).filter(models.Outing.id == outing_id).first()
+    if db_outing is None:
+        raise HTTPException(status_code=404, detail="Outing not found")
+    
+    student_id = db_outing.student_id
+    db.delete(db_outing)
+    db.commit()
+    refresh_student_timeline(db, student_id)
+    return {"message": "Outing deleted successfully"}
+
+# --- Patrol Endpoints ---
+@router.post("/patrols/", response_model=schemas.Patrol)
+def create_patrol(patrol: schemas.PatrolCreate, db: Session = Depends(get_db)):
+    db_patrol = models.Patrol(**patrol.dict())
+    db.add(db_patrol)
+    db.commit()
+    db.refresh(db_patrol)
+    return db_patrol
+
+@router.get("/patrols/", response_model=List[schemas.Patrol])
+def read_patrols(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    patrols = db.query(models.Patrol).order_by(models.Patrol.patrol_date.desc()).offset(skip).limit(limit).all()
+    return patrols
+
+# --- Recurring Outing Endpoints ---
+@router.post("/recurring-outings/", response_model=schemas.RecurringOuting)
+def create_recurring_outing(recurring_outing: schemas.RecurringOutingCreate, db: Session = Depends(get_db)):
+    db_recurring_outing = models.RecurringOuting(**recurring_outing.dict())
+    db.add(db_recurring_outing)
+    db.commit()
+    db.refresh(db_recurring_outing)
+    refresh_student_timeline(db, db_recurring_outing.student_id)
+    return db_recurring_outing
+
+@router.get("/recurring-outings/", response_model=List[schemas.RecurringOuting])
+def read_recurring_outings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    recurring_outings = db.query(models.RecurringOuting).filter(models.RecurringOuting.is_active == 1).offset(skip).limit(limit).all()
+    return recurring_outings
+
+@router.put("/recurring-outings/{recurring_outing_id}", response_model=schemas.RecurringOuting)
+def update_recurring_outing(recurring_outing_id: int, recurring_outing_update: schemas.RecurringOutingUpdate, db: Session = Depends(get_db)):
+    db_recurring_outing = db.query(models.RecurringOuting).filter(models.RecurringOuting.id == recurring_outing_id).first()
+    if db_recurring_outing is None:
+        raise HTTPException(status_code=404, detail="Recurring outing not found")
+    
+    update_data = recurring_outing_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_recurring_outing, key, value)
+    
+    db.add(db_recurring_outing)
+    db.commit()
+    db.refresh(db_recurring_outing)
+    refresh_student_timeline(db, db_recurring_outing.student_id)
+    return db_recurring_outing
+
+@router.delete("/recurring-outings/{recurring_outing_id}")
+def delete_recurring_outing(recurring_outing_id: int, db: Session = Depends(get_db)):
+    db_recurring_outing = db.query(models.RecurringOuting).filter(models.RecurringOuting.id == recurring_outing_id).first()
+    if db_recurring_outing is None:
+        raise HTTPException(status_code=404, detail="Recurring outing not found")
+    
+    db_recurring_outing.is_active = 0
+    db.commit()
+    refresh_student_timeline(db, db_recurring_outing.student_id)
+    return {"message": "Recurring outing deactivated successfully"}
+
+# --- Recurring Counseling Endpoints ---
+@router.post("/recurring-counseling/", response_model=schemas.RecurringCounseling)
+def create_recurring_counseling(recurring_counseling: schemas.RecurringCounselingCreate, db: Session = Depends(get_db)):
+    db_recurring_counseling = models.RecurringCounseling(**recurring_counseling.dict())
+    db.add(db_recurring_counseling)
+    db.commit()
+    db.refresh(db_recurring_counseling)
+    return db_recurring_counseling
+
+@router.get("/recurring-counseling/", response_model=List[schemas.RecurringCounseling])
+def read_recurring_counseling(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    recurring_counseling = db.query(models.RecurringCounseling).filter(models.RecurringCounseling.is_active == 1).offset(skip).limit(limit).all()
+    return recurring_counseling
+
+@router.put("/recurring-counseling/{recurring_counseling_id}", response_model=schemas.RecurringCounseling)
+def update_recurring_counseling(recurring_counseling_id: int, recurring_counseling_update: schemas.RecurringCounselingUpdate, db: Session = Depends(get_db)):
+    db_recurring_counseling = db.query(models.RecurringCounseling).filter(models.RecurringCounseling.id == recurring_counseling_id).first()
+    if db_recurring_counseling is None:
+        raise HTTPException(status_code=404, detail="Recurring counseling not found")
+    
+    update_data = recurring_counseling_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_recurring_counseling, key, value)
+    
+    db.add(db_recurring_counseling)
+    db.commit()
+    db.refresh(db_recurring_counseling)
+    return db_recurring_counseling
+
+@router.delete("/recurring-counseling/{recurring_counseling_id}")
+def delete_recurring_counseling(recurring_counseling_id: int, db: Session = Depends(get_db)):
+    db_recurring_counseling = db.query(models.RecurringCounseling).filter(models.RecurringCounseling.id == recurring_counseling_id).first()
+    if db_recurring_counseling is None:
+        raise HTTPException(status_code=404, detail="Recurring counseling not found")
+    
+    db_recurring_counseling.is_active = 0
+    db.commit()
+    return {"message": "Recurring counseling deactivated successfully"}
+# Inquiry and Student Registration API endpoints
+# Add these to main.py
+
+# --- Inquiry Endpoints ---
+@router.post("/inquiries/", response_model=schemas.Inquiry)
+def create_inquiry(inquiry: schemas.InquiryCreate, db: Session = Depends(get_db)):
+    """?좉퇋 ?깅줉 臾몄쓽 ?앹꽦"""
+    db_inquiry = models.Inquiry(**inquiry.dict())
+    db.add(db_inquiry)
+    db.commit()
+    db.refresh(db_inquiry)
+    return db_inquiry
+
+@router.get("/inquiries/", response_model=List[schemas.Inquiry])
+def read_inquiries(
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """臾몄쓽 紐⑸줉 議고쉶 (?곹깭蹂??꾪꽣留?각??"""
+    query = db.query(models.Inquiry)
+    if status:
+        query = query.filter(models.Inquiry.status == status)
+    inquiries = query.order_by(models.Inquiry.created_at.desc()).offset(skip).limit(limit).all()
+    return inquiries
+
+@router.get("/inquiries/{inquiry_id}", response_model=schemas.Inquiry)
+def read_inquiry(inquiry_id: int, db: Session = Depends(get_db)):
+    """臾몄쓽 ?곸꽭 議고쉶"""
+    inquiry = db.query(models.Inquiry).filter(models.Inquiry.id == inquiry_id).first()
+    if inquiry is None:
+        raise HTTPException(status_code=404, detail="Inquiry not found")
+    return inquiry
+
+@router.put("/inquiries/{inquiry_id}", response_model=schemas.Inquiry)
+def update_inquiry(inquiry_id: int, inquiry_update: schemas.InquiryUpdate, db: Session = Depends(get_db)):
+    """臾몄쓽 ?섏젙"""
+    db_inquiry = db.query(models.Inquiry).filter(models.Inquiry.id == inquiry_id).first()
+    if db_inquiry is None:
+        raise HTTPException(status_code=404, detail="Inquiry not found")
+    
+    update_data = inquiry_update.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_inquiry, key, value)
+    
+    db.add(db_inquiry)
+    db.commit()
+    db.refresh(db_inquiry)
+    return db_inquiry
+
+@router.delete("/inquiries/{inquiry_id}")
+def delete_inquiry(inquiry_id: int, db: Session = Depends(get_db)):
+    """臾몄쓽 ??젣"""
+    db_inquiry = db.query(models.Inquiry).filter(models.Inquiry.id == inquiry_id).first()
+    if db_inquiry is None:
+        raise HTTPException(status_code=404, detail="Inquiry not found")
+    
+    db.delete(db_inquiry)
+    db.commit()
+    return {"message": "Inquiry deleted successfully"}
+
+# --- Student Registration Endpoints ---
+@router.post("/student-registrations/", response_model=schemas.StudentRegistration)
+def create_student_registration(registration: schemas.StudentRegistrationCreate, db: Session = Depends(get_db)):
+    """?좎엯??湲곗큹議곗궗 ?쒖텧 (怨듦컻 API)"""
+    db_registration = models.StudentRegistration(**registration.dict())
+    db.add(db_registration)
+    db.commit()
+    db.refresh(db_registration)
+    
+    # TODO: Send Discord webhook notification
+    # send_discord_notification_registration(db_registration)
+    
+    return db_registration
+
+@router.get("/student-registrations/", response_model=List[schemas.StudentRegistration])
+def read_student_registrations(
+    is_processed: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """湲곗큹議곗궗 ?쒖텧 紐⑸줉 議고쉶"""
+    query = db.query(models.StudentRegistration)
+    if is_processed is not None:
+        query = query.filter(models.StudentRegistration.is_processed == is_processed)
+    registrations = query.order_by(models.StudentRegistration.created_at.desc()).offset(skip).limit(limit).all()
+    return registrations
+
+@router.get("/student-registrations/{registration_id}", response_model=schemas.StudentRegistration)
+def read_student_registration(registration_id: int, db: Session = Depends(get_db)):
+    """湲곗큹議곗궗 ?쒖텧 ?곸꽭 議고쉶"""
+    registration = db.query(models.StudentRegistration).filter(models.StudentRegistration.id == registration_id).first()
+    if registration is None:
+        raise HTTPException(status_code=404, detail="Registration not found")
+    return registration
+
+@router.post("/student-registrations/{registration_id}/process", response_model=schemas.Student)
+def process_student_registration(registration_id: int, seat_number: str, db: Session = Depends(get_db)):
+    """湲곗큹議곗궗 ?곗씠?곕? 湲곕컲?쇰줈 ?숈깮 DB ?앹꽦"""
+    registration = db.query(models.StudentRegistration).filter(models.StudentRegistration.id == registration_id).first()
+    if registration is None:
+        raise HTTPException(status_code=404, detail="Registration not found")
+    
+    if registration.is_processed:
+        raise HTTPException(status_code=400, detail="Registration already processed")
+    
+    # Create student from registration data
+    student_data = {
+        "name": registration.student_name,
+        "seat_number": seat_number,
+        "status": "재원",
+        "student_phone": registration.student_phone,
+        "parent_phone": registration.parent_phone,
+        "gender": registration.gender,
+        "student_type": registration.student_type,
+        "korean_subject": registration.korean_subject,
+        "math_subject": registration.math_subject,
+        "inquiry_subjects": registration.inquiry_subjects,
+        "recent_grade": registration.recent_grade,
+        "school_name": registration.school_name,
+        "seat_type": registration.seat_type,
+        "first_attendance_date": registration.first_attendance_date
+    }
+    
+    db_student = models.Student(**student_data)
+    db.add(db_student)
+    db.commit()
+    db.refresh(db_student)
+    
+    # Create recurring outings if provided
+    if registration.recurring_outings_data:
+        for day, outings_list in registration.recurring_outings_data.items():
+            # Each day contains a LIST of outings
+            for outing_info in outings_list:
+                if outing_info.get('enabled'):
+                    recurring_outing = models.RecurringOuting(
+                        student_id=db_student.id,
+                        day_of_week=int(day),
+                        start_time=outing_info['start_time'],
+                        end_time=outing_info['end_time'],
+                        reason=outing_info['reason']
+                    )
+                    db.add(recurring_outing)
+    
+    # Mark registration as processed
+    registration.is_processed = True
+    registration.processed_student_id = db_student.id
+    db.commit()
+    
+    return db_student
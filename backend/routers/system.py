@@ -0,0 +1,125 @@
+"""시스템/교시 조회 API (리더 선출, DB 풀, 현재 교시, 시간대 상태, 순찰 모니터)"""
+from fastapi import APIRouter, HTTPException
+from datetime import datetime
+import os
+
+from timetable import get_timetable
+from patrol_scheduler import patrol_monitor
+from leader import get_elector
+from utils.schedule import get_period_status, get_operating_hours_info
+
+from .deps import KST, get_current_period, validate_period_timing
+
+router = APIRouter(tags=["시스템"])
+
+@router.get("/system/leader")
+def get_leader_status():
+    """이 프로세스의 리더 선출 상태 (예약 작업/루프 실행 여부)"""
+    return get_elector().status()
+
+
+@router.get("/admin/db-pool")
+def get_db_pool_status():
+    """DB 연결 풀 현황 (엔진별 체크아웃/오버플로/대기 시간/타임아웃) - 이 프로세스 기준"""
+    from db_pool import pool_metrics
+    return pool_metrics()
+
+@router.get("/")
+def read_root():
+    return {"message": "Welcome to Ditton Bot API"}
+
+@router.get("/debug/env")
+def debug_env():
+    """디버그: 환경변수 확인"""
+    external_worker_env = os.getenv("CLASSUP_WORKER_EXTERNAL", "")
+    external_worker_mode = external_worker_env.lower() in ("true", "1", "yes")
+    return {
+        "CLASSUP_WORKER_EXTERNAL": external_worker_env,
+        "external_worker_mode": external_worker_mode
+    }
+
+# --- System Endpoints (Period Validation) ---
+@router.get("/system/current-period")
+def get_current_period_api():
+    """현재 교시 조회"""
+    period = get_current_period()
+    now = datetime.now(KST)
+    return {
+        "current_period": period,
+        "current_time": now.strftime("%H:%M"),
+        "is_class_time": period is not None
+    }
+
+@router.post("/system/validate-period")
+def validate_period_api(period: int):
+    """교시 시간 검증"""
+    return validate_period_timing(period)
+
+@router.get("/system/period-start-time/{period}")
+def get_period_start_time(period: int):
+    """
+    교시 시작 시간 조회
+
+    Returns:
+        {
+            "period": int,
+            "start_time": str (HH:MM),
+            "end_time": str (HH:MM)
+        }
+    """
+    span = get_timetable().period_hhmm(period)
+    if span is None:
+        raise HTTPException(status_code=404, detail=f"{period}교시는 존재하지 않습니다.")
+
+    start, end = span
+
+    return {
+        "period": period,
+        "start_time": start,
+        "end_time": end
+    }
+
+
+# --- Schedule Utility Endpoints ---
+@router.get("/schedule/status")
+def get_schedule_status_api():
+    """
+    현재 시간대 상태 조회 (utils.schedule 모듈 사용)
+
+    Returns:
+        status: "class" | "break" | "lunch" | "dinner" | "before_opening" | "after_closing"
+        period_name: "1교시" | None
+        is_patrol_time: True | False (순찰 가능 시간인지)
+        message: 현재 상태 메시지
+    """
+    return get_period_status()
+
+
+@router.get("/schedule/operating-hours")
+def get_operating_hours_api():
+    """
+    운영 시간 정보 조회 (프론트엔드 표시용)
+
+    Returns:
+        opening, closing, lunch, dinner, periods, breaks 정보
+    """
+    return get_operating_hours_info()
+
+
+@router.get("/patrol-monitor/status")
+def get_patrol_monitor_status_api():
+    """
+    순찰 모니터링 상태 조회
+
+    Returns:
+        is_running: 스케줄러 실행 중 여부
+        is_class_time: 현재 수업 시간인지
+        period_status: 현재 시간대 상태
+        last_patrol_time: 마지막 순찰 시간
+        elapsed_minutes: 경과 시간 (분)
+        alert_15_sent: 15분 알림 전송 여부
+        alert_25_sent: 25분 알림 전송 여부
+        warning_threshold: 경고 임계값 (분)
+        alert_threshold: 긴급 알림 임계값 (분)
+    """
+    return patrol_monitor.get_status()
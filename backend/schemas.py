@@ -277,6 +277,7 @@ class AttendanceRecordCreate(AttendanceRecordBase):
 class AttendanceRecord(AttendanceRecordBase):
     id: int
     created_at: datetime
+    carried_forward: Optional[bool] = False
 
     class Config:
         from_attributes = True
@@ -6,16 +6,24 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# Solapi SDK import (설치 필요: pip install solapi)
-try:
-    from solapi import SolapiMessageService
-    from solapi.model.request.message import Message, KakaoOption
-    SOLAPI_AVAILABLE = True
-except ImportError:
-    SOLAPI_AVAILABLE = False
-    SolapiMessageService = None
-    Message = None
-    KakaoOption = None
+# Solapi SDK (설치 필요: pip install solapi) - 서버 시작이 아닌 첫 발송/조회 때 import
+SOLAPI_AVAILABLE = None
+SolapiMessageService = None
+Message = None
+KakaoOption = None
+
+
+def _load_sdk() -> bool:
+    """Solapi SDK를 한 번만 import (없으면 False)"""
+    global SOLAPI_AVAILABLE, SolapiMessageService, Message, KakaoOption
+    if SOLAPI_AVAILABLE is None:
+        try:
+            from solapi import SolapiMessageService
+            from solapi.model.request.message import Message, KakaoOption
+            SOLAPI_AVAILABLE = True
+        except ImportError:
+            SOLAPI_AVAILABLE = False
+    return SOLAPI_AVAILABLE
 
 
 class MessageService:
@@ -28,7 +36,7 @@ class MessageService:
         self.kakao_pfid = os.getenv('SOLAPI_KAKAO_PFID', '')  # 카카오 채널 ID
         self.service = None
 
-        if SOLAPI_AVAILABLE and self.api_key and self.api_secret:
+        if self.api_key and self.api_secret and _load_sdk():
             self.service = SolapiMessageService(
                 api_key=self.api_key,
                 api_secret=self.api_secret
@@ -256,5 +264,12 @@ class MessageService:
             return {"success": False, "error": str(e)}
 
 
-# 싱글톤 인스턴스
-message_service = MessageService()
+_message_service = None
+
+
+def get_message_service() -> MessageService:
+    """싱글톤 인스턴스 (첫 호출 때 생성)"""
+    global _message_service
+    if _message_service is None:
+        _message_service = MessageService()
+    return _message_service
@@ -0,0 +1,143 @@
+"""서버 시작 벤치마크 - import 시간 분해 + 첫 요청까지 걸리는 시간
+
+main.py를 도메인별 라우터(routers/)로 나누고, 무거운 연동(Gemini SDK/PIL, Solapi SDK)을 첫 사용 시 import하고,
+스키마 부트스트랩을 migrate.py로 옮긴 효과를 측정합니다 (backend 디렉토리에서):
+
+    # import main 시간을 최상위 패키지별로 분해 (python -X importtime)
+    python startup_bench.py imports --top 15
+
+    # uvicorn 프로세스 시작 → GET / 가 200을 돌려줄 때까지 (콜드 스타트, 반복 측정)
+    python startup_bench.py first-request --runs 5
+
+변경 전/후 비교는 이전 커밋을 별도 작업 트리로 꺼내 같은 옵션으로 실행합니다:
+
+    git worktree add /tmp/before <이전 커밋>
+    python startup_bench.py first-request --app-dir /tmp/before/backend --runs 5
+
+first-request는 서버의 startup 이벤트(AUTO_MIGRATE면 마이그레이션 포함)까지 끝나야 응답하므로,
+배포처럼 AUTO_MIGRATE=false로 재려면 환경변수를 지정해 실행합니다.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_breakdown(app_dir: Path, module: str, top: int) -> dict:
+    """python -X importtime -c "import <module>" 결과를 최상위 패키지별 누적 시간으로 집계"""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=app_dir, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} 실패:\n{proc.stderr[-2000:]}")
+
+    by_package, total_us = {}, 0
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # 들여쓰기 1칸 = 이 프로세스가 직접 import한 최상위 모듈 (누적 시간에 하위 import 포함)
+        if not match or len(match.group(3)) != 1:
+            continue
+        cumulative_us, name = int(match.group(2)), match.group(4)
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + cumulative_us
+        total_us += cumulative_us
+
+    ranked = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "module": module,
+        "app_dir": str(app_dir),
+        "process_wall_ms": round(wall_ms, 1),
+        "import_total_ms": round(total_us / 1000, 1),
+        "top_packages_ms": {name: round(us / 1000, 1) for name, us in ranked[:top]},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _time_to_first_request(app_dir: Path, path: str, timeout: float) -> float:
+    """uvicorn 시작부터 path가 200을 돌려줄 때까지 ms"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=app_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise SystemExit(f"uvicorn이 종료됨 (exit {proc.returncode}) - {app_dir}에서 직접 실행해 오류를 확인하세요")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                pass
+            time.sleep(0.02)
+        raise SystemExit(f"{timeout}초 안에 {url} 응답 없음")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def first_request(app_dir: Path, runs: int, path: str, timeout: float) -> dict:
+    samples = [_time_to_first_request(app_dir, path, timeout) for _ in range(runs)]
+    return {
+        "app_dir": str(app_dir),
+        "path": path,
+        "runs": runs,
+        "auto_migrate": os.getenv("AUTO_MIGRATE", "true"),
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+        "samples_ms": [round(ms, 1) for ms in samples],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 벤치마크 (import 시간 / 첫 요청까지 시간)")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    imports_parser = sub.add_parser("imports", help="import 시간 최상위 패키지별 분해")
+    imports_parser.add_argument("--app-dir", type=Path, default=BACKEND_DIR)
+    imports_parser.add_argument("--module", default="main")
+    imports_parser.add_argument("--top", type=int, default=15)
+
+    request_parser = sub.add_parser("first-request", help="uvicorn 시작 → 첫 200 응답까지 시간")
+    request_parser.add_argument("--app-dir", type=Path, default=BACKEND_DIR)
+    request_parser.add_argument("--runs", type=int, default=5)
+    request_parser.add_argument("--path", default="/")
+    request_parser.add_argument("--timeout", type=float, default=120)
+
+    args = parser.parse_args()
+    if args.mode == "imports":
+        result = import_breakdown(args.app_dir, args.module, args.top)
+    else:
+        result = first_request(args.app_dir, args.runs, args.path, args.timeout)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# backend 디렉토리 모듈(leader, classup_core, ...)을 최상위 이름으로 import
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from classup_core.backends import playwright_sync
+from classup_core.backends.playwright_sync import BrowserThread, PlaywrightSyncBackend
+
+
+class FakeClosable:
+    def __init__(self, name):
+        self.name = name
+        self.closed_in = None
+
+    def close(self):
+        self.closed_in = threading.current_thread().name
+
+
+class FakeBrowser(FakeClosable):
+    pass
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    gate = threading.Event()
+    launched = []
+
+    def launch(self, launch_args):
+        launched.append(threading.current_thread().name)
+        if len(launched) > 1:
+            assert gate.wait(5)  # 대기 브라우저 준비가 끝나지 않은 상태 유지
+        self.browser = FakeBrowser(f"browser{len(launched)}")
+        return self.browser
+
+    def new_context(self, browser, metrics=None):
+        return FakeClosable(f"context@{browser.name}"), FakeClosable(f"page@{browser.name}")
+
+    def fetch_rows(self):
+        return [[self.page.name, threading.current_thread().name]]
+
+    monkeypatch.setattr(BrowserThread, "launch", launch)
+    monkeypatch.setattr(PlaywrightSyncBackend, "_new_context", new_context)
+    monkeypatch.setattr(PlaywrightSyncBackend, "_load_entrance", lambda self, page: None)
+    monkeypatch.setattr(PlaywrightSyncBackend, "_fetch_rows", fetch_rows)
+    monkeypatch.setattr(playwright_sync, "child_tree_rss_kb", lambda: None)
+
+    instance = PlaywrightSyncBackend(tmp_path / "session.json")
+    assert instance.start()
+    yield instance, gate
+    gate.set()
+    instance.stop()
+
+
+def test_recycle_keeps_scraping_until_standby_is_ready(backend):
+    instance, gate = backend
+    first_thread = instance.thread
+
+    assert instance.recycle()  # 준비를 기다리지 않고 바로 반환
+    page, thread_name = instance.fetch_rows()[0]
+    assert page == "page@browser1"
+    assert thread_name.startswith("classup-browser_")
+    assert threading.current_thread().name != thread_name
+
+    gate.set()
+    instance._standby.future.result(timeout=5)
+    page, thread_name = instance.fetch_rows()[0]
+    assert page == "page@browser2"
+    assert thread_name.startswith("classup-browser-standby")
+    assert instance.thread is not first_thread
+
+
+def test_failed_standby_keeps_current_browser(backend, monkeypatch):
+    instance, gate = backend
+
+    def broken_entrance(self, page):
+        raise RuntimeError("login page")
+
+    monkeypatch.setattr(PlaywrightSyncBackend, "_load_entrance", broken_entrance)
+    gate.set()
+    assert instance.recycle()
+    instance._standby.future.exception(timeout=5)
+    assert instance.fetch_rows()[0][0] == "page@browser1"
+    assert instance._standby is None
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from notifications import dispatcher as dispatcher_module
+from notifications.dispatcher import KST, NotificationDispatcher
+from notifications.models import NotificationOutbox
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}", connect_args={"check_same_thread": False})
+    NotificationOutbox.__table__.create(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(dispatcher_module, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def add_pending(factory, count, urgent=True):
+    db = factory()
+    now = datetime.now(KST).replace(tzinfo=None)
+    for i in range(count):
+        db.add(NotificationOutbox(
+            webhook_url="https://discord.test/webhook",
+            embed={"title": f"알림 {i}"},
+            urgent=urgent,
+            status="pending",
+            next_attempt_at=now - timedelta(seconds=1),
+        ))
+    db.commit()
+    db.close()
+
+
+def test_dispatch_runs_db_work_off_the_event_loop(session_factory):
+    add_pending(session_factory, 2)
+    dispatcher = NotificationDispatcher()
+    dispatcher._running = True
+    db_threads = []
+
+    load_due = dispatcher._load_due
+
+    def recording_load_due(db, now):
+        db_threads.append(threading.get_ident())
+        return load_due(db, now)
+
+    async def fake_post(webhook_url, payload):
+        return httpx.Response(204)
+
+    dispatcher._load_due = recording_load_due
+    dispatcher._post = fake_post
+
+    async def run():
+        loop_thread = threading.get_ident()
+        await dispatcher._dispatch_due()
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+
+    assert db_threads and loop_thread not in db_threads
+    db = session_factory()
+    statuses = [item.status for item in db.query(NotificationOutbox).all()]
+    db.close()
+    assert statuses == ["sent", "sent"]
+    assert dispatcher.sent_count == 2
+
+
+def test_dispatch_keeps_loop_responsive_while_querying(session_factory):
+    add_pending(session_factory, 1)
+    dispatcher = NotificationDispatcher()
+    dispatcher._running = True
+    load_due = dispatcher._load_due
+    ticks = []
+
+    def slow_load_due(db, now):
+        threading.Event().wait(0.3)
+        return load_due(db, now)
+
+    async def fake_post(webhook_url, payload):
+        return httpx.Response(204)
+
+    dispatcher._load_due = slow_load_due
+    dispatcher._post = fake_post
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(1)
+            await asyncio.sleep(0.02)
+
+    async def run():
+        await asyncio.gather(dispatcher._dispatch_due(), ticker())
+
+    asyncio.run(run())
+
+    # 조회가 스레드에서 도는 동안 다른 코루틴이 계속 실행됨
+    assert len(ticks) == 5
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from classup_core.index import RecentRecordIndex
+
+
+def test_out_of_order_buckets_stay_sorted():
+    index = RecentRecordIndex()
+    base = datetime(2026, 10, 19, 9, 0)
+    for minutes in (10, 5, 0, 7):
+        index.add("학생", "입장", base + timedelta(minutes=minutes))
+    assert list(index._buckets) == sorted(index._buckets)
+
+
+def test_evict_after_out_of_order_inserts_drops_oldest():
+    index = RecentRecordIndex(retention=timedelta(minutes=30))
+    base = datetime(2026, 10, 19, 9, 0)
+    index.add("학생A", "입장", base + timedelta(minutes=40))
+    index.add("학생B", "입장", base)                         # 이미 retention 밖
+    index.add("학생C", "입장", base + timedelta(minutes=20))
+    index.add("학생D", "입장", base + timedelta(minutes=45))
+
+    assert not index.contains("학생B", "입장", base)
+    for name, minutes in (("학생A", 40), ("학생C", 20), ("학생D", 45)):
+        assert index.contains(name, "입장", base + timedelta(minutes=minutes))
+    assert len(index) == 3
+
+
+def test_max_keys_evicts_oldest_records_first():
+    index = RecentRecordIndex(max_keys=2)
+    base = datetime(2026, 10, 19, 9, 0)
+    index.add("학생A", "입장", base + timedelta(minutes=10))
+    index.add("학생B", "입장", base)
+    index.add("학생C", "입장", base + timedelta(minutes=5))
+
+    assert len(index) == 2
+    assert not index.contains("학생B", "입장", base)
+    assert index.contains("학생A", "입장", base + timedelta(minutes=10))
+    assert index.contains("학생C", "입장", base + timedelta(minutes=5))
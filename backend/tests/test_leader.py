@@ -0,0 +1,69 @@
+import asyncio
+
+from leader import LeaderElector
+
+
+class FakeLock:
+    def __init__(self):
+        self.held = False
+        self.acquired = 0
+        self.released = 0
+
+    def acquire(self) -> bool:
+        if self.held:
+            return False
+        self.held = True
+        self.acquired += 1
+        return True
+
+    def alive(self) -> bool:
+        return self.held
+
+    def release(self):
+        if self.held:
+            self.released += 1
+        self.held = False
+
+
+def test_failed_start_demotes_and_retries():
+    lock = FakeLock()
+    elector = LeaderElector(lock=lock, retry_seconds=0.01, enabled=True)
+    events = []
+
+    async def on_elected():
+        events.append("elected")
+        if events.count("elected") == 1:
+            raise RuntimeError("startup failed")
+
+    async def on_demoted():
+        events.append("demoted")
+
+    async def scenario():
+        task = elector.start(on_elected, on_demoted)
+        for _ in range(200):
+            if events.count("elected") >= 2:
+                break
+            await asyncio.sleep(0.01)
+        assert not task.done()
+        assert elector.is_leader
+        await elector.stop()
+
+    asyncio.run(scenario())
+    assert events[:3] == ["elected", "demoted", "elected"]
+    assert lock.acquired == 2
+    assert lock.released == 2  # 실패 후 반납 + 종료 시 해제
+    assert not elector.is_leader
+
+
+def test_disabled_election_retries_failed_start():
+    elector = LeaderElector(lock=FakeLock(), retry_seconds=0.01, enabled=False)
+    calls = []
+
+    def on_elected():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("startup failed")
+
+    asyncio.run(asyncio.wait_for(elector.run(on_elected), timeout=5))
+    assert len(calls) == 3
+    assert elector.is_leader
@@ -0,0 +1,16 @@
+from datetime import date
+
+from classup_core.parser import parse_rows
+
+
+def test_time_only_cells_use_page_date():
+    rows = [["학생", "010-1234-5678", "", "입장", "08:05:00"]]
+    record = parse_rows(rows, day=date(2026, 10, 17))[0]
+    assert record["record_time"].date() == date(2026, 10, 17)
+    assert (record["record_time"].hour, record["record_time"].minute) == (8, 5)
+
+
+def test_full_datetime_cells_keep_their_date():
+    rows = [["학생", "", "", "퇴장", "2026-10-16 21:30:00"]]
+    record = parse_rows(rows, day=date(2026, 10, 17))[0]
+    assert record["record_time"].date() == date(2026, 10, 16)
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import models
+from classup import pipeline as pipeline_module
+from classup.models import ClassUpAttendance
+from classup.pipeline import KST, IngestPipeline
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pipeline.db'}", connect_args={"check_same_thread": False})
+    # models를 먼저 불러와 classup_attendance가 참조하는 students 테이블도 함께 생성
+    models.Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def build_classup_record(record, status, detail, db):
+        if record.student_name.startswith("오류"):
+            raise ValueError(f"잘못된 기록: {record.student_name}")
+        row = ClassUpAttendance(student_name=record.student_name, status=status, status_detail=detail,
+                                record_time=record.record_time.replace(tzinfo=None))
+        return row, None, ""
+
+    handler = pipeline_module.handler
+    monkeypatch.setattr(handler, "build_classup_record", build_classup_record)
+    monkeypatch.setattr(handler, "has_entry_today", lambda name, day, db: False)
+    monkeypatch.setattr(handler, "sync_dittonweb_attendance", lambda row, student, db, on_return_linked=None: [])
+    monkeypatch.setattr(IngestPipeline, "_notify_blocking", lambda self, item: None)
+    yield factory
+    engine.dispose()
+
+
+def record(name, status="입장", minutes=0):
+    record_time = datetime.now(KST).replace(second=0, microsecond=0) - timedelta(minutes=minutes)
+    return {"student_name": name, "status": status, "record_time": record_time.isoformat()}
+
+
+def saved_rows(factory):
+    db = factory()
+    try:
+        return sorted((row.student_name, row.status) for row in db.query(ClassUpAttendance).all())
+    finally:
+        db.close()
+
+
+def run(pipeline, coro_factory):
+    async def main():
+        pipeline.start()
+        try:
+            return await coro_factory()
+        finally:
+            await pipeline.stop()
+
+    return asyncio.run(main())
+
+
+def test_bad_row_does_not_fail_the_batch(session_factory):
+    pipeline = IngestPipeline(session_factory=session_factory, batch_wait_ms=200)
+
+    async def ingest():
+        futures = [await pipeline.submit(raw) for raw in (record("김철수"), record("오류학생"), record("이영희"))]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    results = run(pipeline, ingest)
+
+    assert isinstance(results[1], ValueError)
+    assert results[0] is not None and results[2] is not None
+    assert saved_rows(session_factory) == [("김철수", "입장"), ("이영희", "입장")]
+    assert pipeline.stats()["persist"]["errors"] == 1
+
+
+def test_entry_is_seen_only_after_commit(session_factory, monkeypatch):
+    pipeline = IngestPipeline(session_factory=session_factory)
+    persist_rows = pipeline._persist_rows
+    fail = {"next": True}
+
+    def flaky_persist(items):
+        if fail.pop("next", False):
+            raise RuntimeError("DB 연결 끊김")
+        return persist_rows(items)
+
+    monkeypatch.setattr(pipeline, "_persist_rows", flaky_persist)
+
+    async def ingest():
+        with pytest.raises(RuntimeError):
+            await pipeline.ingest([record("김철수", minutes=5)])
+        # 저장 실패한 입장은 재입장 판정에 쓰이지 않음
+        await pipeline.ingest([record("김철수", minutes=1)])
+        await pipeline.ingest([record("김철수")])
+
+    run(pipeline, ingest)
+
+    assert saved_rows(session_factory) == [("김철수", "입장"), ("김철수", "재입장")]
+    assert pipeline._entries_seen == {"김철수"}
+    assert not pipeline._entries_pending
@@ -0,0 +1,71 @@
+
+import pytest
+
+from classup_core.backends import playwright_sync, shared
+from classup_core.backends.base import SessionExpired
+from classup_core.backends.playwright_sync import BrowserThread, PlaywrightSyncBackend
+from classup_core.backends.shared import SharedBrowser, SharedBrowserBackend
+
+
+class FakeClosable:
+    def __init__(self, name):
+        self.name = name
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def members(monkeypatch, tmp_path):
+    launched = []
+    expired = set()
+
+    def launch(self, launch_args):
+        launched.append(1)
+        self.browser = FakeClosable(f"browser{len(launched)}")
+        return self.browser
+
+    def new_context(self, browser, metrics=None):
+        return FakeClosable(f"context@{browser.name}"), FakeClosable(f"page@{browser.name}")
+
+    def load_entrance(self, page):
+        if self.session_file.stem in expired:
+            raise SessionExpired("세션 만료")
+
+    def fetch_rows(self):
+        if not self.is_initialized:
+            load_entrance(self, self.page)
+            self.is_initialized = True
+        return [[self.page.name]]
+
+    monkeypatch.setattr(BrowserThread, "launch", launch)
+    monkeypatch.setattr(PlaywrightSyncBackend, "_new_context", new_context)
+    monkeypatch.setattr(PlaywrightSyncBackend, "_load_entrance", load_entrance)
+    monkeypatch.setattr(PlaywrightSyncBackend, "_fetch_rows", fetch_rows)
+    monkeypatch.setattr(playwright_sync, "child_tree_rss_kb", lambda: None)
+    monkeypatch.setattr(shared, "child_tree_rss_kb", lambda: None)
+
+    browser = SharedBrowser()
+    backends = {key: SharedBrowserBackend(tmp_path / f"{key}.json", browser) for key in ("a", "b")}
+    for backend in backends.values():
+        assert backend.start()
+    yield browser, backends, expired
+    for backend in backends.values():
+        backend.stop()
+
+
+def test_recycle_swaps_healthy_accounts_when_one_session_expired(members):
+    browser, backends, expired = members
+    expired.add("b")
+
+    assert backends["a"].recycle()
+    browser._standby.future.result(timeout=5)
+
+    assert backends["a"].fetch_rows() == [["page@browser2"]]
+    with pytest.raises(SessionExpired):
+        backends["b"].fetch_rows()
+    assert backends["b"].thread is browser.thread
+    assert not backends["b"].is_initialized
+
+    expired.clear()  # 재로그인 후에는 새 브라우저에서 다시 로드
+    assert backends["b"].fetch_rows() == [["page@browser2"]]
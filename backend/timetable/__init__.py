@@ -0,0 +1,14 @@
+# 시간표 모듈 (DB 저장/편집 + 컴파일된 조회 + 학생별 일일 타임라인)
+from classup_core.timetable import Timetable
+from .models import TimetableSlot
+from .service import (
+    get_timeline_index, get_timetable, invalidate_timelines, refresh_student_timeline, replace_slots,
+    seed_default_slots,
+)
+from .timeline import DailyTimelineIndex, Interval
+from .router import router as timetable_router
+
+__all__ = [
+    'DailyTimelineIndex', 'Interval', 'Timetable', 'TimetableSlot', 'get_timeline_index', 'get_timetable',
+    'invalidate_timelines', 'refresh_student_timeline', 'replace_slots', 'seed_default_slots', 'timetable_router',
+]
@@ -0,0 +1,33 @@
+"""시간표 데이터베이스 모델"""
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+import pytz
+
+from database import Base
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+class TimetableSlot(Base):
+    """시간표 슬롯 (교시/쉬는시간/점심/저녁) - 관리 API로 편집, classup_core.timetable로 컴파일"""
+    __tablename__ = "timetable_slots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)        # period/break/lunch/dinner
+    period = Column(Integer, nullable=True)      # 교시 번호 (교시만)
+    name = Column(String, nullable=False)        # 표시 이름 (1교시, 점심시간 등)
+    start_time = Column(String, nullable=False)  # HH:MM
+    end_time = Column(String, nullable=False)    # HH:MM
+    updated_at = Column(DateTime, default=lambda: datetime.now(KST))
+
+    def to_slot(self) -> dict:
+        return {
+            "kind": self.kind,
+            "period": self.period,
+            "name": self.name,
+            "start": self.start_time,
+            "end": self.end_time,
+        }
+
+    def __repr__(self):
+        return f"<TimetableSlot {self.name} {self.start_time}-{self.end_time}>"
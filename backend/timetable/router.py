@@ -0,0 +1,83 @@
+"""시간표 조회/편집 API"""
+from datetime import datetime
+from typing import List, Optional
+
+import pytz
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from database import get_db
+from .service import get_timeline_index, get_timetable, invalidate_timelines, replace_slots
+
+KST = pytz.timezone('Asia/Seoul')
+
+router = APIRouter(prefix="/timetable", tags=["시간표"])
+
+
+class SlotIn(BaseModel):
+    kind: str                     # period/break/lunch/dinner
+    period: Optional[int] = None  # 교시 번호 (교시만)
+    name: Optional[str] = None
+    start: str                    # HH:MM
+    end: str                      # HH:MM
+
+
+@router.get("")
+def read_timetable(db: Session = Depends(get_db)):
+    """시간표 전체 (정렬된 슬롯 목록)"""
+    timetable = get_timetable(db)
+    return {"version": timetable.version, "slots": timetable.to_dicts()}
+
+
+@router.put("")
+def update_timetable(slots: List[SlotIn], db: Session = Depends(get_db)):
+    """시간표 전체 교체 - 교시/쉬는시간끼리 겹치거나 시각이 잘못되면 400"""
+    try:
+        timetable = replace_slots(db, [slot.dict() for slot in slots])
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"시간표 오류: {e}")
+    invalidate_timelines()
+    return {"version": timetable.version, "slots": timetable.to_dicts()}
+
+
+@router.get("/now")
+def read_timetable_now(db: Session = Depends(get_db)):
+    """현재 교시 / 쉬는시간·식사시간 / 다음 경계"""
+    timetable = get_timetable(db)
+    now = datetime.now(KST)
+    period = timetable.period_at(now)
+    window = timetable.window_at(now)
+    boundary = timetable.next_boundary(now)
+    return {
+        "current_time": now.strftime("%H:%M"),
+        "current_period": period.period if period else None,
+        "period": period.to_dict() if period else None,
+        "window": window.to_dict() if window else None,
+        "next_boundary": {
+            "time": boundary[0].strftime("%H:%M"),
+            "events": boundary[1],
+        } if boundary else None,
+    }
+
+
+@router.get("/students/{student_id}/allowed")
+def read_student_allowed(student_id: int, db: Session = Depends(get_db)):
+    """지금 이 학생이 자리를 비워도 되는지, 언제까지인지 (외출/정기외출/상담/쉬는시간)"""
+    now = datetime.now(KST)
+    found = get_timeline_index(db, now.date()).allowed_until(student_id, now)
+    if found is None:
+        return {"student_id": student_id, "allowed": False, "until": None, "schedule": None}
+    interval, until = found
+    return {
+        "student_id": student_id,
+        "allowed": True,
+        "until": until.strftime("%H:%M"),
+        "schedule": interval.to_dict(),
+    }
+
+
+@router.get("/timeline/stats")
+def read_timeline_stats(db: Session = Depends(get_db)):
+    """오늘 타임라인 인덱스 상태"""
+    return get_timeline_index(db).stats()
@@ -0,0 +1,324 @@
+"""DB 시간표 로드/캐시/편집 + 학생별 일일 타임라인
+
+get_timetable()은 컴파일된 Timetable을 프로세스 메모리에 두고, CHECK_SECONDS마다
+(슬롯 수, 최종 수정 시각)만 조회해 바뀌었을 때만 다시 컴파일합니다.
+DB를 읽을 수 없으면 마지막으로 컴파일한 시간표(없으면 기본 시간표)를 씁니다.
+
+get_timeline_index()는 날짜별 DailyTimelineIndex를 최근 TIMELINE_CACHE_DAYS일치만 보관합니다.
+날짜가 바뀌거나 시간표가 바뀌면 다시 빌드하고, 외출/정기외출/상담/학생 편집 API는
+refresh_student_timeline()으로 해당 학생만 다시 펼칩니다.
+다른 프로세스(uvicorn 워커/레플리카)의 편집은 이 프로세스에 알려지지 않으므로, CHECK_SECONDS마다
+외출/정기외출/상담 테이블별 (행 수, 최종 수정 시각)을 한 번에 조회해 바뀌었으면 보관 중인 날짜를 모두 다시 빌드합니다.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, time as time_type
+from typing import Dict, Iterable, List, Optional
+
+import pytz
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from classup_core.timetable import DEFAULT_SLOTS, Timetable, default_timetable
+from .models import TimetableSlot
+from .timeline import DailyTimelineIndex, Interval, to_minute
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+CHECK_SECONDS = 30  # 시간표 변경 확인 간격
+
+_lock = threading.Lock()
+_cache = {"timetable": None, "signature": None, "checked_at": 0.0}
+
+
+def _signature(db: Session) -> tuple:
+    count, updated_at = db.query(func.count(TimetableSlot.id), func.max(TimetableSlot.updated_at)).one()
+    return count, updated_at
+
+
+def seed_default_slots(db: Session) -> int:
+    """슬롯이 하나도 없으면 기본 시간표로 채움. 추가한 슬롯 수 반환"""
+    if db.query(TimetableSlot.id).first() is not None:
+        return 0
+    _insert_slots(db, DEFAULT_SLOTS)
+    db.commit()
+    logger.info(f"기본 시간표 등록: {len(DEFAULT_SLOTS)}개 슬롯")
+    return len(DEFAULT_SLOTS)
+
+
+def _insert_slots(db: Session, slots: Iterable[dict]):
+    now = datetime.now(KST)
+    for slot in slots:
+        db.add(TimetableSlot(
+            kind=slot["kind"],
+            period=slot.get("period"),
+            name=slot["name"],
+            start_time=slot["start"],
+            end_time=slot["end"],
+            updated_at=now,
+        ))
+
+
+def _compile(db: Session, signature: tuple) -> Timetable:
+    rows = db.query(TimetableSlot).order_by(TimetableSlot.start_time).all()
+    if not rows:
+        return default_timetable()
+    return Timetable([row.to_slot() for row in rows], version=str(signature[1]))
+
+
+def get_timetable(db: Optional[Session] = None, force: bool = False) -> Timetable:
+    """현재 시간표 (변경 확인 간격 안에서는 DB 조회 없음)"""
+    now = time.monotonic()
+    cached = _cache["timetable"]
+    if cached is not None and not force and now - _cache["checked_at"] < CHECK_SECONDS:
+        return cached
+
+    with _lock:
+        if _cache["timetable"] is not None and not force and now - _cache["checked_at"] < CHECK_SECONDS:
+            return _cache["timetable"]
+        _cache["checked_at"] = now
+
+        own_session = db is None
+        if own_session:
+            from database import SessionLocal
+            db = SessionLocal()
+        try:
+            signature = _signature(db)
+            if _cache["timetable"] is None or force or signature != _cache["signature"]:
+                _cache["timetable"] = _compile(db, signature)
+                _cache["signature"] = signature
+                logger.info(f"시간표 컴파일: {len(_cache['timetable'].slots)}개 슬롯")
+        except Exception as e:
+            logger.warning(f"시간표 로드 실패 - 이전 시간표 사용: {e}")
+            if _cache["timetable"] is None:
+                _cache["timetable"] = default_timetable()
+        finally:
+            if own_session:
+                db.close()
+        return _cache["timetable"]
+
+
+def replace_slots(db: Session, slots: Iterable[dict]) -> Timetable:
+    """시간표 전체 교체. 컴파일(검증) 실패 시 ValueError, DB는 바뀌지 않음"""
+    slots = list(slots)
+    compiled = Timetable(slots)
+    normalized = compiled.to_dicts()
+
+    db.query(TimetableSlot).delete(synchronize_session=False)
+    _insert_slots(db, normalized)
+    db.commit()
+    logger.info(f"시간표 변경: {len(normalized)}개 슬롯")
+    return get_timetable(db, force=True)
+
+
+# ============ 학생별 일일 타임라인 ============
+
+TIMELINE_CACHE_DAYS = 2   # 보관할 날짜 수 (오늘 + 자정 직후 전날 기록 처리용)
+COUNSELING_MINUTES = 30   # 다이아몬드 상담 1회 길이 (상담 모델에 종료 시각이 없음)
+
+_timeline_lock = threading.Lock()
+_timelines: "OrderedDict[date, DailyTimelineIndex]" = OrderedDict()
+_schedule_cache = {"signature": None, "checked_at": 0.0}
+
+
+def week_of_month(day: date) -> int:
+    """해당 요일이 그 달의 몇 번째인지 (상담 세션 월별 생성과 같은 기준)"""
+    return (day.day - 1) // 7 + 1
+
+
+def _interval(kind: str, start: str, end: str, reason, source_id) -> Optional[Interval]:
+    try:
+        lo, hi = to_minute(start), to_minute(end)
+    except (AttributeError, ValueError):
+        logger.warning(f"타임라인 - 시각 형식 오류로 제외: {kind} #{source_id} ({start}~{end})")
+        return None
+    if hi < lo:
+        return None
+    return Interval(kind, lo, hi, reason, source_id)
+
+
+def _load_intervals(db: Session, day: date, student_ids: Optional[List[int]] = None) -> Dict[int, List[Interval]]:
+    """재원생의 해당 날짜 일정 → 학생 ID별 구간 목록 (쿼리 4~5번)"""
+    import models
+
+    def scoped(query, column):
+        return query.filter(column.in_(student_ids)) if student_ids is not None else query
+
+    enrolled = {
+        row.id for row in scoped(
+            db.query(models.Student.id).filter(models.Student.status == "재원"), models.Student.id
+        )
+    }
+    by_student: Dict[int, List[Interval]] = {}
+
+    def add(student_id, interval):
+        if interval is not None and student_id in enrolled:
+            by_student.setdefault(student_id, []).append(interval)
+
+    day_start = datetime.combine(day, time_type.min)
+    outings = scoped(db.query(
+        models.Outing.id, models.Outing.student_id, models.Outing.start_time,
+        models.Outing.end_time, models.Outing.reason
+    ).filter(
+        models.Outing.date >= day_start,
+        models.Outing.date < day_start + timedelta(days=1)
+    ), models.Outing.student_id)
+    for row in outings:
+        add(row.student_id, _interval("outing", row.start_time, row.end_time, row.reason, row.id))
+
+    recurring = scoped(db.query(
+        models.RecurringOuting.id, models.RecurringOuting.student_id, models.RecurringOuting.start_time,
+        models.RecurringOuting.end_time, models.RecurringOuting.reason
+    ).filter(
+        models.RecurringOuting.day_of_week == day.weekday(),
+        models.RecurringOuting.is_active == 1
+    ), models.RecurringOuting.student_id)
+    for row in recurring:
+        add(row.student_id, _interval("recurring_outing", row.start_time, row.end_time, row.reason, row.id))
+
+    # 상담: 생성된 세션이 우선, 이번 달 세션이 아직 없는 다이아몬드 상담은 주차/요일로 펼침
+    def counseling(student_id, start, source_id):
+        try:
+            lo = to_minute(start)
+        except (AttributeError, ValueError):
+            logger.warning(f"타임라인 - 상담 시각 형식 오류로 제외: #{source_id} ({start})")
+            return
+        add(student_id, Interval("counseling", lo, min(lo + COUNSELING_MINUTES, 24 * 60 - 1), "상담", source_id))
+
+    sessions = scoped(db.query(
+        models.CounselingSession.id, models.CounselingSession.student_id,
+        models.CounselingSession.scheduled_time
+    ).filter(models.CounselingSession.scheduled_date == day), models.CounselingSession.student_id)
+    for row in sessions:
+        counseling(row.student_id, row.scheduled_time, row.id)
+
+    month_start = day.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    generated = {
+        row.diamond_counseling_id for row in db.query(models.CounselingSession.diamond_counseling_id).filter(
+            models.CounselingSession.scheduled_date >= month_start,
+            models.CounselingSession.scheduled_date < next_month,
+            models.CounselingSession.diamond_counseling_id.isnot(None)
+        )
+    }
+    diamonds = scoped(db.query(
+        models.DiamondCounseling.id, models.DiamondCounseling.student_id, models.DiamondCounseling.start_time
+    ).filter(
+        models.DiamondCounseling.is_active == True,
+        models.DiamondCounseling.day_of_week == day.weekday(),
+        models.DiamondCounseling.week_number == week_of_month(day)
+    ), models.DiamondCounseling.student_id)
+    for row in diamonds:
+        if row.id not in generated:
+            counseling(row.student_id, row.start_time, row.id)
+
+    return by_student
+
+
+def _schedule_signature(db: Session) -> tuple:
+    """외출/정기외출/상담 세션/다이아몬드 상담의 (행 수, 최종 수정 시각) - 쿼리 1번"""
+    import models
+
+    columns = []
+    for model in (models.Outing, models.RecurringOuting, models.CounselingSession, models.DiamondCounseling):
+        columns.append(db.query(func.count(model.id)).scalar_subquery())
+        columns.append(db.query(func.max(model.updated_at)).scalar_subquery())
+    return tuple(db.query(*columns).one())
+
+
+def _check_schedule_changes(db: Optional[Session]):
+    """CHECK_SECONDS마다 일정 테이블 서명 확인 - 바뀌었으면 보관 중인 타임라인 폐기
+
+    이 프로세스의 편집도 서명을 바꾸므로 refresh_student_timeline() 이후 한 번은 다시 빌드됩니다.
+    """
+    now = time.monotonic()
+    if now - _schedule_cache["checked_at"] < CHECK_SECONDS:
+        return
+
+    with _timeline_lock:
+        if now - _schedule_cache["checked_at"] < CHECK_SECONDS:
+            return
+        _schedule_cache["checked_at"] = now
+
+        own_session = db is None
+        if own_session:
+            from database import SessionLocal
+            db = SessionLocal()
+        try:
+            signature = _schedule_signature(db)
+        except Exception as e:
+            logger.warning(f"일정 변경 확인 실패 - 보관 중인 타임라인 사용: {e}")
+            return
+        finally:
+            if own_session:
+                db.close()
+
+        if _schedule_cache["signature"] is not None and signature != _schedule_cache["signature"] and _timelines:
+            logger.info("일정 변경 감지 - 보관 중인 타임라인 다시 빌드")
+            _timelines.clear()
+        _schedule_cache["signature"] = signature
+
+
+def build_timeline_index(db: Session, day: date) -> DailyTimelineIndex:
+    index = DailyTimelineIndex(day, get_timetable(db))
+    for student_id, intervals in _load_intervals(db, day).items():
+        index.set_student(student_id, intervals)
+    index.built_at = datetime.now(KST)
+    logger.info(f"일일 타임라인 빌드 ({day}): 학생 {len(index)}명")
+    return index
+
+
+def get_timeline_index(db: Optional[Session] = None, day: Optional[date] = None) -> DailyTimelineIndex:
+    """해당 날짜(기본 오늘, KST) 타임라인. 없거나 시간표/일정이 바뀌었으면 빌드"""
+    day = day or datetime.now(KST).date()
+    timetable = get_timetable(db)
+    _check_schedule_changes(db)
+    index = _timelines.get(day)
+    if index is not None and index.timetable_version == timetable.version:
+        return index
+
+    with _timeline_lock:
+        index = _timelines.get(day)
+        if index is not None and index.timetable_version == timetable.version:
+            return index
+
+        own_session = db is None
+        if own_session:
+            from database import SessionLocal
+            db = SessionLocal()
+        try:
+            index = build_timeline_index(db, day)
+        finally:
+            if own_session:
+                db.close()
+
+        _timelines[day] = index
+        _timelines.move_to_end(day)
+        while len(_timelines) > TIMELINE_CACHE_DAYS:
+            _timelines.popitem(last=False)
+        return index
+
+
+def refresh_student_timeline(db: Session, student_id: Optional[int]):
+    """편집 후 보관 중인 날짜의 해당 학생 일정만 다시 펼침 (커밋 후 호출)"""
+    if student_id is None:
+        return
+    with _timeline_lock:
+        for day, index in list(_timelines.items()):
+            try:
+                intervals = _load_intervals(db, day, [student_id]).get(student_id, [])
+            except Exception as e:
+                logger.warning(f"타임라인 갱신 실패 - {day} 전체 재빌드 예정: {e}")
+                _timelines.pop(day, None)
+                continue
+            index.set_student(student_id, intervals)
+
+
+def invalidate_timelines():
+    """보관 중인 타임라인 전체 폐기 (다음 조회 시 다시 빌드)"""
+    with _timeline_lock:
+        _timelines.clear()
@@ -0,0 +1,162 @@
+"""학생별 일일 일정 타임라인 인덱스
+
+하루 동안 학생별 외출(1회성), 정기외출, 다이아몬드 상담, 시간표 쉬는시간/식사시간을
+분 단위 구간으로 펼친 뒤, 겹치는 구간을 경계 배열 + 구간별 활성 일정 목록으로 컴파일합니다.
+"지금 이 학생이 나가 있어도 되는지, 언제까지인지"는 bisect 한 번으로 답하며 DB에 접근하지 않습니다.
+
+DB에 의존하지 않으며, 행 로드/날짜 변경/편집 반영은 timetable.service가 담당합니다.
+종료 시각은 포함합니다 (기존 "HH:MM" 문자열 비교 start <= t <= end와 같음).
+"""
+from bisect import bisect_right
+from datetime import date, datetime, time as time_type
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from classup_core.timetable import WINDOW_KINDS, Timetable
+
+# 같은 시각에 여러 일정이 겹치면 앞쪽 구분이 대표 일정
+KIND_PRIORITY = ("outing", "recurring_outing", "counseling") + WINDOW_KINDS
+MINUTES_PER_DAY = 24 * 60
+
+
+class Interval(NamedTuple):
+    kind: str                # outing/recurring_outing/counseling/break/lunch/dinner
+    start: int               # 자정 기준 분
+    end: int                 # 자정 기준 분 (포함)
+    reason: Optional[str]
+    source_id: Optional[int]  # 원본 행 ID (쉬는시간은 None)
+
+    @property
+    def start_time(self) -> time_type:
+        return _time_of(self.start)
+
+    @property
+    def end_time(self) -> time_type:
+        return _time_of(min(self.end, MINUTES_PER_DAY - 1))
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.kind,
+            "start_time": self.start_time.strftime("%H:%M"),
+            "end_time": self.end_time.strftime("%H:%M"),
+            "reason": self.reason,
+        }
+
+
+def _time_of(minute: int) -> time_type:
+    return time_type(minute // 60, minute % 60)
+
+
+def to_minute(value: Union[str, time_type, datetime]) -> int:
+    """"HH:MM"/"HH:MM:SS"/time/datetime → 자정 기준 분"""
+    if isinstance(value, str):
+        hour, minute = value.strip().split(":")[:2]
+        return int(hour) * 60 + int(minute)
+    if isinstance(value, datetime):
+        value = value.time()
+    return value.hour * 60 + value.minute
+
+
+class StudentTimeline:
+    """한 학생의 하루 일정 - 겹치는 구간을 서로 겹치지 않는 조각으로 나눠 저장"""
+
+    def __init__(self, intervals: Iterable[Interval]):
+        rank = {kind: i for i, kind in enumerate(KIND_PRIORITY)}
+        self.intervals: List[Interval] = sorted(intervals, key=lambda iv: (iv.start, iv.end))
+
+        # 조각 경계 (종료는 포함이므로 end + 1에서 끝남)
+        bounds = sorted({iv.start for iv in self.intervals} | {iv.end + 1 for iv in self.intervals})
+        active: List[Tuple[Interval, ...]] = []
+        for lo in bounds[:-1]:
+            covering = [iv for iv in self.intervals if iv.start <= lo <= iv.end]
+            covering.sort(key=lambda iv: (rank.get(iv.kind, len(rank)), iv.start))
+            active.append(tuple(covering))
+
+        # 조각마다 연속으로 이어지는 일정 구간의 끝 (포함)
+        run_end = [0] * len(active)
+        for i in range(len(active) - 1, -1, -1):
+            if not active[i]:
+                continue
+            end = bounds[i + 1] - 1
+            if i + 1 < len(active) and active[i + 1]:
+                end = run_end[i + 1]
+            run_end[i] = end
+
+        self._bounds = bounds
+        self._active = active
+        self._run_end = run_end
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def _segment(self, minute: int) -> int:
+        i = bisect_right(self._bounds, minute) - 1
+        return i if 0 <= i < len(self._active) else -1
+
+    def active_at(self, at, kinds: Iterable[str] = None) -> Tuple[Interval, ...]:
+        """해당 시각에 걸친 일정 (대표 일정 순)"""
+        i = self._segment(to_minute(at))
+        if i < 0:
+            return ()
+        if kinds is None:
+            return self._active[i]
+        kinds = set(kinds)
+        return tuple(iv for iv in self._active[i] if iv.kind in kinds)
+
+    def first_at(self, at, kinds: Iterable[str] = None) -> Optional[Interval]:
+        active = self.active_at(at, kinds)
+        return active[0] if active else None
+
+    def allowed_until(self, at) -> Optional[Tuple[Interval, time_type]]:
+        """(대표 일정, 이어지는 일정까지 포함한 허용 종료 시각). 일정이 없으면 None"""
+        i = self._segment(to_minute(at))
+        if i < 0 or not self._active[i]:
+            return None
+        return self._active[i][0], _time_of(min(self._run_end[i], MINUTES_PER_DAY - 1))
+
+
+class DailyTimelineIndex:
+    """하루치 학생 ID → StudentTimeline (쉬는시간/식사시간은 모든 학생 공통)"""
+
+    def __init__(self, day: date, timetable: Timetable):
+        self.day = day
+        self.timetable = timetable
+        self.timetable_version = timetable.version
+        self.windows: List[Interval] = [
+            Interval(slot.kind, to_minute(slot.start), to_minute(slot.end), slot.name, None)
+            for slot in timetable.slots
+            if slot.kind in WINDOW_KINDS
+        ]
+        self._common = StudentTimeline(self.windows)
+        self.by_student: Dict[int, StudentTimeline] = {}
+        self.built_at: Optional[datetime] = None
+
+    def __len__(self):
+        return len(self.by_student)
+
+    def set_student(self, student_id: int, intervals: Iterable[Interval]):
+        """학생 한 명의 일정 교체 (편집 반영용)"""
+        intervals = list(intervals)
+        if intervals:
+            self.by_student[student_id] = StudentTimeline(intervals + self.windows)
+        else:
+            self.by_student.pop(student_id, None)
+
+    def timeline(self, student_id: int) -> StudentTimeline:
+        """학생 일정 (개인 일정이 없으면 공통 쉬는시간/식사시간만)"""
+        return self.by_student.get(student_id, self._common)
+
+    def first_at(self, student_id: int, at, kinds: Iterable[str] = None) -> Optional[Interval]:
+        return self.timeline(student_id).first_at(at, kinds)
+
+    def allowed_until(self, student_id: int, at) -> Optional[Tuple[Interval, time_type]]:
+        return self.timeline(student_id).allowed_until(at)
+
+    def stats(self) -> dict:
+        return {
+            "day": self.day.isoformat(),
+            "students": len(self.by_student),
+            "intervals": sum(len(t) - len(self.windows) for t in self.by_student.values()),
+            "windows": len(self.windows),
+            "timetable_version": self.timetable_version,
+            "built_at": self.built_at.isoformat() if self.built_at else None,
+        }
@@ -0,0 +1,11 @@
+# 예약 상태 전환 모듈 (set 기반 UPDATE + 실행 기록)
+from .models import TransitionRun
+from .framework import PERIOD_END, PERIOD_START, TRANSITIONS, Transition, register, register_jobs, run_transition
+from .definitions import LATE_TO_STUDYING, SCHOOL_TO_STUDYING
+from .carry_forward import CarryForward, carry_forward
+from .router import router as transitions_router
+
+__all__ = [
+    'CarryForward', 'LATE_TO_STUDYING', 'PERIOD_END', 'PERIOD_START', 'SCHOOL_TO_STUDYING', 'TRANSITIONS', 'Transition',
+    'TransitionRun', 'register', 'register_jobs', 'carry_forward', 'run_transition', 'transitions_router',
+]
@@ -0,0 +1,91 @@
+"""교시 시작 시 이전 교시 출석 이월 (INSERT ... SELECT)
+
+교시가 시작되면 재원생 중 해당 교시 기록이 아직 없는 학생에게 이전 교시 상태를 복사한
+행(carried_forward=True)을 한 문장으로 만들어 둡니다. 감독자는 달라진 학생만 저장하면 되고,
+교시별 현황 조회는 읽을 때 이전 교시를 따라 올라가지 않고 실제 행만 읽습니다.
+
+지각은 해당 교시 동안만 표시하므로 이월할 때 자습중으로 바꿔 넣습니다 (late_to_studying과 같은 규칙).
+"""
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import case, exists, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+
+import models
+from .framework import KST, PERIOD_START, Transition, register
+
+AttendanceRecord = models.AttendanceRecord
+Student = models.Student
+
+COPIED_COLUMNS = ["student_id", "date", "period", "status", "carried_forward", "created_at"]
+
+
+def _periods_until(timetable, period: Optional[int], today: date) -> List[int]:
+    """시작 순 교시 번호 중 period까지 (period가 없으면 이미 시작한 교시까지)"""
+    slots = timetable.period_slots()
+    if period is None:
+        now = datetime.now(KST)
+        if today < now.date():
+            return [s.period for s in slots]
+        return [s.period for s in slots if today == now.date() and s.start <= now.time()]
+    numbers = [s.period for s in slots]
+    return numbers[:numbers.index(period) + 1] if period in numbers else []
+
+
+def carry_forward(db: Session, today: date, previous: int, period: int) -> int:
+    """previous 교시 행을 period 교시로 복사 (이미 기록이 있는 학생 제외). 추가한 행 수 반환"""
+    source = aliased(AttendanceRecord)
+    target = aliased(AttendanceRecord)
+    rows = (
+        select(
+            source.student_id,
+            source.date,
+            literal(period),
+            case((source.status == "지각", "자습중"), else_=source.status),
+            literal(True),
+            literal(datetime.utcnow()),
+        )
+        .join(Student, Student.id == source.student_id)
+        .where(
+            source.date == today,
+            source.period == previous,
+            Student.status == "재원",
+            ~exists().where(
+                target.student_id == source.student_id,
+                target.date == today,
+                target.period == period,
+            ),
+        )
+    )
+    result = db.execute(insert(AttendanceRecord).from_select(COPIED_COLUMNS, rows))
+    return result.rowcount or 0
+
+
+class CarryForward(Transition):
+    """교시 시작마다 이전 교시 출석을 이월하는 INSERT 전환
+
+    앞 교시 이월이 빠졌으면(서버 재시작 등) 1교시부터 차례로 채우므로 수동 실행으로 따라잡을 수 있습니다.
+    """
+
+    def __init__(self):
+        super().__init__(
+            name="period_carry_forward",
+            description="이전 교시 출석 → 기록 없는 학생의 새 교시로 이월 (2교시부터 각 교시 시작)",
+            model=AttendanceRecord,
+            where=lambda today: [],
+            values={"carried_forward": True},
+            at=[PERIOD_START],
+        )
+
+    def run(self, db: Session, today: date, period: Optional[int] = None) -> int:
+        from timetable import get_timetable
+
+        periods = _periods_until(get_timetable(db), period, today)
+        return sum(
+            carry_forward(db, today, previous, current)
+            for previous, current in zip(periods, periods[1:])
+        )
+
+
+register(CarryForward())
@@ -0,0 +1,41 @@
+"""예약 상태 전환 정의 (출석 기록)"""
+from sqlalchemy import select
+
+import models
+from .framework import PERIOD_START, Transition, register
+
+# 18:00 학교 → 자습중 전환 대상 (고등학생)
+HIGH_SCHOOL_TYPES = ["예비고1", "고1", "고2", "고3"]
+
+AttendanceRecord = models.AttendanceRecord
+Student = models.Student
+
+
+# 오후 6시: 학교 등원 중인 고등학생을 자습중으로 전환
+SCHOOL_TO_STUDYING = register(Transition(
+    name="school_to_studying",
+    description="학교 등원 중인 고등학생 → 자습중 (18:00)",
+    model=AttendanceRecord,
+    where=lambda today: [
+        AttendanceRecord.date == today,
+        AttendanceRecord.status == "학교",
+        AttendanceRecord.student_id.in_(
+            select(Student.id).where(Student.student_type.in_(HIGH_SCHOOL_TYPES))
+        ),
+    ],
+    values={"status": "자습중"},
+    at=["18:00"],
+))
+
+# 다음 교시 시작: 지각은 해당 교시 동안만 표시하고 자습중으로 변경
+LATE_TO_STUDYING = register(Transition(
+    name="late_to_studying",
+    description="지각 → 자습중 (2교시부터 각 교시 시작)",
+    model=AttendanceRecord,
+    where=lambda today: [
+        AttendanceRecord.date == today,
+        AttendanceRecord.status == "지각",
+    ],
+    values={"status": "자습중"},
+    at=[PERIOD_START],
+))
@@ -0,0 +1,157 @@
+"""예약 상태 전환 프레임워크
+
+전환 하나 = (대상 모델, 오늘 날짜 → WHERE 조건 목록, 바꿀 값, 실행 시각).
+행을 세션으로 읽어 한 건씩 바꾸지 않고 UPDATE ... WHERE 한 문장으로 실행하며,
+실행마다 영향 행 수와 소요 시간을 status_transition_runs에 남깁니다.
+
+실행 시각은 "HH:MM" 또는 시간표 경계(PERIOD_START / PERIOD_END)로 지정합니다.
+시간표 경계는 스케줄러 등록 시점의 시간표로 풀리므로, 시간표를 바꾸면 서버 재시작 후 반영됩니다.
+
+새 전환 추가:
+    register(Transition(
+        name="outing_to_studying",
+        description="...",
+        model=models.AttendanceRecord,
+        where=lambda today: [models.AttendanceRecord.date == today, ...],
+        values={"status": "자습중"},
+        at=[PERIOD_START],
+    ))
+"""
+import logging
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pytz
+from sqlalchemy.orm import Session
+
+from .models import TransitionRun
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 시간표 경계 실행 시각
+PERIOD_START = "period_start"              # 2교시부터 각 교시 시작
+PERIOD_END = "period_end"                  # 각 교시 종료
+
+TRANSITIONS: Dict[str, "Transition"] = {}
+
+
+class Transition:
+    """set 기반 상태 전환 하나"""
+
+    def __init__(self, name: str, description: str, model, where: Callable[[date], list],
+                 values: dict, at: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.model = model
+        self.where = where
+        self.values = values
+        self.at = list(at)
+
+    def run(self, db: Session, today: date, period: Optional[int] = None) -> int:
+        """UPDATE 실행 (커밋은 호출 측). 영향 행 수 반환
+
+        period는 시간표 경계로 실행될 때 해당 교시 번호 (UPDATE 전환은 쓰지 않음, 하위 클래스용)
+        """
+        return db.query(self.model).filter(*self.where(today)).update(
+            self.values, synchronize_session=False
+        )
+
+    def schedule(self, timetable) -> List[Tuple[int, int, str, Optional[int]]]:
+        """실행 시각 목록 [(시, 분, 계기 이름, 교시 번호)]"""
+        times = []
+        for spec in self.at:
+            if spec == PERIOD_START:
+                for slot in timetable.period_slots()[1:]:
+                    times.append((slot.start.hour, slot.start.minute, f"{slot.name} 시작", slot.period))
+            elif spec == PERIOD_END:
+                for slot in timetable.period_slots():
+                    times.append((slot.end.hour, slot.end.minute, f"{slot.name} 종료", slot.period))
+            else:
+                hour, minute = spec.split(":")
+                times.append((int(hour), int(minute), spec, None))
+        return times
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "table": self.model.__tablename__,
+            "values": self.values,
+            "at": self.at,
+        }
+
+
+def register(transition: Transition) -> Transition:
+    TRANSITIONS[transition.name] = transition
+    return transition
+
+
+def run_transition(name: str, db: Session = None, today: date = None, trigger: str = "manual",
+                   period: Optional[int] = None) -> dict:
+    """전환 실행 + 실행 기록 저장. 오류는 기록만 하고 결과로 반환"""
+    transition = TRANSITIONS[name]
+    today = today or datetime.now(KST).date()
+
+    own_session = db is None
+    if own_session:
+        from database import SessionLocal
+        db = SessionLocal()
+
+    started_at = datetime.now(KST)
+    started = time.perf_counter()
+    affected, error = 0, None
+    try:
+        affected = transition.run(db, today, period) or 0
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        error = str(e)
+    duration_ms = int((time.perf_counter() - started) * 1000)
+
+    try:
+        run = TransitionRun(
+            name=name, trigger=trigger, started_at=started_at, duration_ms=duration_ms,
+            affected=affected, success=error is None, error=error,
+        )
+        db.add(run)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"상태 전환 실행 기록 저장 실패 ({name}): {e}")
+    finally:
+        if own_session:
+            db.close()
+
+    if error:
+        logger.error(f"상태 전환 오류 [{name}/{trigger}]: {error}")
+    elif affected:
+        logger.info(f"상태 전환 [{name}/{trigger}]: {affected}건 ({duration_ms}ms)")
+    return {"name": name, "trigger": trigger, "affected": affected, "duration_ms": duration_ms, "error": error}
+
+
+def register_jobs(scheduler, timetable) -> int:
+    """등록된 전환을 APScheduler cron 작업으로 등록. 등록한 작업 수 반환"""
+    from apscheduler.triggers.cron import CronTrigger
+
+    count = 0
+    for transition in TRANSITIONS.values():
+        for hour, minute, label, period in transition.schedule(timetable):
+            scheduler.add_job(
+                run_transition,
+                trigger=CronTrigger(hour=hour, minute=minute, timezone='Asia/Seoul'),
+                kwargs={"name": transition.name, "trigger": label, "period": period},
+                id=f"transition_{transition.name}_{hour:02d}{minute:02d}",
+                replace_existing=True
+            )
+            count += 1
+    return count
+
+
+def recent_runs(db: Session, name: Optional[str] = None, limit: int = 50) -> List[dict]:
+    query = db.query(TransitionRun)
+    if name:
+        query = query.filter(TransitionRun.name == name)
+    return [run.to_dict() for run in query.order_by(TransitionRun.started_at.desc()).limit(limit)]
@@ -0,0 +1,34 @@
+"""상태 전환 실행 기록 모델"""
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from datetime import datetime
+import pytz
+
+from database import Base
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+class TransitionRun(Base):
+    """예약 상태 전환 1회 실행 (영향 행 수/소요 시간)"""
+    __tablename__ = "status_transition_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, index=True)   # 전환 이름 (late_to_studying 등)
+    trigger = Column(String, nullable=True)             # 실행 계기 (18:00, 3교시 시작, manual 등)
+    started_at = Column(DateTime, default=lambda: datetime.now(KST), index=True)
+    duration_ms = Column(Integer, default=0)
+    affected = Column(Integer, default=0)               # UPDATE 영향 행 수
+    success = Column(Boolean, default=True)
+    error = Column(Text, nullable=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "duration_ms": self.duration_ms,
+            "affected": self.affected,
+            "success": self.success,
+            "error": self.error,
+        }
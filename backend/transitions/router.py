@@ -0,0 +1,33 @@
+"""예약 상태 전환 조회/수동 실행 API"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from database import get_db
+from .framework import TRANSITIONS, recent_runs, run_transition
+
+router = APIRouter(prefix="/transitions", tags=["상태 전환"])
+
+
+@router.get("")
+def read_transitions(db: Session = Depends(get_db)):
+    """등록된 전환 + 최근 실행 기록"""
+    return {
+        "transitions": [transition.to_dict() for transition in TRANSITIONS.values()],
+        "runs": recent_runs(db, limit=20),
+    }
+
+
+@router.get("/runs")
+def read_transition_runs(name: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
+    """전환 실행 기록 (영향 행 수/소요 시간)"""
+    return recent_runs(db, name=name, limit=limit)
+
+
+@router.post("/{name}/run")
+def run_transition_now(name: str, db: Session = Depends(get_db)):
+    """전환 수동 실행 (교시 경계 전환을 손으로 돌릴 때)"""
+    if name not in TRANSITIONS:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 전환: {name}")
+    return run_transition(name, db=db, trigger="manual")
@@ -43,17 +43,6 @@ COMMAND_PREFIX = "!"
 PATROL_WARNING_MINUTES_1 = 15
 PATROL_WARNING_MINUTES_2 = 25
 
-# 교시 시간표
-PERIOD_SCHEDULE = {
-    1: ("08:00", "10:00"),   # 1교시
-    2: ("10:20", "12:00"),   # 2교시
-    3: ("13:00", "15:00"),   # 3교시
-    4: ("15:20", "16:40"),   # 4교시
-    5: ("16:50", "18:00"),   # 5교시
-    6: ("19:00", "20:20"),   # 6교시
-    7: ("20:30", "22:00"),   # 7교시
-}
-
 # 권한 레벨
 PERMISSION_LEVELS = {
     "관리자": 100,      # 전동현
@@ -1,7 +1,7 @@
 """
 알림 서비스 - 순찰 및 출석 체크
 """
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional, List, Dict, Any
 
 from bot.core.database import (
@@ -10,7 +10,8 @@ from bot.core.database import (
     AttendanceRecord,
     Student
 )
-from bot.config import PERIOD_SCHEDULE
+# 교시 시간표는 백엔드 timetable 모듈(DB 저장, 웹에서 편집)을 사용
+from timetable import get_timetable
 
 
 class NotificationService:
@@ -61,20 +62,14 @@ class NotificationService:
         Returns:
             현재 교시 번호 (1-7) 또는 None
         """
-        now = datetime.now()
-        current_time = now.strftime("%H:%M")
-
-        for period, (start, end) in PERIOD_SCHEDULE.items():
-            if start <= current_time <= end:
-                return period
-
-        return None
+        return get_timetable().current_period(datetime.now())
 
     @staticmethod
     def get_period_start_time(period: int) -> Optional[str]:
         """교시 시작 시간 조회"""
-        if period in PERIOD_SCHEDULE:
-            return PERIOD_SCHEDULE[period][0]
+        span = get_timetable().period_hhmm(period)
+        if span:
+            return span[0]
         return None
 
     @staticmethod
@@ -97,10 +92,11 @@ class NotificationService:
                 Student.status == "재원"
             ).all()
 
-            # 해당 교시 출석 확인된 학생 ID 조회
+            # 해당 교시 출석 확인된 학생 ID 조회 (교시 시작 시 자동 이월된 행은 미확인)
             confirmed_records = db.query(AttendanceRecord.student_id).filter(
                 AttendanceRecord.date == today,
-                AttendanceRecord.period == period
+                AttendanceRecord.period == period,
+                AttendanceRecord.carried_forward.isnot(True)
             ).all()
 
             confirmed_ids = {r.student_id for r in confirmed_records}
@@ -129,12 +125,11 @@ class NotificationService:
         Returns:
             시작 시간 여부
         """
-        if period not in PERIOD_SCHEDULE:
+        span = get_timetable().period_range(period)
+        if span is None:
             return False
 
-        start_str = PERIOD_SCHEDULE[period][0]
-        start_hour, start_min = map(int, start_str.split(":"))
-        start_time = time(start_hour, start_min)
+        start_time = span[0]
 
         now = datetime.now()
         start_datetime = datetime.combine(date.today(), start_time)
@@ -151,21 +146,19 @@ class NotificationService:
             {"period": int, "start_time": str, "minutes_until": int} 또는 None
         """
         now = datetime.now()
-        current_time = now.strftime("%H:%M")
 
-        for period, (start, end) in PERIOD_SCHEDULE.items():
-            if start > current_time:
-                start_hour, start_min = map(int, start.split(":"))
-                start_datetime = datetime.combine(date.today(), time(start_hour, start_min))
-                minutes_until = int((start_datetime - now).total_seconds() / 60)
+        slot = get_timetable().next_period(now)
+        if slot is None:
+            return None
 
-                return {
-                    "period": period,
-                    "start_time": start,
-                    "minutes_until": minutes_until
-                }
+        start_datetime = datetime.combine(date.today(), slot.start)
+        minutes_until = int((start_datetime - now).total_seconds() / 60)
 
-        return None
+        return {
+            "period": slot.period,
+            "start_time": slot.start.strftime("%H:%M"),
+            "minutes_until": minutes_until
+        }
 
     @staticmethod
     def check_attendance_alert() -> Optional[Dict[str, Any]]:
@@ -185,43 +178,44 @@ class NotificationService:
         import requests
 
         now = datetime.now()
-        current_time = now.strftime("%H:%M")
-
-        # 각 교시를 순회하며 시작 후 10분 이상 경과했는지 체크
-        for period, (start, end) in PERIOD_SCHEDULE.items():
-            start_hour, start_min = map(int, start.split(":"))
-            start_datetime = datetime.combine(date.today(), time(start_hour, start_min))
-
-            # 교시 시작 시간과 현재 시간 차이 계산
-            elapsed = now - start_datetime
-            elapsed_minutes = int(elapsed.total_seconds() / 60)
 
-            # 교시 시작 후 10분 이상 경과했고, 아직 교시 종료 전인지 확인
-            if 10 <= elapsed_minutes and start <= current_time <= end:
-                # API 호출하여 출석 확인 완료 여부 체크
-                try:
-                    response = requests.get(
-                        f"http://localhost:8000/attendance-records/check-completion/{period}",
-                        timeout=5
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-
-                        # 출석 확인이 완료되지 않았으면 알림
-                        if not data.get("is_completed", False):
-                            return {
-                                "period": period,
-                                "start_time": start,
-                                "elapsed_minutes": elapsed_minutes,
-                                "message": f"⚠️ {period}교시 출석 확인이 아직 완료되지 않았습니다!\n"
-                                          f"교시 시작: {start}\n"
-                                          f"경과 시간: {elapsed_minutes}분\n"
-                                          f"출석 확인을 진행해주세요."
-                            }
-                except Exception as e:
-                    # API 호출 실패 시 로그만 남기고 계속 진행
-                    print(f"[ERROR] 출석 확인 API 호출 실패: {e}")
-                    continue
+        # 현재 교시가 시작 후 10분 이상 경과했는지 체크 (교시는 겹치지 않으므로 현재 교시만 확인)
+        slot = get_timetable().period_at(now)
+        if slot is None:
+            return None
+
+        period = slot.period
+        start = slot.start.strftime("%H:%M")
+        start_datetime = datetime.combine(date.today(), slot.start)
+
+        # 교시 시작 시간과 현재 시간 차이 계산
+        elapsed = now - start_datetime
+        elapsed_minutes = int(elapsed.total_seconds() / 60)
+
+        if 10 <= elapsed_minutes:
+            # API 호출하여 출석 확인 완료 여부 체크
+            try:
+                response = requests.get(
+                    f"http://localhost:8000/attendance-records/check-completion/{period}",
+                    timeout=5
+                )
+
+                if response.status_code == 200:
+                    data = response.json()
+
+                    # 출석 확인이 완료되지 않았으면 알림
+                    if not data.get("is_completed", False):
+                        return {
+                            "period": period,
+                            "start_time": start,
+                            "elapsed_minutes": elapsed_minutes,
+                            "message": f"⚠️ {period}교시 출석 확인이 아직 완료되지 않았습니다!\n"
+                                      f"교시 시작: {start}\n"
+                                      f"경과 시간: {elapsed_minutes}분\n"
+                                      f"출석 확인을 진행해주세요."
+                        }
+            except Exception as e:
+                # API 호출 실패 시 로그만 남기고 계속 진행
+                print(f"[ERROR] 출석 확인 API 호출 실패: {e}")
 
         return None
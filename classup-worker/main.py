@@ -1,24 +1,115 @@
 """ClassUp 스크래퍼 독립 워커 - 안정적인 스크래핑"""
+import hmac
 import os
+import re
 import sys
 import time
 import json
 import logging
 import threading
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
 import pytz
-from playwright.sync_api import sync_playwright, Error as PlaywrightError
+
+# 스크래퍼 코어 (backend/classup_core) - 메인 서버와 같은 파서/백엔드/스케줄러 사용
+CORE_PATH = os.getenv("CLASSUP_CORE_PATH", str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, CORE_PATH)
+
+from classup_core.backends import create_backend
+from classup_core.backfill import BackfillRunner, OutageDetector
+from classup_core.backends.playwright_sync import DEFAULT_LAUNCH_ARGS
+from classup_core.backends.shared import SharedBrowser
+from classup_core.index import RecentRecordIndex, StudentIndex
+from classup_core.multi import MultiAccountLoop
+from classup_core.runner import ScrapeLoop
+from classup_core.schedule import AdaptiveScheduler
+from classup_core.timetable import Timetable, default_timetable
+from classup_core.synclog import SyncRollup, merge_into
+# DB 풀 설정/계측 (메인 서버와 같은 DB_POOL_* 환경변수)
+from db_pool import engine_options, pool_metrics, register_engine
 
 # ============ Healthcheck 서버 ============
+# 수동 백필(POST /backfill)은 X-Worker-Token 헤더가 이 값과 같아야 실행 (비어 있으면 수동 백필 비활성화)
+WORKER_ADMIN_TOKEN = os.getenv("CLASSUP_WORKER_TOKEN", "")
+
+
 class HealthHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status: int, data: dict):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _account(self, params: dict):
+        return accounts.get(params.get("account", ["default"])[0])
+
     def do_GET(self):
+        from urllib.parse import urlparse, parse_qs
+
+        parsed = urlparse(self.path)
+        # 계정(세션 키)별 상태 - 사이클/연속 실패/세션 만료/마지막 성공 시각/백필
+        if parsed.path == '/accounts':
+            health = multi_loop.health() if multi_loop else {}
+            self._send_json(200, {
+                key: {**health.get(key, {"mode": "no_session"}),
+                      "backfill": account.backfill_runner.progress.status}
+                for key, account in accounts.items()
+            })
+            return
+        # DB 연결 풀 (체크아웃/오버플로/대기 시간)
+        if parsed.path == '/db-pool':
+            self._send_json(200, pool_metrics())
+            return
+        # 백필 진행 상황 (페이지/기록 수, 처리량)
+        if parsed.path == '/backfill':
+            account = self._account(parse_qs(parsed.query))
+            if account is None:
+                self._send_json(404, {"error": "알 수 없는 계정"})
+                return
+            self._send_json(200, account.backfill_runner.progress.to_dict())
+            return
         self.send_response(200)
         self.send_header('Content-type', 'text/plain')
         self.end_headers()
         self.wfile.write(b'OK')
+
+    def do_POST(self):
+        """수동 백필: POST /backfill?start=ISO시각&end=ISO시각&account=세션키 (end 생략 시 현재, account 생략 시 default)
+
+        헤더 X-Worker-Token: CLASSUP_WORKER_TOKEN 필요
+        """
+        from urllib.parse import urlparse, parse_qs
+
+        parsed = urlparse(self.path)
+        if parsed.path != '/backfill':
+            self._send_json(404, {"error": "not found"})
+            return
+        if not WORKER_ADMIN_TOKEN:
+            self._send_json(403, {"error": "수동 백필 비활성화 (CLASSUP_WORKER_TOKEN 미설정)"})
+            return
+        token = self.headers.get("X-Worker-Token", "")
+        if not hmac.compare_digest(token.encode(), WORKER_ADMIN_TOKEN.encode()):
+            self._send_json(401, {"error": "인증 실패"})
+            return
+        params = parse_qs(parsed.query)
+        account = self._account(params)
+        if account is None:
+            self._send_json(404, {"error": "알 수 없는 계정"})
+            return
+        try:
+            start = parse_backfill_time(params["start"][0])
+            end = parse_backfill_time(params["end"][0]) if "end" in params else datetime.now(KST)
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"start/end 형식 오류: {e}"})
+            return
+        started = account.backfill_runner.start(start, end)
+        self._send_json(202 if started else 409, account.backfill_runner.progress.to_dict())
+
     def log_message(self, format, *args):
         pass  # 로그 무시
 
@@ -27,10 +118,6 @@ def start_health_server():
     server = HTTPServer(('0.0.0.0', port), HealthHandler)
     server.serve_forever()
 
-# Healthcheck 서버를 별도 스레드로 시작
-health_thread = threading.Thread(target=start_health_server, daemon=True)
-health_thread.start()
-
 # 환경변수에서 DB 연결 정보 가져오기
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -38,7 +125,7 @@ if not DATABASE_URL:
     sys.exit(1)
 
 # SQLAlchemy 설정
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import create_engine, func, text, Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -46,7 +133,8 @@ from sqlalchemy.orm import sessionmaker
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+register_engine("worker", engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -60,8 +148,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ============ 설정 ============
-SCRAPE_INTERVAL = 5  # 5초 간격 (안정성을 위해)
-BROWSER_RESTART_INTERVAL = 50  # 50회마다 브라우저 재시작
+# 스크래핑 주기는 classup_core.schedule.AdaptiveScheduler가 시간표에 따라 결정 (CLASSUP_SCRAPE_PROFILE)
+# 브라우저는 프로세스 트리 RSS가 CLASSUP_BROWSER_MAX_RSS_MB(기본 600MB)를 넘으면 대기 인스턴스로 교체
+
+# 스크래핑 엔진: "browser" (Playwright, 기본값) / "http" (세션 쿠키 + httpx, 로그인/세션 갱신에만 Playwright)
+SCRAPE_ENGINE = os.getenv("CLASSUP_SCRAPE_ENGINE", "browser").lower()
+
+# 스크래핑할 세션 키 (classup_sessions.session_key, 쉼표 구분) - 지점마다 하나
+# 여러 개면 브라우저 하나에 계정별 컨텍스트를 만들어 번갈아 스크래핑 (classup_core.multi)
+SESSION_KEYS = [k.strip() for k in os.getenv("CLASSUP_SESSION_KEYS", "default").split(",") if k.strip()] or ["default"]
+
+# 새 기록 알림 채널 (메인 서버 classup/notify_channel.py와 같은 이름)
+NOTIFY_CHANNEL = os.getenv("CLASSUP_NOTIFY_CHANNEL", "classup_attendance")
+NOTIFY_CHUNK_SIZE = 500
 
 # ============ 모델 정의 ============
 
@@ -93,6 +192,7 @@ class ClassUpAttendance(Base):
     return_record_id = Column(Integer, nullable=True)
     return_alert_sent = Column(Boolean, default=False)
     is_schedule_valid = Column(Boolean, nullable=True)
+    source_account = Column(String, default="default")
 
 
 class ClassUpSyncLog(Base):
@@ -105,6 +205,26 @@ class ClassUpSyncLog(Base):
     status = Column(String, default="success")
 
 
+class ClassUpSyncRollup(Base):
+    __tablename__ = "classup_sync_rollups"
+    __table_args__ = (UniqueConstraint("source", "bucket_start", name="uq_classup_sync_rollup_bucket"),)
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False, default="external")
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    bucket_seconds = Column(Integer, default=60)
+    cycles = Column(Integer, default=0)
+    idle_cycles = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    records_fetched = Column(Integer, default=0)
+    new_records = Column(Integer, default=0)
+    duration_count = Column(Integer, default=0)
+    duration_total_ms = Column(Integer, default=0)
+    duration_min_ms = Column(Integer, nullable=True)
+    duration_max_ms = Column(Integer, nullable=True)
+    last_sync_time = Column(DateTime, nullable=True)
+    last_error = Column(String, nullable=True)
+
+
 class ClassUpSession(Base):
     __tablename__ = "classup_sessions"
     id = Column(Integer, primary_key=True, index=True)
@@ -114,19 +234,37 @@ class ClassUpSession(Base):
     updated_at = Column(DateTime, default=lambda: datetime.now(KST))
 
 
+class TimetableSlot(Base):
+    __tablename__ = "timetable_slots"
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    period = Column(Integer, nullable=True)
+    name = Column(String, nullable=False)
+    start_time = Column(String, nullable=False)
+    end_time = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(KST))
+
+
+
 # ============ 유틸리티 함수 ============
 
-CLASSUP_URL = "https://academy.classup.io/user/entrance"
 SESSION_FILE = Path(__file__).parent / "classup_session.json"
 
 
-def get_session_from_db():
+def session_file_for(session_key: str) -> Path:
+    """세션 키별 storage_state 파일 (default는 기존 파일 이름 유지)"""
+    if session_key == "default":
+        return SESSION_FILE
+    return Path(__file__).parent / f"classup_session_{re.sub(r'[^A-Za-z0-9_-]', '_', session_key)}.json"
+
+
+def get_session_from_db(session_key: str = "default"):
     """DB에서 세션 storage_state 조회 및 파일로 저장"""
     db = SessionLocal()
     try:
-        session = db.query(ClassUpSession).filter_by(session_key="default").first()
+        session = db.query(ClassUpSession).filter_by(session_key=session_key).first()
         if session:
-            with open(SESSION_FILE, 'w', encoding='utf-8') as f:
+            with open(session_file_for(session_key), 'w', encoding='utf-8') as f:
                 f.write(session.session_data)
             storage_state = json.loads(session.session_data)
             cookie_count = len(storage_state.get("cookies", [])) if isinstance(storage_state, dict) else 0
@@ -136,98 +274,205 @@ def get_session_from_db():
         db.close()
 
 
-def match_student(name: str, phone: str, db) -> int:
-    """학생 이름/전화번호로 매칭"""
-    student = db.query(Student).filter(
-        Student.name == name,
-        Student.status == "재원"
-    ).first()
+def save_session_to_db(storage_state: dict, session_key: str = "default"):
+    """갱신된 세션 storage_state를 DB에 반영 (메인 서버와 공유)"""
+    db = SessionLocal()
+    try:
+        session = db.query(ClassUpSession).filter_by(session_key=session_key).first()
+        if session:
+            session.session_data = json.dumps(storage_state, ensure_ascii=False)
+            session.updated_at = datetime.now(KST)
+            db.commit()
+    except Exception as e:
+        logger.error(f"세션 DB 저장 실패 ({session_key}): {e}")
+        db.rollback()
+    finally:
+        db.close()
+
 
-    if student:
-        return student.id
+def ensure_source_account_column():
+    """classup_attendance.source_account 컬럼 추가 (메인 서버 classup.models.ensure_added_columns와 같은 DDL)"""
+    from sqlalchemy import inspect
 
-    if phone:
-        clean_phone = phone.replace("-", "").replace(" ", "")
-        if len(clean_phone) >= 4:
-            student = db.query(Student).filter(
-                (Student.student_phone.contains(clean_phone[-4:])) |
-                (Student.parent_phone.contains(clean_phone[-4:]))
-            ).first()
-            if student:
-                return student.id
+    columns = {column["name"] for column in inspect(engine).get_columns("classup_attendance")}
+    if "source_account" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE classup_attendance ADD COLUMN source_account VARCHAR DEFAULT 'default'"))
+        logger.info("classup_attendance.source_account 컬럼 추가")
 
-    return None
 
+def load_timetable() -> Timetable:
+    """메인 서버가 관리하는 시간표 (테이블이 없거나 비어 있으면 기본 시간표). 변경은 워커 재시작 시 반영"""
+    db = SessionLocal()
+    try:
+        rows = db.query(TimetableSlot).all()
+        if rows:
+            return Timetable([
+                {"kind": r.kind, "period": r.period, "name": r.name, "start": r.start_time, "end": r.end_time}
+                for r in rows
+            ])
+    except Exception as e:
+        logger.warning(f"시간표 로드 실패 - 기본 시간표 사용: {e}")
+    finally:
+        db.close()
+    return default_timetable()
+
+
+class Account:
+    """세션 키(지점) 하나의 중복 확인 인덱스/사이클 집계/백필 상태"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.session_file = session_file_for(key)
+        # 롤업 source - 메인 서버 /status에서 계정별 마지막 동기화로 사용
+        self.source = "external" if key == "default" else f"external:{key}"
+        # 계정이 하나면 기존 로그 형식 유지
+        self.label = "" if len(SESSION_KEYS) == 1 else f"[{key}] "
+        self.recent_records = RecentRecordIndex()
+        self.sync_rollup = SyncRollup()
+        self.outage_detector = OutageDetector()
+        self.backfill_runner = BackfillRunner(
+            self.session_file, partial(save_backfill_records, self), before_start=self.load_session
+        )
+
+    def load_session(self):
+        return get_session_from_db(self.key)
+
+    def save_session(self, storage_state: dict):
+        save_session_to_db(storage_state, self.key)
+
+
+# 학생 매칭 인덱스 (저장 단계의 행마다 DB 조회하지 않도록, 학생 명단은 계정 공통)
+student_index = StudentIndex()
+# 스크래핑 루프와 백필 스레드가 student_index/계정별 recent_records를 함께 쓰므로 접근은 이 잠금 안에서만
+index_lock = threading.RLock()
+ROSTER_CHECK_SECONDS = 30     # 학생 명단 변경 확인 간격
+ROSTER_MAX_AGE_SECONDS = 600  # 변경이 없어도 전체 재빌드하는 간격 (이름/전화번호 수정 반영)
+_roster_checked_at = 0.0
+# 워커 시작 시각 - 이후 기록은 이 프로세스만 저장하므로 인덱스만으로 중복 판단
+WORKER_STARTED_AT = datetime.now(KST)
+
+
+def refresh_student_index(db, force: bool = False):
+    """학생 명단이 바뀌었으면 인덱스 재빌드 (학생 수/최대 ID로 변경 감지)"""
+    global _roster_checked_at
+
+    now = time.monotonic()
+    if not force and now - _roster_checked_at < ROSTER_CHECK_SECONDS:
+        return
+    _roster_checked_at = now
+
+    signature = tuple(db.query(func.count(Student.id), func.max(Student.id)).one())
+    expired = now - student_index.built_at >= ROSTER_MAX_AGE_SECONDS
+    if not force and not expired and signature == student_index.signature:
+        return
+
+    rows = db.query(
+        Student.id, Student.name, Student.student_phone, Student.parent_phone, Student.status
+    ).all()
+    student_index.build(rows, signature=signature)
+    logger.info(f"학생 인덱스 갱신: 재원생 {len(student_index)}명")
+
+
+def match_student(name: str, phone: str) -> int:
+    """학생 이름/전화번호로 매칭 (메모리 인덱스)"""
+    return student_index.match(name, phone)
+
+
+def is_duplicate(db, account: Account, name: str, status: str, record_time: datetime) -> bool:
+    """중복 기록 확인 (계정별)
+
+    워커 시작 이후 기록은 인덱스로만 판단하고, 시작 전 기록(이전 프로세스가 저장했을 수 있음)만
+    ±1분 범위를 DB에서 한 번 확인합니다. 확인한 기록은 인덱스에 추가됩니다.
+    """
+    if account.recent_records.contains(name, status, record_time):
+        return True
+    if record_time >= WORKER_STARTED_AT - timedelta(minutes=1):
+        return False
 
-def is_duplicate(db, name: str, status: str, record_time: datetime) -> bool:
-    """중복 기록 확인"""
     time_window = timedelta(minutes=1)
-    existing = db.query(ClassUpAttendance).filter(
+    existing = db.query(ClassUpAttendance.id).filter(
+        ClassUpAttendance.source_account == account.key,
         ClassUpAttendance.student_name == name,
         ClassUpAttendance.status == status,
         ClassUpAttendance.record_time >= record_time - time_window,
         ClassUpAttendance.record_time <= record_time + time_window
     ).first()
-    return existing is not None
+    if existing is not None:
+        account.recent_records.add(name, status, record_time)
+        return True
+    return False
 
 
-def parse_record_time(record_time_str: str):
-    """시간 문자열 파싱"""
-    try:
-        record_time_str = record_time_str.strip()
-        if " " in record_time_str:
-            record_time = datetime.strptime(record_time_str, "%Y-%m-%d %H:%M:%S")
-            return KST.localize(record_time)
-        elif ":" in record_time_str:
-            today = datetime.now(KST).date()
-            parts = record_time_str.split(":")
-            hour, minute = int(parts[0]), int(parts[1])
-            return datetime(today.year, today.month, today.day, hour, minute, tzinfo=KST)
-    except:
-        pass
-    return None
-
-
-def save_records(records: list) -> dict:
-    """기록을 DB에 저장"""
+def notify_new_records(db, record_ids: list):
+    """Postgres NOTIFY로 새 레코드 ID 전달 (메인 서버 LISTEN, SQLite면 생략 - 메인 서버가 폴링)"""
+    if engine.dialect.name != "postgresql":
+        return
+    # payload 8000바이트 제한 - ID를 나눠서 전송
+    for start in range(0, len(record_ids), NOTIFY_CHUNK_SIZE):
+        payload = ",".join(str(i) for i in record_ids[start:start + NOTIFY_CHUNK_SIZE])
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": NOTIFY_CHANNEL, "payload": payload})
+
+
+def save_records(account: Account, records: list, fetched: int = None) -> dict:
+    """기록을 DB에 저장 (records는 classup_core.parser.parse_rows 형식)"""
     db = SessionLocal()
-    result = {"fetched": len(records), "new": 0}
+    result = {"fetched": len(records) if fetched is None else fetched, "new": 0}
+    saved = []
+    saved_rows = []
 
     try:
-        for rec in records:
-            if is_duplicate(db, rec["name"], rec["status"], rec["record_time"]):
-                continue
-
-            student_id = match_student(rec["name"], rec["phone"], db)
+        with index_lock:
+            refresh_student_index(db)
+            fresh = []
+            for rec in records:
+                if is_duplicate(db, account, rec["student_name"], rec["status"], rec["record_time"]):
+                    continue
+                fresh.append((rec, match_student(rec["student_name"], rec["phone_number"])))
 
+        for rec, student_id in fresh:
             is_late = False
             if rec["status"] == "입장":
                 if rec["record_time"].hour >= 8 and rec["record_time"].minute > 10:
                     is_late = True
 
             attendance = ClassUpAttendance(
-                student_name=rec["name"],
-                phone_number=rec["phone"],
+                student_name=rec["student_name"],
+                phone_number=rec["phone_number"],
                 available_time=rec["available_time"],
                 status=rec["status"],
-                status_detail=rec["status_detail"],
+                status_detail=None,
                 record_time=rec["record_time"],
                 local_student_id=student_id,
-                is_late=is_late
+                is_late=is_late,
+                source_account=account.key
             )
             db.add(attendance)
+            saved.append(rec)
+            saved_rows.append(attendance)
             result["new"] += 1
 
-        sync_log = ClassUpSyncLog(
-            records_fetched=result["fetched"],
-            new_records=result["new"],
-            status="success"
-        )
-        db.add(sync_log)
+        # 개별 로그는 새 기록이 있는 사이클만 (나머지는 log_cycle의 분 단위 롤업)
+        if result["new"]:
+            db.add(ClassUpSyncLog(
+                records_fetched=result["fetched"],
+                new_records=result["new"],
+                status="success"
+            ))
+
+        # 새 레코드 ID를 메인 서버에 알림 (NOTIFY는 커밋 시점에 전달됨)
+        if saved_rows:
+            db.flush()
+            notify_new_records(db, [row.id for row in saved_rows])
         db.commit()
 
+        # 커밋된 기록만 인덱스에 반영 (롤백 시 다음 사이클에 다시 저장 시도)
+        with index_lock:
+            for rec in saved:
+                account.recent_records.add(rec["student_name"], rec["status"], rec["record_time"])
+
     except Exception as e:
-        logger.error(f"저장 오류: {e}")
+        logger.error(f"{account.label}저장 오류: {e}")
         db.rollback()
         result["error"] = str(e)
     finally:
@@ -236,252 +481,254 @@ def save_records(records: list) -> dict:
     return result
 
 
-# ============ 브라우저 관리 클래스 ============
+# ============ 백필 (중단 구간 복구) ============
 
-class BrowserManager:
-    """브라우저 생명주기 관리"""
+def parse_backfill_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return KST.localize(parsed) if parsed.tzinfo is None else parsed
 
-    def __init__(self):
-        self.playwright = None
-        self.browser = None
-        self.context = None
-        self.page = None
-        self.is_initialized = False
 
-    def start(self):
-        """브라우저 시작"""
-        try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--single-process',
-                    '--no-zygote'
-                ]
-            )
-            self._create_context()
-            logger.info("브라우저 시작 완료")
-            return True
-        except Exception as e:
-            logger.error(f"브라우저 시작 실패: {e}")
-            return False
-
-    def _create_context(self):
-        """새 컨텍스트/페이지 생성"""
-        if self.context:
-            try:
-                self.context.close()
-            except:
-                pass
-
-        self.context = self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            ignore_https_errors=True,
-            locale='ko-KR',
-            timezone_id='Asia/Seoul',
-            storage_state=str(SESSION_FILE) if SESSION_FILE.exists() else None
-        )
-        self.page = self.context.new_page()
-        self.is_initialized = False
+def save_backfill_records(account: Account, records: list) -> int:
+    """백필 기록 저장 - classup_attendance와 ±1분 중복 제거 후 일괄 INSERT
 
-    def initialize_page(self) -> bool:
-        """페이지 초기 로드"""
-        try:
-            self.page.goto(CLASSUP_URL, wait_until='networkidle', timeout=30000)
-            time.sleep(1)
+    지난 구간의 기록이므로 Discord 알림은 보내지 않음 (discord_notified=True)
+    """
+    if not records:
+        return 0
 
-            if "login" in self.page.url.lower():
-                logger.error("로그인 페이지로 리다이렉트됨 - 세션 만료")
-                return False
+    start = min(r["record_time"] for r in records) - timedelta(minutes=1)
+    end = max(r["record_time"] for r in records) + timedelta(minutes=1)
+    db = SessionLocal()
+    try:
+        with index_lock:
+            refresh_student_index(db, force=True)
+
+        # 구간 안의 기존 기록으로 중복 확인 인덱스 구성 (DB의 naive 시각은 KST)
+        existing = RecentRecordIndex(retention=end - start + timedelta(days=1), max_keys=10 ** 7)
+        for name, status, record_time in db.query(
+            ClassUpAttendance.student_name, ClassUpAttendance.status, ClassUpAttendance.record_time
+        ).filter(
+            ClassUpAttendance.source_account == account.key,
+            ClassUpAttendance.record_time >= start,
+            ClassUpAttendance.record_time <= end
+        ):
+            existing.add(name, status, KST.localize(record_time) if record_time.tzinfo is None else record_time)
+
+        rows = []
+        with index_lock:
+            for rec in sorted(records, key=lambda r: r["record_time"]):
+                if existing.contains(rec["student_name"], rec["status"], rec["record_time"]):
+                    continue
+                existing.add(rec["student_name"], rec["status"], rec["record_time"])
+                rows.append({
+                    "student_name": rec["student_name"],
+                    "phone_number": rec["phone_number"],
+                    "available_time": rec["available_time"],
+                    "status": rec["status"],
+                    "status_detail": None,
+                    "record_time": rec["record_time"],
+                    "local_student_id": match_student(rec["student_name"], rec["phone_number"]),
+                    "is_late": rec["status"] == "입장" and rec["record_time"].hour >= 8 and rec["record_time"].minute > 10,
+                    "discord_notified": True,
+                    "source_account": account.key,
+                })
+
+        if rows:
+            db.bulk_insert_mappings(ClassUpAttendance, rows)
+            db.commit()
+            with index_lock:
+                for row in rows:
+                    account.recent_records.add(row["student_name"], row["status"], row["record_time"])
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
-            # 팝업 닫기
-            self.page.keyboard.press("Escape")
-            time.sleep(0.3)
 
-            self.page.wait_for_selector("table", timeout=10000)
-            self.is_initialized = True
-            logger.info(f"페이지 초기화 완료: {self.page.url}")
-            return True
-        except Exception as e:
-            logger.error(f"페이지 초기화 실패: {e}")
-            return False
+def last_synced_at(account: Account):
+    """DB에 남은 계정의 마지막 동기화 시각 (워커 시작 시 중단 구간 판단용)"""
+    db = SessionLocal()
+    try:
+        candidates = [
+            db.query(func.max(ClassUpSyncRollup.last_sync_time)).filter(
+                ClassUpSyncRollup.source == account.source
+            ).scalar(),
+        ]
+        if account.key == "default":
+            # 개별 로그에는 계정 구분이 없으므로 기본 계정에만 반영
+            candidates.append(db.query(func.max(ClassUpSyncLog.sync_time)).scalar())
+        candidates = [KST.localize(c) if c.tzinfo is None else c for c in candidates if c]
+        return max(candidates) if candidates else None
+    except Exception as e:
+        logger.warning(f"마지막 동기화 시각 조회 실패: {e}")
+        return None
+    finally:
+        db.close()
 
-    def scrape(self) -> list:
-        """페이지에서 데이터 스크래핑"""
-        records = []
 
-        try:
-            # 초기화 안됐으면 초기화
-            if not self.is_initialized:
-                if not self.initialize_page():
-                    return []
-            else:
-                # 이미 초기화됐으면 reload만
-                self.page.reload(wait_until='networkidle', timeout=15000)
-                time.sleep(0.3)
-
-            # 로그인 체크
-            if "login" in self.page.url.lower():
-                logger.error("세션 만료 감지")
-                self.is_initialized = False
-                return []
-
-            # 팝업 닫기
-            self.page.keyboard.press("Escape")
-            time.sleep(0.1)
-
-            # 테이블 데이터 수집
-            rows = self.page.query_selector_all('table tbody tr, table tr')
-
-            for row in rows:
-                try:
-                    cells = row.query_selector_all('td')
-                    if len(cells) >= 5:
-                        name = cells[0].inner_text().strip()
-                        phone = cells[1].inner_text().strip()
-                        available_time = cells[2].inner_text().strip()
-                        status = cells[3].inner_text().strip()
-                        record_time_str = cells[4].inner_text().strip()
-
-                        record_time = parse_record_time(record_time_str)
-
-                        if name and status and record_time:
-                            records.append({
-                                "name": name,
-                                "phone": phone,
-                                "available_time": available_time,
-                                "status": status,
-                                "status_detail": None,
-                                "record_time": record_time
-                            })
-                except:
-                    continue
+accounts = {key: Account(key) for key in SESSION_KEYS}
+multi_loop = None  # run_worker에서 생성 (헬스 서버 /accounts)
 
-            return records
-
-        except PlaywrightError as e:
-            error_msg = str(e).lower()
-            if "crash" in error_msg or "closed" in error_msg or "target" in error_msg:
-                logger.warning(f"페이지 크래시 감지, 컨텍스트 재생성: {e}")
-                self._create_context()
-            else:
-                logger.error(f"Playwright 오류: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"스크래핑 오류: {e}")
-            return []
-
-    def restart(self):
-        """브라우저 완전 재시작"""
-        logger.info("브라우저 재시작 중...")
-        self.stop()
-        time.sleep(2)
-        get_session_from_db()  # 세션 다시 로드
-        return self.start()
-
-    def stop(self):
-        """브라우저 종료"""
-        try:
-            if self.page:
-                self.page.close()
-        except:
-            pass
-        try:
-            if self.context:
-                self.context.close()
-        except:
-            pass
-        try:
-            if self.browser:
-                self.browser.close()
-        except:
-            pass
-        try:
-            if self.playwright:
-                self.playwright.stop()
-        except:
-            pass
-        self.playwright = None
-        self.browser = None
-        self.context = None
-        self.page = None
-        self.is_initialized = False
+# Healthcheck 서버를 별도 스레드로 시작 (핸들러가 쓰는 accounts/multi_loop가 정의된 뒤)
+health_thread = threading.Thread(target=start_health_server, daemon=True)
+health_thread.start()
 
 
 # ============ 메인 워커 ============
 
+def store_new_records(account: Account, records: list, new_records: list) -> int:
+    """ScrapeLoop 저장 콜백 - 새 기록만 DB 저장 (실패 시 예외로 다음 사이클에 재시도)"""
+    if not new_records:
+        return 0
+    result = save_records(account, new_records, fetched=len(records))
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result["new"]
+
+
+# 사이클 집계는 계정별 (Account.sync_rollup, 구간이 끝날 때 classup_sync_rollups에 한 번 저장)
+
+def save_rollup(db, bucket: dict, source: str = "external"):
+    """구간 집계 저장 (재시작으로 같은 구간 행이 있으면 합침)"""
+    row = db.query(ClassUpSyncRollup).filter(
+        ClassUpSyncRollup.source == source,
+        ClassUpSyncRollup.bucket_start == bucket["bucket_start"]
+    ).first()
+    if row is None:
+        row = ClassUpSyncRollup(source=source)
+        db.add(row)
+    merge_into(row, bucket)
+
+
+def record_cycle_stats(account: Account, result: dict, closed: dict = None):
+    """오류 사이클은 개별 로그, 끝난 구간은 롤업으로 저장 (유휴 사이클은 DB에 쓰지 않음)"""
+    error = None if result["success"] else (result["error"] or "스크래핑 실패")
+    if closed is None:
+        closed = account.sync_rollup.add(datetime.now(KST), len(result["records"]), result["new"],
+                                 error, result.get("elapsed_ms"))
+    if not error and not closed:
+        return
+
+    db = SessionLocal()
+    try:
+        if error:
+            db.add(ClassUpSyncLog(errors=f"{account.label}{error}"[:1000], status="error"))
+        if closed:
+            save_rollup(db, closed, account.source)
+        db.commit()
+    except Exception as e:
+        logger.error(f"동기화 로그 저장 오류: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def log_cycle(account: Account, result: dict):
+    """사이클 결과 로그"""
+    record_cycle_stats(account, result)
+
+    # 중단 구간에서 복구되면 그 구간 백필 (백그라운드)
+    window = account.outage_detector.observe(result["success"], datetime.now(KST))
+    if window and account.backfill_runner.start(*window):
+        logger.info(f"{account.label}중단 구간 감지 - 백필 시작: {window[0].isoformat()} ~ {window[1].isoformat()}")
+
+    cycle = result["cycle"]
+    label = account.label
+    if not result["success"]:
+        if cycle % 10 == 0 or result["session_expired"]:
+            logger.warning(f"{label}[{cycle}] 스크래핑 실패: {result['error']}")
+        return
+
+    if result["new"] > 0:
+        logger.info(f"{label}[{cycle}] 새 기록: {result['new']}개 (총 {len(result['records'])}개)")
+    elif cycle % 20 == 0:
+        # 20회마다 상태 로그 (새 기록 없어도)
+        logger.info(f"{label}[{cycle}] 스크래핑 정상 - {len(result['records'])}개 확인 (새 기록 없음)")
+
+    metrics = result.get("metrics")
+    if metrics and cycle % 20 == 0:
+        rss_kb = result.get("rss_kb")
+        logger.info(
+            f"{label}[{cycle}] 사이클 지표: {metrics['duration_ms']}ms, "
+            f"{metrics['bytes'] / 1024:.1f}KB, 요청 {metrics['requests']}개, 차단 {metrics['blocked']}개"
+            + (f", 브라우저 RSS {rss_kb / 1024:.0f}MB" if rss_kb else "")
+        )
+
+
 def run_worker():
     """워커 메인 루프"""
-    logger.info("ClassUp Worker 시작")
+    global multi_loop
+    logger.info(f"ClassUp Worker 시작 (계정: {', '.join(SESSION_KEYS)})")
 
-    # 세션 확인
-    cookie_count = get_session_from_db()
-    if not cookie_count:
+    # 동기화 롤업 테이블/계정 컬럼 (메인 서버보다 먼저 배포된 경우 대비)
+    try:
+        ClassUpSyncRollup.__table__.create(bind=engine, checkfirst=True)
+        ensure_source_account_column()
+    except Exception as e:
+        logger.warning(f"롤업 테이블/계정 컬럼 확인 실패: {e}")
+
+    # 워커가 내려가 있던 구간도 첫 성공 사이클 후 백필
+    for account in accounts.values():
+        account.outage_detector.seed(last_synced_at(account))
+
+    # 세션 확인 - 세션이 있는 계정만 시작 (하나도 없으면 대기)
+    while True:
+        ready = []
+        for account in accounts.values():
+            cookie_count = account.load_session()
+            if cookie_count:
+                logger.info(f"{account.label}세션 로드 완료: {cookie_count}개 쿠키")
+                ready.append(account)
+            elif len(accounts) > 1:
+                logger.warning(f"{account.label}세션이 없어 제외합니다. (session_key={account.key})")
+        if ready:
+            break
         logger.error("세션이 없습니다. 메인 서버에서 ClassUp 로그인을 해주세요.")
         logger.info("30초 후 재시도...")
         time.sleep(30)
-        return run_worker()
-
-    logger.info(f"세션 로드 완료: {cookie_count}개 쿠키")
-
-    manager = BrowserManager()
-    if not manager.start():
-        logger.error("브라우저 시작 실패, 30초 후 재시도")
-        time.sleep(30)
-        return run_worker()
 
-    scrape_count = 0
-    error_count = 0
+    # 계정이 여러 개면 브라우저 하나를 공유하고 계정별 컨텍스트만 생성
+    shared_browser = None
+    if SCRAPE_ENGINE in ("browser", "playwright") and len(ready) > 1:
+        shared_browser = SharedBrowser(DEFAULT_LAUNCH_ARGS)
+
+    timetable = load_timetable()
+    loops = {}
+    for account in ready:
+        if SCRAPE_ENGINE == "http":
+            backend = create_backend("http", account.session_file, on_session_refreshed=account.save_session)
+        elif shared_browser:
+            backend = create_backend(SCRAPE_ENGINE, account.session_file, shared_browser=shared_browser,
+                                     launch_args=DEFAULT_LAUNCH_ARGS)
+        else:
+            backend = create_backend(SCRAPE_ENGINE, account.session_file, launch_args=DEFAULT_LAUNCH_ARGS)
+
+        # 재시작/세션 갱신 전에는 메인 서버가 다시 로그인했을 수 있으므로 DB 세션을 다시 로드
+        loops[account.key] = ScrapeLoop(
+            backend,
+            on_records=partial(store_new_records, account),
+            scheduler=AdaptiveScheduler(timetable=timetable),
+            before_restart=account.load_session,
+            on_cycle=partial(log_cycle, account),
+        )
+    logger.info(f"스크래핑 엔진: {backend.name} (계정 {len(loops)}개)")
 
+    multi_loop = MultiAccountLoop(loops)
     try:
-        while True:
-            scrape_count += 1
-
-            # 주기적 브라우저 재시작 (메모리 관리)
-            if scrape_count > 0 and scrape_count % BROWSER_RESTART_INTERVAL == 0:
-                logger.info(f"[{scrape_count}] 주기적 브라우저 재시작")
-                if not manager.restart():
-                    logger.error("브라우저 재시작 실패")
-                    time.sleep(10)
-                    continue
-                error_count = 0
-
-            # 스크래핑
-            records = manager.scrape()
-
-            if records:
-                result = save_records(records)
-                if result.get("new", 0) > 0:
-                    logger.info(f"[{scrape_count}] 새 기록: {result['new']}개 (총 {len(records)}개)")
-                elif scrape_count % 20 == 0:
-                    # 20회마다 상태 로그 (새 기록 없어도)
-                    logger.info(f"[{scrape_count}] 스크래핑 정상 - {len(records)}개 확인 (새 기록 없음)")
-                error_count = 0
-            else:
-                error_count += 1
-                if error_count % 10 == 0:
-                    logger.warning(f"연속 {error_count}회 빈 결과")
-
-                # 연속 에러가 많으면 브라우저 재시작
-                if error_count >= 20:
-                    logger.warning("연속 20회 실패, 브라우저 재시작")
-                    if manager.restart():
-                        error_count = 0
-                    else:
-                        time.sleep(30)
-
-            time.sleep(SCRAPE_INTERVAL)
-
+        # 다음 사이클 시각이 가장 이른 계정부터 번갈아 실행
+        # 운영 시간 외에는 브라우저를 내리고 대기, 경계 시각 ~1초, 교시 중간 느리게
+        multi_loop.run()
     except KeyboardInterrupt:
         logger.info("종료 신호 수신")
     except Exception as e:
         logger.error(f"워커 오류: {e}")
     finally:
-        manager.stop()
+        for account in accounts.values():
+            closed = account.sync_rollup.flush()
+            if closed:
+                record_cycle_stats(account, {"success": True, "records": [], "new": 0}, closed=closed)
         logger.info("ClassUp Worker 종료")
 
 
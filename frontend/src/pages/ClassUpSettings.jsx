@@ -431,6 +431,12 @@ function ClassUpSettings() {
                                         </span>
                                     </div>
                                     <div className="text-sm">
+                                        {log.cycles != null && (
+                                            <>
+                                                <span className="text-gray-600">사이클: {log.cycles}{log.error_count > 0 ? ` (오류 ${log.error_count})` : ''}</span>
+                                                <span className="mx-2 text-gray-300">|</span>
+                                            </>
+                                        )}
                                         <span className="text-gray-600">조회: {log.records_fetched}</span>
                                         <span className="mx-2 text-gray-300">|</span>
                                         <span className="text-green-600">신규: {log.new_records}</span>
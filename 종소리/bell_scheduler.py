@@ -34,47 +34,29 @@ except ImportError:
 # 이 스크립트와 같은 폴더(종소리)에 bell.mp3를 넣으세요
 BELL_SOUND_FILE = os.path.join(os.path.dirname(__file__), "bell.mp3")
 
-# 시간표 정의 (시작시간, 종료시간, 이름)
-SCHEDULE = [
-    # 등원
-    ("08:00", "등원 시작"),
-
-    # 1교시
-    ("08:00", "1교시 시작"),
-    ("10:00", "1교시 종료"),
-
-    # 1교시 쉬는시간
-    ("10:20", "2교시 시작"),
-    ("12:00", "2교시 종료"),
-
-    # 점심시간
-    ("13:00", "3교시 시작"),
-    ("15:00", "3교시 종료"),
-
-    # 3교시 쉬는시간
-    ("15:20", "4교시 시작"),
-    ("16:40", "4교시 종료"),
-
-    # 쉬는시간
-    ("16:50", "5교시 시작"),
-    ("18:00", "5교시 종료"),
-
-    # 저녁시간
-    ("19:00", "6교시 시작"),
-    ("20:20", "6교시 종료"),
-
-    # 6교시 쉬는시간
-    ("20:30", "7교시 시작"),
-    ("22:00", "7교시 종료 (하원)"),
-]
-
-# 중복 제거 (같은 시간에 여러 이벤트가 있을 수 있음)
-BELL_TIMES = {}
-for bell_time, description in SCHEDULE:
-    if bell_time not in BELL_TIMES:
-        BELL_TIMES[bell_time] = description
-    else:
-        BELL_TIMES[bell_time] += f" / {description}"
+# 시간표는 백엔드 시간표 모듈(DB 저장, 웹에서 편집)을 사용
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# 시간표 변경 확인 간격 (분) - 바뀌면 종 시간을 다시 등록
+TIMETABLE_CHECK_MINUTES = 10
+
+
+def load_timetable():
+    """DB 시간표 (DB/백엔드 패키지를 쓸 수 없으면 기본 시간표)"""
+    try:
+        from timetable.service import get_timetable
+        return get_timetable(force=True)
+    except Exception as e:
+        print(f"[경고] DB 시간표 로드 실패 - 기본 시간표 사용: {e}")
+        from classup_core.timetable import default_timetable
+        return default_timetable()
+
+
+def build_bell_times(timetable):
+    """{"HH:MM": "1교시 시작 / ..."} - 같은 시각 이벤트는 합쳐서 한 번만 울림"""
+    return dict(timetable.bell_events())
 
 
 # ============================================
@@ -112,10 +94,30 @@ def play_bell(description=""):
 
 def schedule_bell(bell_time, description):
     """특정 시간에 종소리를 예약합니다."""
-    schedule.every().day.at(bell_time).do(play_bell, description=description)
+    schedule.every().day.at(bell_time).do(play_bell, description=description).tag("bell")
     print(f"  ⏰ {bell_time} - {description}")
 
 
+def register_bells(bell_times):
+    """종 시간 전체 등록 (기존 등록은 지움)"""
+    schedule.clear("bell")
+    print("📅 등록된 종 시간:")
+    print("-" * 50)
+    for bell_time, description in sorted(bell_times.items()):
+        schedule_bell(bell_time, description)
+    print("-" * 50)
+    print()
+
+
+def refresh_bells(state):
+    """DB 시간표가 바뀌었으면 종 시간 재등록"""
+    bell_times = build_bell_times(load_timetable())
+    if bell_times != state["bell_times"]:
+        print("\n🔄 시간표 변경 감지 - 종 시간을 다시 등록합니다.")
+        register_bells(bell_times)
+        state["bell_times"] = bell_times
+
+
 # ============================================
 # 메인 실행
 # ============================================
@@ -135,12 +137,9 @@ def main():
     print()
 
     # 스케줄 등록
-    print("📅 등록된 종 시간:")
-    print("-" * 50)
-    for bell_time, description in sorted(BELL_TIMES.items()):
-        schedule_bell(bell_time, description)
-    print("-" * 50)
-    print()
+    state = {"bell_times": build_bell_times(load_timetable())}
+    register_bells(state["bell_times"])
+    schedule.every(TIMETABLE_CHECK_MINUTES).minutes.do(refresh_bells, state)
 
     # 현재 시간 표시
     now = datetime.datetime.now()